@@ -0,0 +1,138 @@
+import numpy as np
+from scipy.special import loggamma
+
+EXTRAPOLATIONS = ("power_law", "constant", "zeros")
+
+
+def mellin_spherical_bessel(z: np.array, ell: int) -> np.array:
+    """
+    Mellin transform of the spherical Bessel function, int_0^inf x^(z-1) j_ell(x) dx,
+    valid for -ell < Re(z) < 2.
+    """
+    return (
+        2.0 ** (z - 2.0)
+        * np.sqrt(np.pi)
+        * np.exp(loggamma(0.5 * (ell + z)) - loggamma(0.5 * (3.0 + ell - z)))
+    )
+
+
+def fourier_window(n: int, window: float) -> np.array:
+    """
+    Tapers the highest frequency Fourier coefficients to reduce ringing (Eq 13 in
+    https://arxiv.org/abs/1911.11947), for the rfft ordering of n points.
+    Args:
+        n: number of points in configuration space.
+        window: fraction of the coefficients to taper.
+    """
+    m = np.arange(n // 2 + 1, dtype=float)
+    m_max = n / 2.0
+    m_right = (1.0 - window) * m_max
+    weights = np.ones_like(m)
+    if window > 0.0:
+        taper = m > m_right
+        x = (m_max - m[taper]) / (m_max - m_right)
+        weights[taper] = x - np.sin(2.0 * np.pi * x) / (2.0 * np.pi)
+    return weights
+
+
+def extrapolate(f: np.array, n_pad: int, extrapolation: str) -> np.array:
+    """
+    Pads f, sampled on a log-spaced grid, with n_pad points on each side along the last axis.
+    Args:
+        f: function values.
+        n_pad: number of points to add on each side.
+        extrapolation: either power_law (continues the local log-log slope, falls back to zeros
+        if the values change sign), constant or zeros.
+    """
+    if n_pad == 0:
+        return f
+    if extrapolation not in EXTRAPOLATIONS:
+        raise ValueError(f"extrapolation must be one of {EXTRAPOLATIONS}")
+    steps = np.arange(1, n_pad + 1)
+    if extrapolation == "zeros":
+        low = np.zeros(f.shape[:-1] + (n_pad,))
+        high = low
+    elif extrapolation == "constant":
+        low = np.repeat(f[..., :1], n_pad, axis=-1)
+        high = np.repeat(f[..., -1:], n_pad, axis=-1)
+    else:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            low_ratio = f[..., :1] / f[..., 1:2]
+            high_ratio = f[..., -1:] / f[..., -2:-1]
+        low_ratio = np.where(np.isfinite(low_ratio) & (low_ratio > 0.0), low_ratio, 0.0)
+        high_ratio = np.where(
+            np.isfinite(high_ratio) & (high_ratio > 0.0), high_ratio, 0.0
+        )
+        low = f[..., :1] * low_ratio ** steps[::-1]
+        high = f[..., -1:] * high_ratio ** steps
+    return np.concatenate((low, f, high), axis=-1)
+
+
+class FFTLogPlan:
+    def __init__(
+        self,
+        r: np.array,
+        ell: int,
+        q: float = 1.5,
+        kr: float = 1.0,
+        n_pad: int = 0,
+        extrapolation: str = "power_law",
+        window: float = 0.25,
+    ):
+        """
+        Precomputes the FFTLog ( https://arxiv.org/abs/astro-ph/9905191 ) spherical Bessel transform
+            G(k) = int_0^inf f(r) j_ell(kr) r^2 dr,
+        so that transforming new f(r) sampled on the same grid only costs one FFT pair.
+        Args:
+            r: log-spaced input grid.
+            ell: order of the spherical Bessel function.
+            q: power law bias, the transform assumes r^(3 - q) f(r) is periodic. Must satisfy -ell < q < 2.
+            kr: product of the first point of the output grid and the last point of the input
+            grid, by default k spans [1 / r_max, 1 / r_min].
+            n_pad: number of points used to extrapolate f(r) on each side of the grid.
+            extrapolation: either power_law, constant or zeros.
+            window: fraction of the Fourier coefficients tapered to reduce ringing.
+        """
+        r = np.asarray(r, dtype=float)
+        dlnr = np.diff(np.log(r))
+        if not np.allclose(dlnr, dlnr[0], rtol=1.0e-5):
+            raise ValueError("r must be log-spaced")
+        if not -ell < q < 2:
+            raise ValueError("q must satisfy -ell < q < 2")
+        if extrapolation not in EXTRAPOLATIONS:
+            raise ValueError(f"extrapolation must be one of {EXTRAPOLATIONS}")
+        self.r = r
+        self.ell = ell
+        self.q = q
+        self.n_pad = n_pad
+        self.extrapolation = extrapolation
+        self.dlnr = dlnr[0]
+
+        n = len(r) + 2 * n_pad
+        r_padded = r[0] * np.exp(self.dlnr * (np.arange(n) - n_pad))
+        k_padded = kr / r_padded[-1] * np.exp(self.dlnr * np.arange(n))
+        self.n = n
+        self.k = k_padded[n_pad : n_pad + len(r)]
+
+        omega = 2.0 * np.pi * np.arange(n // 2 + 1) / (n * self.dlnr)
+        u = mellin_spherical_bessel(q + 1j * omega, ell) * (
+            k_padded[0] * r_padded[0]
+        ) ** (-1j * omega)
+        if n % 2 == 0:
+            # The Nyquist mode must be real for the output to be real
+            u[-1] = u[-1].real
+        self._u = u * fourier_window(n, window)
+        self._input_weight = r_padded ** (3.0 - q)
+        self._output_weight = k_padded[n_pad : n_pad + len(r)] ** (-q)
+
+    def __call__(self, f: np.array) -> np.array:
+        """
+        Args:
+            f: function values on the r grid (transformed along the last axis).
+        Returns:
+            G(k) on the k grid (``self.k``).
+        """
+        f = extrapolate(np.asarray(f, dtype=float), self.n_pad, self.extrapolation)
+        c = np.fft.rfft(f * self._input_weight, axis=-1)
+        g = np.fft.irfft(np.conj(c * self._u), n=self.n, axis=-1)
+        return self._output_weight * g[..., self.n_pad : self.n_pad + len(self.r)]
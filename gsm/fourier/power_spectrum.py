@@ -0,0 +1,76 @@
+import numpy as np
+from typing import Dict, Sequence
+from scipy.integrate import simps
+from scipy.special import eval_legendre
+from gsm.fourier.fftlog import FFTLogPlan
+
+
+def multipoles_from_s_mu(
+    twopcf_s_mu: np.array, mu_c: np.array, ells: Sequence[int] = (0, 2, 4)
+) -> np.array:
+    """
+    Legendre multipoles of the redshift space two point correlation function, as returned
+    by ```gsm.streaming_integral.real2redshift.simps_integrate```.
+    Args:
+        twopcf_s_mu: 2-D array with the correlation function as a function of s and mu.
+        mu_c: cosine of the angle respect to the line of sight bins, between 0 and 1.
+        ells: even multipoles to compute.
+    Returns:
+        twopcf_ell: 2-D array with shape (len(ells), n_s).
+    """
+    return np.array(
+        [
+            (2 * ell + 1) * simps(twopcf_s_mu * eval_legendre(ell, mu_c), mu_c, axis=-1)
+            for ell in ells
+        ]
+    )
+
+
+def get_plans(
+    s: np.array, ells: Sequence[int] = (0, 2, 4), **kwargs
+) -> Dict[int, FFTLogPlan]:
+    """
+    Transform plans to go from correlation function to power spectrum multipoles. Keep them
+    around to transform new multipoles sampled at the same s at the cost of one FFT pair each.
+    Args:
+        s: log-spaced pair distances.
+        ells: even multipoles.
+        kwargs: passed to ```FFTLogPlan``` (q, kr, n_pad, extrapolation, window).
+    Returns:
+        plans: dictionary with one plan per multipole.
+    """
+    if any(ell % 2 != 0 for ell in ells):
+        raise ValueError("Only even multipoles are supported")
+    return {ell: FFTLogPlan(s, ell, **kwargs) for ell in ells}
+
+
+def xi2pk(
+    s: np.array,
+    twopcf_ell: np.array,
+    ells: Sequence[int] = (0, 2, 4),
+    plans: Dict[int, FFTLogPlan] = None,
+    **kwargs,
+):
+    """
+    Redshift space power spectrum multipoles,
+        P_ell(k) = 4 pi (-i)^ell int xi_ell(s) j_ell(ks) s^2 ds,
+    computed with FFTLog.
+    Args:
+        s: log-spaced pair distances.
+        twopcf_ell: 2-D array with the correlation function multipoles, shape (len(ells), n_s).
+        ells: even multipoles.
+        plans: plans returned by ```get_plans```, built on the fly if not given.
+        kwargs: passed to ```get_plans``` if plans is None.
+    Returns:
+        k: wavenumbers.
+        power_ell: 2-D array with shape (len(ells), n_k).
+    """
+    if plans is None:
+        plans = get_plans(s, ells, **kwargs)
+    power_ell = np.array(
+        [
+            4.0 * np.pi * (-1) ** (ell // 2) * plans[ell](twopcf)
+            for ell, twopcf in zip(ells, twopcf_ell)
+        ]
+    )
+    return plans[ells[0]].k, power_ell
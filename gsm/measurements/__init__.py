@@ -1 +1,11 @@
-from .tpcf import compute_real_tpcf , compute_tpcf_s_mu
+from .chunked import compute_chunked_statistics
+from .cache import enable_cache, disable_cache, get_cache
+
+
+def __getattr__(name):
+    # the tpcf estimators depend on halotools, which is only imported when they are requested
+    if name in ("compute_real_tpcf", "compute_tpcf_s_mu"):
+        from . import tpcf
+
+        return getattr(tpcf, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,165 @@
+import functools
+import hashlib
+import inspect
+import os
+import tempfile
+import numpy as np
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+
+def update_hash(digest, value):
+    """
+    Feeds value into the hash, arrays by dtype, shape and memory (no conversion to text), containers
+    recursively and anything else by its repr.
+    """
+    if isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value)
+        digest.update(f"array{value.dtype.str}{value.shape}".encode())
+        digest.update(memoryview(value).cast("B"))
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}{len(value)}".encode())
+        for item in value:
+            update_hash(digest, item)
+    elif isinstance(value, dict):
+        digest.update(f"dict{len(value)}".encode())
+        for key in sorted(value, key=repr):
+            update_hash(digest, key)
+            update_hash(digest, value[key])
+    else:
+        digest.update(repr(value).encode())
+
+
+def hash_arguments(function: Callable, args: tuple, kwargs: dict, ignore: Sequence[str] = ()):
+    """
+    Key identifying a call to function, independent of how the arguments are passed (positional,
+    keyword or defaults). Arguments in ignore (e.g. num_threads) do not change the key.
+    """
+    arguments = inspect.signature(function).bind(*args, **kwargs)
+    arguments.apply_defaults()
+    digest = hashlib.blake2b(digest_size=20)
+    update_hash(digest, f"{function.__module__}.{function.__qualname__}")
+    for name, value in arguments.arguments.items():
+        if name not in ignore:
+            update_hash(digest, name)
+            update_hash(digest, value)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of measurement results, one .npz file per call, with least recently used
+    eviction once the total size of the files exceeds max_size.
+    """
+
+    def __init__(self, directory: str, max_size: float = 1.0e9):
+        """
+        Args:
+            directory: where to store the results (created if needed).
+            max_size: maximum total size of the stored results, in bytes.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.npz"
+
+    def get(self, key: str):
+        """ Returns the stored result, or None if there is none """
+        path = self.path(key)
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                names = list(stored.files)
+                values = {name: stored[name] for name in names}
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        # file modification times keep track of the last use
+        os.utime(path)
+        self.hits += 1
+        if names == ["__result__"]:
+            return values["__result__"]
+        return values
+
+    def put(self, key: str, result):
+        """ Stores a result, either an array or a dictionary of arrays """
+        values = result if isinstance(result, dict) else {"__result__": result}
+        # write to a temporary file first, so that readers never see partial results
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(handle, "wb") as f:
+            np.savez(f, **values)
+        os.replace(temporary, self.path(key))
+        self.evict()
+
+    def evict(self):
+        files = [
+            (path.stat().st_mtime, path.stat().st_size, path)
+            for path in self.directory.glob("*.npz")
+        ]
+        total_size = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total_size <= self.max_size:
+                break
+            path.unlink()
+            total_size -= size
+
+    def clear(self):
+        for path in self.directory.glob("*.npz"):
+            path.unlink()
+        self.hits = 0
+        self.misses = 0
+
+    def size(self) -> int:
+        return sum(path.stat().st_size for path in self.directory.glob("*.npz"))
+
+
+_cache = None
+
+
+def enable_cache(directory: str, max_size: float = 1.0e9) -> ResultCache:
+    """
+    Turns on caching of the gsm.measurements functions. Results are keyed on a hash of all the
+    arguments (input arrays, binning, box size, line of sight, cosmology...) except num_threads.
+    Args:
+        directory: where to store the results.
+        max_size: maximum total size of the stored results, in bytes.
+    Returns:
+        cache: the ResultCache in use, with hits and misses counters.
+    """
+    global _cache
+    _cache = ResultCache(directory, max_size=max_size)
+    return _cache
+
+
+def disable_cache():
+    global _cache
+    _cache = None
+
+
+def get_cache() -> Optional[ResultCache]:
+    return _cache
+
+
+def cached(function: Callable = None, ignore: Sequence[str] = ("num_threads",)):
+    """
+    Decorator that looks up the results of function in the cache (if enabled) before computing them.
+    """
+    if function is None:
+        return functools.partial(cached, ignore=ignore)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        cache = _cache
+        if cache is None:
+            return function(*args, **kwargs)
+        key = hash_arguments(function, args, kwargs, ignore=ignore)
+        result = cache.get(key)
+        if result is None:
+            result = function(*args, **kwargs)
+            cache.put(key, result)
+        return result
+
+    return wrapper
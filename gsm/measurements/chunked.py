@@ -0,0 +1,213 @@
+import contextlib
+import os
+import tempfile
+import numpy as np
+from scipy.spatial import cKDTree
+from scipy.special import binom
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Moments measured, named as in gsm.moments (radial order, transverse order)
+MOMENTS = ((1, 0), (2, 0), (0, 2), (3, 0), (1, 2), (4, 0), (2, 2), (0, 4))
+
+
+def iterate_npy_chunks(
+    pos_files: Sequence[str], vel_files: Sequence[str], chunk_size: int = 1_000_000
+) -> Iterable[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Iterates over the (pos, vel) pairs of .npy files (e.g. one per snapshot file) in chunks of at
+    most chunk_size tracers, memory mapping the files so that only one chunk is read at a time.
+    """
+    for pos_file, vel_file in zip(pos_files, vel_files):
+        pos = np.load(pos_file, mmap_mode="r")
+        vel = np.load(vel_file, mmap_mode="r")
+        for start in range(0, len(pos), chunk_size):
+            yield (
+                np.asarray(pos[start : start + chunk_size]),
+                np.asarray(vel[start : start + chunk_size]),
+            )
+
+
+def bucket_into_slabs(
+    chunks: Iterable[Tuple[np.ndarray, np.ndarray]],
+    boxsize: float,
+    rmax: float,
+    n_slabs: int,
+    directory: str,
+    axis: int = 0,
+) -> Tuple[List[Tuple[str, str]], int]:
+    """
+    Distributes the tracers of a periodic box in n_slabs slabs along axis, stored on disk. Each slab
+    has a core (the tracers inside it) and a halo buffer (the tracers of other slabs closer than rmax
+    to it), so that all pairs with separation below rmax that involve a core tracer can be found
+    within the slab.
+    Args:
+        chunks: iterable of (pos, vel) arrays, each of shape (n, 3).
+        boxsize: size of the periodic box.
+        rmax: width of the halo buffers.
+        n_slabs: number of slabs.
+        directory: where to write the slabs.
+        axis: axis perpendicular to the slabs.
+    Returns:
+        slab_files: list of (core, halo) filenames, each storing (pos, vel) as float64 rows of 6 columns.
+        n_tracers: total number of tracers.
+    """
+    width = boxsize / n_slabs
+    slab_files = [
+        (
+            os.path.join(directory, f"slab_{i}_core.bin"),
+            os.path.join(directory, f"slab_{i}_halo.bin"),
+        )
+        for i in range(n_slabs)
+    ]
+    n_tracers = 0
+    # keep every slab file open for the whole pass, instead of reopening them for each chunk
+    with contextlib.ExitStack() as stack:
+        handles = [
+            (stack.enter_context(open(core, "wb")), stack.enter_context(open(halo, "wb")))
+            for core, halo in slab_files
+        ]
+        for pos, vel in chunks:
+            rows = np.hstack((np.mod(pos, boxsize), vel)).astype(np.float64)
+            n_tracers += len(rows)
+            x = rows[:, axis]
+            slab = np.minimum((x / width).astype(int), n_slabs - 1)
+            for i, (core, halo) in enumerate(handles):
+                # periodic distance to the slab [i * width, (i + 1) * width]
+                dx = np.mod(x - i * width, boxsize)
+                distance = np.minimum(np.maximum(dx - width, 0.0), boxsize - dx)
+                rows[slab == i].tofile(core)
+                rows[(slab != i) & (distance < rmax)].tofile(halo)
+    return slab_files, n_tracers
+
+
+def load_slab(filename: str) -> Tuple[np.ndarray, np.ndarray]:
+    rows = np.fromfile(filename, dtype=np.float64).reshape(-1, 6)
+    return rows[:, :3], rows[:, 3:]
+
+
+def pair_velocity_sums(
+    pos1: np.ndarray,
+    vel1: np.ndarray,
+    pos2: np.ndarray,
+    vel2: np.ndarray,
+    r_bins: np.array,
+    boxsize: float,
+    max_order: int = 4,
+    chunk_size: int = 100_000,
+) -> np.ndarray:
+    """
+    Sums of v_r^a |v_t|^b over the pairs (i in sample 1, j in sample 2) in each r bin, where v_r and
+    v_t are the components of v_j - v_i parallel and perpendicular to x_j - x_i (periodic box).
+    Args:
+        pos1, vel1, pos2, vel2: positions and velocities of the two samples.
+        r_bins: pair distance bin edges, r_bins[0] > 0 (so that self pairs are excluded).
+        boxsize: size of the periodic box.
+        max_order: maximum a + b.
+        chunk_size: number of tracers of sample 1 processed at once, which bounds the memory used
+            by the pair lists.
+    Returns:
+        sums: array of shape (max_order + 1, max_order + 1, n_bins), with the pair counts in sums[0, 0].
+    """
+    n_bins = len(r_bins) - 1
+    sums = np.zeros((max_order + 1, max_order + 1, n_bins))
+    if len(pos1) == 0 or len(pos2) == 0:
+        return sums
+    tree2 = cKDTree(pos2, boxsize=boxsize)
+    for start in range(0, len(pos1), chunk_size):
+        tree1 = cKDTree(pos1[start : start + chunk_size], boxsize=boxsize)
+        pairs = tree1.sparse_distance_matrix(
+            tree2, r_bins[-1], output_type="ndarray"
+        )
+        i, j, r = pairs["i"] + start, pairs["j"], pairs["v"]
+        r_bin = np.searchsorted(r_bins, r, side="right") - 1
+        in_range = (r_bin >= 0) & (r_bin < n_bins)
+        i, j, r, r_bin = i[in_range], j[in_range], r[in_range], r_bin[in_range]
+        separation = pos2[j] - pos1[i]
+        separation -= boxsize * np.round(separation / boxsize)
+        relative_velocity = vel2[j] - vel1[i]
+        v_r = np.sum(relative_velocity * separation, axis=-1) / r
+        v_t = np.sqrt(
+            np.maximum(np.sum(relative_velocity ** 2, axis=-1) - v_r ** 2, 0.0)
+        )
+        for a in range(max_order + 1):
+            for b in range(max_order + 1 - a):
+                sums[a, b] += np.bincount(
+                    r_bin, weights=v_r ** a * v_t ** b, minlength=n_bins
+                )
+    return sums
+
+
+def sums_to_moments(sums: np.ndarray) -> Dict[str, np.array]:
+    """
+    Pairwise velocity moments from the pair sums of ```pair_velocity_sums```. Transverse moments refer
+    to one component of the transverse velocity, for isotropic pairs <v_t1^b> = <|v_t|^b> (b-1)!!/b!!.
+    Returns:
+        dictionary with m_10 and the central moments c_ab of MOMENTS up to the order of the sums.
+    """
+    counts = sums[0, 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raw = np.where(counts > 0, sums / counts, 0.0)
+    # <cos(phi)^b> for phi uniform
+    angular = {0: 1.0, 2: 1.0 / 2.0, 4: 3.0 / 8.0}
+    max_order = len(sums) - 1
+    moments = {"m_10": raw[1, 0]}
+    for a, b in MOMENTS:
+        if (a, b) == (1, 0) or a + b > max_order:
+            continue
+        moments[f"c_{a}{b}"] = angular[b] * sum(
+            binom(a, k) * raw[k, b] * (-raw[1, 0]) ** (a - k) for k in range(a + 1)
+        )
+    return moments
+
+
+def compute_chunked_statistics(
+    r_bins: np.array,
+    chunks: Iterable[Tuple[np.ndarray, np.ndarray]],
+    boxsize: float,
+    n_slabs: int,
+    directory: Optional[str] = None,
+    axis: int = 0,
+    max_order: int = 4,
+) -> Dict[str, np.array]:
+    """
+    Computes the real space two point correlation function and the pairwise velocity moments of a
+    periodic box without holding the whole catalogue in memory. The chunks are first bucketed into
+    slabs on disk (with halo buffers of width r_bins[-1]), then the pair sums are accumulated slab by
+    slab, so peak memory is set by the size of one slab plus its halo.
+    Args:
+        r_bins: pair distance bin edges, with 0 < r_bins[0] and r_bins[-1] < boxsize / 2.
+        chunks: iterable of (pos, vel) arrays, e.g. from ```iterate_npy_chunks```.
+        boxsize: size of the periodic box.
+        n_slabs: number of slabs.
+        directory: where to create the (temporary, removed at the end) directory with the slabs,
+            the system default if None.
+        axis: axis perpendicular to the slabs.
+        max_order: maximum order of the velocity moments (from 1 to 4).
+    Returns:
+        dictionary with tpcf (natural estimator with analytical randoms), the pair counts
+        (npairs, ordered pairs) and the velocity moments of ```sums_to_moments```.
+    """
+    r_bins = np.asarray(r_bins, dtype=np.float64)
+    with tempfile.TemporaryDirectory(dir=directory) as slab_directory:
+        slab_files, n_tracers = bucket_into_slabs(
+            chunks, boxsize, r_bins[-1], n_slabs, slab_directory, axis=axis
+        )
+        sums = 0.0
+        for core, halo in slab_files:
+            pos_core, vel_core = load_slab(core)
+            pos_halo, vel_halo = load_slab(halo)
+            sums = sums + pair_velocity_sums(
+                pos_core,
+                vel_core,
+                np.concatenate((pos_core, pos_halo)),
+                np.concatenate((vel_core, vel_halo)),
+                r_bins,
+                boxsize,
+                max_order=max_order,
+            )
+    npairs = sums[0, 0]
+    shell_volume = 4.0 / 3.0 * np.pi * np.diff(r_bins ** 3)
+    random_pairs = n_tracers * (n_tracers - 1) * shell_volume / boxsize ** 3
+    statistics = {"npairs": npairs, "tpcf": npairs / random_pairs - 1.0}
+    statistics.update(sums_to_moments(sums))
+    return statistics
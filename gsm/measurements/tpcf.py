@@ -1,8 +1,10 @@
 from halotools.mock_observables import tpcf, s_mu_tpcf
 from halotools.mock_observables import apply_zspace_distortion
 import numpy as np
+from .cache import cached
 
 
+@cached
 def compute_real_tpcf(r, pos, boxsize, num_threads=1, pos_cross=None):
     """
         Computes the real space two point correlation function using halotools
@@ -57,6 +59,7 @@ def move_to_redshift_space(pos, vel, cosmology, redshift, los_direction, boxsize
     return s_pos
 
 
+@cached
 def compute_tpcf_s_mu(
     s,
     mu,
@@ -1,6 +1,8 @@
 from halotools.mock_observables import mean_radial_velocity_vs_r
 import numpy as np
+from .cache import cached
 
+@cached
 def compute_mean_radial_velocity(r, pos, vel, boxsize, num_threads = 1):
     '''
 	Computes the mean radial pairwise velocity as a function of r,
@@ -26,6 +28,7 @@ def compute_mean_radial_velocity(r, pos, vel, boxsize, num_threads = 1):
 
     return mean_radial_velocity
 
+@cached
 def compute_mean_transverse_velocity(r, pos, vel, boxsize, num_threads = 1):
     '''
 	Computes the mean radial pairwise velocity as a function of r,
@@ -52,6 +55,7 @@ def compute_mean_transverse_velocity(r, pos, vel, boxsize, num_threads = 1):
     return mean_transverse_velocity
 
 
+@cached
 def compute_std_radial_velocity(r, pos, vel, boxsize, num_threads = 1):
     '''
 	Computes the standard deviation of the radial pairwise velocity
@@ -77,6 +81,7 @@ def compute_std_radial_velocity(r, pos, vel, boxsize, num_threads = 1):
 
     return std_radial_velocity
 
+@cached
 def compute_std_transverse_velocity(r, pos, vel, boxsize, num_threads = 1):
     '''
 	Computes the standard deviation of the transverse pairwise velocity
@@ -0,0 +1,38 @@
+import numpy as np
+
+EXPANSIONS = ("edgeworth", "gram_charlier")
+
+
+def hermite(z):
+    """ Probabilists' Hermite polynomials He3, He4 and He6 evaluated at z """
+    z2 = z ** 2
+    he3 = z * (z2 - 3.0)
+    he4 = z2 * (z2 - 6.0) + 3.0
+    he6 = z2 * (z2 * (z2 - 15.0) + 45.0) - 15.0
+    return he3, he4, he6
+
+
+def pdf(v, mean, std, gamma1, gamma2, expansion="edgeworth", clip=True):
+    """ Edgeworth (or Gram-Charlier A) expansion of a PDF around a Gaussian, given its first four moments.
+    Args: 
+	    v: random variable.
+	    mean: mean.
+	    std: standard deviation.
+	    gamma1: skewness.
+	    gamma2: excess kurtosis.
+	    expansion: either edgeworth (includes the gamma1**2 He6 term) or gram_charlier.
+	    clip: whether to set to zero the negative values the expansion can take in the tails.
+    Returns:
+	    PDF evaluated at v
+    """
+    if expansion not in EXPANSIONS:
+        raise ValueError(f"expansion must be one of {EXPANSIONS}")
+    z = (v - mean) / std
+    he3, he4, he6 = hermite(z)
+    correction = 1.0 + gamma1 / 6.0 * he3 + gamma2 / 24.0 * he4
+    if expansion == "edgeworth":
+        correction = correction + gamma1 ** 2 / 72.0 * he6
+    values = np.exp(-0.5 * z ** 2) / (np.sqrt(2.0 * np.pi) * std) * correction
+    if clip:
+        values = np.clip(values, 0.0, None)
+    return values
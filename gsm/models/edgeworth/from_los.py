@@ -0,0 +1,39 @@
+import numpy as np
+from typing import Callable
+from gsm.models.edgeworth import edgeworth
+
+
+def losmoments2edgeworth(
+    mean: Callable,
+    std: Callable,
+    gamma1: Callable,
+    gamma2: Callable,
+    expansion: str = "edgeworth",
+    clip: bool = True,
+) -> Callable:
+    """
+    Args:
+        mean: function that takes r_perp and r_parallel as inputs and returns the mean 
+        line of sight pairwise velocity
+        std:  function that takes r_perp and r_parallel as inputs and returns the standard 
+        deviation of the line of sight pairwise velocity
+        gamma1: same for the skewness.
+        gamma2: same for the excess kurtosis.
+        expansion: either edgeworth or gram_charlier.
+        clip: whether to clip the negative tails of the expansion.
+
+    Returns:
+        pdf_los: line of sight pairwise velocity PDF 
+    """
+    def pdf_los(vlos: np.array, r_perp: np.array, r_parallel: np.array):
+        return edgeworth.pdf(
+            vlos,
+            mean=mean(r_perp, r_parallel),
+            std=std(r_perp, r_parallel),
+            gamma1=gamma1(r_perp, r_parallel),
+            gamma2=gamma2(r_perp, r_parallel),
+            expansion=expansion,
+            clip=clip,
+        )
+
+    return pdf_los
@@ -0,0 +1,43 @@
+from typing import Callable
+from gsm.models.edgeworth import from_los
+from gsm.models.skewt.from_radial_transverse import project_moments
+
+
+def moments2edgeworth(
+    m_10: Callable,
+    c_20: Callable,
+    c_02: Callable,
+    c_12: Callable,
+    c_30: Callable,
+    c_40: Callable,
+    c_04: Callable,
+    c_22: Callable,
+    expansion: str = "edgeworth",
+    clip: bool = True,
+) -> Callable:
+    """
+    Line of sight pairwise velocity PDF built directly from the projected moments, with no
+    parameter solve (unlike ```gsm.models.skewt.from_radial_transverse.moments2skewt```).
+
+    Args:
+        m_10 ... c_22: functions that take pair separation (r) as input and return the
+        radial and transverse moments.
+        expansion: either edgeworth or gram_charlier.
+        clip: whether to clip the negative tails of the expansion.
+
+    Returns:
+        pdf_los: line of sight pairwise velocity PDF 
+    """
+    mean, std, gamma1, gamma2 = project_moments(
+        m_10=m_10,
+        c_20=c_20,
+        c_02=c_02,
+        c_12=c_12,
+        c_30=c_30,
+        c_40=c_40,
+        c_04=c_04,
+        c_22=c_22,
+    )
+    return from_los.losmoments2edgeworth(
+        mean, std, gamma1, gamma2, expansion=expansion, clip=clip
+    )
@@ -2,21 +2,65 @@ import numpy as np
 from typing import Callable
 from scipy.stats import norm
 
-def losmoments2gaussian(mean: Callable, scale: Callable)->Callable:
+def gaussian_pdf(x: np.array, loc: np.array, scale: np.array, dtype: np.dtype = np.float64):
+    """ Gaussian PDF evaluated in the given floating point precision """
+    z = (np.asarray(x, dtype=dtype) - np.asarray(loc, dtype=dtype)) / np.asarray(
+        scale, dtype=dtype
+    )
+    values = np.exp(-0.5 * z * z)
+    values /= np.sqrt(2.0 * np.pi) * np.asarray(scale, dtype=dtype)
+    return values
+
+def losmoments2gaussian(
+    mean: Callable, scale: Callable, dtype: np.dtype = np.float64
+) -> Callable:
     """
     Args:
         mean: function that takes r_parallel and r_perp as inputs and returns the mean 
         line of sight pairwise velocity
         std:  function that takes r_parallel and r_perp as inputs and returns the standard 
         deviation of the line of sight pairwise velocity
+        dtype: floating point precision of the PDF values.
 
 
     Returns:
         pdf_los: line of sight pairwise velocity PDF 
     """
     def pdf_los(vlos: np.array, r_perp: np.array, r_parallel: np.array):
-        return norm.pdf(
-            vlos, loc=mean(r_perp, r_parallel), scale=scale(r_perp, r_parallel)
+        return gaussian_pdf(
+            vlos,
+            loc=mean(r_perp, r_parallel),
+            scale=scale(r_perp, r_parallel),
+            dtype=dtype,
+        )
+
+    return pdf_los
+
+
+def losmoments2gaussian_with_gradient(mean: Callable, scale: Callable) -> Callable:
+    """
+    Args:
+        mean: function that takes r_parallel and r_perp as inputs and returns the mean 
+        line of sight pairwise velocity and its gradient with respect to the model parameters
+        std:  function that takes r_parallel and r_perp as inputs and returns the standard 
+        deviation of the line of sight pairwise velocity and its gradient
+
+
+    Returns:
+        pdf_los: line of sight pairwise velocity PDF, returning the PDF and its gradient
+        (with an extra trailing axis over the model parameters)
+    """
+    def pdf_los(vlos: np.array, r_perp: np.array, r_parallel: np.array):
+        mean_value, mean_gradient = mean(r_perp, r_parallel)
+        scale_value, scale_gradient = scale(r_perp, r_parallel)
+        pdf = norm.pdf(vlos, loc=mean_value, scale=scale_value)
+        x = (vlos - mean_value) / scale_value
+        dpdf_dmean = pdf * x / scale_value
+        dpdf_dscale = pdf * (x ** 2 - 1.0) / scale_value
+        gradient = (
+            dpdf_dmean[..., np.newaxis] * mean_gradient
+            + dpdf_dscale[..., np.newaxis] * scale_gradient
         )
+        return pdf, gradient
 
     return pdf_los
@@ -2,9 +2,11 @@ import numpy as np
 from collections import namedtuple
 from typing import Callable
 from gsm.models.gaussian import from_los
-from gsm.moments.project_to_los import project_to_los
+from gsm.moments.project_to_los import project_to_los, project_to_los_with_gradient
 
-def project_moments(m_10: Callable, c_20: Callable, c_02: Callable)->Callable:
+def project_moments(
+    m_10: Callable, c_20: Callable, c_02: Callable, dtype: np.dtype = np.float64
+) -> Callable:
     """
     Args:
         m_10: function that takes pair separation (r) as input and returns the mean 
@@ -13,18 +15,52 @@ def project_moments(m_10: Callable, c_20: Callable, c_02: Callable)->Callable:
         deviation of the radial pairwise velocity
         c_02:  function that takes pair separation (r) as input and returns the standard 
         deviation of the radial pairwise velocity
+        dtype: floating point precision of the projected moments.
 
     Returns:
         pdf_los: line of sight pairwise velocity PDF 
     """
     Moments = namedtuple('Moments', ['m_10', 'c_20', 'c_02'])
     moments = Moments(m_10, c_20, c_02)
-    mean = project_to_los(moments, 1, mode='m')
-    c_2 = project_to_los(moments, 2, mode='c')
+    mean = project_to_los(moments, 1, mode='m', dtype=dtype)
+    c_2 = project_to_los(moments, 2, mode='c', dtype=dtype)
     std = lambda r_perp, r_parallel: np.sqrt(c_2(r_perp, r_parallel))
     return mean, std
 
-def moments2gaussian(m_10: Callable, c_20: Callable, c_02: Callable)->Callable:
-    mean, std = project_moments(m_10, c_20, c_02)
-    return from_los.losmoments2gaussian(mean, std)
+def moments2gaussian(
+    m_10: Callable, c_20: Callable, c_02: Callable, dtype: np.dtype = np.float64
+) -> Callable:
+    mean, std = project_moments(m_10, c_20, c_02, dtype=dtype)
+    return from_los.losmoments2gaussian(mean, std, dtype=dtype)
 
+
+def project_moments_with_gradient(
+    m_10: Callable, c_20: Callable, c_02: Callable
+) -> Callable:
+    """
+    Args:
+        m_10, c_20, c_02: functions that take pair separation (r) as input and return a tuple
+        with the moment and its gradient with respect to the model parameters (extra trailing
+        axis).
+
+    Returns:
+        mean, std: functions of r_perp and r_parallel returning the line of sight mean and
+        standard deviation together with their gradients
+    """
+    Moments = namedtuple('Moments', ['m_10', 'c_20', 'c_02'])
+    moments = Moments(m_10, c_20, c_02)
+    mean = project_to_los_with_gradient(moments, 1, mode='m')
+    c_2 = project_to_los_with_gradient(moments, 2, mode='c')
+
+    def std(r_perp, r_parallel):
+        c_2_value, c_2_gradient = c_2(r_perp, r_parallel)
+        std_value = np.sqrt(c_2_value)
+        return std_value, c_2_gradient / (2.0 * std_value[..., np.newaxis])
+
+    return mean, std
+
+def moments2gaussian_with_gradient(
+    m_10: Callable, c_20: Callable, c_02: Callable
+) -> Callable:
+    mean, std = project_moments_with_gradient(m_10, c_20, c_02)
+    return from_los.losmoments2gaussian_with_gradient(mean, std)
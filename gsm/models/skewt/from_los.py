@@ -8,29 +8,60 @@ from scipy.special import gamma
 from scipy.interpolate import interp2d
 
 
-def losmoments2skewt(w: Callable, v_c: Callable, alpha: Callable, nu: Callable):
-    def pdf_los(vlos, r_perp, r_parallel):
-        # tricky hack, RectBivariateSpline sadly only takes sorted values, but r_parallel
-        # won't be necessarily sorted
-        sorted_r_perp = np.sort(r_perp[:, 0])
-        idx_to_unsort_perp = r_perp[:, 0].argsort().argsort()
+def evaluate_sorted(function: Callable, r_perp: np.array, r_parallel: np.array):
+    # tricky hack, RectBivariateSpline sadly only takes sorted values, but r_parallel
+    # won't be necessarily sorted
+    sorted_r_perp = np.sort(r_perp[:, 0])
+    idx_to_unsort_perp = r_perp[:, 0].argsort().argsort()
+
+    sorted_r_parallel = np.sort(r_parallel[0, :])
+    idx_to_unsort_parallel = r_parallel[0, :].argsort().argsort()
+    values = function(sorted_r_perp, sorted_r_parallel)
+    if isinstance(values, tuple):
+        return tuple(
+            v[idx_to_unsort_perp, :][:, idx_to_unsort_parallel] for v in values
+        )
+    return values[idx_to_unsort_perp, :][:, idx_to_unsort_parallel]
 
-        sorted_r_parallel = np.sort(r_parallel[0, :])
-        idx_to_unsort_parallel = r_parallel[0, :].argsort().argsort()
+
+def losmoments2skewt(
+    w: Callable,
+    v_c: Callable,
+    alpha: Callable,
+    nu: Callable,
+    dtype: np.dtype = np.float64,
+):
+    def pdf_los(vlos, r_perp, r_parallel):
         return skewt.pdf(
             v=vlos,
-            w=w(sorted_r_perp, sorted_r_parallel)[idx_to_unsort_perp, :][
-                :, idx_to_unsort_parallel
-            ],
-            v_c=v_c(sorted_r_perp, sorted_r_parallel)[idx_to_unsort_perp, :][
-                :, idx_to_unsort_parallel
-            ],
-            alpha=alpha(sorted_r_perp, sorted_r_parallel)[idx_to_unsort_perp, :][
-                :, idx_to_unsort_parallel
-            ],
-            nu=nu(sorted_r_perp, sorted_r_parallel)[idx_to_unsort_perp, :][
-                :, idx_to_unsort_parallel
-            ],
+            w=evaluate_sorted(w, r_perp, r_parallel),
+            v_c=evaluate_sorted(v_c, r_perp, r_parallel),
+            alpha=evaluate_sorted(alpha, r_perp, r_parallel),
+            nu=evaluate_sorted(nu, r_perp, r_parallel),
+            dtype=dtype,
+        )
+
+    return pdf_los
+
+
+def losmoments2skewt_with_gradient(
+    w: Callable, v_c: Callable, alpha: Callable, nu: Callable
+):
+    """
+    Same as ```losmoments2skewt```, but the parameter functions return a tuple (value, gradient)
+    and so does the resulting PDF, gradient having an extra trailing axis over the model parameters.
+    """
+    def pdf_los(vlos, r_perp, r_parallel):
+        parameters = [
+            evaluate_sorted(p, r_perp, r_parallel) for p in (w, v_c, alpha, nu)
+        ]
+        pdf, pdf_gradient = skewt.pdf_with_gradient(
+            vlos, *[value for value, _ in parameters]
+        )
+        gradient = sum(
+            pdf_gradient[..., i, np.newaxis] * parameter_gradient
+            for i, (_, parameter_gradient) in enumerate(parameters)
         )
+        return pdf, gradient
 
     return pdf_los
@@ -3,10 +3,11 @@ from pathlib import Path
 from collections import namedtuple
 from typing import Callable
 from gsm.models.skewt import from_los
-from gsm.moments.project_to_los import project_to_los
+from gsm.moments.project_to_los import project_to_los, project_to_los_with_gradient
 from gsm.models.skewt.moments2parameters import (
     interpolate_moments2parameters,
     direct_spline_moments2parameters,
+    interpolate_moments2parameters_with_gradient,
 )
 
 
@@ -66,7 +67,12 @@ def moments2skewt(
     r_max: float=70.,
     n_eval: int = 70,
     use_spl: bool = False,
+    dtype: np.dtype = np.float64,
 ) -> Callable:
+    """
+    dtype sets the floating point precision of the PDF evaluation, the (w, v_c, alpha, nu)
+    tabulation is always done in float64.
+    """
 
     mean, std, gamma1, gamma2 = project_moments(
         m_10=m_10,
@@ -88,4 +94,100 @@ def moments2skewt(
         w, v_c, alpha, nu = direct_spline_moments2parameters(
             r_perp, r_parallel, mean=mean, std=std, gamma1=gamma1, gamma2=gamma2
         )
-    return from_los.losmoments2skewt(w, v_c, alpha, nu)
+    return from_los.losmoments2skewt(w, v_c, alpha, nu, dtype=dtype)
+
+
+def project_moments_with_gradient(
+    m_10: Callable,
+    c_20: Callable,
+    c_02: Callable,
+    c_12: Callable,
+    c_30: Callable,
+    c_22: Callable,
+    c_40: Callable,
+    c_04: Callable,
+) -> Callable:
+    """
+    Same as ```project_moments```, but the moments return a tuple (value, gradient), with
+    the gradient respect to the model parameters along an extra trailing axis, and so do
+    the resulting mean, std, gamma1 and gamma2.
+    """
+
+    Moments = namedtuple(
+        "Moments", ["m_10", "c_20", "c_02", "c_12", "c_30", "c_22", "c_40", "c_04"]
+    )
+    moments = Moments(m_10, c_20, c_02, c_12, c_30, c_22, c_40, c_04)
+    mean = project_to_los_with_gradient(moments, 1, mode="m")
+    c_2 = project_to_los_with_gradient(moments, 2, mode="c")
+    c_3 = project_to_los_with_gradient(moments, 3, mode="c")
+    c_4 = project_to_los_with_gradient(moments, 4, mode="c")
+
+    def std(r_perp, r_parallel):
+        c_2_value, c_2_gradient = c_2(r_perp, r_parallel)
+        std_value = np.sqrt(c_2_value)
+        return std_value, c_2_gradient / (2.0 * std_value[..., np.newaxis])
+
+    def gamma1(r_perp, r_parallel):
+        c_2_value, c_2_gradient = c_2(r_perp, r_parallel)
+        c_3_value, c_3_gradient = c_3(r_perp, r_parallel)
+        value = c_3_value / c_2_value ** (3.0 / 2.0)
+        gradient = (
+            c_3_gradient / c_2_value[..., np.newaxis] ** (3.0 / 2.0)
+            - 1.5 * (value / c_2_value)[..., np.newaxis] * c_2_gradient
+        )
+        return value, gradient
+
+    def gamma2(r_perp, r_parallel):
+        c_2_value, c_2_gradient = c_2(r_perp, r_parallel)
+        c_4_value, c_4_gradient = c_4(r_perp, r_parallel)
+        value = c_4_value / c_2_value ** 2 - 3.0
+        gradient = (
+            c_4_gradient / c_2_value[..., np.newaxis] ** 2
+            - 2.0 * (c_4_value / c_2_value ** 3)[..., np.newaxis] * c_2_gradient
+        )
+        return value, gradient
+
+    return mean, std, gamma1, gamma2
+
+
+def moments2skewt_with_gradient(
+    m_10: Callable,
+    c_20: Callable,
+    c_02: Callable,
+    c_12: Callable,
+    c_30: Callable,
+    c_40: Callable,
+    c_04: Callable,
+    c_22: Callable,
+    r_max: float=70.,
+    n_eval: int = 70,
+    use_spl: bool = False,
+) -> Callable:
+    """
+    Same as ```moments2skewt```, for moments returning a tuple (value, gradient). The derivatives
+    of (alpha, nu) respect to (gamma1, gamma2) are obtained through the implicit function theorem,
+    so no extra parameter solve is needed.
+    """
+
+    mean, std, gamma1, gamma2 = project_moments_with_gradient(
+        m_10=m_10,
+        c_20=c_20,
+        c_02=c_02,
+        c_12=c_12,
+        c_30=c_30,
+        c_40=c_40,
+        c_04=c_04,
+        c_22=c_22,
+    )
+    r_perp = np.geomspace(0.7, r_max, n_eval)
+    r_parallel = np.geomspace(0.7, r_max, n_eval)
+    w, v_c, alpha, nu = interpolate_moments2parameters_with_gradient(
+        r_perp,
+        r_parallel,
+        mean=mean,
+        std=std,
+        gamma1=gamma1,
+        gamma2=gamma2,
+        use_spl=use_spl,
+    )
+    return from_los.losmoments2skewt_with_gradient(w, v_c, alpha, nu)
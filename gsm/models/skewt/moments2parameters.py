@@ -5,6 +5,7 @@ from typing import List, Callable
 from scipy.special import gamma
 from scipy.optimize import fsolve, minimize, root
 from scipy.interpolate import RectBivariateSpline
+from gsm.models.skewt import parameters2moments
 
 spl_path = Path(__file__).resolve().parents[0] / "gamma2params.csv"
 
@@ -111,6 +112,141 @@ def direct_spline_moments2parameters(
     return callable_st_parameters
 
 
+def complex_step_jacobian(function: Callable, args: List, step: float = 1.0e-20):
+    """
+    Jacobian of a closed-form, complex-analytic function computed with the complex step
+    method, which is exact to machine precision (forward mode derivative).
+    Returns an array with shape (..., n_outputs, n_args).
+    """
+    args = [np.asarray(arg, dtype=complex) for arg in args]
+    columns = []
+    for i in range(len(args)):
+        perturbed = list(args)
+        perturbed[i] = perturbed[i] + 1j * step
+        columns.append(np.stack(np.broadcast_arrays(*function(*perturbed)), axis=-1).imag / step)
+    return np.stack(columns, axis=-1)
+
+
+def shape_parameters_jacobian(alpha, nu):
+    """
+    Derivatives of (alpha, nu) with respect to (gamma1, gamma2), obtained by applying the
+    implicit function theorem to the constrains solved in ```moments2parameters```.
+    Returns an array with shape (..., 2, 2).
+    """
+    moments_jacobian = complex_step_jacobian(
+        lambda alpha, nu: (
+            parameters2moments.gamma1(alpha, nu),
+            parameters2moments.gamma2(alpha, nu),
+        ),
+        [alpha, nu],
+    )
+    return np.linalg.inv(moments_jacobian)
+
+
+def low_order_jacobian(mean, std, alpha, nu):
+    """
+    Derivatives of (w, v_c) with respect to (mean, std, alpha, nu).
+    Returns an array with shape (..., 2, 4).
+    """
+    return complex_step_jacobian(moments2parameters_low_order, [mean, std, alpha, nu])
+
+
+def spline_with_gradient(
+    r_perp: np.array, r_parallel: np.array, values: np.array, gradients: np.array
+) -> Callable:
+    """
+    Interpolates values and gradients in (r_perp, r_parallel). Since the spline is linear in
+    the tabulated values, the spline of the gradients is the gradient of the spline.
+    """
+    value_spline = RectBivariateSpline(r_perp, r_parallel, values)
+    gradient_splines = [
+        RectBivariateSpline(r_perp, r_parallel, gradients[..., p])
+        for p in range(gradients.shape[-1])
+    ]
+
+    def spline(r_perp, r_parallel):
+        return (
+            value_spline(r_perp, r_parallel),
+            np.stack([s(r_perp, r_parallel) for s in gradient_splines], axis=-1),
+        )
+
+    return spline
+
+
+def interpolate_moments2parameters_with_gradient(
+    r_perp: np.array,
+    r_parallel: np.array,
+    mean: Callable,
+    std: Callable,
+    gamma1: Callable,
+    gamma2: Callable,
+    use_spl: bool = False,
+) -> List[Callable]:
+    """
+    Same as ```interpolate_moments2parameters``` (or ```direct_spline_moments2parameters```
+    if use_spl), but mean, std, gamma1 and gamma2 return a tuple (value, gradient), and
+    so do the resulting skew-t parameter functions.
+    """
+    grid = (r_perp.reshape(-1, 1), r_parallel.reshape(1, -1))
+    mean_values, mean_gradient = mean(*grid)
+    std_values, std_gradient = std(*grid)
+    gamma1_values, gamma1_gradient = gamma1(*grid)
+    gamma2_values, gamma2_gradient = gamma2(*grid)
+
+    if use_spl:
+        alpha_interp, nu_interp = get_interpolators(pd.read_csv(spl_path))
+        alpha = alpha_interp(gamma1_values, gamma2_values, grid=False)
+        nu = nu_interp(gamma1_values, gamma2_values, grid=False)
+        shape_jacobian = np.stack(
+            [
+                np.stack(
+                    [
+                        interp(gamma1_values, gamma2_values, dx=1, grid=False),
+                        interp(gamma1_values, gamma2_values, dy=1, grid=False),
+                    ],
+                    axis=-1,
+                )
+                for interp in (alpha_interp, nu_interp)
+            ],
+            axis=-2,
+        )
+    else:
+        alpha = np.zeros_like(gamma1_values)
+        nu = np.zeros_like(gamma1_values)
+        for i in range(len(r_perp)):
+            for j in range(len(r_parallel)):
+                alpha[i, j], nu[i, j] = fsolve(
+                    constrains,
+                    (-0.7, 5),
+                    args=(gamma1_values[i, j], gamma2_values[i, j]),
+                )
+        shape_jacobian = shape_parameters_jacobian(alpha, nu)
+    w, v_c = moments2parameters_low_order(mean_values, std_values, alpha, nu)
+
+    shape_gradient = shape_jacobian @ np.stack(
+        np.broadcast_arrays(gamma1_gradient, gamma2_gradient), axis=-2
+    )
+    inputs_gradient = np.concatenate(
+        (
+            np.stack(np.broadcast_arrays(mean_gradient, std_gradient), axis=-2),
+            shape_gradient,
+        ),
+        axis=-2,
+    )
+    w_v_c_gradient = low_order_jacobian(mean_values, std_values, alpha, nu) @ inputs_gradient
+
+    st_gradients = [
+        w_v_c_gradient[..., 0, :],
+        w_v_c_gradient[..., 1, :],
+        shape_gradient[..., 0, :],
+        shape_gradient[..., 1, :],
+    ]
+    return [
+        spline_with_gradient(r_perp, r_parallel, values, gradients)
+        for values, gradients in zip([w, v_c, alpha, nu], st_gradients)
+    ]
+
+
 def generate_gamma_grid(min_gamma1, min_gamma2, max_gamma1, max_gamma2, n):
     p0 = (-0.7, 5)
     gamma1_values = np.linspace(min_gamma1, max_gamma1, n)
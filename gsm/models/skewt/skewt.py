@@ -1,8 +1,15 @@
 from scipy.stats import t
+from scipy.special import digamma, gammaln, stdtr
 import numpy as np
 
 
-def pdf(v, w, v_c, alpha, nu):
+def student_t_pdf(x, nu):
+    """ Student-t PDF, evaluated in the floating point precision of x and nu """
+    log_norm = gammaln(0.5 * (nu + 1)) - gammaln(0.5 * nu) - 0.5 * np.log(nu * np.pi)
+    return np.exp(log_norm - 0.5 * (nu + 1) * np.log1p(x * x / nu))
+
+
+def pdf(v, w, v_c, alpha, nu, dtype=np.float64):
     """ Probability Density Function of a Skewed-Student-t distribution in one dimension.
     Args: 
 	    v: random variable.
@@ -10,12 +17,71 @@ def pdf(v, w, v_c, alpha, nu):
 	    v_c: location parameter.
 	    alpha: skewness parameter.
 	    nu: degrees of freedom.
+	    dtype: floating point precision of the computation.
     Returns:
 	    Skewt PDF evaluated at v
     """
+    v, w, v_c, alpha, nu = (
+        np.asarray(x, dtype=dtype) for x in (v, w, v_c, alpha, nu)
+    )
     rescaled_v = (v - v_c) / w
     cdf_arg = alpha * rescaled_v * ((nu + 1) / (rescaled_v ** 2 + nu)) ** 0.5
-    values = (nu + 1) / (rescaled_v ** 2 + nu)
-    return (
-        2.0 / w * t.pdf(rescaled_v, scale=1, df=nu) * t.cdf(cdf_arg, df=nu + 1, scale=1)
+    return 2.0 / w * student_t_pdf(rescaled_v, nu) * stdtr(nu + 1, cdf_arg)
+
+
+def pdf_with_gradient(v, w, v_c, alpha, nu):
+    """ Skewed-Student-t PDF together with its derivatives with respect to its parameters.
+    Args: 
+	    v: random variable.
+	    w: scale parameter.
+	    v_c: location parameter.
+	    alpha: skewness parameter.
+	    nu: degrees of freedom.
+    Returns:
+	    Skewt PDF evaluated at v, and its gradient with respect to (w, v_c, alpha, nu)
+	    stacked along an extra trailing axis.
+    """
+    rescaled_v = (v - v_c) / w
+    norm2 = rescaled_v ** 2 + nu
+    sqrt_ratio = ((nu + 1) / norm2) ** 0.5
+    cdf_arg = alpha * rescaled_v * sqrt_ratio
+
+    t_pdf = t.pdf(rescaled_v, scale=1, df=nu)
+    t_cdf = t.cdf(cdf_arg, df=nu + 1, scale=1)
+    pdf = 2.0 / w * t_pdf * t_cdf
+
+    # Derivatives of the Student-t density
+    dt_pdf_dx = -t_pdf * (nu + 1) * rescaled_v / norm2
+    dt_pdf_dnu = t_pdf * 0.5 * (
+        digamma(0.5 * (nu + 1))
+        - digamma(0.5 * nu)
+        - 1.0 / nu
+        - np.log1p(rescaled_v ** 2 / nu)
+        + (nu + 1) * rescaled_v ** 2 / (nu * norm2)
+    )
+    # Derivatives of the Student-t CDF, the one respect to the degrees of freedom
+    # has no closed form and is obtained with a central difference
+    dt_cdf_darg = t.pdf(cdf_arg, df=nu + 1, scale=1)
+    step = 1.0e-5 * np.maximum(nu, 1.0)
+    dt_cdf_dnu = (
+        t.cdf(cdf_arg, df=nu + 1 + step, scale=1)
+        - t.cdf(cdf_arg, df=nu + 1 - step, scale=1)
+    ) / (2.0 * step)
+    darg_dx = alpha * nu * (nu + 1) ** 0.5 / norm2 ** 1.5
+    darg_dalpha = rescaled_v * sqrt_ratio
+    darg_dnu = alpha * rescaled_v * (rescaled_v ** 2 - 1) / (
+        2.0 * (nu + 1) ** 0.5 * norm2 ** 1.5
+    )
+
+    dpdf_dx = 2.0 / w * (dt_pdf_dx * t_cdf + t_pdf * dt_cdf_darg * darg_dx)
+    dpdf_dw = -pdf / w - dpdf_dx * rescaled_v / w
+    dpdf_dv_c = -dpdf_dx / w
+    dpdf_dalpha = 2.0 / w * t_pdf * dt_cdf_darg * darg_dalpha
+    dpdf_dnu = (
+        2.0
+        / w
+        * (dt_pdf_dnu * t_cdf + t_pdf * (dt_cdf_darg * darg_dnu + dt_cdf_dnu))
+    )
+    return pdf, np.stack(
+        np.broadcast_arrays(dpdf_dw, dpdf_dv_c, dpdf_dalpha, dpdf_dnu), axis=-1
     )
@@ -0,0 +1,156 @@
+import numpy as np
+from typing import Callable, Optional
+
+
+def regular_grid(x: np.array, name: str):
+    """ Returns (start, step, size) of a regularly spaced, increasing grid """
+    x = np.asarray(x, dtype=np.float64)
+    if x.ndim != 1 or len(x) < 2:
+        raise ValueError(f"{name} must be a 1-D grid with at least two points")
+    step = (x[-1] - x[0]) / (len(x) - 1)
+    if step <= 0.0 or not np.allclose(np.diff(x), step, rtol=1e-6, atol=0.0):
+        raise ValueError(f"{name} must be regularly spaced and increasing")
+    return x[0], step, len(x)
+
+
+class TabulatedLOSPDF:
+    """
+    Line of sight pairwise velocity PDF tabulated on a regular (r_perp, r_parallel, v_los) grid,
+    e.g. measured from simulations, that can be used as los_pdf_function in the streaming integral.
+
+    The PDF is evaluated by trilinear interpolation, the cell of each point being found by index
+    arithmetic on the regular grid (no search). Distances outside the grid are clamped to its
+    edges, while the PDF vanishes for velocities outside the grid.
+    """
+
+    def __init__(
+        self,
+        r_perp: np.array,
+        r_parallel: np.array,
+        v_los: np.array,
+        pdf: np.array,
+    ):
+        """
+        Args:
+            r_perp: regular grid of perpendicular distances to the line of sight.
+            r_parallel: regular grid of parallel distances to the line of sight.
+            v_los: regular grid of line of sight velocities.
+            pdf: array of shape (n_r_perp, n_r_parallel, n_v_los) with the PDF, can be a np.memmap
+                (see ```from_npy```), in which case only the cells needed are read.
+        """
+        self.r_perp = np.asarray(r_perp, dtype=np.float64)
+        self.r_parallel = np.asarray(r_parallel, dtype=np.float64)
+        self.v_los = np.asarray(v_los, dtype=np.float64)
+        self.grids = (
+            regular_grid(self.r_perp, "r_perp"),
+            regular_grid(self.r_parallel, "r_parallel"),
+            regular_grid(self.v_los, "v_los"),
+        )
+        shape = tuple(size for _, _, size in self.grids)
+        if not isinstance(pdf, np.memmap):
+            pdf = np.ascontiguousarray(np.nan_to_num(np.asarray(pdf)))
+        if pdf.shape != shape:
+            raise ValueError(f"pdf must have shape {shape}, got {pdf.shape}")
+        self.pdf = pdf
+        self.flat_pdf = pdf.reshape(-1)
+
+    @classmethod
+    def from_function(
+        cls,
+        los_pdf_function: Callable,
+        r_perp: np.array,
+        r_parallel: np.array,
+        v_los: np.array,
+        dtype: np.dtype = np.float64,
+    ):
+        """
+        Tabulates a los_pdf_function (e.g. from ```moments2gaussian``` or ```moments2skewt```) on the grid.
+        """
+        r_perp_grid = np.asarray(r_perp, dtype=np.float64).reshape(-1, 1)
+        r_parallel_grid = np.asarray(r_parallel, dtype=np.float64).reshape(1, -1)
+        pdf = np.stack(
+            [
+                np.broadcast_to(
+                    los_pdf_function(v * np.ones((1, 1)), r_perp_grid, r_parallel_grid),
+                    (len(r_perp), len(r_parallel)),
+                )
+                for v in v_los
+            ],
+            axis=-1,
+        ).astype(dtype)
+        return cls(r_perp, r_parallel, v_los, pdf)
+
+    @classmethod
+    def from_npy(
+        cls,
+        filename: str,
+        r_perp: np.array,
+        r_parallel: np.array,
+        v_los: np.array,
+        mmap_mode: Optional[str] = "r",
+    ):
+        """
+        Loads the table from a .npy file (see ```save```), memory mapped by default so that tables
+        larger than the available memory can be used. The table must not contain NaNs.
+        """
+        return cls(r_perp, r_parallel, v_los, np.load(filename, mmap_mode=mmap_mode))
+
+    def save(self, filename: str):
+        np.save(filename, np.asarray(self.pdf))
+
+    def axis_weights(self, x: np.array, axis: int, clamp: bool):
+        """
+        Lower cell index and distance to it (in units of the step) along one axis of the table.
+        Returns:
+            idx, fraction, inside (None if clamp)
+        """
+        start, step, size = self.grids[axis]
+        t = (np.asarray(x, dtype=np.float64) - start) / step
+        inside = None
+        if clamp:
+            t = np.clip(t, 0.0, size - 1)
+        else:
+            inside = (t >= 0.0) & (t <= size - 1)
+        idx = np.clip(np.floor(t), 0, size - 2).astype(np.intp)
+        return idx, t - idx, inside
+
+    def __call__(
+        self,
+        vlos: np.array,
+        r_perp: np.array,
+        r_parallel: np.array,
+        dtype: Optional[np.dtype] = None,
+    ) -> np.array:
+        """
+        Args:
+            vlos: line of sight velocities.
+            r_perp, r_parallel: distances to the line of sight, broadcastable with vlos. The
+                interpolation weights are computed before broadcasting, so that for the streaming
+                integral (r_perp of shape (n, 1), r_parallel of shape (1, m)) only the velocity
+                axis is handled on the full array.
+            dtype: precision of the output, defaults to the precision of the table.
+        Returns:
+            pdf: PDF values with the broadcasted shape of the inputs.
+        """
+        dtype = self.pdf.dtype if dtype is None else np.dtype(dtype)
+        i_perp, f_perp, _ = self.axis_weights(r_perp, 0, clamp=True)
+        i_par, f_par, _ = self.axis_weights(r_parallel, 1, clamp=True)
+        i_v, f_v, inside = self.axis_weights(vlos, 2, clamp=False)
+        n_par, n_v = self.grids[1][2], self.grids[2][2]
+
+        base = (i_perp * n_par + i_par) * n_v
+        f_perp, f_par, f_v = (
+            np.asarray(f, dtype=dtype) for f in (f_perp, f_par, f_v)
+        )
+        idx = base + i_v
+        pdf = np.zeros(np.broadcast(idx, f_perp, f_par).shape, dtype=dtype)
+        for perp_offset, w_perp in ((0, 1 - f_perp), (n_par * n_v, f_perp)):
+            for par_offset, w_par in ((0, 1 - f_par), (n_v, f_par)):
+                w_r = w_perp * w_par
+                offset = perp_offset + par_offset
+                pdf += w_r * (
+                    (1 - f_v) * self.flat_pdf[idx + offset]
+                    + f_v * self.flat_pdf[idx + offset + 1]
+                )
+        pdf *= inside
+        return pdf
@@ -35,7 +35,9 @@ def get_moment(
         return getattr(moments, f"{mode}_{r_order}{t_order}")(r)
 
 
-def project_to_los(moments: NamedTuple, n: int, mode: str = "c") -> Callable:
+def project_to_los(
+    moments: NamedTuple, n: int, mode: str = "c", dtype: np.dtype = np.float64
+) -> Callable:
     """ 
     Project the moments of the radial and tangential velocity field onto the line of sight moments.
 
@@ -43,27 +45,99 @@ def project_to_los(moments: NamedTuple, n: int, mode: str = "c") -> Callable:
         moments: Named tuple containing the radial and transverse moments.
         n: order of the moment.
         mode: Type of moment. If central moments use c, if moments about the origin use m.
+        dtype: floating point precision of the returned moments.
     Returns:
         2D function of r_parallel and r_perpendicular that returns the 
         n-th moment of the line of sight velocity PDF 
     """
 
     def los_moment(r_perpendicular, r_parallel):
-        r_perpedicular = np.atleast_2d(r_perpendicular)
-        r_parallel = np.atleast_2d(r_parallel)
+        r_perpendicular = np.atleast_2d(r_perpendicular).astype(dtype, copy=False)
+        r_parallel = np.atleast_2d(r_parallel).astype(dtype, copy=False)
 
         r = np.sqrt(r_parallel ** 2 + r_perpendicular ** 2)
         mu = r_parallel / r
+        # sqrt(1 - mu**2), without the cancellation at mu -> 1 that matters in float32
+        sin_theta = np.abs(r_perpendicular) / r
 
         return np.sum(
             [
                 binom(n, k)
                 * mu ** k
-                * np.sqrt(1 - mu ** 2) ** (n - k)
-                * get_moment(moments, r, r_order=k, t_order=n - k, mode=mode)
+                * sin_theta ** (n - k)
+                * np.asarray(
+                    get_moment(moments, r, r_order=k, t_order=n - k, mode=mode),
+                    dtype=dtype,
+                )
                 for k in range(n + 1)
             ],
             axis=0,
+            dtype=dtype,
         )
 
     return los_moment
+
+
+def get_moment_with_gradient(
+    moments: NamedTuple, r: np.array, r_order: int, t_order: int, mode: str
+):
+    """
+    Same as ```get_moment```, but the moments in the named tuple return a tuple
+    (value, gradient), where gradient has an extra trailing axis over the model parameters.
+
+    Args:
+        moments: Named tuple containing the radial and transverse moments and their gradients.
+        r:  pair separation.
+        r_order: order of the radial moment
+        t_order: order of the transverse moments
+        mode: either ```c``` for central moments or ```m``` for moments.
+
+    Returns:
+        moment, gradient
+    """
+    if (
+        (t_order % 2 != 0)
+        or ((r_order == 0) and (t_order == 0))
+        or ((mode == "c") and (r_order + t_order == 1))
+    ):
+        # Moments fixed by isotropy or normalisation do not depend on the parameters
+        gradient = np.zeros(np.shape(r) + (1,))
+        return get_moment(moments, r, r_order, t_order, mode), gradient
+    return getattr(moments, f"{mode}_{r_order}{t_order}")(r)
+
+
+def project_to_los_with_gradient(
+    moments: NamedTuple, n: int, mode: str = "c"
+) -> Callable:
+    """ 
+    Project the moments of the radial and tangential velocity field onto the line of sight moments,
+    propagating their derivatives with respect to the model parameters (forward mode).
+
+    Args:
+        moments: Named tuple containing the radial and transverse moments, each of them returning
+        a tuple (value, gradient) where gradient has an extra trailing axis over the parameters.
+        n: order of the moment.
+        mode: Type of moment. If central moments use c, if moments about the origin use m.
+    Returns:
+        2D function of r_parallel and r_perpendicular that returns the 
+        n-th moment of the line of sight velocity PDF and its gradient
+    """
+
+    def los_moment(r_perpendicular, r_parallel):
+        r_perpendicular = np.atleast_2d(r_perpendicular)
+        r_parallel = np.atleast_2d(r_parallel)
+
+        r = np.sqrt(r_parallel ** 2 + r_perpendicular ** 2)
+        mu = r_parallel / r
+
+        moment, gradient = 0.0, 0.0
+        for k in range(n + 1):
+            coefficient = binom(n, k) * mu ** k * np.sqrt(1 - mu ** 2) ** (n - k)
+            value, value_gradient = get_moment_with_gradient(
+                moments, r, r_order=k, t_order=n - k, mode=mode
+            )
+            moment = moment + coefficient * value
+            gradient = gradient + coefficient[..., np.newaxis] * value_gradient
+        return moment, gradient
+
+    return los_moment
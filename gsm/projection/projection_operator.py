@@ -0,0 +1,175 @@
+import numpy as np
+from functools import lru_cache
+from scipy import sparse
+from scipy.integrate import simps
+from gsm.projection.project_pdf import get_cos_theta, get_sin_theta
+
+
+def linear_interpolation_weights(grid: np.array, x: np.array):
+    """
+    Indices and weights of the linear interpolation of a function tabulated on grid at x,
+    f(x) = w_low * f[idx] + w_high * f[idx + 1]. Weights are zero for x outside the grid.
+    Returns:
+        idx, w_low, w_high
+    """
+    idx = np.clip(np.searchsorted(grid, x, side="right") - 1, 0, len(grid) - 2)
+    w_high = (x - grid[idx]) / (grid[idx + 1] - grid[idx])
+    inside = (x >= grid[0]) & (x <= grid[-1])
+    w_high = np.where(inside, w_high, 0.0)
+    w_low = np.where(inside, 1.0 - w_high, 0.0)
+    return idx, w_low, w_high
+
+
+class ProjectionOperator:
+    """
+    Linear map from a pairwise velocity PDF tabulated on a (r, v_r, v_t) grid to the line of
+    sight PDF on a (r_perpendicular, r_parallel, v_los) grid, stored as a sparse matrix.
+
+    It performs the same integral as ```get_projected_pdf``` (over v_r if r_parallel < r_perpendicular,
+    over v_t otherwise), using the grid of the integration variable as quadrature nodes (Simpson's
+    rule) and linear interpolation of the table in the other velocity and in r. Building it costs
+    about as much as one call to ```get_projected_pdf```, applying it is a single sparse matrix
+    product. Memory scales as n_r_perp * n_r_parallel * n_v_los * n_nodes * 4 non zero entries.
+    """
+
+    def __init__(
+        self,
+        r: np.array,
+        v_r: np.array,
+        v_t: np.array,
+        r_perpendicular: np.array,
+        r_parallel: np.array,
+        v_los: np.array,
+    ):
+        """
+        Args:
+            r: pair distances where the PDF is tabulated (increasing).
+            v_r: radial velocities where the PDF is tabulated (increasing).
+            v_t: transverse velocities where the PDF is tabulated (increasing).
+            r_perpendicular: perpendicular distances to the line of sight of the output.
+            r_parallel: parallel distances to the line of sight of the output.
+            v_los: line of sight velocities of the output.
+        """
+        self.r, self.v_r, self.v_t = (
+            np.asarray(x, dtype=np.float64) for x in (r, v_r, v_t)
+        )
+        self.r_perpendicular, self.r_parallel, self.v_los = (
+            np.asarray(x, dtype=np.float64) for x in (r_perpendicular, r_parallel, v_los)
+        )
+        self.input_shape = (len(self.r), len(self.v_r), len(self.v_t))
+        self.output_shape = (
+            len(self.r_perpendicular),
+            len(self.r_parallel),
+            len(self.v_los),
+        )
+        self.matrix = self.build()
+
+    def build(self) -> sparse.csr_matrix:
+        r_perp, r_par = np.meshgrid(self.r_perpendicular, self.r_parallel, indexing="ij")
+        r_perp, r_par = r_perp.ravel(), r_par.ravel()
+        r_cell = np.sqrt(r_perp ** 2 + r_par ** 2)
+        if r_cell.min() < self.r[0] or r_cell.max() > self.r[-1]:
+            raise ValueError(
+                f"The PDF must be tabulated for {r_cell.min()} <= r <= {r_cell.max()}"
+            )
+        idx_r, w_r_low, w_r_high = linear_interpolation_weights(self.r, r_cell)
+        v_r_weights = simps(np.eye(len(self.v_r)), self.v_r, axis=-1)
+        v_t_weights = simps(np.eye(len(self.v_t)), self.v_t, axis=-1)
+        n_v_r, n_v_t = len(self.v_r), len(self.v_t)
+        n_los = len(self.v_los)
+
+        rows, columns, values = [], [], []
+        for cell in range(len(r_cell)):
+            cos_theta = get_cos_theta(r_cell[cell], r_par[cell])
+            sin_theta = get_sin_theta(r_cell[cell], r_par[cell])
+            v_los = self.v_los.reshape(-1, 1)
+            if r_par[cell] < r_perp[cell]:
+                # nodes on the v_r grid, interpolate in v_t
+                node = np.arange(n_v_r).reshape(1, -1)
+                idx_v, w_v_low, w_v_high = linear_interpolation_weights(
+                    self.v_t, (v_los - self.v_r.reshape(1, -1) * cos_theta) / sin_theta
+                )
+                quadrature = v_r_weights / sin_theta
+                velocity_columns = [node * n_v_t + idx_v, node * n_v_t + idx_v + 1]
+            else:
+                # nodes on the v_t grid, interpolate in v_r
+                node = np.arange(n_v_t).reshape(1, -1)
+                idx_v, w_v_low, w_v_high = linear_interpolation_weights(
+                    self.v_r, (v_los - self.v_t.reshape(1, -1) * sin_theta) / cos_theta
+                )
+                quadrature = v_t_weights / cos_theta
+                velocity_columns = [idx_v * n_v_t + node, (idx_v + 1) * n_v_t + node]
+            row = cell * n_los + np.broadcast_to(
+                np.arange(n_los).reshape(-1, 1), idx_v.shape
+            )
+            for r_column, w_r in (
+                (idx_r[cell], w_r_low[cell]),
+                (idx_r[cell] + 1, w_r_high[cell]),
+            ):
+                for velocity_column, w_v in zip(velocity_columns, (w_v_low, w_v_high)):
+                    value = w_r * w_v * quadrature
+                    nonzero = value != 0.0
+                    rows.append(row[nonzero])
+                    columns.append(r_column * n_v_r * n_v_t + velocity_column[nonzero])
+                    values.append(value[nonzero])
+        return sparse.csr_matrix(
+            (np.concatenate(values), (np.concatenate(rows), np.concatenate(columns))),
+            shape=(len(r_cell) * n_los, int(np.prod(self.input_shape))),
+        )
+
+    def __call__(self, pdf_rt: np.array) -> np.array:
+        """
+        Args:
+            pdf_rt: PDF tabulated on the (r, v_r, v_t) grid, with shape (..., n_r, n_v_r, n_v_t),
+                leading axes are projected together.
+        Returns:
+            los_pdf: np.ndarray
+                array of shape (..., n_r_perpendicular, n_r_parallel, n_v_los).
+        """
+        pdf_rt = np.asarray(pdf_rt)
+        batch_shape = pdf_rt.shape[: pdf_rt.ndim - 3]
+        if pdf_rt.shape[pdf_rt.ndim - 3 :] != self.input_shape:
+            raise ValueError(
+                f"pdf_rt must have shape (..., {self.input_shape}), got {pdf_rt.shape}"
+            )
+        los_pdf = self.matrix @ pdf_rt.reshape(-1, self.matrix.shape[1]).T
+        return los_pdf.T.reshape(batch_shape + self.output_shape)
+
+
+@lru_cache(maxsize=16)
+def _cached_projection_operator(*grids):
+    return ProjectionOperator(*(np.array(grid) for grid in grids))
+
+
+def get_projection_operator(
+    r: np.array,
+    v_r: np.array,
+    v_t: np.array,
+    r_perpendicular: np.array,
+    r_parallel: np.array,
+    v_los: np.array,
+) -> ProjectionOperator:
+    """
+    Same as ```ProjectionOperator```, but operators are cached (16 most recent geometries), so that
+    repeated projections on the same grids only pay for the sparse matrix product.
+    """
+    return _cached_projection_operator(
+        *(
+            tuple(np.asarray(grid, dtype=np.float64).ravel())
+            for grid in (r, v_r, v_t, r_perpendicular, r_parallel, v_los)
+        )
+    )
+
+
+def tabulate_pdf_rt(pdf_rt, r: np.array, v_r: np.array, v_t: np.array) -> np.array:
+    """
+    Evaluates pdf_rt(r=, v_r=, v_t=) on the (r, v_r, v_t) grid, broadcasting over the three axes.
+    """
+    return np.broadcast_to(
+        pdf_rt(
+            r=np.reshape(r, (-1, 1, 1)),
+            v_r=np.reshape(v_r, (1, -1, 1)),
+            v_t=np.reshape(v_t, (1, 1, -1)),
+        ),
+        (len(r), len(v_r), len(v_t)),
+    )
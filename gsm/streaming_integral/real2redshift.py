@@ -1,10 +1,20 @@
 import numpy as np
-from typing import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
 from scipy.integrate import simps, quadrature, quad
+from gsm.models.tabulated.tabulated import TabulatedLOSPDF
+
+# Rough peak memory of the streaming integrand per (s, mu, r_parallel) point, in bytes: the
+# coordinates, the LOS PDF and its temporaries amount to ~13 float64 arrays of that size.
+BYTES_PER_INTEGRAND_POINT = 128
 
 
 def integrand_s_mu(
-    s_c: float, mu_c: float, twopcf_function: Callable, los_pdf_function: Callable
+    s_c: float,
+    mu_c: float,
+    twopcf_function: Callable,
+    los_pdf_function: Callable,
+    dtype: np.dtype = np.float64,
 ):
     """
     Computes the streaming model integrand ( https://arxiv.org/abs/1710.09379, Eq 22 ) at s, mu
@@ -15,29 +25,121 @@ def integrand_s_mu(
                 correlation function.
         los_pdf_function: given the line of sight velocity, perpendicular and parallel distances to the line
                 of sight, returns the value of the line of sight pairwise velocity distribution.
+        dtype: floating point precision of the (n_s * n_mu, n) arrays.
     Returns:
         integrand: np.ndarray
             2-D array with the value of the integrand evaluated at the given s_c and mu_c.			
 	"""
 
     def integrand(y):
-        S = s_c.reshape(-1, 1)
-        MU = mu_c.reshape(1, -1)
-        s_parallel = S * MU
-        s_perp = S * np.sqrt(1 - MU ** 2)
-        # Use reshape to vectorize all possible combinations
-        s_perp = s_perp.reshape(-1, 1)
-        s_parallel = s_parallel.reshape(-1, 1)
-        y = y.reshape(1, -1)
-        vlos = (s_parallel - y) * np.sign(y)
-        r = np.sqrt(s_perp ** 2 + y ** 2)
-        los_pdf = np.nan_to_num(los_pdf_function(vlos, s_perp, np.abs(y)),
-                copy=False)
-        return los_pdf * (1 + twopcf_function(r))
+        s_perp, y, vlos, r = los_coordinates(s_c, mu_c, y, dtype=dtype)
+        if isinstance(los_pdf_function, TabulatedLOSPDF):
+            # tables are finite and interpolated directly in the requested precision
+            los_pdf = los_pdf_function(vlos, s_perp, np.abs(y), dtype=dtype)
+        else:
+            # copy, so that the array returned by the PDF is never modified
+            los_pdf = np.nan_to_num(
+                np.array(los_pdf_function(vlos, s_perp, np.abs(y)), dtype=dtype),
+                copy=False,
+            )
+        # out of place, the PDF may broadcast against the (n_s * n_mu, n) grid
+        return los_pdf * (1 + np.asarray(twopcf_function(r), dtype=dtype))
 
     return integrand
 
 
+def los_coordinates(
+    s_c: np.array, mu_c: np.array, y: np.array, dtype: np.dtype = np.float64
+):
+    """
+    Line of sight velocities and real space distances for all combinations of s_c, mu_c and the
+    integration variable y (real space parallel distance).
+    Returns:
+        s_perp, y, vlos, r
+    """
+    S = np.asarray(s_c, dtype=dtype).reshape(-1, 1)
+    MU = np.asarray(mu_c, dtype=dtype).reshape(1, -1)
+    s_parallel = S * MU
+    s_perp = S * np.sqrt(1 - MU ** 2)
+    # Use reshape to vectorize all possible combinations
+    s_perp = s_perp.reshape(-1, 1)
+    s_parallel = s_parallel.reshape(-1, 1)
+    y = np.asarray(y, dtype=dtype).reshape(1, -1)
+    vlos = (s_parallel - y) * np.sign(y)
+    r = np.sqrt(s_perp ** 2 + y ** 2)
+    return s_perp, y, vlos, r
+
+
+def integrand_s_mu_with_gradient(
+    s_c: float, mu_c: float, twopcf_function: Callable, los_pdf_function: Callable
+):
+    """
+    Computes the streaming model integrand and its gradient respect to the model parameters
+    (forward mode).
+    Args:
+        s_c: bin centers for the pair distance bins.
+        mu_c: bin centers for the cosine of the angle rescpect to the line of sight bins.
+        twopcf_function: function that given pair distance as an argument returns the real space two point 
+                correlation function and its gradient (extra trailing axis over the parameters).
+        los_pdf_function: given the line of sight velocity, perpendicular and parallel distances to the line
+                of sight, returns the line of sight pairwise velocity distribution and its gradient.
+    Returns:
+        integrand: function returning the integrand and its gradient, with shapes
+            (n_s * n_mu, n) and (n_s * n_mu, n, n_params).
+	"""
+
+    def integrand(y):
+        s_perp, y, vlos, r = los_coordinates(s_c, mu_c, y)
+        los_pdf, los_pdf_gradient = los_pdf_function(vlos, s_perp, np.abs(y))
+        los_pdf = np.nan_to_num(los_pdf, copy=False)
+        los_pdf_gradient = np.nan_to_num(los_pdf_gradient, copy=False)
+        twopcf, twopcf_gradient = twopcf_function(r)
+        value = los_pdf * (1 + twopcf)
+        gradient = (
+            los_pdf_gradient * (1 + twopcf)[..., np.newaxis]
+            + los_pdf[..., np.newaxis] * twopcf_gradient
+        )
+        return value, gradient
+
+    return integrand
+
+
+def simps_weights(x: np.array) -> np.array:
+    """
+    Weights of Simpson's rule on the grid x, such that simps(y, x, axis=-1) == y @ weights.
+    """
+    return simps(np.eye(len(x)), x, axis=-1)
+
+
+def quadrature_sum(integrand: np.array, weights: np.array) -> np.array:
+    """
+    Weighted sum along the last axis, always accumulated in float64 regardless of the
+    precision of the integrand (the casting is buffered, no float64 copy is made).
+    """
+    return np.einsum("ij,j->i", integrand, weights, dtype=np.float64)
+
+
+def get_blocks(n_s: int, n_mu: int, cells_per_block: int):
+    """
+    Splits the (n_s, n_mu) grid of cells in blocks of at most cells_per_block cells (but at least one).
+    Whole rows of mu are kept together when possible.
+    Returns:
+        list of (s_slice, mu_slice) tuples.
+    """
+    cells_per_block = max(int(cells_per_block), 1)
+    if cells_per_block >= n_mu:
+        s_per_block = cells_per_block // n_mu
+        return [
+            (slice(i, i + s_per_block), slice(0, n_mu))
+            for i in range(0, n_s, s_per_block)
+        ]
+    return [
+        (slice(i, i + 1), slice(j, j + cells_per_block))
+        for i in range(n_s)
+        for j in range(0, n_mu, cells_per_block)
+    ]
+
+
 def simps_integrate(
     s_c: np.array,
     mu_c: np.array,
@@ -46,6 +148,9 @@ def simps_integrate(
     limit: float = 120.0,
     epsilon: float = 0.0001,
     n: int = 300,
+    dtype: np.dtype = np.float64,
+    max_memory: Optional[float] = None,
+    num_threads: int = 1,
 ):
     """
     Computes the streaming model integral ( https://arxiv.org/abs/1710.09379, Eq 22 ) 
@@ -59,22 +164,97 @@ def simps_integrate(
         limit: r_parallel limits of the integral.
         epsilon: due to discontinuity at zero, add small offset +-epsilon to estimate integral.
         n: number of points to evaluate the integrand.
+        dtype: floating point precision of the (n_s * n_mu, n) integrand arrays. np.float32 halves
+                their memory and bandwidth; the quadrature is still accumulated in float64. For
+                s well inside limit, float32 changes twopcf_s by less than ~2e-6 (1 + xi(s, mu))
+                for the Gaussian PDF and ~2e-5 (1 + xi(s, mu)) for the skew-t.
+        max_memory: approximate memory budget, in bytes, for the integrand temporaries. If given,
+                the (s, mu) cells are integrated in blocks small enough to fit in it (summed over
+                threads), each block being reduced to its integral right away. None evaluates all
+                cells at once.
+        num_threads: number of threads integrating blocks concurrently (numpy and scipy release
+                the GIL). los_pdf_function and twopcf_function must be thread safe.
+    Returns:
+        twopcf_s: np.ndarray
+            2-D array with the resulting redshift space two point correlation function
+	"""
+    n_s, n_mu = s_c.shape[0], mu_c.shape[0]
+    num_threads = max(int(num_threads), 1)
+    if max_memory is None:
+        cells_per_block = -(-n_s * n_mu // num_threads)
+    else:
+        cells_per_block = max_memory / (num_threads * n * BYTES_PER_INTEGRAND_POINT)
+
+    # split integrand in two due to discontinuity at 0
+    r_integrands = (np.linspace(-limit, -epsilon, n), np.linspace(epsilon, limit, n))
+    weights = [simps_weights(r_integrand) for r_integrand in r_integrands]
+
+    def integrate_block(block):
+        s_slice, mu_slice = block
+        streaming_integrand = integrand_s_mu(
+            s_c[s_slice], mu_c[mu_slice], twopcf_function, los_pdf_function, dtype=dtype
+        )
+        return sum(
+            quadrature_sum(streaming_integrand(r_integrand), w)
+            for r_integrand, w in zip(r_integrands, weights)
+        )
+
+    blocks = get_blocks(n_s, n_mu, cells_per_block)
+    twopcf_s = np.empty((n_s, n_mu))
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        for (s_slice, mu_slice), integral in zip(
+            blocks, executor.map(integrate_block, blocks)
+        ):
+            twopcf_s[s_slice, mu_slice] = integral.reshape(
+                twopcf_s[s_slice, mu_slice].shape
+            )
+    return twopcf_s - 1.0
+
+
+def simps_integrate_with_gradient(
+    s_c: np.array,
+    mu_c: np.array,
+    twopcf_function: Callable,
+    los_pdf_function: Callable,
+    limit: float = 120.0,
+    epsilon: float = 0.0001,
+    n: int = 300,
+):
+    """
+    Computes the streaming model integral ( https://arxiv.org/abs/1710.09379, Eq 22 ) together
+    with its Jacobian respect to the model parameters, in a single pass.
+    Args:
+        s_c: pair distance bins.
+        mu_c: cosine of the angle rescpect to the line of sight bins.
+        twopcf_function: function that given pair distance as an argument returns the real space two point 
+                correlation function and its gradient (extra trailing axis over the parameters).
+        los_pdf_function: given the line of sight velocity, perpendicular and parallel distances to the line
+                of sight, returns the line of sight pairwise velocity distribution and its gradient.
+        limit: r_parallel limits of the integral.
+        epsilon: due to discontinuity at zero, add small offset +-epsilon to estimate integral.
+        n: number of points to evaluate the integrand.
     Returns:
         twopcf_s: np.ndarray
             2-D array with the resulting redshift space two point correlation function
+        jacobian: np.ndarray
+            3-D array with the derivatives of twopcf_s respect to the parameters (last axis)
 	"""
 
-    streaming_integrand = integrand_s_mu(s_c, mu_c, twopcf_function, los_pdf_function)
+    streaming_integrand = integrand_s_mu_with_gradient(
+        s_c, mu_c, twopcf_function, los_pdf_function
+    )
+    twopcf_s = -1.0
+    jacobian = 0.0
     # split integrand in two due to discontinuity at 0
-    r_integrand = np.linspace(-limit, -epsilon, n)
-    integral_left = simps(
-        streaming_integrand(r_integrand), r_integrand, axis=-1
-    ).reshape((s_c.shape[0], mu_c.shape[0]))
-
-    r_integrand = np.linspace(epsilon, limit, n)
-    integral_right = simps(
-        streaming_integrand(r_integrand), r_integrand, axis=-1
-    ).reshape((s_c.shape[0], mu_c.shape[0]))
-
-    twopcf_s = integral_left + integral_right - 1.0
-    return twopcf_s
+    for r_integrand in (
+        np.linspace(-limit, -epsilon, n),
+        np.linspace(epsilon, limit, n),
+    ):
+        value, gradient = streaming_integrand(r_integrand)
+        twopcf_s = twopcf_s + simps(value, r_integrand, axis=-1).reshape(
+            (s_c.shape[0], mu_c.shape[0])
+        )
+        jacobian = jacobian + simps(gradient, r_integrand, axis=-2).reshape(
+            (s_c.shape[0], mu_c.shape[0], -1)
+        )
+    return twopcf_s, jacobian
@@ -0,0 +1,21 @@
+import numpy as np
+from gsm.fourier.power_spectrum import get_plans, xi2pk
+from gsm_benchmarks.catalogues import power_law_tpcf
+
+
+class PowerSpectrumMultipoles:
+    params = [256, 1024, 4096]
+    param_names = ["n_s"]
+
+    def setup(self, n_s):
+        self.s = np.geomspace(0.1, 1000.0, n_s)
+        self.twopcf_ell = np.array(
+            [power_law_tpcf()(self.s), 0.5 * power_law_tpcf()(self.s), 0.1 * power_law_tpcf()(self.s)]
+        )
+        self.plans = get_plans(self.s, n_pad=n_s // 2)
+
+    def time_xi2pk_with_plans(self, n_s):
+        xi2pk(self.s, self.twopcf_ell, plans=self.plans)
+
+    def time_xi2pk_without_plans(self, n_s):
+        xi2pk(self.s, self.twopcf_ell, n_pad=n_s // 2)
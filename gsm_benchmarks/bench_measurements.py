@@ -0,0 +1,164 @@
+import numpy as np
+from gsm_benchmarks.catalogues import fake_catalogue
+
+BOXSIZE = 500.0
+
+
+class Measurements:
+    params = ([int(1e4), int(1e5), int(1e6)], [1, 4])
+    param_names = ["n_points", "num_threads"]
+    timeout = 600
+
+    def setup(self, n_points, num_threads):
+        try:
+            from gsm.measurements import tpcf, velocities
+            from astropy.cosmology import Planck15
+        except ImportError:
+            # halotools is an optional dependency of the benchmarks
+            raise NotImplementedError
+        self.tpcf = tpcf
+        self.velocities = velocities
+        self.cosmology = Planck15
+        self.pos, self.vel = fake_catalogue(n_points, boxsize=BOXSIZE)
+        self.r = np.geomspace(0.1, 30.0, 20)
+        self.s = np.linspace(0.0, 30.0, 16)
+        self.mu = np.linspace(0.0, 1.0, 11)
+
+    def time_compute_real_tpcf(self, n_points, num_threads):
+        self.tpcf.compute_real_tpcf(
+            self.r, self.pos, BOXSIZE, num_threads=num_threads
+        )
+
+    def time_compute_tpcf_s_mu(self, n_points, num_threads):
+        self.tpcf.compute_tpcf_s_mu(
+            self.s,
+            self.mu,
+            self.pos,
+            self.vel,
+            los_direction=2,
+            cosmology=self.cosmology,
+            boxsize=BOXSIZE,
+            redshift=0.0,
+            num_threads=num_threads,
+        )
+
+    def time_compute_mean_radial_velocity(self, n_points, num_threads):
+        self.velocities.compute_mean_radial_velocity(
+            self.r, self.pos, self.vel, BOXSIZE, num_threads=num_threads
+        )
+
+
+class ChunkedMeasurements:
+    params = ([int(1e4), int(1e5)], [1, 4, 16])
+    param_names = ["n_points", "n_slabs"]
+    timeout = 600
+
+    def setup(self, n_points, n_slabs):
+        try:
+            from gsm.measurements import chunked
+        except ImportError:
+            raise NotImplementedError
+        self.chunked = chunked
+        self.pos, self.vel = fake_catalogue(n_points, boxsize=BOXSIZE)
+        self.r = np.geomspace(0.1, 30.0, 20)
+
+    def chunks(self, chunk_size=10_000):
+        for start in range(0, len(self.pos), chunk_size):
+            yield self.pos[start : start + chunk_size], self.vel[start : start + chunk_size]
+
+    def time_compute_chunked_statistics(self, n_points, n_slabs):
+        self.chunked.compute_chunked_statistics(
+            self.r, self.chunks(), BOXSIZE, n_slabs=n_slabs
+        )
+
+    def peakmem_compute_chunked_statistics(self, n_points, n_slabs):
+        self.chunked.compute_chunked_statistics(
+            self.r, self.chunks(), BOXSIZE, n_slabs=n_slabs
+        )
+
+
+class WeightedPairCounts:
+    params = [int(1e4), int(1e5)]
+    param_names = ["n_points"]
+    timeout = 600
+
+    def setup(self, n_points):
+        try:
+            from halotools_test.mock_observables import los_pvd_vs_rp, marked_tpcf
+        except ImportError:
+            raise NotImplementedError
+        self.los_pvd_vs_rp = los_pvd_vs_rp
+        self.marked_tpcf = marked_tpcf
+        self.pos, self.vel = fake_catalogue(n_points, boxsize=BOXSIZE)
+        self.marks = np.random.default_rng(0).uniform(0.0, 1.0, n_points)
+        self.rp = np.geomspace(0.1, 10.0, 10)
+
+    def time_los_pvd_vs_rp(self, n_points):
+        self.los_pvd_vs_rp(
+            self.pos, self.vel, rp_bins=self.rp, pi_max=15.0, period=BOXSIZE
+        )
+
+    def time_marked_tpcf(self, n_points):
+        self.marked_tpcf(
+            self.pos, self.rp, marks1=self.marks, period=BOXSIZE, weight_func_id=1
+        )
+
+
+class IsolationCriteria:
+    params = [int(1e5), int(1e6)]
+    param_names = ["n_tracers"]
+    timeout = 600
+
+    def setup(self, n_tracers):
+        try:
+            from halotools_test.mock_observables import (
+                spherical_isolation,
+                conditional_cylindrical_isolation,
+            )
+        except ImportError:
+            raise NotImplementedError
+        self.spherical_isolation = spherical_isolation
+        self.conditional_cylindrical_isolation = conditional_cylindrical_isolation
+        self.galaxies, _ = fake_catalogue(n_tracers // 10, boxsize=BOXSIZE)
+        self.tracers, _ = fake_catalogue(
+            n_tracers, boxsize=BOXSIZE, clustered_fraction=0.9, seed=44
+        )
+        rng = np.random.default_rng(0)
+        self.galaxy_marks = rng.uniform(0.0, 1.0, len(self.galaxies))
+        self.tracer_marks = rng.uniform(0.0, 1.0, n_tracers)
+
+    def time_spherical_isolation(self, n_tracers):
+        self.spherical_isolation(self.galaxies, self.tracers, 2.0, period=BOXSIZE)
+
+    def time_conditional_cylindrical_isolation(self, n_tracers):
+        self.conditional_cylindrical_isolation(
+            self.galaxies,
+            self.tracers,
+            1.0,
+            5.0,
+            marks1=self.galaxy_marks,
+            marks2=self.tracer_marks,
+            cond_func=1,
+            period=BOXSIZE,
+        )
+
+
+class ConditionalRank:
+    params = [[int(1e5), int(1e6)], [101, 1001, 10001]]
+    param_names = ["n_points", "window_length"]
+    timeout = 600
+
+    def setup(self, n_points, window_length):
+        try:
+            from halotools_test.utils import sliding_conditional_percentile
+        except ImportError:
+            raise NotImplementedError
+        self.sliding_conditional_percentile = sliding_conditional_percentile
+        rng = np.random.default_rng(0)
+        self.x = rng.uniform(10.0, 15.0, n_points)
+        self.y = self.x + rng.normal(0.0, 1.0, n_points)
+
+    def time_sliding_conditional_percentile(self, n_points, window_length):
+        self.sliding_conditional_percentile(
+            self.x, self.y, window_length, add_subgrid_noise=False
+        )
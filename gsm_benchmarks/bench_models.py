@@ -0,0 +1,150 @@
+import numpy as np
+from scipy.integrate import simps
+from gsm.models.edgeworth import edgeworth
+from gsm.models.edgeworth.from_radial_transverse import moments2edgeworth
+from gsm.models.gaussian.from_radial_transverse import moments2gaussian
+from gsm.models.skewt import skewt
+from gsm.models.skewt.from_radial_transverse import moments2skewt
+from gsm.models.skewt.moments2parameters import moments2parameters
+from gsm.models.tabulated.tabulated import TabulatedLOSPDF
+from gsm.projection.project_pdf import get_projected_pdf
+from gsm.projection.projection_operator import ProjectionOperator, tabulate_pdf_rt
+from gsm.streaming_integral import real2redshift
+from gsm_benchmarks.catalogues import power_law_tpcf, toy_moments
+
+
+class MomentsToSkewt:
+    params = ([10, 30, 70], [False, True])
+    param_names = ["n_eval", "use_spl"]
+
+    def setup(self, n_eval, use_spl):
+        self.moments = toy_moments()
+
+    def time_moments2skewt(self, n_eval, use_spl):
+        moments2skewt(**self.moments, n_eval=n_eval, use_spl=use_spl)
+
+
+def gaussian_pdf_rt(r, v_r, v_t):
+    mean_r = -300.0 * (r / 5.0) / (1.0 + (r / 5.0) ** 2)
+    sigma_r, sigma_t = 400.0, 350.0
+    return np.exp(
+        -0.5 * ((v_r - mean_r) / sigma_r) ** 2 - 0.5 * (v_t / sigma_t) ** 2
+    ) / (2.0 * np.pi * sigma_r * sigma_t)
+
+
+class ProjectedPDF:
+    params = ([5, 10, 20], [100, 300], [100, 300])
+    param_names = ["n_r", "n_v_los", "n_v_r_bins"]
+
+    def setup(self, n_r, n_v_los, n_v_r_bins):
+        self.r_perp = np.linspace(0.5, 50.0, n_r)
+        self.r_parallel = np.linspace(0.5, 50.0, n_r)
+        self.v_los = np.linspace(-2000.0, 2000.0, n_v_los)
+
+    def time_get_projected_pdf(self, n_r, n_v_los, n_v_r_bins):
+        get_projected_pdf(
+            gaussian_pdf_rt,
+            self.r_perp,
+            self.r_parallel,
+            self.v_los,
+            v_r_min=-2000.0,
+            v_r_max=2000.0,
+            n_v_r_bins=n_v_r_bins,
+        )
+
+
+class ProjectionOperatorApply:
+    """ Projection of a tabulated PDF through a precomputed ProjectionOperator """
+
+    params = ([5, 10], [100, 300])
+    param_names = ["n_r", "n_v"]
+
+    def setup(self, n_r, n_v):
+        r_perp = np.linspace(0.5, 50.0, n_r)
+        r = np.linspace(0.5, 75.0, 60)
+        v = np.linspace(-2000.0, 2000.0, n_v)
+        self.operator = ProjectionOperator(r, v, v, r_perp, r_perp, v)
+        self.pdf_rt = tabulate_pdf_rt(gaussian_pdf_rt, r, v, v)
+
+    def time_apply(self, n_r, n_v):
+        self.operator(self.pdf_rt)
+
+
+class EdgeworthVsSkewt:
+    """ Accuracy and speed of the Edgeworth LOS PDF respect to the skew-t, for typical moments """
+
+    params = ([-0.1, -0.3, -0.5, -0.8], [0.2, 0.5, 1.0, 2.0])
+    param_names = ["gamma1", "gamma2"]
+
+    def setup(self, gamma1, gamma2):
+        self.v = np.linspace(-3000.0, 3000.0, 2001)
+        self.mean, self.std = -200.0, 400.0
+
+    def _skewt(self, gamma1, gamma2):
+        w, v_c, alpha, nu = moments2parameters(self.mean, self.std, gamma1, gamma2)
+        return skewt.pdf(self.v, w, v_c, alpha, nu)
+
+    def _edgeworth(self, gamma1, gamma2):
+        return edgeworth.pdf(self.v, self.mean, self.std, gamma1, gamma2)
+
+    def time_skewt(self, gamma1, gamma2):
+        self._skewt(gamma1, gamma2)
+
+    def time_edgeworth(self, gamma1, gamma2):
+        self._edgeworth(gamma1, gamma2)
+
+    def track_l1_distance(self, gamma1, gamma2):
+        return simps(
+            np.abs(self._skewt(gamma1, gamma2) - self._edgeworth(gamma1, gamma2)),
+            self.v,
+        )
+
+    track_l1_distance.unit = "L1"
+
+
+class LOSModels:
+    """ Model setup plus streaming integral for the different LOS PDF models """
+
+    params = ["skewt", "skewt_spl", "edgeworth"]
+    param_names = ["model"]
+
+    def setup(self, model):
+        self.moments = toy_moments()
+        self.s_c = np.linspace(0.5, 50.0, 20)
+        self.mu_c = np.linspace(0.005, 0.995, 20)
+        self.tpcf = power_law_tpcf()
+
+    def time_model_and_integral(self, model):
+        if model == "edgeworth":
+            los_pdf = moments2edgeworth(**self.moments)
+        else:
+            los_pdf = moments2skewt(
+                **self.moments, n_eval=30, use_spl=(model == "skewt_spl")
+            )
+        real2redshift.simps_integrate(self.s_c, self.mu_c, self.tpcf, los_pdf)
+
+
+class TabulatedLOSPDFIntegral:
+    """ Streaming integral with a tabulated LOS PDF, compared to the Gaussian it tabulates """
+
+    params = ["gaussian", "tabulated"]
+    param_names = ["model"]
+
+    def setup(self, model):
+        moments = toy_moments()
+        self.los_pdf = moments2gaussian(
+            moments["m_10"], moments["c_20"], moments["c_02"]
+        )
+        if model == "tabulated":
+            self.los_pdf = TabulatedLOSPDF.from_function(
+                self.los_pdf,
+                r_perp=np.linspace(0.25, 60.25, 121),
+                r_parallel=np.linspace(0.25, 120.25, 241),
+                v_los=np.linspace(-100.0, 100.0, 201),
+            )
+        self.s_c = np.linspace(0.5, 50.0, 50)
+        self.mu_c = np.linspace(0.005, 0.995, 50)
+        self.tpcf = power_law_tpcf()
+
+    def time_simps_integrate(self, model):
+        real2redshift.simps_integrate(self.s_c, self.mu_c, self.tpcf, self.los_pdf)
@@ -0,0 +1,17 @@
+import numpy as np
+from gsm.moments.perturbation_theory import linear
+from gsm_benchmarks.catalogues import toy_power_spectrum
+
+
+class LinearTheory:
+    params = [10, 50, 200]
+    param_names = ["n_r"]
+
+    def setup(self, n_r):
+        self.r = np.geomspace(0.5, 150.0, n_r)
+
+    def time_v_r(self, n_r):
+        linear.v_r(self.r, toy_power_spectrum, f=0.5, bias=2.0)
+
+    def time_psi_r(self, n_r):
+        linear.psi_r(self.r, toy_power_spectrum, f=0.5)
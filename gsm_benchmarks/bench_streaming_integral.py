@@ -0,0 +1,87 @@
+import numpy as np
+from gsm.streaming_integral import real2redshift
+from gsm.models.gaussian.from_radial_transverse import moments2gaussian
+from gsm_benchmarks.catalogues import power_law_tpcf, toy_moments
+
+
+class SimpsIntegrate:
+    params = ([20, 50, 100], [20, 50, 100], [100, 300, 600])
+    param_names = ["n_s", "n_mu", "n"]
+
+    def setup(self, n_s, n_mu, n):
+        moments = toy_moments()
+        self.s_c = np.linspace(0.5, 50.0, n_s)
+        self.mu_c = np.linspace(0.005, 0.995, n_mu)
+        self.tpcf = power_law_tpcf()
+        self.los_pdf = moments2gaussian(
+            moments["m_10"], moments["c_20"], moments["c_02"]
+        )
+
+    def time_simps_integrate(self, n_s, n_mu, n):
+        real2redshift.simps_integrate(
+            self.s_c, self.mu_c, self.tpcf, self.los_pdf, n=n
+        )
+
+    def peakmem_simps_integrate(self, n_s, n_mu, n):
+        real2redshift.simps_integrate(
+            self.s_c, self.mu_c, self.tpcf, self.los_pdf, n=n
+        )
+
+
+class SimpsIntegratePrecision:
+    params = (["float64", "float32"], [50, 100], [300, 600])
+    param_names = ["dtype", "n_s", "n"]
+
+    def setup(self, dtype, n_s, n):
+        moments = toy_moments()
+        self.dtype = np.dtype(dtype)
+        self.s_c = np.linspace(0.5, 50.0, n_s)
+        self.mu_c = np.linspace(0.005, 0.995, 100)
+        self.tpcf = power_law_tpcf()
+        self.los_pdf = moments2gaussian(
+            moments["m_10"], moments["c_20"], moments["c_02"], dtype=self.dtype
+        )
+
+    def time_simps_integrate(self, dtype, n_s, n):
+        real2redshift.simps_integrate(
+            self.s_c, self.mu_c, self.tpcf, self.los_pdf, n=n, dtype=self.dtype
+        )
+
+    def peakmem_simps_integrate(self, dtype, n_s, n):
+        real2redshift.simps_integrate(
+            self.s_c, self.mu_c, self.tpcf, self.los_pdf, n=n, dtype=self.dtype
+        )
+
+
+class SimpsIntegrateBlocks:
+    params = ([None, 2.0e8, 5.0e7], [1, 4])
+    param_names = ["max_memory", "num_threads"]
+
+    def setup(self, max_memory, num_threads):
+        moments = toy_moments()
+        self.s_c = np.linspace(0.5, 50.0, 100)
+        self.mu_c = np.linspace(0.005, 0.995, 100)
+        self.tpcf = power_law_tpcf()
+        self.los_pdf = moments2gaussian(
+            moments["m_10"], moments["c_20"], moments["c_02"]
+        )
+
+    def time_simps_integrate(self, max_memory, num_threads):
+        real2redshift.simps_integrate(
+            self.s_c,
+            self.mu_c,
+            self.tpcf,
+            self.los_pdf,
+            max_memory=max_memory,
+            num_threads=num_threads,
+        )
+
+    def peakmem_simps_integrate(self, max_memory, num_threads):
+        real2redshift.simps_integrate(
+            self.s_c,
+            self.mu_c,
+            self.tpcf,
+            self.los_pdf,
+            max_memory=max_memory,
+            num_threads=num_threads,
+        )
@@ -0,0 +1,85 @@
+import numpy as np
+
+
+def fake_catalogue(
+    n_points: int,
+    boxsize: float = 500.0,
+    clustered_fraction: float = 0.5,
+    n_points_per_blob: int = 20,
+    blob_radius: float = 1.0,
+    velocity_dispersion: float = 300.0,
+    seed: int = 43,
+):
+    """
+    Generates a synthetic periodic catalogue of tracers, in the spirit of halotools ``FakeSim``,
+    so that benchmarks can run offline. A fraction of the tracers is placed in small Gaussian
+    blobs to mimic the clustering of a real catalogue on small scales.
+    Args:
+        n_points: number of tracers.
+        boxsize: size of the periodic box, in Mpc/h.
+        clustered_fraction: fraction of the tracers placed in blobs.
+        n_points_per_blob: average number of tracers per blob.
+        blob_radius: standard deviation of the tracer positions around the blob centers.
+        velocity_dispersion: one dimensional velocity dispersion, in km/s.
+        seed: random number seed, identical arguments give identical catalogues.
+    Returns:
+        pos: np.ndarray
+            (n_points, 3) array with the positions of the tracers.
+        vel: np.ndarray
+            (n_points, 3) array with the velocities of the tracers.
+    """
+    rng = np.random.RandomState(seed)
+    n_points = int(n_points)
+    n_clustered = int(clustered_fraction * n_points)
+    n_blobs = max(n_clustered // n_points_per_blob, 1)
+
+    centers = rng.uniform(0.0, boxsize, size=(n_blobs, 3))
+    center_vel = rng.normal(0.0, velocity_dispersion, size=(n_blobs, 3))
+    host = rng.randint(0, n_blobs, size=n_clustered)
+    clustered_pos = centers[host] + rng.normal(0.0, blob_radius, size=(n_clustered, 3))
+    clustered_vel = center_vel[host] + rng.normal(
+        0.0, 0.5 * velocity_dispersion, size=(n_clustered, 3)
+    )
+
+    field_pos = rng.uniform(0.0, boxsize, size=(n_points - n_clustered, 3))
+    field_vel = rng.normal(
+        0.0, velocity_dispersion, size=(n_points - n_clustered, 3)
+    )
+
+    pos = np.mod(np.concatenate((clustered_pos, field_pos)), boxsize)
+    vel = np.concatenate((clustered_vel, field_vel))
+    return pos, vel
+
+
+def power_law_tpcf(r0: float = 5.0, gamma: float = 1.8):
+    return lambda r: (r / r0) ** (-gamma)
+
+
+def toy_moments(r0: float = 5.0):
+    """
+    Smooth radial and transverse pairwise velocity moments with realistic amplitudes
+    (in Mpc/h, as used by the streaming integral), used to build the LOS PDFs in the
+    model benchmarks.
+    """
+    m_10 = lambda r: -3.0 * (r / r0) / (1.0 + (r / r0) ** 2)
+    c_20 = lambda r: 4.0 ** 2 * (1.0 + 0.5 / (1.0 + r / r0))
+    c_02 = lambda r: 3.5 ** 2 * (1.0 + 0.3 / (1.0 + r / r0))
+    c_30 = lambda r: -0.3 * c_20(r) ** 1.5 / (1.0 + r / r0)
+    c_12 = lambda r: -0.1 * c_02(r) * c_20(r) ** 0.5 / (1.0 + r / r0)
+    c_40 = lambda r: (3.0 + 1.0 / (1.0 + r / r0)) * c_20(r) ** 2
+    c_04 = lambda r: (3.0 + 0.8 / (1.0 + r / r0)) * c_02(r) ** 2
+    c_22 = lambda r: (1.0 + 0.3 / (1.0 + r / r0)) * c_20(r) * c_02(r)
+    return dict(
+        m_10=m_10,
+        c_20=c_20,
+        c_02=c_02,
+        c_12=c_12,
+        c_30=c_30,
+        c_22=c_22,
+        c_40=c_40,
+        c_04=c_04,
+    )
+
+
+def toy_power_spectrum(k):
+    return 2.0e4 * k / (1.0 + (k / 0.02) ** 2) ** 1.4
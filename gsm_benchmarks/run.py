@@ -0,0 +1,211 @@
+"""
+Minimal offline runner for the benchmarks in this directory.
+
+The benchmark classes follow the airspeed-velocity conventions (``params``, ``param_names``,
+``setup`` raising ``NotImplementedError`` to skip, ``time_*``, ``peakmem_*`` and ``track_*`` methods), so they
+can also be collected by asv. This runner only needs the repository checkout:
+
+    python -m gsm_benchmarks.run [--bench REGEX] [--quick] [--output DIR]
+    python -m gsm_benchmarks.run --compare OLD.json NEW.json
+
+Each run writes ``<output>/<commit>.json``, which can be compared across commits.
+"""
+import argparse
+import importlib
+import itertools
+import json
+import platform
+import re
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+from pathlib import Path
+
+BENCHMARK_MODULES = (
+    "bench_streaming_integral",
+    "bench_models",
+    "bench_moments",
+    "bench_fourier",
+    "bench_measurements",
+)
+DEFAULT_OUTPUT = Path(__file__).resolve().parents[1] / ".benchmarks"
+
+
+def get_commit() -> str:
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=Path(__file__).resolve().parent,
+                stderr=subprocess.DEVNULL,
+            )
+            .decode()
+            .strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def get_params(benchmark_class):
+    params = getattr(benchmark_class, "params", [])
+    if params and not isinstance(params[0], (list, tuple)):
+        params = [params]
+    names = list(getattr(benchmark_class, "param_names", []))
+    names += [f"param{i}" for i in range(len(names), len(params))]
+    return names, list(itertools.product(*params)) if params else [()]
+
+
+def collect(pattern: str = None):
+    for module_name in BENCHMARK_MODULES:
+        module = importlib.import_module(f"gsm_benchmarks.{module_name}")
+        for class_name, benchmark_class in list(vars(module).items()):
+            if not isinstance(benchmark_class, type) or class_name.startswith("_"):
+                continue
+            if benchmark_class.__module__ != module.__name__:
+                continue
+            for method in sorted(vars(benchmark_class)):
+                if not method.startswith(("time_", "peakmem_", "track_")):
+                    continue
+                name = f"{module_name}.{class_name}.{method}"
+                if pattern is None or re.search(pattern, name):
+                    yield name, benchmark_class, method
+
+
+def time_call(function, quick: bool, repeat: int = 5, min_time: float = 0.2):
+    """ Returns the best time per call in seconds, asv-style (auto-ranged number of calls) """
+    if quick:
+        return timeit.timeit(function, number=1)
+    t0 = time.perf_counter()
+    function()
+    single = max(time.perf_counter() - t0, 1e-9)
+    number = max(1, int(min_time / single))
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def peakmem_call(function):
+    """ Returns the peak memory, in bytes, traced while running the function """
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(pattern: str = None, quick: bool = False):
+    results = []
+    for name, benchmark_class, method in collect(pattern):
+        param_names, combinations = get_params(benchmark_class)
+        for combination in combinations:
+            instance = benchmark_class()
+            params = dict(zip(param_names, combination))
+            row = {"name": name, "params": params}
+            try:
+                if hasattr(instance, "setup"):
+                    instance.setup(*combination)
+            except NotImplementedError:
+                row.update(value=None, unit="skipped")
+                results.append(row)
+                print_row(row)
+                continue
+            function = lambda: getattr(instance, method)(*combination)
+            if method.startswith("time_"):
+                row.update(value=time_call(function, quick), unit="s")
+            elif method.startswith("peakmem_"):
+                row.update(value=peakmem_call(function), unit="bytes")
+            else:
+                unit = getattr(getattr(instance, method), "unit", "unit")
+                row.update(value=float(function()), unit=unit)
+            if hasattr(instance, "teardown"):
+                instance.teardown(*combination)
+            results.append(row)
+            print_row(row)
+    return results
+
+
+def format_value(value, unit):
+    if value is None:
+        return "n/a"
+    if unit == "s":
+        for scale, suffix in ((1.0, "s"), (1e-3, "ms"), (1e-6, "us")):
+            if value >= scale:
+                return f"{value / scale:.3g}{suffix}"
+        return f"{value * 1e9:.3g}ns"
+    if unit == "bytes":
+        return f"{value / 2 ** 20:.3g}M"
+    return f"{value:.3g}"
+
+
+def format_params(params):
+    return ", ".join(f"{key}={value}" for key, value in params.items())
+
+
+def print_row(row):
+    print(
+        f"{row['name']:<55} {format_params(row['params']):<40} "
+        f"{format_value(row['value'], row['unit']):>10}"
+    )
+    sys.stdout.flush()
+
+
+def compare(old_path: Path, new_path: Path, factor: float = 1.1):
+    old, new = (json.loads(Path(path).read_text()) for path in (old_path, new_path))
+    old_rows = {
+        (row["name"], format_params(row["params"])): row for row in old["results"]
+    }
+    print(
+        f"{'benchmark':<55} {'params':<40} {old['commit']:>10} {new['commit']:>10} {'ratio':>7}"
+    )
+    for row in new["results"]:
+        key = (row["name"], format_params(row["params"]))
+        old_row = old_rows.get(key)
+        if old_row is None or not old_row["value"] or row["value"] is None:
+            ratio, flag = "", ""
+        else:
+            ratio_value = row["value"] / old_row["value"]
+            ratio = f"{ratio_value:.2f}"
+            flag = "+" if ratio_value > factor else "-" if ratio_value < 1 / factor else ""
+        old_value = format_value(old_row["value"], old_row["unit"]) if old_row else "n/a"
+        print(
+            f"{key[0]:<55} {key[1]:<40} {old_value:>10} "
+            f"{format_value(row['value'], row['unit']):>10} {ratio:>7} {flag}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--bench", default=None, help="regex selecting benchmarks")
+    parser.add_argument(
+        "--quick", action="store_true", help="time a single call per benchmark"
+    )
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, type=Path)
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), default=None)
+    args = parser.parse_args(argv)
+
+    if args.compare is not None:
+        compare(*args.compare)
+        return
+
+    commit = get_commit()
+    results = run(args.bench, quick=args.quick)
+    args.output.mkdir(parents=True, exist_ok=True)
+    output = args.output / f"{commit}.json"
+    output.write_text(
+        json.dumps(
+            {
+                "commit": commit,
+                "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "machine": platform.node(),
+                "python": platform.python_version(),
+                "results": results,
+            },
+            indent=1,
+        )
+    )
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from scipy.special import eval_legendre
+from gsm.fourier.fftlog import FFTLogPlan
+from gsm.fourier.power_spectrum import multipoles_from_s_mu, xi2pk
+
+
+@pytest.mark.parametrize("ell", [0, 2, 4])
+def test__analytical(ell):
+    r = np.geomspace(1.0e-4, 1.0e4, 1024)
+    plan = FFTLogPlan(r, ell)
+    # int r^(ell+2) exp(-r^2/2) j_ell(kr) dr = sqrt(pi/2) k^ell exp(-k^2/2)
+    result = plan(r ** ell * np.exp(-0.5 * r ** 2))
+    expected = np.sqrt(np.pi / 2.0) * plan.k ** ell * np.exp(-0.5 * plan.k ** 2)
+    mask = (plan.k > 1.0e-2) & (plan.k < 5.0)
+    np.testing.assert_allclose(result[mask], expected[mask], atol=1.0e-3)
+
+
+@pytest.mark.parametrize("extrapolation", ["power_law", "constant"])
+def test__extrapolation(extrapolation):
+    r = np.geomspace(0.5, 200.0, 128)
+    sigma = 5.0
+    without_padding = FFTLogPlan(r, 0)
+    plan = FFTLogPlan(r, 0, n_pad=128, extrapolation=extrapolation)
+    f = np.exp(-0.5 * r ** 2 / sigma ** 2)
+    expected = lambda k: np.sqrt(np.pi / 2.0) * sigma ** 3 * np.exp(-0.5 * k ** 2 * sigma ** 2)
+    mask = (plan.k > 1.0e-2) & (plan.k < 0.5)
+    np.testing.assert_allclose(plan(f)[mask], expected(plan.k[mask]), atol=1.0e-3)
+    assert np.abs(without_padding(f) - expected(without_padding.k))[mask].max() > 1.0e-1
+
+
+def test__power_spectrum_multipoles():
+    s = np.geomspace(1.0e-4, 1.0e4, 1024)
+    mu = np.linspace(0.0, 1.0, 201)
+    monopole = np.exp(-0.5 * s ** 2)
+    quadrupole = s ** 2 * np.exp(-0.5 * s ** 2)
+    twopcf_s_mu = monopole[:, None] + quadrupole[:, None] * eval_legendre(2, mu)
+    twopcf_ell = multipoles_from_s_mu(twopcf_s_mu, mu, ells=(0, 2))
+    np.testing.assert_allclose(twopcf_ell[0], monopole, atol=1.0e-6)
+    np.testing.assert_allclose(twopcf_ell[1], quadrupole, atol=1.0e-6)
+
+    k, power_ell = xi2pk(s, twopcf_ell, ells=(0, 2))
+    mask = (k > 1.0e-2) & (k < 5.0)
+    prefactor = 4.0 * np.pi * np.sqrt(np.pi / 2.0)
+    np.testing.assert_allclose(
+        power_ell[0][mask], prefactor * np.exp(-0.5 * k[mask] ** 2), atol=1.0e-2
+    )
+    np.testing.assert_allclose(
+        power_ell[1][mask], -prefactor * k[mask] ** 2 * np.exp(-0.5 * k[mask] ** 2), atol=1.0e-2
+    )
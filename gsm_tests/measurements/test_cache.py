@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from gsm.measurements import cache
+
+
+@pytest.fixture
+def result_cache(tmp_path):
+    yield cache.enable_cache(tmp_path, max_size=1.0e9)
+    cache.disable_cache()
+
+
+calls = []
+
+
+@cache.cached
+def measurement(r, pos, boxsize, num_threads=1, los_direction=2):
+    calls.append(1)
+    return np.histogram(np.mod(pos[:, los_direction], boxsize), bins=r)[0] * 1.0
+
+
+@cache.cached
+def measurement_dict(r, pos):
+    calls.append(1)
+    return {"counts": np.histogram(pos[:, 0], bins=r)[0], "r": r}
+
+
+def test__hits_and_misses(result_cache):
+    calls.clear()
+    pos = np.random.RandomState(0).uniform(0.0, 10.0, size=(1000, 3))
+    r = np.linspace(0.0, 10.0, 11)
+    expected = measurement(r, pos, 10.0)
+    np.testing.assert_array_equal(measurement(r, pos, boxsize=10.0, num_threads=4), expected)
+    np.testing.assert_array_equal(measurement(r, pos, 10.0, 1, 2), expected)
+    assert (result_cache.hits, result_cache.misses, len(calls)) == (2, 1, 1)
+    measurement(r, pos, 10.0, los_direction=1)
+    pos[0, 2] += 1.0
+    measurement(r, pos, 10.0)
+    assert (result_cache.hits, result_cache.misses, len(calls)) == (2, 3, 3)
+
+    result = measurement_dict(r, pos)
+    cached_result = measurement_dict(r, pos)
+    assert set(cached_result) == {"counts", "r"}
+    np.testing.assert_array_equal(cached_result["counts"], result["counts"])
+
+
+def test__disabled():
+    calls.clear()
+    pos = np.ones((10, 3))
+    measurement(np.linspace(0.0, 2.0, 3), pos, 10.0)
+    measurement(np.linspace(0.0, 2.0, 3), pos, 10.0)
+    assert len(calls) == 2
+
+
+def test__eviction(result_cache):
+    pos = np.random.RandomState(0).uniform(0.0, 10.0, size=(100, 3))
+    measurement(np.linspace(0.0, 10.0, 1001), pos, 10.0)
+    result_cache.max_size = 2.5 * result_cache.size()
+    for n_bins in (1002, 1003, 1004):
+        measurement(np.linspace(0.0, 10.0, n_bins), pos, 10.0)
+    assert result_cache.size() <= result_cache.max_size
+    assert len(list(result_cache.directory.glob("*.npz"))) == 2
+    # the most recently used results are kept
+    hits = result_cache.hits
+    measurement(np.linspace(0.0, 10.0, 1004), pos, 10.0)
+    assert result_cache.hits == hits + 1
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from gsm.measurements.chunked import (
+    compute_chunked_statistics,
+    iterate_npy_chunks,
+    pair_velocity_sums,
+)
+
+BOXSIZE = 30.0
+R_BINS = np.linspace(0.5, 6.0, 8)
+
+
+def get_catalogue(n=400, seed=5):
+    rng = np.random.RandomState(seed)
+    pos = rng.uniform(0.0, BOXSIZE, size=(n, 3))
+    vel = rng.normal(0.0, 3.0, size=(n, 3)) + 0.3 * pos
+    return pos, vel
+
+
+def brute_force_sums(pos, vel, max_order=4):
+    separation = pos[np.newaxis, :] - pos[:, np.newaxis]
+    separation -= BOXSIZE * np.round(separation / BOXSIZE)
+    r = np.sqrt(np.sum(separation ** 2, axis=-1))
+    relative_velocity = vel[np.newaxis, :] - vel[:, np.newaxis]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        v_r = np.sum(relative_velocity * separation, axis=-1) / r
+    v_t = np.sqrt(np.maximum(np.sum(relative_velocity ** 2, axis=-1) - v_r ** 2, 0.0))
+    sums = np.zeros((max_order + 1, max_order + 1, len(R_BINS) - 1))
+    for k in range(len(R_BINS) - 1):
+        in_bin = (r >= R_BINS[k]) & (r < R_BINS[k + 1])
+        for a in range(max_order + 1):
+            for b in range(max_order + 1 - a):
+                sums[a, b, k] = np.sum(v_r[in_bin] ** a * v_t[in_bin] ** b)
+    return sums
+
+
+def test__pair_velocity_sums():
+    pos, vel = get_catalogue()
+    np.testing.assert_allclose(
+        pair_velocity_sums(pos, vel, pos, vel, R_BINS, BOXSIZE, chunk_size=150),
+        brute_force_sums(pos, vel),
+        rtol=1e-10,
+    )
+
+
+@pytest.mark.parametrize("n_slabs, axis", [(1, 0), (4, 0), (7, 2)])
+def test__slabs(n_slabs, axis, tmp_path):
+    pos, vel = get_catalogue()
+    for i in range(3):
+        np.save(tmp_path / f"pos_{i}.npy", pos[i::3])
+        np.save(tmp_path / f"vel_{i}.npy", vel[i::3])
+    chunks = iterate_npy_chunks(
+        [tmp_path / f"pos_{i}.npy" for i in range(3)],
+        [tmp_path / f"vel_{i}.npy" for i in range(3)],
+        chunk_size=50,
+    )
+    statistics = compute_chunked_statistics(
+        R_BINS, chunks, BOXSIZE, n_slabs=n_slabs, directory=tmp_path, axis=axis
+    )
+    sums = brute_force_sums(pos, vel)
+    np.testing.assert_array_equal(statistics["npairs"], sums[0, 0])
+    np.testing.assert_allclose(statistics["m_10"], sums[1, 0] / sums[0, 0], rtol=1e-10)
+    mean_vt2 = sums[0, 2] / sums[0, 0]
+    np.testing.assert_allclose(statistics["c_02"], mean_vt2 / 2.0, rtol=1e-10)
+    volume = 4.0 / 3.0 * np.pi * np.diff(R_BINS ** 3)
+    np.testing.assert_allclose(
+        statistics["tpcf"], sums[0, 0] / (400 * 399 * volume / BOXSIZE ** 3) - 1.0
+    )
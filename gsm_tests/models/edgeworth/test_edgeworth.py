@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from scipy.integrate import simps
+from gsm.models.edgeworth import edgeworth
+from gsm.models.skewt import skewt
+from gsm.models.skewt.moments2parameters import moments2parameters
+
+
+@pytest.mark.parametrize("expansion", ["edgeworth", "gram_charlier"])
+def test_moments(expansion):
+    v = np.linspace(-60.0, 60.0, 2001)
+    true_mean, true_std, true_gamma1, true_gamma2 = -3.0, 4.0, -0.4, 0.8
+    pdf = edgeworth.pdf(
+        v, true_mean, true_std, true_gamma1, true_gamma2, expansion=expansion, clip=False
+    )
+
+    mean = simps(pdf * v, v)
+    std = np.sqrt(simps(pdf * (v - mean) ** 2, v))
+    np.testing.assert_almost_equal(simps(pdf, v), 1.0, decimal=4)
+    np.testing.assert_almost_equal(mean, true_mean, decimal=4)
+    np.testing.assert_almost_equal(std, true_std, decimal=4)
+    np.testing.assert_almost_equal(
+        simps(pdf * (v - mean) ** 3, v) / std ** 3, true_gamma1, decimal=3
+    )
+    np.testing.assert_almost_equal(
+        simps(pdf * (v - mean) ** 4, v) / std ** 4 - 3.0, true_gamma2, decimal=3
+    )
+
+
+def test_positivity():
+    v = np.linspace(-30.0, 30.0, 1001)
+    assert edgeworth.pdf(v, 0.0, 3.0, -0.8, 2.0, clip=False).min() < 0.0
+    assert edgeworth.pdf(v, 0.0, 3.0, -0.8, 2.0).min() == 0.0
+
+
+def test_close_to_skewt():
+    v = np.linspace(-30.0, 30.0, 1001)
+    mean, std, gamma1, gamma2 = -1.0, 3.0, -0.3, 0.5
+    w, v_c, alpha, nu = moments2parameters(mean, std, gamma1, gamma2)
+    difference = simps(
+        np.abs(
+            edgeworth.pdf(v, mean, std, gamma1, gamma2)
+            - skewt.pdf(v, w, v_c, alpha, nu)
+        ),
+        v,
+    )
+    assert difference < 0.02
@@ -0,0 +1,40 @@
+import numpy as np
+from scipy.optimize import fsolve
+from gsm.models.skewt import skewt
+from gsm.models.skewt.moments2parameters import (
+    constrains,
+    shape_parameters_jacobian,
+)
+
+
+def test_pdf_gradient():
+    v = np.linspace(-10.0, 10.0, 20)
+    parameters = np.array([2.0, 0.5, -1.2, 6.0])
+    pdf, gradient = skewt.pdf_with_gradient(v, *parameters)
+
+    np.testing.assert_allclose(pdf, skewt.pdf(v, *parameters))
+    for p in range(len(parameters)):
+        step = np.zeros_like(parameters)
+        step[p] = 1.0e-6
+        finite_difference = (
+            skewt.pdf(v, *(parameters + step)) - skewt.pdf(v, *(parameters - step))
+        ) / 2.0e-6
+        np.testing.assert_allclose(gradient[:, p], finite_difference, atol=1.0e-8)
+
+
+def test_shape_parameters_jacobian():
+    gamma1, gamma2 = -0.5, 1.5
+    step = 1.0e-6
+    alpha, nu = fsolve(constrains, (-0.7, 5), args=(gamma1, gamma2), xtol=1.0e-12)
+    jacobian = shape_parameters_jacobian(alpha, nu)
+
+    finite_difference = np.zeros((2, 2))
+    for i, delta in enumerate(np.eye(2) * step):
+        plus = fsolve(
+            constrains, (alpha, nu), args=(gamma1 + delta[0], gamma2 + delta[1]), xtol=1.0e-12
+        )
+        minus = fsolve(
+            constrains, (alpha, nu), args=(gamma1 - delta[0], gamma2 - delta[1]), xtol=1.0e-12
+        )
+        finite_difference[:, i] = (plus - minus) / (2.0 * step)
+    np.testing.assert_allclose(jacobian, finite_difference, rtol=1.0e-4)
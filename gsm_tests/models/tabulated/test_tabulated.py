@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from gsm.models.gaussian.from_radial_transverse import moments2gaussian
+from gsm.models.tabulated.tabulated import TabulatedLOSPDF
+from gsm.streaming_integral import real2redshift
+
+
+def get_gaussian():
+    return moments2gaussian(
+        lambda r: -3.0 * (r / 5.0) / (1.0 + (r / 5.0) ** 2),
+        lambda r: 16.0 * (1.0 + 0.5 / (1.0 + r / 5.0)),
+        lambda r: 12.0 * (1.0 + 0.3 / (1.0 + r / 5.0)),
+    )
+
+
+@pytest.fixture(scope="module")
+def table():
+    return TabulatedLOSPDF.from_function(
+        get_gaussian(),
+        r_perp=np.linspace(0.25, 100.25, 201),
+        r_parallel=np.linspace(0.25, 130.25, 261),
+        v_los=np.linspace(-150.0, 150.0, 601),
+    )
+
+
+def test__interpolation(table):
+    los_pdf = get_gaussian()
+    r_perp = np.array([[2.3], [7.1], [42.7]])
+    r_parallel = np.array([[1.2, 3.3, 25.9, 99.1]])
+    vlos = np.linspace(-20.0, 20.0, 12).reshape(-1, 1, 1) * np.ones((1, 3, 4))
+    expected = np.stack([los_pdf(v, r_perp, r_parallel) for v in vlos])
+    np.testing.assert_allclose(table(vlos, r_perp, r_parallel), expected, atol=5e-4)
+    assert np.all(table(np.full((3, 4), 1000.0), r_perp, r_parallel) == 0.0)
+
+
+def test__streaming_integral(table):
+    los_pdf = get_gaussian()
+    s = np.linspace(5.0, 60.0, 12)
+    mu = np.linspace(0.005, 0.95, 10)
+    tpcf = lambda r: (r / 5.0) ** -1.8
+    expected = real2redshift.simps_integrate(s, mu, tpcf, los_pdf)
+    result = real2redshift.simps_integrate(s, mu, tpcf, table)
+    np.testing.assert_array_less(np.abs(result - expected), 5e-3 * (1.0 + expected))
+
+
+def test__memmap(table, tmp_path):
+    filename = tmp_path / "los_pdf.npy"
+    table.save(filename)
+    mapped = TabulatedLOSPDF.from_npy(
+        filename, table.r_perp, table.r_parallel, table.v_los
+    )
+    assert isinstance(mapped.pdf, np.memmap)
+    vlos = np.linspace(-50.0, 50.0, 7).reshape(1, -1)
+    r_perp, r_parallel = np.array([[3.0], [17.5]]), np.array([[0.4, 2.0, 8.0, 90.0, 120.0, 4.0, 1.0]])
+    np.testing.assert_array_equal(
+        mapped(vlos, r_perp, r_parallel), table(vlos, r_perp, r_parallel)
+    )
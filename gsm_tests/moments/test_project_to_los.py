@@ -1,7 +1,7 @@
 from collections import namedtuple
 import pytest
 import numpy as np
-from gsm.moments.project_to_los import project_to_los
+from gsm.moments.project_to_los import project_to_los, project_to_los_with_gradient
 
 def test__project_to_los():
     m_10 = lambda x: x
@@ -21,3 +21,27 @@ def test__project_to_los():
     
     assert mean(r_perp,r_parallel) == pytest.approx(m_10(r)*mu,rel=0.01)
     assert c_2(r_perp,r_parallel) == pytest.approx(mu**2*c_20(r) + (1-mu**2)*c_02(r), rel=0.01)
+
+def test__project_to_los_with_gradient():
+    # m_10 = a*r, c_20 = b*r**2, c_02 = (r-5)**2, parameters (a, b)
+    m_10 = lambda x: (2.*x, np.stack([x, 0.*x], axis=-1))
+    c_20 = lambda x: (3.*x**2, np.stack([0.*x, x**2], axis=-1))
+    c_02 = lambda x: ((x-5)**2, np.zeros(np.shape(x) + (2,)))
+
+    Moments = namedtuple('Moments', ['m_10', 'c_20', 'c_02'])
+    moments = Moments(m_10, c_20, c_02)
+
+    mean = project_to_los_with_gradient(moments, 1, mode='m')
+    c_2 = project_to_los_with_gradient(moments, 2, mode='c')
+
+    r_perp = 10.
+    r_parallel = 5.
+    r = np.sqrt(r_perp**2 + r_parallel**2)
+    mu = r_parallel/r
+
+    mean_value, mean_gradient = mean(r_perp, r_parallel)
+    assert mean_value == pytest.approx(2.*r*mu, rel=0.01)
+    np.testing.assert_allclose(mean_gradient.ravel(), [r*mu, 0.])
+    c_2_value, c_2_gradient = c_2(r_perp, r_parallel)
+    assert c_2_value == pytest.approx(mu**2*3.*r**2 + (1-mu**2)*(r-5)**2, rel=0.01)
+    np.testing.assert_allclose(c_2_gradient.ravel(), [0., mu**2*r**2])
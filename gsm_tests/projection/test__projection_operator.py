@@ -0,0 +1,75 @@
+import numpy as np
+from scipy.integrate import simps
+from gsm.projection.project_pdf import get_projected_pdf
+from gsm.projection.projection_operator import (
+    ProjectionOperator,
+    get_projection_operator,
+    tabulate_pdf_rt,
+)
+
+
+def mean(r):
+    return 2.0 * r
+
+
+def pdf_rt(r, v_r, v_t):
+    return np.exp(-0.5 * ((v_r - mean(r)) ** 2 + v_t ** 2) / 5.0) / (2.0 * np.pi * 5.0)
+
+
+def get_grids():
+    r = np.linspace(1.0, 10.0, 30)
+    v_r = np.linspace(-40.0, 40.0, 301)
+    v_t = np.linspace(-40.0, 40.0, 301)
+    return r, v_r, v_t
+
+
+def test__analytical_moments():
+    r, v_r, v_t = get_grids()
+    r_parallel = np.linspace(1, 5, 5)
+    r_perp = np.linspace(1.0, 8, 10)
+    v_los = np.linspace(-40, 40, 400)
+    operator = ProjectionOperator(r, v_r, v_t, r_perp, r_parallel, v_los)
+    los_pdf = operator(tabulate_pdf_rt(pdf_rt, r, v_r, v_t))
+    r_cell = np.sqrt(r_perp.reshape(-1, 1) ** 2 + r_parallel.reshape(1, -1) ** 2)
+    desired_mean = r_parallel.reshape(1, -1) / r_cell * mean(r_cell)
+    np.testing.assert_allclose(simps(los_pdf, v_los, axis=-1), 1.0, atol=1e-3)
+    actual_mean = simps(v_los * los_pdf, v_los, axis=-1)
+    np.testing.assert_allclose(actual_mean, desired_mean, atol=2e-2)
+    variance = simps(v_los ** 2 * los_pdf, v_los, axis=-1) - actual_mean ** 2
+    np.testing.assert_allclose(variance, 5.0, atol=1e-1)
+
+
+def test__agrees_with_get_projected_pdf():
+    # both integration branches (r_parallel < r_perpendicular and >=) are covered,
+    # the difference comes from the linear interpolation of the table in r
+    r, v_r, v_t = get_grids()
+    r_parallel = np.linspace(1, 5, 5)
+    r_perp = np.linspace(1.0, 8, 10)
+    v_los = np.linspace(-30, 30, 121)
+    operator = ProjectionOperator(r, v_r, v_t, r_perp, r_parallel, v_los)
+    los_pdf = operator(tabulate_pdf_rt(pdf_rt, r, v_r, v_t))
+    desired = get_projected_pdf(
+        pdf_rt,
+        r_perp,
+        r_parallel,
+        v_los,
+        v_r_min=v_r[0],
+        v_r_max=v_r[-1],
+        n_v_r_bins=len(v_r),
+    )
+    np.testing.assert_allclose(los_pdf, desired, atol=1e-2 * desired.max())
+
+
+def test__batches_and_cache():
+    r, v_r, v_t = get_grids()
+    r_parallel = np.linspace(1, 5, 3)
+    r_perp = np.linspace(1.0, 8, 4)
+    v_los = np.linspace(-40, 40, 50)
+    operator = get_projection_operator(r, v_r, v_t, r_perp, r_parallel, v_los)
+    assert get_projection_operator(r, v_r, v_t, r_perp, r_parallel, v_los) is operator
+    table = tabulate_pdf_rt(pdf_rt, r, v_r, v_t)
+    batch = np.stack((table, 2.0 * table))
+    los_pdf = operator(batch)
+    assert los_pdf.shape == (2, 4, 3, 50)
+    np.testing.assert_allclose(los_pdf[0], operator(table))
+    np.testing.assert_allclose(los_pdf[1], 2.0 * operator(table))
@@ -4,6 +4,8 @@ from scipy.integrate import simps, quadrature, quad
 
 from gsm.streaming_integral import real2redshift
 from gsm.models.gaussian import from_los as gaussian_from_los
+from gsm.models.gaussian import from_radial_transverse as gaussian_from_radial_transverse
+from gsm.models.skewt import from_radial_transverse as skewt_from_radial_transverse
 
 
 @pytest.mark.parametrize("a,b", [(2, 3), (3, 2), (10, 1)])
@@ -19,3 +21,143 @@ def test__analytical(a, b):
     result = simps(integrand(r_integrand), r_integrand, axis=-1)
     analytical_result = 2 + a ** 2 + b ** 2
     assert result == pytest.approx(analytical_result, rel=0.05)
+
+
+def gaussian_streaming_model(theta, with_gradient=False):
+    # parameters: mean amplitude, dispersion and correlation length
+    a, b, r0 = theta
+    m_10 = lambda r: a * r / (1 + r)
+    c_20 = lambda r: b ** 2 * (1 + 1 / (1 + r))
+    c_02 = lambda r: b ** 2 * (0.8 + 1 / (1 + r))
+    tpcf = lambda r: (r / r0) ** -1.8
+    if not with_gradient:
+        return tpcf, gaussian_from_radial_transverse.moments2gaussian(m_10, c_20, c_02)
+    zero = lambda r: np.zeros_like(r)
+    gradient = lambda f, *derivatives: lambda r: (
+        f(r),
+        np.stack([d(r) for d in derivatives], axis=-1),
+    )
+    return (
+        gradient(tpcf, zero, zero, lambda r: 1.8 * (r / r0) ** -1.8 / r0),
+        gaussian_from_radial_transverse.moments2gaussian_with_gradient(
+            gradient(m_10, lambda r: r / (1 + r), zero, zero),
+            gradient(c_20, zero, lambda r: 2 * b * (1 + 1 / (1 + r)), zero),
+            gradient(c_02, zero, lambda r: 2 * b * (0.8 + 1 / (1 + r)), zero),
+        ),
+    )
+
+
+def test__gradient():
+    s = np.linspace(1.0, 40.0, 5)
+    mu = np.linspace(0.05, 0.95, 4)
+    theta = np.array([-3.0, 4.0, 5.0])
+    twopcf_s, jacobian = real2redshift.simps_integrate_with_gradient(
+        s, mu, *gaussian_streaming_model(theta, with_gradient=True), n=100
+    )
+    np.testing.assert_allclose(
+        twopcf_s,
+        real2redshift.simps_integrate(s, mu, *gaussian_streaming_model(theta), n=100),
+    )
+    for p in range(len(theta)):
+        step = np.zeros_like(theta)
+        step[p] = 1.0e-5
+        finite_difference = (
+            real2redshift.simps_integrate(
+                s, mu, *gaussian_streaming_model(theta + step), n=100
+            )
+            - real2redshift.simps_integrate(
+                s, mu, *gaussian_streaming_model(theta - step), n=100
+            )
+        ) / 2.0e-5
+        np.testing.assert_allclose(
+            jacobian[..., p], finite_difference, rtol=1.0e-5, atol=1.0e-7
+        )
+
+
+def float32_test_moments(r0=5.0):
+    m_10 = lambda r: -3.0 * (r / r0) / (1.0 + (r / r0) ** 2)
+    c_20 = lambda r: 16.0 * (1.0 + 0.5 / (1.0 + r / r0))
+    c_02 = lambda r: 12.0 * (1.0 + 0.3 / (1.0 + r / r0))
+    c_30 = lambda r: -0.3 * c_20(r) ** 1.5 / (1.0 + r / r0)
+    c_12 = lambda r: -0.1 * c_02(r) * c_20(r) ** 0.5 / (1.0 + r / r0)
+    c_40 = lambda r: (3.0 + 1.0 / (1.0 + r / r0)) * c_20(r) ** 2
+    c_04 = lambda r: (3.0 + 1.0 / (1.0 + r / r0)) * c_02(r) ** 2
+    c_22 = lambda r: (1.0 + 0.5 / (1.0 + r / r0)) * c_20(r) * c_02(r)
+    return dict(
+        m_10=m_10,
+        c_20=c_20,
+        c_02=c_02,
+        c_12=c_12,
+        c_30=c_30,
+        c_40=c_40,
+        c_04=c_04,
+        c_22=c_22,
+    )
+
+
+def gaussian_los_pdf(dtype):
+    moments = float32_test_moments()
+    return gaussian_from_radial_transverse.moments2gaussian(
+        moments["m_10"], moments["c_20"], moments["c_02"], dtype=dtype
+    )
+
+
+def skewt_los_pdf(dtype):
+    return skewt_from_radial_transverse.moments2skewt(
+        **float32_test_moments(), dtype=dtype
+    )
+
+
+@pytest.mark.parametrize(
+    "los_pdf, tolerance", [(gaussian_los_pdf, 2.0e-6), (skewt_los_pdf, 2.0e-5)]
+)
+def test__float32(los_pdf, tolerance):
+    s = np.linspace(0.5, 50.0, 20)
+    mu = np.linspace(0.005, 0.995, 10)
+    tpcf = lambda r: (r / 5.0) ** -1.8
+    expected = real2redshift.simps_integrate(s, mu, tpcf, los_pdf(np.float64))
+    integrand = real2redshift.integrand_s_mu(
+        s, mu, tpcf, los_pdf(np.float32), dtype=np.float32
+    )
+    assert integrand(np.linspace(0.1, 10.0, 5)).dtype == np.float32
+    result = real2redshift.simps_integrate(
+        s, mu, tpcf, los_pdf(np.float32), dtype=np.float32
+    )
+    assert result.dtype == np.float64
+    np.testing.assert_array_less(np.abs(result - expected), tolerance * (1 + expected))
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test__integrand_keeps_los_pdf(dtype):
+    # a PDF returning a cached array, smaller than the (n_s * n_mu, n) grid
+    cached_pdf = np.full((1, 5), 0.1, dtype=dtype)
+    los_pdf = lambda vlos, r_perp, r_parallel: cached_pdf
+    integrand = real2redshift.integrand_s_mu(
+        np.linspace(1.0, 10.0, 3),
+        np.linspace(0.1, 0.9, 2),
+        lambda r: r,
+        los_pdf,
+        dtype=dtype,
+    )
+    y = np.linspace(0.5, 2.5, 5)
+    result = integrand(y)
+    assert result.shape == (6, 5)
+    assert np.all(cached_pdf == np.asarray(0.1, dtype=dtype))
+    np.testing.assert_allclose(integrand(y), result)
+
+
+@pytest.mark.parametrize("max_memory, num_threads", [(None, 3), (1.0e6, 1), (1.0e6, 4), (1.0, 2)])
+def test__blocks(max_memory, num_threads):
+    s = np.linspace(0.5, 80.0, 13)
+    mu = np.linspace(0.005, 0.995, 7)
+    tpcf = lambda r: (r / 5.0) ** -1.8
+    los_pdf = gaussian_from_radial_transverse.moments2gaussian(
+        lambda r: -3.0 * r / (1 + r),
+        lambda r: 16.0 * (1 + 1 / (1 + r)),
+        lambda r: 12.0 * (1 + 1 / (1 + r)),
+    )
+    expected = real2redshift.simps_integrate(s, mu, tpcf, los_pdf, n=100)
+    result = real2redshift.simps_integrate(
+        s, mu, tpcf, los_pdf, n=100, max_memory=max_memory, num_threads=num_threads
+    )
+    np.testing.assert_allclose(result, expected, rtol=1e-12, atol=1e-12)
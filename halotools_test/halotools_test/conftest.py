@@ -3,6 +3,8 @@
 # no matter how it is invoked within the source tree.
 from distutils.version import LooseVersion
 
+import pytest
+
 from astropy.version import version as astropy_version
 
 if LooseVersion(astropy_version) < LooseVersion('2.0.3'):
@@ -48,3 +50,13 @@ except (NameError, KeyError):  # NameError is needed to support Astropy < 1.0
 
 TESTED_VERSIONS['halotools'] = version
 TESTED_VERSIONS['astropy_helpers'] = astropy_helpers_version
+
+
+@pytest.fixture(autouse=True)
+def lookup_table_cache_dirname(monkeypatch, tmp_path):
+    """ Store the lookup tables of the phase space models built during the tests
+    in a temporary directory, instead of the Halotools cache directory of the user.
+    """
+    from .empirical_models.phase_space_models.analytic_models import monte_carlo_helpers
+    monkeypatch.setattr(monte_carlo_helpers, '_lookup_table_cache_dirname',
+        str(tmp_path / 'lookup_tables'))
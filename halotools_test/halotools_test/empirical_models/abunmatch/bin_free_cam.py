@@ -2,13 +2,15 @@
 """
 import numpy as np
 from ...utils import unsorting_indices
+from ...utils.random_streams import _random_stream_seed
 from ...utils.conditional_percentile import _check_xyn_bounds, rank_order_function
 from .engines import cython_bin_free_cam_kernel, get_value_at_rank
 from .tests.naive_python_cam import sample2_window_indices
 
 
 def conditional_abunmatch(x, y, x2, y2, nwin, add_subgrid_noise=True,
-            assume_x_is_sorted=False, assume_x2_is_sorted=False, return_indexes=False):
+            assume_x_is_sorted=False, assume_x2_is_sorted=False, return_indexes=False,
+            seed=None):
     r"""
     Given a set of input points with primary property `x` and secondary property `y`,
     and a mapping between that primary property and another secondary property
@@ -57,6 +59,11 @@ def conditional_abunmatch(x, y, x2, y2, nwin, add_subgrid_noise=True,
         `add_subgrid_noise` must be set to False is this is set.
         Default is False.
 
+    seed : int, optional
+        Random number seed used together with the `add_subgrid_noise` argument.
+        The random number of each point only depends on `seed` and on the rank of
+        its `x` value. Default is None, for stochastic results.
+
     Returns
     -------
     ynew : ndarray
@@ -110,9 +117,10 @@ def conditional_abunmatch(x, y, x2, y2, nwin, add_subgrid_noise=True,
         y2_sorted = y2[idx_x2_sorted]
 
     i2_matched = np.searchsorted(x2_sorted, x_sorted).astype('i4')
+    seed = _random_stream_seed(seed)
 
     result = np.array(cython_bin_free_cam_kernel(
-        y_sorted, y2_sorted, i2_matched, nwin, int(add_subgrid_noise), int(return_indexes)))
+        y_sorted, y2_sorted, i2_matched, nwin, int(add_subgrid_noise), int(return_indexes), seed))
 
     #  Finish the leftmost points in pure python
     iw = 0
@@ -127,7 +135,8 @@ def conditional_abunmatch(x, y, x2, y2, nwin, add_subgrid_noise=True,
             ]
         else:
             leftmost_sorted_window_y2 = np.sort(y2_sorted[iy2_low:iy2_high])
-            result[ix1] = get_value_at_rank(leftmost_sorted_window_y2, leftmost_window_ranks[iw], nwin, int(add_subgrid_noise))
+            result[ix1] = get_value_at_rank(leftmost_sorted_window_y2, leftmost_window_ranks[iw], nwin, int(add_subgrid_noise),
+                seed, ix1)
 
         iw += 1
 
@@ -144,7 +153,8 @@ def conditional_abunmatch(x, y, x2, y2, nwin, add_subgrid_noise=True,
             ]
         else:
             rightmost_sorted_window_y2 = np.sort(y2_sorted[iy2_low:iy2_high])
-            result[ix1] = get_value_at_rank(rightmost_sorted_window_y2, rightmost_window_ranks[iw], nwin, int(add_subgrid_noise))
+            result[ix1] = get_value_at_rank(rightmost_sorted_window_y2, rightmost_window_ranks[iw], nwin, int(add_subgrid_noise),
+                seed, ix1)
         iw += 1
 
 
@@ -1,18 +1,17 @@
 # cython: language_level=2
 """
 """
-from libc.stdlib cimport rand, RAND_MAX
 from libc.math cimport floor
+from libc.stdint cimport uint32_t, uint64_t
 import numpy as np
 cimport cython
 from ....utils import unsorting_indices
+from ....utils.random_streams import random_stream_id
+from ....utils.engines.random_streams cimport random_stream_uniform_value
 
 __all__ = ('cython_bin_free_cam_kernel', 'get_value_at_rank')
 
-
-cdef double random_uniform():
-    cdef double r = rand()
-    return r / RAND_MAX
+cdef uint32_t subgrid_noise_stream = random_stream_id('conditional_abunmatch')
 
 
 @cython.boundscheck(False)
@@ -125,13 +124,19 @@ cdef int _find_index(int[:] arr, int val):
 @cython.boundscheck(False)
 @cython.nonecheck(False)
 @cython.wraparound(False)
-def get_value_at_rank(double[:] sorted_values, int rank1, int nwin, int add_subgrid_noise):
-    return _get_value_at_rank(sorted_values, rank1, nwin, add_subgrid_noise)
+def get_value_at_rank(double[:] sorted_values, int rank1, int nwin, int add_subgrid_noise,
+            uint64_t seed=0, uint64_t index=0):
+    return _get_value_at_rank(sorted_values, rank1, nwin, add_subgrid_noise, seed, index)
 
 @cython.boundscheck(False)
 @cython.nonecheck(False)
 @cython.wraparound(False)
-cdef double _get_value_at_rank(double[:] sorted_values, int rank1, int nwin, int add_subgrid_noise):
+cdef double _get_value_at_rank(double[:] sorted_values, int rank1, int nwin, int add_subgrid_noise,
+            uint64_t seed, uint64_t index):
+    """ Value of rank ``rank1`` in the window. With subgrid noise, the uniform random number
+    for the point ``index`` of the first array is drawn from the counter-based stream,
+    so that the result does not depend on the order in which points are processed.
+    """
     if add_subgrid_noise == 0:
         return sorted_values[rank1]
     else:
@@ -139,14 +144,15 @@ cdef double _get_value_at_rank(double[:] sorted_values, int rank1, int nwin, int
         high_rank = min(rank1 + 1, nwin - 1)
         low_cdf = sorted_values[low_rank]
         high_cdf = sorted_values[high_rank]
-        return low_cdf + (high_cdf-low_cdf)*random_uniform()
+        return low_cdf + (high_cdf-low_cdf)*random_stream_uniform_value(
+            seed, subgrid_noise_stream, index, 0)
 
 
 @cython.boundscheck(False)
 @cython.nonecheck(False)
 @cython.wraparound(False)
 def cython_bin_free_cam_kernel(double[:] y1, double[:] y2, int[:] i2_match, int nwin,
-            int add_subgrid_noise, int return_indexes):
+            int add_subgrid_noise, int return_indexes, uint64_t seed=0):
     """ Kernel underlying the bin-free implementation of conditional abundance matching.
     For the i^th element of y1, we define a window of length `nwin` surrounding the
     point y1[i], and another window surrounding y2[i2_match[i]]. We calculate the
@@ -161,7 +167,8 @@ def cython_bin_free_cam_kernel(double[:] y1, double[:] y2, int[:] i2_match, int
     instead we assign a random uniform number from the range spanned by
     (y2_window[rank-1],y2_window[rank+1]). This reduces discreteness effects
     and comes at no loss of precision since the PDF is not known to an accuracy
-    better than 1/nwin.
+    better than 1/nwin. The random number used for y1[i] is the counter-based
+    random number of index i for the input ``seed``.
 
     The arrays named sorted_cdf_values store the y-values in the two windows.
     The arrays correspondence_indx are responsible for the bookkeeping involved in
@@ -276,7 +283,8 @@ def cython_bin_free_cam_kernel(double[:] y1, double[:] y2, int[:] i2_match, int
                 raise Exception("Index {} not found in correspondence_indx2".format(rank1))
             y1_new_indexes[iy1] = iy2 + nhalfwin - index
         else:
-            y1_new_values[iy1] = _get_value_at_rank(sorted_cdf_values2, rank1, nwin, add_subgrid_noise)
+            y1_new_values[iy1] = _get_value_at_rank(sorted_cdf_values2, rank1, nwin, add_subgrid_noise,
+                seed, iy1)
 
         #  Move on to the next value in y1
 
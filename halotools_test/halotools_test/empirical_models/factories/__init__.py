@@ -10,3 +10,5 @@ from .model_factory_template import *
 from .hod_model_factory import *
 from .subhalo_model_factory import *
 from .prebuilt_model_factory import *
+
+from .halo_pair_table import *
@@ -0,0 +1,364 @@
+"""
+Module containing the `~halotools.empirical_models.HaloPairTable` class,
+used to predict the two-point function and pairwise velocity moments of
+HOD-style models without populating mocks.
+
+Pairs of halos are counted once, binned in the primary halo property of both halos
+and in three-dimensional separation, for the three kinds of tracers of an HOD:
+halo centers (centrals), and two independent Monte Carlo realizations of
+one satellite per halo following the NFW phase space distribution (satellites).
+The predictions of a model are then weighted sums of the tabulated counts,
+with weights given by the mean occupations of the model in each halo bin.
+"""
+
+import numpy as np
+
+from ..phase_space_models import NFWPhaseSpace
+from ...mock_observables.pair_counters import marked_npairs_3d
+from ...mock_observables.pairwise_velocities import velocity_marked_npairs_3d
+from ...custom_exceptions import HalotoolsError
+
+
+__all__ = ['HaloPairTable']
+__author__ = ['Andrew Hearin']
+
+_tracer_pairs = (('centers', 'centers'), ('centers', 'satellites'), ('satellites', 'satellites2'))
+_table_names = ('cc', 'cs', 'ss')
+_one_halo_table_names = ('cs_one_halo', 'ss_one_halo')
+
+
+class HaloPairTable(object):
+    r""" Tabulated pair counts and pairwise velocities of host halos,
+    binned in the primary halo property of each halo and in separation.
+
+    For an HOD-style model with mean occupations :math:`\langle N_{\rm c}\rangle_i` and
+    :math:`\langle N_{\rm s}\rangle_i` in halo bin *i*, the number of ordered pairs of
+    galaxies in a separation bin is
+
+    .. math::
+        DD = \sum_{ij} \langle N_{\rm c}\rangle_i \langle N_{\rm c}\rangle_j CC_{ij}
+            + 2\langle N_{\rm c}\rangle_i \langle N_{\rm s}\rangle_j CS_{ij}
+            + \langle N_{\rm s}\rangle_i \langle N_{\rm s}\rangle_j SS_{ij},
+
+    where :math:`CC_{ij}`, :math:`CS_{ij}` and :math:`SS_{ij}` are the tabulated counts
+    of center-center, center-satellite and satellite-satellite pairs.
+    The pairs of galaxies of different halos are counted between the halo centers and
+    two Monte Carlo realizations of one satellite per halo. The pairs of galaxies of the
+    same halo, which enter the sum for *i* = *j*, are tabulated separately by drawing
+    many pairs of points in the NFW profiles of the halos of each bin.
+    This assumes that centrals sit at the halo center, that satellites follow the NFW
+    profile of their host halo with Poisson-distributed numbers, and that the numbers of
+    centrals and satellites of a halo are uncorrelated.
+    The sums of the radial velocity and its square are tabulated in the same way.
+
+    Halos outside the range of ``prim_haloprop_bins`` are assumed to host no galaxies.
+    The accuracy of the predictions is set by the width of the halo bins,
+    since the occupations are averaged over the halos in each bin.
+    """
+
+    def __init__(self, halocat, rbins, prim_haloprop_bins=np.linspace(11, 15.5, 46),
+            prim_haloprop_key='halo_mvir', concentration_key='halo_nfw_conc',
+            num_subbins=10, num_one_halo_samples=int(1e4), seed=None, num_threads=1):
+        r"""
+        Parameters
+        ----------
+        halocat : object
+            Either an instance of `~halotools.sim_manager.CachedHaloCatalog`
+            or `~halotools.sim_manager.UserSuppliedHaloCatalog`.
+            Only host halos, with ``halo_upid`` = -1, are used.
+
+        rbins : array_like
+            Boundaries of the bins of three-dimensional separation
+            in which pairs are counted. The first boundary must be strictly positive.
+            Length units are comoving and assumed to be in Mpc/h.
+
+        prim_haloprop_bins : array_like, optional
+            Boundaries of the bins of :math:`\log_{10}` of the primary halo property.
+            Default is 45 bins of width 0.1 dex between 11 and 15.5.
+
+        prim_haloprop_key : string, optional
+            Column of the halo catalog storing the primary halo property,
+            which must be the halo mass setting the mass definition of the
+            NFW profile of the satellites. Default is ``halo_mvir``.
+            As when populating mocks, the satellites are distributed out to the halo
+            boundary stored in the catalog column of the same mass definition,
+            e.g., ``halo_rvir``.
+
+        concentration_key : string, optional
+            Column of the halo catalog storing the NFW concentration.
+            Default is ``halo_nfw_conc``.
+
+        num_subbins : int, optional
+            Number of sub-bins of each halo bin over which the mean occupations
+            are averaged, weighted by the number of halos in each sub-bin. Default is 10.
+
+        num_one_halo_samples : int, optional
+            Number of pairs of satellites, and of central-satellite pairs, drawn in the halos
+            of each bin to tabulate the pairs of galaxies of the same halo. Default is 1e4.
+
+        seed : int, optional
+            Random number seed of the Monte Carlo realizations of the satellites.
+            Default is None, which will produce stochastic results.
+
+        num_threads : int, optional
+            Number of threads used by the pair counter. Default is 1.
+
+        Examples
+        --------
+        >>> from halotools.sim_manager import FakeSim
+        >>> halocat = FakeSim()
+        >>> rbins = np.logspace(-1, 1, 10)
+        >>> table = HaloPairTable(halocat, rbins, seed=43)
+
+        >>> from halotools.empirical_models import PrebuiltHodModelFactory
+        >>> model = PrebuiltHodModelFactory('zheng07')
+        >>> number_density, xi, vr_mean, vr_disp = table.predict(model)
+        """
+        rbins = np.atleast_1d(rbins).astype(float)
+        if (rbins.ndim != 1) or (len(rbins) < 2) or (rbins[0] <= 0) or np.any(np.diff(rbins) <= 0):
+            msg = ("Input ``rbins`` must be a monotonically increasing array "
+                "of at least two strictly positive values")
+            raise HalotoolsError(msg)
+        self.rbins = rbins
+        self.prim_haloprop_bins = np.atleast_1d(prim_haloprop_bins).astype(float)
+        self.prim_haloprop_key = prim_haloprop_key
+        self.Lbox = np.atleast_1d(halocat.Lbox).astype(float)*np.ones(3)
+
+        halos = halocat.halo_table
+        halos = halos[halos['halo_upid'] == -1]
+        log_prim_haloprop = np.log10(halos[prim_haloprop_key])
+        ibin = np.digitize(log_prim_haloprop, self.prim_haloprop_bins) - 1
+        num_bins = len(self.prim_haloprop_bins) - 1
+        mask = (ibin >= 0) & (ibin < num_bins)
+        halos, ibin, log_prim_haloprop = halos[mask], ibin[mask], log_prim_haloprop[mask]
+
+        # Histogram of the primary halo property within each bin,
+        # used to average the occupations over the halos of the bin
+        subbin_edges = np.concatenate([np.linspace(low, high, num_subbins + 1)[:-1]
+            for low, high in zip(self.prim_haloprop_bins[:-1], self.prim_haloprop_bins[1:])])
+        subbin_edges = np.append(subbin_edges, self.prim_haloprop_bins[-1])
+        self.log_prim_haloprop_subbins = 0.5*(subbin_edges[:-1] + subbin_edges[1:])
+        self.subbin_num_halos = np.histogram(log_prim_haloprop,
+            bins=subbin_edges)[0].reshape(num_bins, num_subbins)
+
+        pos = np.vstack([halos['halo_x'], halos['halo_y'], halos['halo_z']]).T
+        vel = np.vstack([halos['halo_vx'], halos['halo_vy'], halos['halo_vz']]).T
+        mass, conc = np.array(halos[prim_haloprop_key]), np.array(halos[concentration_key])
+        nfw = NFWPhaseSpace(mdef=prim_haloprop_key[len('halo_m'):], redshift=halocat.redshift)
+        try:
+            halo_radius = np.array(halos[nfw.halo_boundary_key])
+        except KeyError:
+            msg = ("halo_boundary_key = %s must be a key of the input halo catalog")
+            raise HalotoolsError(msg % nfw.halo_boundary_key)
+
+        # Host-centric positions and velocity variances of two independent satellites per halo
+        satellites1 = _mc_satellites(nfw, mass, conc, halo_radius, seed)
+        satellites2 = _mc_satellites(nfw, mass, conc, halo_radius,
+            None if seed is None else seed + 1)
+        zeros = np.zeros((len(halos), 1))
+        tracers = {'centers': (np.hstack((pos, vel, zeros)), zeros[:, 0])}
+        for name, (sat_pos, sat_var) in zip(('satellites', 'satellites2'), (satellites1, satellites2)):
+            tracers[name] = (np.hstack((np.mod(pos + sat_pos, self.Lbox), vel, zeros)), sat_var)
+
+        members = [np.flatnonzero(ibin == i) for i in range(num_bins)]
+        self._tabulate(tracers, members, num_threads)
+        self._tabulate_one_halo(nfw, mass, conc, halo_radius, members, satellites1, satellites2,
+            num_one_halo_samples, seed)
+
+    def _tabulate(self, tracers, members, num_threads):
+        """ Counts the pairs of tracers in each pair of halo bins.
+        The center-center and satellite-satellite tables are symmetric,
+        so only the pairs of bins with j >= i are counted for them.
+
+        The tracers move with their host halo, and the internal velocities of the satellites
+        enter through their expectation values: they do not change the mean radial velocity,
+        and add the sum of the velocity variances of the two tracers to its square.
+        """
+        num_bins = len(self.prim_haloprop_bins) - 1
+        num_rbins = len(self.rbins) - 1
+
+        for table_name, (name1, name2) in zip(_table_names, _tracer_pairs):
+            symmetric = table_name != 'cs'
+            # counts, sum of radial velocities and sum of squared radial velocities
+            table = np.zeros((3, num_bins, num_bins, num_rbins))
+            for i in range(num_bins):
+                for j in range(i if symmetric else 0, num_bins):
+                    if (len(members[i]) == 0) or (len(members[j]) == 0):
+                        continue
+                    weights1, variances1 = (x[members[i]] for x in tracers[name1])
+                    weights2, variances2 = (x[members[j]] for x in tracers[name2])
+                    vr_sum, vr2_sum, counts = velocity_marked_npairs_3d(
+                        weights1[:, :3], weights2[:, :3], self.rbins, period=self.Lbox,
+                        weights1=weights1, weights2=weights2, weight_func_id=2,
+                        num_threads=num_threads)
+                    if name1 != 'centers' or name2 != 'centers':
+                        vr2_sum = vr2_sum + marked_npairs_3d(weights1[:, :3], weights2[:, :3],
+                            self.rbins, 2, period=self.Lbox, weights1=variances1,
+                            weights2=variances2, num_threads=num_threads)
+                    table[:, i, j] = np.diff([counts, vr_sum, vr2_sum], axis=1)
+                    if symmetric:
+                        table[:, j, i] = table[:, i, j]
+            setattr(self, table_name, table)
+
+    def _tabulate_one_halo(self, nfw, mass, conc, halo_radius, members, satellites1, satellites2,
+            num_one_halo_samples, seed):
+        """ Replaces the pairs of tracers of the same halo, of which there is only one
+        per halo, by ``num_one_halo_samples`` pairs drawn in the halos of each bin.
+        The one-halo tables store the sums over the halos of each bin.
+        """
+        num_bins = len(self.prim_haloprop_bins) - 1
+        num_rbins = len(self.rbins) - 1
+        self.cs_one_halo = np.zeros((3, num_bins, num_rbins))
+        self.ss_one_halo = np.zeros((3, num_bins, num_rbins))
+        centers = (np.zeros((len(mass), 3)), np.zeros(len(mass)))
+
+        rng = np.random.RandomState(seed)
+        for i, halo_indices in enumerate(members):
+            if len(halo_indices) == 0:
+                continue
+            halo_centers, halo_satellites1, halo_satellites2 = (
+                tuple(x[halo_indices] for x in tracers)
+                for tracers in (centers, satellites1, satellites2))
+            self.cs[:, i, i] -= _one_halo_pairs(self.rbins, halo_centers, halo_satellites1)
+            self.ss[:, i, i] -= _one_halo_pairs(self.rbins, halo_satellites1, halo_satellites2)
+
+            samples = halo_indices[rng.randint(0, len(halo_indices), num_one_halo_samples)]
+            sample_seeds = (None, None) if seed is None else rng.randint(0, 2**31, 2)
+            sample_centers = tuple(x[samples] for x in centers)
+            sample_satellites1 = _mc_satellites(nfw, mass[samples], conc[samples],
+                halo_radius[samples], sample_seeds[0])
+            sample_satellites2 = _mc_satellites(nfw, mass[samples], conc[samples],
+                halo_radius[samples], sample_seeds[1])
+            weight = len(halo_indices)/float(num_one_halo_samples)
+            self.cs_one_halo[:, i] = weight*_one_halo_pairs(self.rbins,
+                sample_centers, sample_satellites1)
+            self.ss_one_halo[:, i] = weight*_one_halo_pairs(self.rbins,
+                sample_satellites1, sample_satellites2)
+
+    def mean_occupations(self, model):
+        r""" Mean occupations of central-like and satellite-like galaxies
+        in each halo bin, averaged over the halos of the bin.
+
+        Parameters
+        ----------
+        model : object
+            Instance of `~halotools.empirical_models.HodModelFactory`.
+            The occupations of gal_types with an upper occupation bound of 1 are placed at the
+            halo centers, all other gal_types are distributed like the satellites.
+
+        Returns
+        -------
+        ncen, nsat : arrays
+            Arrays of length *Nbins*.
+        """
+        prim_haloprop = 10**self.log_prim_haloprop_subbins
+        ncen = np.zeros_like(prim_haloprop)
+        nsat = np.zeros_like(prim_haloprop)
+        for gal_type in model.gal_types:
+            mean_occupation = getattr(model, 'mean_occupation_' + gal_type)(
+                prim_haloprop=prim_haloprop)
+            component = model.model_dictionary[gal_type + '_occupation']
+            if component._upper_occupation_bound == 1:
+                ncen = ncen + mean_occupation
+            else:
+                nsat = nsat + mean_occupation
+
+        num_halos = self.subbin_num_halos.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ncen = np.sum(ncen.reshape(self.subbin_num_halos.shape)*self.subbin_num_halos,
+                axis=1)/num_halos
+            nsat = np.sum(nsat.reshape(self.subbin_num_halos.shape)*self.subbin_num_halos,
+                axis=1)/num_halos
+        return np.nan_to_num(ncen), np.nan_to_num(nsat)
+
+    def predict(self, model):
+        r""" Prediction of the input model for the galaxy number density,
+        two-point function and pairwise radial velocity moments.
+
+        Parameters
+        ----------
+        model : object
+            Instance of `~halotools.empirical_models.HodModelFactory`, with its current
+            ``param_dict``.
+
+        Returns
+        -------
+        number_density : float
+            Number density of galaxies, in units of :math:`(h/{\rm Mpc})^3`.
+
+        xi : array
+            Two-point function in the bins of separation, of length len(rbins)-1.
+
+        mean_radial_velocity : array
+            Mean pairwise radial velocity in the bins of separation, in km/s.
+
+        radial_velocity_dispersion : array
+            Pairwise radial velocity dispersion in the bins of separation, in km/s.
+        """
+        ncen, nsat = self.mean_occupations(model)
+        weights = {'cc': np.outer(ncen, ncen), 'cs': 2*np.outer(ncen, nsat),
+            'ss': np.outer(nsat, nsat)}
+        counts, vr_sum, vr2_sum = (
+            sum(np.einsum('ij,kijr->kr', weights[name], getattr(self, name))
+                for name in _table_names) +
+            np.einsum('i,kir->kr', np.diag(weights['cs']), self.cs_one_halo) +
+            np.einsum('i,kir->kr', np.diag(weights['ss']), self.ss_one_halo))
+
+        volume = np.prod(self.Lbox)
+        num_halos = self.subbin_num_halos.sum(axis=1)
+        num_gals = np.sum(num_halos*(ncen + nsat))
+        shell_volumes = 4./3.*np.pi*np.diff(self.rbins**3)
+        xi = counts/(num_gals**2*shell_volumes/volume) - 1.
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_radial_velocity = vr_sum/counts
+            radial_velocity_dispersion = np.sqrt(np.maximum(
+                vr2_sum/counts - mean_radial_velocity**2, 0.))
+        return num_gals/volume, xi, mean_radial_velocity, radial_velocity_dispersion
+
+    def write(self, fname):
+        r""" Stores the tables in a compressed ``.npz`` file, read back with `HaloPairTable.read`.
+        """
+        np.savez_compressed(fname, rbins=self.rbins, prim_haloprop_bins=self.prim_haloprop_bins,
+            prim_haloprop_key=self.prim_haloprop_key, Lbox=self.Lbox,
+            log_prim_haloprop_subbins=self.log_prim_haloprop_subbins,
+            subbin_num_halos=self.subbin_num_halos,
+            **{name: getattr(self, name) for name in _table_names + _one_halo_table_names})
+
+    @classmethod
+    def read(cls, fname):
+        r""" Loads the tables stored by `HaloPairTable.write`.
+        """
+        table = cls.__new__(cls)
+        with np.load(fname, allow_pickle=False) as stored:
+            for name in stored.files:
+                setattr(table, name, stored[name])
+        table.prim_haloprop_key = str(table.prim_haloprop_key)
+        return table
+
+
+def _mc_satellites(nfw, mass, conc, halo_radius, seed):
+    """ Monte Carlo realization of the host-centric positions of one NFW satellite
+    in each input halo, as a (Nhalos, 3) array, and variance of each component of the
+    satellite velocity, given by the solution to the isotropic Jeans equation.
+    """
+    x, y, z = nfw.mc_halo_centric_pos(conc, halo_radius=halo_radius, seed=seed)
+    pos = np.vstack([x, y, z]).T
+    scaled_radius = np.sqrt(np.sum(pos*pos, axis=1))/halo_radius
+    velocity_dispersion = nfw._vrad_disp_from_lookup(scaled_radius, conc)*nfw.virial_velocity(mass)
+    return pos, velocity_dispersion**2
+
+
+def _one_halo_pairs(rbins, tracers1, tracers2):
+    """ Counts, sum of radial velocities and sum of squared radial velocities of the pairs
+    formed by the n-th points of the two input samples of host-centric
+    (positions, velocity variances), binned in separation.
+    The mean radial velocity of pairs in the same halo vanishes,
+    and its square is the sum of the velocity variances of the two points.
+    """
+    dr = tracers1[0] - tracers2[0]
+    r = np.sqrt(np.sum(dr*dr, axis=1))
+    variances = tracers1[1] + tracers2[1]
+    counts = np.histogram(r, bins=rbins)[0]
+    vr2_sum = np.histogram(r, bins=rbins, weights=variances)[0]
+    return np.array([counts, np.zeros_like(vr2_sum), vr2_sum], dtype=float)
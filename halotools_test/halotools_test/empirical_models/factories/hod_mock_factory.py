@@ -9,13 +9,15 @@ and Halotools models.
 """
 
 import numpy as np
-from copy import copy
+import multiprocessing
+from copy import copy, deepcopy
+from time import time
 from astropy.table import Table
 from astropy.utils.misc import NumpyRNGContext
 
 from .mock_factory_template import MockFactory
 
-from .. import model_helpers
+from .. import model_helpers, model_defaults
 
 from ...sim_manager import sim_defaults
 from ...utils.table_utils import SampleSelector
@@ -210,8 +212,37 @@ class HodMockFactory(MockFactory):
             Random number seed used in the Monte Carlo realization.
             Default is None, which will produce stochastic results.
 
+        num_threads : int, optional
+            Number of processes used to populate the chunks of the halo catalog.
+            If set to 'max', use all available cores. Default is 1.
+            If ``num_threads`` is larger than 1 or ``num_halos_per_chunk`` is passed,
+            the halo catalog is split into chunks of contiguous host halos
+            that are populated independently, see Notes.
+
+        num_halos_per_chunk : int, optional
+            Number of host halos in each chunk of the halo catalog.
+            By default, the halo catalog is split into a few chunks per process,
+            as set in `~halotools.empirical_models.model_defaults`.
+
         Notes
         -----
+        When populating in chunks, every method of the model is called
+        separately on each chunk of halos. The methods drawing their Monte Carlo
+        realization from the random streams of `~halotools.utils.random_stream_uniform`,
+        such as the ``mc_occupation`` methods and the phase space models,
+        receive the index of each halo or galaxy in the whole catalog,
+        so that for a given ``seed`` their realization is the same as when
+        populating the whole halo catalog at once. The other methods receive
+        a seed derived from ``seed`` and the index of the chunk, so that
+        the mock only depends on ``num_halos_per_chunk``, and not on ``num_threads``,
+        if ``num_halos_per_chunk`` is passed. Likewise, models whose methods depend on
+        all the halos passed to them, e.g. through percentiles of a secondary halo property,
+        depend on the chunks. The resulting galaxies are written
+        into a single pre-allocated ``galaxy_table``, ordered in the same way
+        as when populating the whole halo catalog at once. The ``populate_timings``
+        attribute of the mock stores the time spent in each method of the model,
+        summed over all chunks.
+
         Note the difference between the
         `halotools.empirical_models.HodMockFactory.populate` method and the
         closely related method
@@ -305,7 +336,157 @@ class HodMockFactory(MockFactory):
         except:
             self.halo_table = self._orig_halo_table
 
+        try:
+            num_threads = kwargs['num_threads']
+        except KeyError:
+            num_threads = 1
+        if num_threads == 'max':
+            num_threads = multiprocessing.cpu_count()
+
+        try:
+            num_halos_per_chunk = kwargs['num_halos_per_chunk']
+        except KeyError:
+            num_halos_per_chunk = None
+
+        self._populate_kwargs = dict(kwargs, seed=seed)
+        self._populated_param_dict = deepcopy(self.model.param_dict)
+
+        if (num_threads == 1) and (num_halos_per_chunk is None):
+            self._populate_halo_table(seed=seed)
+            self._galaxy_buffer = self.galaxy_table
+        else:
+            self._populate_halo_table_in_chunks(num_threads, num_halos_per_chunk, seed=seed)
+            self._galaxy_buffer = None
+
+        if self.enforce_PBC is True:
+            self._enforce_periodicity(self.galaxy_table)
+
+        if hasattr(self.model, 'galaxy_selection_func'):
+            mask = self.model.galaxy_selection_func(self.galaxy_table)
+            self.galaxy_table = self.galaxy_table[mask]
+
+    def repopulate(self, **changed_params):
+        """
+        Method repopulating host halos with mock galaxies after a change
+        of the parameters of the model, only calling the methods of the model
+        whose parameters have changed since the last call to
+        `populate` or `repopulate`.
+
+        The parameters of a method of the model are the keys of the ``param_dict``
+        of the component model providing the method. Whenever a method of some ``gal_type``
+        has to be called, the galaxies of that ``gal_type`` are rebuilt from their host halos
+        and all methods of that ``gal_type`` are called, whereas the galaxies
+        of the other gal_types are kept. The seed, and all
+        other keyword arguments, of the last call to `populate` are re-used,
+        so that the result is identical to calling `populate` with the new parameters
+        whenever the seed is not None.
+
+        Parameters
+        ------------
+        **changed_params : floats, optional
+            New values of keys of the ``param_dict`` of the model.
+            Changes made directly to the ``param_dict`` of the model
+            are also taken into account.
+
+        Returns
+        --------
+        galaxy_table : `astropy.table.Table`
+            The ``galaxy_table`` of the mock. The table is a view of buffers
+            that are re-used, and grown only when needed, by later calls to `repopulate`,
+            so it is overwritten by the next call.
+
+        Examples
+        ----------
+        >>> from halotools.empirical_models import PrebuiltHodModelFactory
+        >>> from halotools.sim_manager import FakeSim
+        >>> model_instance = PrebuiltHodModelFactory('zheng07')
+        >>> model_instance.populate_mock(FakeSim(), seed=43)
+        >>> galaxy_table = model_instance.mock.repopulate(alpha=1.1)
+
+        Here, only the occupation and phase space methods of satellites were called.
+        """
+        for key, value in changed_params.items():
+            if key not in self.model.param_dict:
+                msg = ("\nThe ``%s`` parameter passed to the repopulate method "
+                    "is not a key of the param_dict of the model.\n")
+                raise HalotoolsError(msg % key)
+            self.model.param_dict[key] = value
+
+        if getattr(self, '_galaxy_buffer', None) is None:
+            self.populate(**self._populate_kwargs)
+            return self.galaxy_table
+
+        method_seeds = self._calling_sequence_seeds(self._populate_kwargs['seed'])
+        changed_keys = self._changed_param_keys()
+        rerun_methods = [method for method in method_seeds
+            if len(self._method_param_keys(method) & changed_keys) > 0]
+        if len(rerun_methods) == 0:
+            return self.galaxy_table
+        elif len(set(rerun_methods) - set(self._remaining_methods_to_call) -
+                set('mc_occupation_' + gal_type for gal_type in self.gal_types)) > 0:
+            # A method called on the halo table changed, so all gal_types are affected
+            self.populate(**self._populate_kwargs)
+            return self.galaxy_table
+
+        self.populate_timings = {}
+        self._populated_param_dict = deepcopy(self.model.param_dict)
+        rerun_gal_types = set(getattr(self.model, method).gal_type for method in rerun_methods)
+        rerun_occupations = [gal_type for gal_type in self.gal_types
+            if 'mc_occupation_' + gal_type in rerun_methods]
+
+        for gal_type in rerun_occupations:
+            self._occupation[gal_type] = self._call_model_method(
+                'mc_occupation_' + gal_type, self.halo_table, method_seeds)
+            self.halo_table['halo_num_' + gal_type][:] = self._occupation[gal_type]
+            self._total_abundance[gal_type] = self._occupation[gal_type].sum()
+
+        old_gal_type_indices = copy(self._gal_type_indices)
+        first_galaxy_index = 0
+        for gal_type in self.gal_types:
+            last_galaxy_index = first_galaxy_index + self._total_abundance[gal_type]
+            self._gal_type_indices[gal_type] = slice(first_galaxy_index, last_galaxy_index)
+            first_galaxy_index = last_galaxy_index
+        self.Ngals = first_galaxy_index
+        self._move_galaxy_buffer_rows(old_gal_type_indices, rerun_gal_types)
+
+        for gal_type in self.gal_types:
+            gal_type_table = self._galaxy_buffer[self._gal_type_indices[gal_type]]
+            if gal_type in rerun_gal_types:
+                self._fill_gal_type_rows(gal_type, gal_type_table)
+                for method in self._remaining_methods_to_call:
+                    if getattr(self.model, method).gal_type == gal_type:
+                        self._call_model_method(method, gal_type_table, method_seeds)
+                if self.enforce_PBC is True:
+                    self._enforce_periodicity(gal_type_table)
+            else:
+                # Only the occupations of the other gal_types inherited from the halos change
+                for other_gal_type in rerun_occupations:
+                    key = 'halo_num_' + other_gal_type
+                    gal_type_table[key][:] = np.repeat(
+                        self.halo_table[key], self._occupation[gal_type], axis=0)
+
+        self.galaxy_table = self._galaxy_buffer[:self.Ngals]
+        if hasattr(self.model, 'galaxy_selection_func'):
+            mask = self.model.galaxy_selection_func(self.galaxy_table)
+            self.galaxy_table = self.galaxy_table[mask]
+        return self.galaxy_table
+
+    def _populate_halo_table(self, seed=None):
+        """ Method populating all halos in ``halo_table`` at once,
+        storing the result in ``galaxy_table``.
+        """
         self.allocate_memory(seed=seed)
+        self._populate_galaxies(seed=seed)
+
+    def _populate_galaxies(self, seed=None, first_galaxy_index=None):
+        """ Method calling the methods of the model on the galaxies of the
+        ``galaxy_table`` allocated by `allocate_memory`. When populating a chunk
+        of the halo catalog, ``first_galaxy_index`` stores, for each gal_type,
+        the index of the first galaxy of the chunk among all galaxies of that gal_type.
+        """
+        method_seeds = self._calling_sequence_seeds(seed)
+        if first_galaxy_index is None:
+            first_galaxy_index = {gal_type: 0 for gal_type in self.gal_types}
 
         # Loop over all gal_types in the model
         for gal_type in self.gal_types:
@@ -335,41 +516,228 @@ class HodMockFactory(MockFactory):
         self.galaxy_table['vz'] = self.galaxy_table['halo_vz']
 
         for method in self._remaining_methods_to_call:
-            func = getattr(self.model, method)
-            try:
-                d = {key: getattr(self, key) for key in func.additional_kwargs}
-            except AttributeError:
-                d = {}
-            gal_type_slice = self._gal_type_indices[func.gal_type]
-            if seed is not None:
-                seed += 1
-            func(table=self.galaxy_table[gal_type_slice], seed=seed, **d)
+            gal_type = getattr(self.model, method).gal_type
+            self._call_model_method(method, self.galaxy_table[self._gal_type_indices[gal_type]],
+                method_seeds, first_index=first_galaxy_index[gal_type])
+
+    def _populate_halo_table_in_chunks(self, num_threads, num_halos_per_chunk, seed=None):
+        """ Method populating the halos in ``halo_table`` in chunks of
+        ``num_halos_per_chunk`` contiguous halos, using ``num_threads`` processes.
+        The occupations of all chunks are drawn first, so that the galaxies of each chunk
+        know their index among all galaxies of their gal_type. The galaxies of each chunk
+        are then written into a pre-allocated ``galaxy_table``,
+        with the galaxies of each ``gal_type`` stored in the order of their host halos.
+        """
+        if seed is None:
+            seed = np.random.randint(0, 2**31)
+
+        num_halos = len(self.halo_table)
+        if num_halos_per_chunk is None:
+            num_chunks = model_defaults.default_num_chunks_per_thread*num_threads
+            num_halos_per_chunk = max(int(np.ceil(num_halos/float(num_chunks))),
+                model_defaults.default_min_num_halos_per_chunk)
+        first_halo_indices = np.arange(0, max(num_halos, 1), num_halos_per_chunk)
+        chunks = [dict(first=first, last=min(first + num_halos_per_chunk, num_halos),
+                seed=seed, chunk_seed=_chunk_seed(seed, ichunk))
+            for ichunk, first in enumerate(first_halo_indices)]
+
+        occupation_results = self._map_chunks(_populate_chunk_occupations, chunks, num_threads)
+
+        # Columns assigned to the halo_table during the population of the chunks
+        for key in occupation_results[0]['halo_columns']:
+            self.halo_table[key] = np.concatenate(
+                [result['halo_columns'][key] for result in occupation_results])
+        self.additional_haloprops = occupation_results[0]['additional_haloprops']
+        self._remaining_methods_to_call = occupation_results[0]['remaining_methods_to_call']
+        self._set_gal_type_indices()
+
+        first_galaxy_index = {gal_type: 0 for gal_type in self.gal_types}
+        for chunk, result in zip(chunks, occupation_results):
+            chunk['first_galaxy_index'] = copy(first_galaxy_index)
+            for gal_type in self.gal_types:
+                first_galaxy_index[gal_type] += result['total_abundance'][gal_type]
+
+        results = self._map_chunks(_populate_chunk_galaxies, chunks, num_threads)
+
+        self.populate_timings = {}
+        for result in occupation_results + results:
+            for method, seconds in result['populate_timings'].items():
+                self.populate_timings[method] = self.populate_timings.get(method, 0.) + seconds
+
+        # Allocate the galaxy_table and copy the galaxies of each chunk into it
+        self.galaxy_table = Table()
+        for key in results[0]['galaxy_table'].keys():
+            column = results[0]['galaxy_table'][key]
+            self.galaxy_table[key] = np.zeros((self.Ngals, ) + column.shape[1:],
+                dtype=column.dtype)
 
-        if self.enforce_PBC is True:
-            self.galaxy_table['x'], self.galaxy_table['vx'] = (
-                model_helpers.enforce_periodicity_of_box(
-                    self.galaxy_table['x'], self.Lbox[0],
-                    velocity=self.galaxy_table['vx'],
-                    check_multiple_box_lengths=self._testing_mode)
-                )
+        for gal_type in self.gal_types:
+            first_galaxy_index = self._gal_type_indices[gal_type].start
+            for result in results:
+                chunk_slice = result['gal_type_indices'][gal_type]
+                last_galaxy_index = first_galaxy_index + chunk_slice.stop - chunk_slice.start
+                for key in self.galaxy_table.keys():
+                    self.galaxy_table[key][first_galaxy_index:last_galaxy_index] = (
+                        result['galaxy_table'][key][chunk_slice])
+                first_galaxy_index = last_galaxy_index
+
+    def _map_chunks(self, func, chunks, num_threads):
+        """ Apply ``func`` to each of the ``chunks`` of the mock, using ``num_threads`` processes.
+        """
+        if num_threads > 1:
+            pool = multiprocessing.Pool(num_threads,
+                initializer=_set_chunk_mock, initargs=(self, ))
+            results = pool.map(func, chunks)
+            pool.close()
+        else:
+            _set_chunk_mock(self)
+            results = list(map(func, chunks))
+        _set_chunk_mock(None)
+        return results
+
+    def _set_gal_type_indices(self):
+        """ Set up ``_occupation`` and ``_gal_type_indices`` from the
+        ``halo_num_`` columns of the ``halo_table``.
+        """
+        self._occupation = {}
+        self._total_abundance = {}
+        self._gal_type_indices = {}
+        first_galaxy_index = 0
+        for gal_type in self.gal_types:
+            self._occupation[gal_type] = self.halo_table['halo_num_'+gal_type]
+            self._total_abundance[gal_type] = self._occupation[gal_type].sum()
+            last_galaxy_index = first_galaxy_index + self._total_abundance[gal_type]
+            self._gal_type_indices[gal_type] = slice(first_galaxy_index, last_galaxy_index)
+            first_galaxy_index = last_galaxy_index
+        self.Ngals = first_galaxy_index
 
-            self.galaxy_table['y'], self.galaxy_table['vy'] = (
-                model_helpers.enforce_periodicity_of_box(
-                    self.galaxy_table['y'], self.Lbox[1],
-                    velocity=self.galaxy_table['vy'],
-                    check_multiple_box_lengths=self._testing_mode)
-                )
+    def _call_model_method(self, method, table, method_seeds, first_index=0):
+        """ Call ``method`` of the model on ``table`` with its seed in ``method_seeds``,
+        and return the result.
 
-            self.galaxy_table['z'], self.galaxy_table['vz'] = (
+        When populating a chunk of the halo catalog, the methods drawing their
+        Monte Carlo realization from the random streams also receive the index of the rows
+        of ``table`` in the whole catalog, starting at ``first_index``, as ``random_stream_index``,
+        so that the result does not depend on the chunks. The other methods receive
+        the seed of the chunk instead.
+        """
+        func = getattr(self.model, method)
+        try:
+            d = {key: getattr(self, key) for key in func.additional_kwargs}
+        except AttributeError:
+            d = {}
+
+        chunk_method_seeds = getattr(self, '_chunk_method_seeds', None)
+        if chunk_method_seeds is None:
+            d['seed'] = method_seeds[method]
+        elif getattr(func, 'uses_random_streams', False):
+            d['seed'] = method_seeds[method]
+            d['random_stream_index'] = first_index + np.arange(len(table))
+        else:
+            d['seed'] = chunk_method_seeds[method]
+
+        start = time()
+        result = func(table=table, **d)
+        self._add_populate_timing(method, start)
+        return result
+
+    def _calling_sequence_seeds(self, seed):
+        """ Seeds passed by `populate` to each method of the calling sequence of the model.
+        The methods called on the halo table come first, followed by the
+        ``mc_occupation`` methods in the order of ``gal_types``, and by the
+        remaining methods, each method receiving a seed larger by one than the previous one.
+        """
+        calling_sequence = []
+        for func_name in self.model._mock_generation_calling_sequence:
+            if 'mc_occupation' in func_name:
+                break
+            calling_sequence.append(func_name)
+        calling_sequence.extend('mc_occupation_' + gal_type for gal_type in self.gal_types)
+        calling_sequence.extend(func_name for func_name in self.model._mock_generation_calling_sequence
+            if func_name not in calling_sequence)
+
+        if seed is None:
+            return {func_name: None for func_name in calling_sequence}
+        else:
+            return {func_name: seed + i + 1 for i, func_name in enumerate(calling_sequence)}
+
+    def _changed_param_keys(self):
+        """ Keys of the ``param_dict`` of the model whose values changed since the mock was populated.
+        """
+        changed_keys = set()
+        for key, value in self.model.param_dict.items():
+            try:
+                unchanged = np.all(self._populated_param_dict[key] == value)
+            except KeyError:
+                unchanged = False
+            if not unchanged:
+                changed_keys.add(key)
+        return changed_keys
+
+    def _method_param_keys(self, method):
+        """ Keys of the ``param_dict`` of the component model providing ``method``.
+        """
+        func = getattr(self.model, method)
+        for component_model in self.model.model_dictionary.values():
+            if ((component_model.gal_type == getattr(func, 'gal_type', None)) and
+                    (component_model.feature_name == getattr(func, 'feature_name', None))):
+                return set(getattr(component_model, 'param_dict', {}).keys())
+        return set(self.model.param_dict.keys())
+
+    def _move_galaxy_buffer_rows(self, old_gal_type_indices, rerun_gal_types):
+        """ Move the galaxies of the gal_types that are not re-populated from
+        ``old_gal_type_indices`` to ``_gal_type_indices``, growing the
+        buffer of the ``galaxy_table`` if needed.
+        """
+        old_buffer = self._galaxy_buffer
+        if self.Ngals > len(old_buffer):
+            capacity = int(1.2*self.Ngals)
+            self._galaxy_buffer = Table()
+            for key in old_buffer.keys():
+                self._galaxy_buffer[key] = np.zeros((capacity, ) + old_buffer[key].shape[1:],
+                    dtype=old_buffer[key].dtype)
+
+        kept_rows = {}
+        for gal_type in self.gal_types:
+            old_slice, new_slice = old_gal_type_indices[gal_type], self._gal_type_indices[gal_type]
+            if (gal_type not in rerun_gal_types) and (
+                    (old_slice != new_slice) or (self._galaxy_buffer is not old_buffer)):
+                kept_rows[gal_type] = {key: np.copy(old_buffer[key][old_slice])
+                    for key in old_buffer.keys()}
+        for gal_type, columns in kept_rows.items():
+            for key, column in columns.items():
+                self._galaxy_buffer[key][self._gal_type_indices[gal_type]] = column
+
+    def _fill_gal_type_rows(self, gal_type, table):
+        """ Reset the ``table`` of ``gal_type`` galaxies to the properties of their host halos.
+        """
+        table['gal_type'][:] = gal_type
+        for halocatkey in self.additional_haloprops:
+            table[halocatkey][:] = np.repeat(
+                self.halo_table[halocatkey], self._occupation[gal_type], axis=0)
+        for key in table.keys():
+            if (key not in self.additional_haloprops) and (key != 'gal_type'):
+                table[key][:] = 0
+        for key in ('x', 'y', 'z', 'vx', 'vy', 'vz'):
+            table[key][:] = table['halo_' + key]
+
+    def _enforce_periodicity(self, table):
+        """ Re-map in place the galaxies of the ``table`` whose positions
+        spilled over the edge of the periodic box.
+        """
+        for ipos, pos_key in enumerate(('x', 'y', 'z')):
+            vel_key = 'v' + pos_key
+            table[pos_key][:], table[vel_key][:] = (
                 model_helpers.enforce_periodicity_of_box(
-                    self.galaxy_table['z'], self.Lbox[2],
-                    velocity=self.galaxy_table['vz'],
+                    table[pos_key], self.Lbox[ipos],
+                    velocity=table[vel_key],
                     check_multiple_box_lengths=self._testing_mode)
                 )
 
-        if hasattr(self.model, 'galaxy_selection_func'):
-            mask = self.model.galaxy_selection_func(self.galaxy_table)
-            self.galaxy_table = self.galaxy_table[mask]
+    def _add_populate_timing(self, method, start):
+        """ Add the time elapsed since ``start`` to the ``populate_timings`` of ``method``.
+        """
+        self.populate_timings[method] = self.populate_timings.get(method, 0.) + time() - start
 
     def allocate_memory(self, seed=None):
         """ Method allocates the memory for all the numpy arrays
@@ -382,7 +750,16 @@ class HodMockFactory(MockFactory):
         """
 
         self.galaxy_table = Table()
-
+        self.populate_timings = {}
+        self._populate_occupations(seed=seed)
+        self._allocate_galaxy_table()
+
+    def _populate_occupations(self, seed=None, first_halo_index=0):
+        """ Method calling the methods of the model on the ``halo_table``, including the
+        ``mc_occupation`` methods, and setting up ``_occupation`` and ``_gal_type_indices``.
+        When populating a chunk of the halo catalog, ``first_halo_index`` is the index
+        of the first halo of the chunk in the whole catalog.
+        """
         # We will keep track of the calling sequence with a list called _remaining_methods_to_call
         # Each time a function in this list is called, we will remove that function from the list
         # Mock generation will be complete when _remaining_methods_to_call is exhausted
@@ -391,6 +768,7 @@ class HodMockFactory(MockFactory):
         # Call all composite model methods that should be called prior to mc_occupation
         # All such function calls must be applied to the table, since we do not yet know
         # how much memory we need for the mock galaxy_table
+        method_seeds = self._calling_sequence_seeds(seed)
         galprops_assigned_to_halo_table = []
         for func_name in self.model._mock_generation_calling_sequence:
             if 'mc_occupation' in func_name:
@@ -398,13 +776,8 @@ class HodMockFactory(MockFactory):
                 break
             else:
                 func = getattr(self.model, func_name)
-                try:
-                    d = {key: getattr(self, key) for key in func.additional_kwargs}
-                except AttributeError:
-                    d = {}
-                if seed is not None:
-                    seed += 1
-                func(table=self.halo_table, seed=seed, **d)
+                self._call_model_method(func_name, self.halo_table, method_seeds,
+                    first_index=first_halo_index)
                 galprops_assigned_to_halo_table_by_func = func._galprop_dtypes_to_allocate.names
                 galprops_assigned_to_halo_table.extend(galprops_assigned_to_halo_table_by_func)
                 self._remaining_methods_to_call.remove(func_name)
@@ -416,6 +789,8 @@ class HodMockFactory(MockFactory):
         # then all we need to do is append to this list
         galprops_assigned_to_halo_table = list(set(
             galprops_assigned_to_halo_table))
+        self._galprops_assigned_to_halo_table = (galprops_assigned_to_halo_table +
+            ['halo_num_'+gal_type for gal_type in self.gal_types])
         self.additional_haloprops.extend(galprops_assigned_to_halo_table)
         self.additional_haloprops = list(set(self.additional_haloprops))
 
@@ -429,13 +804,10 @@ class HodMockFactory(MockFactory):
         first_galaxy_index = 0
         for gal_type in self.gal_types:
             occupation_func_name = 'mc_occupation_'+gal_type
-            occupation_func = getattr(self.model, occupation_func_name)
             # Call the component model to get a Monte Carlo
             # realization of the abundance of gal_type galaxies
-            if seed is not None:
-                seed += 1
-
-            self._occupation[gal_type] = occupation_func(table=self.halo_table, seed=seed)
+            self._occupation[gal_type] = self._call_model_method(occupation_func_name,
+                self.halo_table, method_seeds, first_index=first_halo_index)
             self.halo_table['halo_num_'+gal_type][:] = self._occupation[gal_type]
 
             # Now use the above result to set up the indexing scheme
@@ -454,6 +826,9 @@ class HodMockFactory(MockFactory):
 
         self.Ngals = np.sum(list(self._total_abundance.values()))
 
+    def _allocate_galaxy_table(self):
+        """ Method allocating the columns of the ``galaxy_table`` for the ``Ngals`` galaxies.
+        """
         # Allocate memory for all additional halo properties,
         # including profile parameters of the halos such as 'conc_NFWmodel'
         for halocatkey in self.additional_haloprops:
@@ -505,3 +880,67 @@ class HodMockFactory(MockFactory):
             ngals = ngals + np.sum(occupation_func(table=halo_table, seed=seed))
 
         return ngals
+
+
+_chunk_mock = None
+
+
+def _set_chunk_mock(mock):
+    """ Bind the mock whose halos are populated by `_populate_chunk`
+    to the module, so that the processes of the pool inherit it.
+    """
+    global _chunk_mock
+    _chunk_mock = mock
+
+
+def _chunk_seed(seed, ichunk):
+    """ Seed of chunk ``ichunk``. The seed is smaller than 2**31 so that
+    it remains a valid Numpy seed after the increments made in `HodMockFactory.populate`.
+    """
+    state = np.random.SeedSequence([seed, ichunk]).generate_state(1)
+    return int(state[0] >> 1)
+
+
+def _chunk_of_mock(chunk):
+    """ Copy of the mock restricted to the host halos ``first`` to ``last``.
+    The methods of the model that do not draw from the random streams
+    are called with seeds derived from ``chunk_seed``.
+    """
+    mock = copy(_chunk_mock)
+    mock.halo_table = _chunk_mock.halo_table[chunk['first']:chunk['last']].copy()
+    mock.additional_haloprops = list(_chunk_mock.additional_haloprops)
+    mock._chunk_method_seeds = mock._calling_sequence_seeds(chunk['chunk_seed'])
+    mock.populate_timings = {}
+    return mock
+
+
+def _populate_chunk_occupations(chunk):
+    """ Call the methods of the model on the halos of the chunk, including the ``mc_occupation`` methods.
+    """
+    mock = _chunk_of_mock(chunk)
+    mock._populate_occupations(seed=chunk['seed'], first_halo_index=chunk['first'])
+
+    return {
+        'halo_columns': {key: np.array(mock.halo_table[key])
+            for key in mock._galprops_assigned_to_halo_table},
+        'total_abundance': mock._total_abundance,
+        'additional_haloprops': mock.additional_haloprops,
+        'remaining_methods_to_call': mock._remaining_methods_to_call,
+        'populate_timings': mock.populate_timings}
+
+
+def _populate_chunk_galaxies(chunk):
+    """ Call the methods of the model on the galaxies of the chunk,
+    whose occupations are already stored in the ``halo_table``.
+    """
+    mock = _chunk_of_mock(chunk)
+    mock._remaining_methods_to_call = list(_chunk_mock._remaining_methods_to_call)
+    mock._set_gal_type_indices()
+    mock.galaxy_table = Table()
+    mock._allocate_galaxy_table()
+    mock._populate_galaxies(seed=chunk['seed'], first_galaxy_index=chunk['first_galaxy_index'])
+
+    return {
+        'galaxy_table': mock.galaxy_table,
+        'gal_type_indices': mock._gal_type_indices,
+        'populate_timings': mock.populate_timings}
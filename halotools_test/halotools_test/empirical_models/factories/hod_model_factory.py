@@ -613,6 +613,8 @@ class HodModelFactory(ModelFactory):
                     '_galprop_dtypes_to_allocate', component_model_galprop_dtype)
                 setattr(getattr(self, new_method_name), 'gal_type', gal_type)
                 setattr(getattr(self, new_method_name), 'feature_name', feature_name)
+                setattr(getattr(self, new_method_name), 'uses_random_streams',
+                    methodname in getattr(component_model, '_methods_using_random_streams', []))
 
                 docstring = getattr(component_model, methodname).__doc__
                 getattr(self, new_method_name).__doc__ = docstring
@@ -682,14 +684,21 @@ class HodModelFactory(ModelFactory):
         """
         return ModelFactory.update_param_dict_decorator(self, component_model, func_name)
 
-    def build_lookup_tables(self):
+    def build_lookup_tables(self, **kwargs):
         """ Method to compute and load lookup tables for each of
         the phase space component models.
+
+        Parameters
+        ----------
+        **kwargs : optional
+            Keyword arguments such as ``num_threads`` or ``use_cache`` passed on
+            to the ``build_lookup_tables`` method of each component model,
+            e.g., `~halotools.empirical_models.NFWPhaseSpace.build_lookup_tables`.
         """
 
         for component_model in list(self.model_dictionary.values()):
             if hasattr(component_model, 'build_lookup_tables'):
-                component_model.build_lookup_tables()
+                component_model.build_lookup_tables(**kwargs)
 
     def build_init_param_dict(self):
         """ Create the ``param_dict`` attribute of the instance. The ``param_dict`` is a dictionary storing
@@ -151,6 +151,16 @@ class ModelFactory(object):
             Random number seed used in the Monte Carlo realization.
             Default is None, which will produce stochastic results.
 
+        num_threads : int, optional
+            Number of processes used to populate the halo catalog in chunks.
+            Default is 1. See `~halotools.empirical_models.HodMockFactory.populate`.
+            Currently only supported for instances of `~halotools.empirical_models.HodModelFactory`.
+
+        num_halos_per_chunk : int, optional
+            Number of host halos in each chunk of the halo catalog.
+            See `~halotools.empirical_models.HodMockFactory.populate`.
+            Currently only supported for instances of `~halotools.empirical_models.HodModelFactory`.
+
         Notes
         -----
         Note the difference between the
@@ -230,7 +240,8 @@ class ModelFactory(object):
             pass
         self.mock = self.mock_factory(**mock_factory_init_args)
 
-        additional_potential_kwargs = ('masking_function', '_testing_mode', 'enforce_PBC', 'seed')
+        additional_potential_kwargs = ('masking_function', '_testing_mode', 'enforce_PBC', 'seed',
+            'num_threads', 'num_halos_per_chunk')
         mockpop_keys = set(additional_potential_kwargs) & set(kwargs)
         mockpop_kwargs = {key: kwargs[key] for key in mockpop_keys}
         self.mock.populate(**mockpop_kwargs)
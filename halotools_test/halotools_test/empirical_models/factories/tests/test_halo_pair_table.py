@@ -0,0 +1,113 @@
+"""
+"""
+from __future__ import (absolute_import, division, print_function)
+
+import numpy as np
+import pytest
+
+from ..halo_pair_table import HaloPairTable
+from ..prebuilt_model_factory import PrebuiltHodModelFactory
+
+from ....mock_observables import (marked_npairs_3d, tpcf,
+    mean_radial_velocity_vs_r, radial_pvd_vs_r)
+from ....sim_manager import FakeSim
+from ....custom_exceptions import HalotoolsError
+
+__all__ = ('test_halo_pair_table_centrals', )
+
+fixed_seed = 43
+
+
+def test_halo_pair_table_centrals():
+    """ Without satellites, the predicted pairs are the pairs of halos
+    weighted by their mean central occupations.
+    """
+    halocat = FakeSim()
+    rbins = np.logspace(-0.5, 1.2, 6)
+    table = HaloPairTable(halocat, rbins, prim_haloprop_bins=np.linspace(10.5, 16.5, 61),
+        num_one_halo_samples=1000, seed=fixed_seed)
+
+    model = PrebuiltHodModelFactory('zheng07')
+    model.param_dict['logM1'] = 20.
+    model.param_dict['logM0'] = 20.
+    number_density, xi, vr_mean, vr_disp = table.predict(model)
+
+    halos = halocat.halo_table[halocat.halo_table['halo_upid'] == -1]
+    ncen = model.mean_occupation_centrals(prim_haloprop=halos['halo_mvir'])
+    volume = np.prod(halocat.Lbox)
+    assert np.allclose(number_density, ncen.sum()/volume, rtol=0.01)
+
+    pos = np.vstack([halos['halo_x'], halos['halo_y'], halos['halo_z']]).T
+    counts = np.diff(marked_npairs_3d(pos, pos, rbins, 1, period=halocat.Lbox,
+        weights1=ncen, weights2=ncen))
+    expected_xi = counts/(ncen.sum()**2*4./3.*np.pi*np.diff(rbins**3)/volume) - 1.
+    assert np.allclose(xi, expected_xi, rtol=0.02)
+    assert np.all(np.isfinite(vr_mean[counts > 0]))
+    assert np.all(vr_disp[counts > 0] >= 0)
+
+
+def test_halo_pair_table_satellites():
+    """ The prediction for a model with satellites agrees with the mean
+    two-point function and pairwise radial velocity moments of mocks
+    populated with the same model.
+
+    The halos of FakeSim have no coherent infall, so the mean radial velocity
+    is only required to agree within 4 sigma of the scatter of the mean of the mocks.
+    The radial velocity dispersion agrees to about 1%.
+    """
+    halocat = FakeSim()
+    rbins = np.logspace(-1, 0.5, 5)
+    table = HaloPairTable(halocat, rbins, prim_haloprop_bins=np.linspace(10.5, 16.5, 61),
+        num_one_halo_samples=2000, seed=fixed_seed)
+
+    model = PrebuiltHodModelFactory('zheng07')
+    number_density, xi, vr_mean, vr_disp = table.predict(model)
+
+    num_mocks = 10
+    mock_number_density = np.zeros(num_mocks)
+    mock_xi, mock_vr_mean, mock_vr_disp = (np.zeros((num_mocks, len(rbins)-1)) for __ in range(3))
+    for i in range(num_mocks):
+        model.populate_mock(halocat, seed=fixed_seed+i)
+        gals = model.mock.galaxy_table
+        pos = np.vstack([gals['x'], gals['y'], gals['z']]).T
+        vel = np.vstack([gals['vx'], gals['vy'], gals['vz']]).T
+        mock_number_density[i] = len(gals)/np.prod(halocat.Lbox)
+        mock_xi[i] = tpcf(pos, rbins, period=halocat.Lbox)
+        mock_vr_mean[i] = mean_radial_velocity_vs_r(pos, vel,
+            rbins_absolute=rbins, period=halocat.Lbox)
+        mock_vr_disp[i] = radial_pvd_vs_r(pos, vel,
+            rbins_absolute=rbins, period=halocat.Lbox)
+
+    assert np.allclose(number_density, mock_number_density.mean(), rtol=0.05)
+    assert np.allclose(xi, mock_xi.mean(axis=0), rtol=0.1)
+
+    vr_mean_err = mock_vr_mean.std(axis=0)/np.sqrt(num_mocks)
+    assert np.all(np.abs(vr_mean - mock_vr_mean.mean(axis=0)) < 4*vr_mean_err)
+    assert np.allclose(vr_disp, mock_vr_disp.mean(axis=0), rtol=0.02)
+
+
+def test_halo_pair_table_io(tmpdir):
+    halocat = FakeSim()
+    rbins = np.logspace(-1, 1, 5)
+    table = HaloPairTable(halocat, rbins, prim_haloprop_bins=np.linspace(10.5, 16.5, 13),
+        num_one_halo_samples=1000, seed=fixed_seed)
+    model = PrebuiltHodModelFactory('zheng07')
+
+    fname = str(tmpdir.join('halo_pair_table.npz'))
+    table.write(fname)
+    table2 = HaloPairTable.read(fname)
+    assert table2.prim_haloprop_key == 'halo_mvir'
+    for result, result2 in zip(table.predict(model), table2.predict(model)):
+        assert np.allclose(result, result2, equal_nan=True)
+
+    # the occupations, not the pair counts, change with the model parameters
+    model.param_dict['logM1'] -= 0.5
+    assert table.predict(model)[0] > table2.predict(PrebuiltHodModelFactory('zheng07'))[0]
+
+
+def test_halo_pair_table_bad_rbins():
+    halocat = FakeSim()
+    with pytest.raises(HalotoolsError) as err:
+        HaloPairTable(halocat, np.linspace(0, 10, 5))
+    substr = "strictly positive"
+    assert substr in err.value.args[0]
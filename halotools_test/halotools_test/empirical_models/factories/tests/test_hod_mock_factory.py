@@ -288,3 +288,63 @@ def test_one_two_halo_decomposition_on_mock():
     xi_1h, xi_2h = tpcf_one_two_halo_decomp(pos, halo_hostid, rbins,
         period=model.mock.Lbox, num_threads='max')
     assert xi_1h[-1] == -1
+
+
+def test_chunked_mock_making():
+    """ Test ensuring that populating the halos in chunks is deterministic
+    for a given seed, regardless of the number of processes and of the chunks,
+    and gives the same result as populating all halos at once.
+    """
+    model = PrebuiltHodModelFactory('zheng07', threshold=-21)
+    halocat = FakeSim(seed=fixed_seed)
+    model.populate_mock(halocat, seed=fixed_seed, num_halos_per_chunk=300)
+    h1 = deepcopy(model.mock.galaxy_table)
+    occupations = deepcopy(model.mock.halo_table['halo_num_satellites'])
+    assert set(model.mock.populate_timings) == set(model._mock_generation_calling_sequence)
+
+    for kwargs in (dict(num_halos_per_chunk=300, num_threads=3),
+            dict(num_halos_per_chunk=1000, num_threads=2), dict()):
+        model.mock.populate(seed=fixed_seed, **kwargs)
+        h2 = model.mock.galaxy_table
+
+        assert len(h1) == len(h2)
+        for key in h1.keys():
+            assert np.all(h1[key] == h2[key])
+
+    satellites = h1[h1['gal_type'] == 'satellites']
+    assert len(satellites) == occupations.sum()
+    assert np.all(np.diff(np.flatnonzero(h1['gal_type'] == 'satellites')) == 1)
+    assert np.all(np.repeat(model.mock.halo_table['halo_id'], occupations) == satellites['halo_id'])
+
+
+def test_repopulate():
+    """ Test ensuring that repopulating the mock after a change of parameters
+    gives the same galaxies as populating the mock from scratch, while only
+    calling the methods of the gal_type whose parameters changed.
+    """
+    model = PrebuiltHodModelFactory('zheng07', threshold=-21)
+    halocat = FakeSim(seed=fixed_seed)
+    model.populate_mock(halocat, seed=fixed_seed)
+
+    for changed_params in ({'alpha': 1.3}, {'logMmin': 12.2}, {'alpha': 0.9, 'logM1': 13.2}):
+        h1 = deepcopy(model.mock.repopulate(**changed_params))
+        changed_gal_types = set(key[len('mc_occupation_'):]
+            for key in model.mock.populate_timings if key.startswith('mc_occupation_'))
+        model.mock.populate(seed=fixed_seed)
+        h2 = model.mock.galaxy_table
+
+        assert len(h1) == len(h2)
+        for key in h1.keys():
+            assert np.all(h1[key] == h2[key])
+        if 'logMmin' not in changed_params:
+            assert changed_gal_types == set(['satellites'])
+
+    with pytest.raises(HalotoolsError) as err:
+        model.mock.repopulate(not_a_param=0)
+    substr = "is not a key of the param_dict of the model"
+    assert substr in err.value.args[0]
+
+    model.mock.populate(seed=fixed_seed)
+    buffer_x = model.mock.galaxy_table['x']
+    model.mock.repopulate(alpha=0.5)
+    assert np.shares_memory(model.mock.galaxy_table['x'], buffer_x)
@@ -98,6 +98,12 @@ conc_mass_model = 'direct_from_halo_catalog'
 concentration_key = 'halo_nfw_conc'
 
 
+# When HodMockFactory.populate is run in chunked mode without num_halos_per_chunk,
+# the halo catalog is split into default_num_chunks_per_thread chunks per process,
+# each with at least default_min_num_halos_per_chunk host halos.
+default_num_chunks_per_thread = 4
+default_min_num_halos_per_chunk = int(1e4)
+
 default_rbins = np.logspace(-1, 1.25, 15)
 default_nptcls = 1e5
 
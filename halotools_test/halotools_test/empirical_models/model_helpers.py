@@ -5,14 +5,17 @@ used by many of the Halotools models.
 
 import numpy as np
 from scipy.interpolate import InterpolatedUnivariateSpline as spline
+from scipy.interpolate import PPoly
 from scipy.special import gammaincc, gamma, expi
 
 from ..utils.array_utils import custom_len
+from ..utils.engines import cython_spline_table_kernel
 from ..custom_exceptions import HalotoolsError
 
 
 __all__ = ('solve_for_polynomial_coefficients', 'polynomial_from_table',
             'enforce_periodicity_of_box', 'custom_spline', 'create_composite_dtype',
+            'spline_table_coefficients', 'spline_table_functions', 'call_spline_table',
             'bind_default_kwarg_mixin_safe', 'custom_incomplete_gamma')
 
 __author__ = ['Andrew Hearin', 'Surhud More', 'Johannes Ulf Lange']
@@ -268,6 +271,126 @@ def call_func_table(func_table, abscissa, func_indices):
     return out
 
 
+def spline_table_coefficients(func_table):
+    r""" Stacks the piecewise-polynomial coefficients of an array of splines
+    into arrays that can be evaluated in a single pass by `call_spline_table`.
+
+    Parameters
+    ----------
+    func_table : array_like
+        Length k array of spline objects returned by `custom_spline`
+        with a degree of at least 1. All splines must have the same number of knots.
+
+    Returns
+    -------
+    spline_table : tuple
+        Tuple ``(breakpoints, coefficients)`` of arrays of shape (k, n_breaks) and
+        (k, n_breaks-1, 4). On the interval ``breakpoints[f, j] <= x < breakpoints[f, j+1]``,
+        spline ``f`` is the cubic polynomial in ``x - breakpoints[f, j]``
+        whose coefficients are ``coefficients[f, j, :]``, highest order first.
+
+    Examples
+    --------
+    >>> x = np.linspace(0, 1, 10)
+    >>> func_table = [custom_spline(x, a*x**2, k=3) for a in (1, 2, 3)]
+    >>> spline_table = spline_table_coefficients(func_table)
+    >>> result = call_spline_table(spline_table, [0.5, 0.5], [0, 2])
+    """
+    func_table = np.atleast_1d(func_table)
+    shape_error_msg = "Input ``func_table must be one-dimensional, but has shape = {0}"
+    assert len(np.shape(func_table)) == 1, shape_error_msg.format(func_table.shape)
+
+    max_spline_degree = 3
+    breakpoints, coefficients = [], []
+    for f in func_table:
+        try:
+            t, c, k = f._eval_args
+        except AttributeError:
+            raise HalotoolsError("Each element of ``func_table`` must be a spline object "
+                "returned by ``custom_spline`` with a degree of at least 1")
+        if k > max_spline_degree:
+            raise HalotoolsError("Spline degree must be at most {0}".format(max_spline_degree))
+        #  Drop the repeated boundary knots, which define zero-length intervals
+        ppoly = PPoly.from_spline((t, c, k))
+        breakpoints.append(t[k:len(t)-k])
+        c = ppoly.c[:, k:len(t)-k-1].T
+        coefficients.append(np.pad(c, ((0, 0), (max_spline_degree-k, 0)), mode='constant'))
+
+    if len(set(len(b) for b in breakpoints)) > 1:
+        raise HalotoolsError("All splines of ``func_table`` must have the same number of knots")
+    return np.array(breakpoints, dtype='f8'), np.array(coefficients, dtype='f8')
+
+
+def spline_table_functions(spline_table):
+    r""" Function objects of the splines stored in a stacked table.
+
+    Parameters
+    ----------
+    spline_table : tuple
+        Tuple ``(breakpoints, coefficients)`` of k splines
+        returned by `spline_table_coefficients`.
+
+    Returns
+    -------
+    func_table : list
+        Length k list of `~scipy.interpolate.PPoly` objects that can be passed
+        to `call_func_table`. Points outside the breakpoints are extrapolated
+        in the same way as by `call_spline_table`.
+
+    Examples
+    --------
+    >>> x = np.linspace(0, 1, 10)
+    >>> spline_table = spline_table_coefficients([custom_spline(x, x**3, k=3)])
+    >>> f = spline_table_functions(spline_table)[0]
+    >>> assert np.allclose(f(0.5), 0.125)
+    """
+    breakpoints, coefficients = spline_table
+    return list(PPoly(np.asarray(c).T, np.asarray(b)) for b, c in zip(breakpoints, coefficients))
+
+
+def call_spline_table(spline_table, abscissa, func_indices):
+    r""" Returns the output of a stacked table of splines evaluated at a set of input points
+    if the indices of required splines is known.
+
+    Equivalent to `call_func_table`, but all points are evaluated in a single pass
+    rather than looping over the functions.
+
+    Parameters
+    ----------
+    spline_table : tuple
+        Tuple ``(breakpoints, coefficients)`` of k splines
+        returned by `spline_table_coefficients`.
+
+    abscissa : array_like
+        Length Npts array of points at which to evaluate the splines.
+
+    func_indices : array_like
+        Length Npts array providing the indices to use to choose which spline
+        operates on each abscissa element. Thus func_indices is an array of integers
+        ranging between 0 and k-1.
+
+    Returns
+    -------
+    out : array_like
+        Length Npts array giving the evaluation of the appropriate spline on each
+        abscissa element.
+
+    Examples
+    --------
+    >>> x = np.linspace(0, 1, 10)
+    >>> spline_table = spline_table_coefficients([custom_spline(x, x**3, k=3)])
+    >>> result = call_spline_table(spline_table, [0.25, 0.5], [0, 0])
+    """
+    breakpoints, coefficients = spline_table
+    abscissa = np.atleast_1d(abscissa).astype('f8')
+    func_indices = np.atleast_1d(func_indices).astype(np.intp)
+    if len(func_indices) > 0:
+        msg = "Input ``func_indices`` must range between 0 and {0}"
+        assert func_indices.min() >= 0, msg.format(len(breakpoints)-1)
+        assert func_indices.max() < len(breakpoints), msg.format(len(breakpoints)-1)
+    return cython_spline_table_kernel(breakpoints, coefficients, abscissa, func_indices)
+
+
 def bind_required_kwargs(required_kwargs, obj, **kwargs):
     r""" Method binds each element of ``required_kwargs`` to
     the input object ``obj``, or raises and exception for cases
@@ -5,7 +5,6 @@ model.
 
 import numpy as np
 from scipy.special import erfc, erfcinv
-from astropy.utils.misc import NumpyRNGContext
 
 from .occupation_model_template import OccupationComponent
 from .engines import cacciato09_sats_mc_prim_galprop_engine
@@ -13,9 +12,13 @@ from .engines import cacciato09_sats_mc_prim_galprop_engine
 from .. import custom_incomplete_gamma
 
 from ...custom_exceptions import HalotoolsError
+from ...utils.random_streams import random_stream_id, random_stream_uniform, _random_stream_seed
 
 __all__ = ('Cacciato09Cens', 'Cacciato09Sats')
 
+_cens_prim_galprop_stream = random_stream_id('Cacciato09Cens.mc_prim_galprop')
+_sats_prim_galprop_stream = random_stream_id('Cacciato09Sats.mc_prim_galprop')
+
 
 class Cacciato09Cens(OccupationComponent):
     r""" CLF-style model for the central galaxy occupation. Since it is a CLF
@@ -61,6 +64,7 @@ class Cacciato09Cens(OccupationComponent):
 
         self._mock_generation_calling_sequence = ['mc_occupation',
                                                   'mc_prim_galprop']
+        self._methods_using_random_streams = ['mc_occupation', 'mc_prim_galprop']
         self.prim_galprop_key = prim_galprop_key
         self._galprop_dtypes_to_allocate = np.dtype([(prim_galprop_key, 'f8')])
         self.param_dict = self.get_published_parameters()
@@ -226,6 +230,11 @@ class Cacciato09Cens(OccupationComponent):
             Random number seed used to generate the Monte Carlo realization.
             Default is None.
 
+        random_stream_index : array, optional
+            Integer array storing the index of each halo in the random streams,
+            so that the Monte Carlo realization of a halo does not depend on
+            which other halos are passed. Default is ``np.arange(len(prim_haloprop))``.
+
         Returns
         -------
         mc_prim_galprop : array
@@ -256,31 +265,32 @@ class Cacciato09Cens(OccupationComponent):
             raise HalotoolsError(msg)
 
         seed = kwargs.get('seed', None)
+        index = kwargs.get('random_stream_index', None)
+        if index is None:
+            index = len(mass)
 
         prim_galprop = np.zeros(len(mean_occupation))
 
-        with NumpyRNGContext(seed):
-
-            # Draw cumulative distribution function (CDF) values for the
-            # primary galaxy properties in [0, 1).
-            x = np.random.random(len(mass))
-
-            # Take into account that the occupation with one central sets a
-            # lower limit on the CDF values. We also compute 1 - CDF because
-            # for low expected occupations CDF ~ 1 which can lead to numerical
-            # problems.
-            cdf = mean_occupation * x + (1 - mean_occupation)
-            cdfc = mean_occupation * (1 - x)  # 1 - cdf
-
-            # Draw primary galaxy properties.
-            mask = cdf <= 0.5
-            prim_galprop[mask] = 10**(-erfcinv(2 * cdf[mask]) *
-                                      np.sqrt(2 * self.param_dict['sigma']**2) +
-                                      log_median_prim_galprop[mask])
-            mask = np.logical_not(mask)  # cdf > 0.5
-            prim_galprop[mask] = 10**(erfcinv(2 * cdfc[mask]) *
-                                      np.sqrt(2 * self.param_dict['sigma']**2) +
-                                      log_median_prim_galprop[mask])
+        # Draw cumulative distribution function (CDF) values for the
+        # primary galaxy properties in [0, 1).
+        x = random_stream_uniform(index, seed=seed, stream=_cens_prim_galprop_stream)
+
+        # Take into account that the occupation with one central sets a
+        # lower limit on the CDF values. We also compute 1 - CDF because
+        # for low expected occupations CDF ~ 1 which can lead to numerical
+        # problems.
+        cdf = mean_occupation * x + (1 - mean_occupation)
+        cdfc = mean_occupation * (1 - x)  # 1 - cdf
+
+        # Draw primary galaxy properties.
+        mask = cdf <= 0.5
+        prim_galprop[mask] = 10**(-erfcinv(2 * cdf[mask]) *
+                                  np.sqrt(2 * self.param_dict['sigma']**2) +
+                                  log_median_prim_galprop[mask])
+        mask = np.logical_not(mask)  # cdf > 0.5
+        prim_galprop[mask] = 10**(erfcinv(2 * cdfc[mask]) *
+                                  np.sqrt(2 * self.param_dict['sigma']**2) +
+                                  log_median_prim_galprop[mask])
 
         if 'table' in list(kwargs.keys()):
             kwargs['table'][self.prim_galprop_key][:] = prim_galprop
@@ -329,6 +339,7 @@ class Cacciato09Sats(OccupationComponent):
 
         self._mock_generation_calling_sequence = ['mc_occupation',
                                                   'mc_prim_galprop']
+        self._methods_using_random_streams = ['mc_occupation', 'mc_prim_galprop']
         self._galprop_dtypes_to_allocate = np.dtype([(prim_galprop_key, 'f8')])
         self.prim_galprop_key = prim_galprop_key
         self.param_dict = self.get_default_parameters()
@@ -636,6 +647,11 @@ class Cacciato09Sats(OccupationComponent):
             Random number seed used to generate the Monte Carlo realization.
             Default is None.
 
+        random_stream_index : array, optional
+            Integer array storing the index of each satellite in the random streams,
+            so that the Monte Carlo realization of a satellite does not depend on
+            which other satellites are passed. Default is ``np.arange(len(prim_haloprop))``.
+
         Returns
         -------
         mc_prim_galprop : array
@@ -665,13 +681,13 @@ class Cacciato09Sats(OccupationComponent):
                    "alpha_sat is bigger than 10.\n")
             raise HalotoolsError(msg)
 
-        seed = kwargs.get('seed', None)
-        with NumpyRNGContext(seed):
-            while np.any(prim_galprop == 0):
-                randoms = np.random.random(size=len(mass) * 2)
-                prim_galprop = cacciato09_sats_mc_prim_galprop_engine(
-                    prim_galprop, randoms, alpha_sat, prim_galprop_cut,
-                    10**self.threshold)
+        seed = _random_stream_seed(kwargs.get('seed', None))
+        index = kwargs.get('random_stream_index', None)
+        index = np.arange(len(mass)) if index is None else np.asarray(index)
+        prim_galprop = cacciato09_sats_mc_prim_galprop_engine(
+            np.broadcast_to(alpha_sat, prim_galprop.shape),
+            np.broadcast_to(prim_galprop_cut, prim_galprop.shape),
+            10**self.threshold, seed, _sats_prim_galprop_stream, index)
 
         if 'table' in list(kwargs.keys()):
             kwargs['table'][self.prim_galprop_key][:] = prim_galprop
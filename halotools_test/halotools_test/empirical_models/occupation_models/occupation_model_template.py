@@ -8,11 +8,11 @@ import numpy as np
 from scipy.special import pdtrik
 import six
 from abc import ABCMeta
-from astropy.utils.misc import NumpyRNGContext
 
 from .. import model_defaults, model_helpers
 
 from ...utils.array_utils import custom_len
+from ...utils.random_streams import random_stream_id, random_stream_uniform
 from ...custom_exceptions import HalotoolsError
 
 __all__ = ('OccupationComponent', )
@@ -100,6 +100,9 @@ class OccupationComponent(object):
         # The _mock_generation_calling_sequence determines which methods
         # will be called during mock population, as well as in what order they will be called
         self._mock_generation_calling_sequence = ['mc_occupation']
+        # The _methods_using_random_streams are the methods whose Monte Carlo realization
+        # only depends on the seed and on the random_stream_index of each halo or galaxy
+        self._methods_using_random_streams = ['mc_occupation']
         self._galprop_dtypes_to_allocate = np.dtype([('halo_num_' + self.gal_type, 'i4')])
 
     def mc_occupation(self, seed=None, **kwargs):
@@ -119,6 +122,11 @@ class OccupationComponent(object):
             Random number seed used to generate the Monte Carlo realization.
             Default is None.
 
+        random_stream_index : array, optional
+            Integer array storing the index of each halo in the random streams,
+            so that the Monte Carlo realization of a halo does not depend on
+            which other halos are passed. Default is ``np.arange(len(table))``.
+
         Returns
         -------
         mc_abundance : array
@@ -149,19 +157,33 @@ class OccupationComponent(object):
             Random number seed used to generate the Monte Carlo realization.
             Default is None.
 
+        random_stream_index : array, optional
+            Integer array storing the index of each halo in the random streams,
+            so that the Monte Carlo realization of a halo does not depend on
+            which other halos are passed. Default is ``np.arange(len(table))``.
+
         Returns
         -------
         mc_abundance : array
             Integer array giving the number of galaxies in each of the input table.
         """
-        with NumpyRNGContext(seed):
-            mc_generator = np.random.random(custom_len(first_occupation_moment))
+        mc_generator = self._mc_occupation_randoms(first_occupation_moment, seed, **kwargs)
 
         result = np.where(mc_generator < first_occupation_moment, 1, 0)
         if 'table' in kwargs:
             kwargs['table']['halo_num_'+self.gal_type] = result
         return result
 
+    def _mc_occupation_randoms(self, first_occupation_moment, seed=None,
+            random_stream_index=None, **kwargs):
+        """ Uniform randoms in [0, 1) drawn from the ``mc_occupation`` stream of
+        ``gal_type`` for each of the input halos.
+        """
+        if random_stream_index is None:
+            random_stream_index = custom_len(first_occupation_moment)
+        stream = random_stream_id('mc_occupation_' + self.gal_type)
+        return random_stream_uniform(random_stream_index, seed=seed, stream=stream)
+
     def _poisson_distribution(self, first_occupation_moment, seed=None, **kwargs):
         """ Poisson distribution used to draw Monte Carlo occupation statistics
         for satellite-like populations in which per-halo abundances are unbounded.
@@ -175,6 +197,11 @@ class OccupationComponent(object):
             Random number seed used to generate the Monte Carlo realization.
             Default is None.
 
+        random_stream_index : array, optional
+            Integer array storing the index of each halo in the random streams,
+            so that the Monte Carlo realization of a halo does not depend on
+            which other halos are passed. Default is ``np.arange(len(table))``.
+
         Returns
         -------
         mc_abundance : array
@@ -182,9 +209,9 @@ class OccupationComponent(object):
         """
         # We don't use the built-in Poisson number generator so that when a seed
         # is specified, it preserves the ranks among rvs even when mean is changed.
-        with NumpyRNGContext(seed):
-            result = np.ceil(pdtrik(np.random.rand(*first_occupation_moment.shape),
-                                    first_occupation_moment)).astype(np.int)
+        randoms = self._mc_occupation_randoms(first_occupation_moment, seed, **kwargs)
+        result = np.ceil(pdtrik(randoms.reshape(np.shape(first_occupation_moment)),
+                                first_occupation_moment)).astype(int)
         if 'table' in kwargs:
             kwargs['table']['halo_num_'+self.gal_type] = result
         return result
@@ -254,6 +254,21 @@ def test_Cacciato09Sats5():
     assert p_value > 0.001
 
 
+def test_Cacciato09Sats6():
+    """
+    Check that the luminosity of each satellite only depends on its index
+    in the random streams, and not on which other satellites are drawn.
+    """
+    model = Cacciato09Sats(threshold=9.0)
+    mass = np.logspace(12, 15, 1000)
+    lum_mc = model.mc_prim_galprop(prim_haloprop=mass, seed=1)
+
+    index = np.arange(250, 1000, 3)
+    lum_mc2 = model.mc_prim_galprop(prim_haloprop=mass[index], seed=1,
+                                    random_stream_index=index)
+    assert np.all(lum_mc2 == lum_mc[index])
+
+
 def test_Cacciato09Sats_phi_sat_raises_exception():
     model = Cacciato09Sats(threshold=11.0)
     with pytest.raises(HalotoolsError) as err:
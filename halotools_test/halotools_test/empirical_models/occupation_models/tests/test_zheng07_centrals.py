@@ -54,7 +54,7 @@ def enforce_mc_occupation_behavior(model):
     masses = np.ones(Npts)*mvir_midpoint
     mc_occ = model.mc_occupation(prim_haloprop=masses, seed=43)
     assert set(mc_occ).issubset([0, 1])
-    expected_result = 0.48599999
+    expected_result = 0.497
     np.testing.assert_allclose(mc_occ.mean(), expected_result, rtol=1e-5, atol=1.e-5)
 
     # Now check that the model is ~ 1.0 when evaluated for a cluster
@@ -68,10 +68,11 @@ def enforce_mc_occupation_behavior(model):
     Npts = int(1e3)
     masses = np.ones(Npts)*10.**model.param_dict['logM1']
     mc_occ = model.mc_occupation(prim_haloprop=masses, seed=43)
-    # We chose a specific seed that has been pre-tested,
-    # so we should always get the same result
-    expected_result = 1.0
-    np.testing.assert_allclose(mc_occ.mean(), expected_result, rtol=1e-2, atol=1.e-2)
+    # The mean of the Poisson realizations should agree with the mean occupation
+    # to within a few times its standard error, whatever the seed
+    expected_result = model.mean_occupation(prim_haloprop=masses).mean()
+    assert np.allclose(expected_result, 0.95)
+    assert np.abs(mc_occ.mean() - expected_result) < 4*np.sqrt(expected_result/Npts)
 
 
 def test_ncen_inheritance_behavior1():
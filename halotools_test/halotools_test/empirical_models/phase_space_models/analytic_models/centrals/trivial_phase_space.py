@@ -41,6 +41,7 @@ class TrivialPhaseSpace(object):
             Default is set in `~halotools.empirical_models.model_defaults`.
         """
         self._mock_generation_calling_sequence = ['assign_phase_space']
+        self._methods_using_random_streams = ['assign_phase_space']
         self._galprop_dtypes_to_allocate = np.dtype([
             ('x', 'f8'), ('y', 'f8'), ('z', 'f8'),
             ('vx', 'f8'), ('vy', 'f8'), ('vz', 'f8'),
@@ -7,18 +7,35 @@ is a composite class that can be used to generate Monte Carlo realizations
 of the full phase space distribution of galaxies within their halos.
 """
 
+import os
+import hashlib
+import multiprocessing
 import numpy as np
 
 from itertools import product
-from astropy.utils.misc import NumpyRNGContext
+from tempfile import NamedTemporaryFile
+from warnings import warn
 
-from ...model_helpers import custom_spline, call_func_table
+from ...model_helpers import (custom_spline, spline_table_coefficients,
+    spline_table_functions, call_spline_table)
 from ... import model_defaults
 
+from ....sim_manager import halotools_cache_dirname
 from ....custom_exceptions import HalotoolsError
+from ....utils.random_streams import (random_stream_id, random_stream_uniform,
+    random_stream_normal, _random_stream_seed)
 
 _epsilon = 0.001
 
+_radial_distance_stream = random_stream_id('MonteCarloGalProf._mc_dimensionless_radial_distance')
+_unit_sphere_stream = random_stream_id('MonteCarloGalProf.mc_unit_sphere')
+_radial_velocity_stream = random_stream_id('MonteCarloGalProf.mc_radial_velocity')
+
+_lookup_table_cache_dirname = os.path.join(halotools_cache_dirname, 'lookup_tables')
+#  Increment whenever the format or the computation of the cached tables changes
+_lookup_table_cache_version = '2'
+_lookup_table_names = ('rad_breakpoints', 'rad_coefficients', 'vel_breakpoints', 'vel_coefficients')
+
 __author__ = ['Andrew Hearin']
 __all__ = ['MonteCarloGalProf']
 
@@ -78,7 +95,8 @@ class MonteCarloGalProf(object):
     def build_lookup_tables(self,
             logrmin=model_defaults.default_lograd_min,
             logrmax=model_defaults.default_lograd_max,
-            Npts_radius_table=model_defaults.Npts_radius_table):
+            Npts_radius_table=model_defaults.Npts_radius_table,
+            num_threads=1, use_cache=True):
         r""" Method used to create a lookup table of the spatial and velocity radial profiles.
 
         Parameters
@@ -95,6 +113,24 @@ class MonteCarloGalProf(object):
             Number of control points used in the spline.
             Default is set in `~halotools.empirical_models.model_defaults`.
 
+        num_threads : int, optional
+            Number of processes used to tabulate the profiles
+            of the different profile parameter bins.
+            If set to the string ``max``, all available cores are used. Default is 1.
+
+        use_cache : bool, optional
+            If True, the tables are stored in the Halotools cache directory
+            the first time they are built, and are memory-mapped from disk for any later
+            instance of the same class with the same binning. Default is True.
+
+        Notes
+        -----
+        The cached tables are keyed by the class of the model and by the binning
+        of the profile parameters and of the radius. Subclasses whose
+        ``cumulative_gal_PDF`` or ``dimensionless_radial_velocity_dispersion``
+        depend on anything but the profile parameters passed as arguments
+        should call this method with ``use_cache=False``.
+
         """
         self.Npts_radius_table = Npts_radius_table
 
@@ -117,27 +153,70 @@ class MonteCarloGalProf(object):
             self.rad_prof_func_table = np.array([])
             self.rad_prof_func_table_indices = np.array([])
         else:
-            func_table = []
-            velocity_func_table = []
-            for ii, items in enumerate(product(*profile_params_list)):
-                table_ordinates = self.cumulative_gal_PDF(radius_array, *items)
-                log_table_ordinates = np.log10(table_ordinates)
-                funcobj = custom_spline(log_table_ordinates, self.logradius_array, k=3)
-                func_table.append(funcobj)
-
-                velocity_table_ordinates = self.dimensionless_radial_velocity_dispersion(
-                    radius_array, *items)
-                velocity_funcobj = custom_spline(self.logradius_array, velocity_table_ordinates, k=3)
-                velocity_func_table.append(velocity_funcobj)
+            spline_tables = None
+            if use_cache:
+                cache_fname = self._lookup_table_cache_fname(profile_params_list, radius_array)
+                spline_tables = _load_lookup_tables(cache_fname)
+
+            if spline_tables is None:
+                spline_tables = self._tabulate_profiles(
+                    profile_params_list, radius_array, num_threads)
+                if use_cache:
+                    _save_lookup_tables(cache_fname, spline_tables)
+
+            #  Coefficients of all splines stacked into single arrays,
+            #  so that each table is evaluated in a single pass
+            self.rad_prof_spline_table = spline_tables[:2]
+            self.vel_prof_spline_table = spline_tables[2:]
 
             profile_params_dimensions = [len(p) for p in profile_params_list]
-            self.rad_prof_func_table = np.array(func_table).reshape(profile_params_dimensions)
-            self.vel_prof_func_table = np.array(velocity_func_table).reshape(profile_params_dimensions)
+            self.rad_prof_func_table = np.array(
+                spline_table_functions(self.rad_prof_spline_table)).reshape(profile_params_dimensions)
+            self.vel_prof_func_table = np.array(
+                spline_table_functions(self.vel_prof_spline_table)).reshape(profile_params_dimensions)
 
             self.rad_prof_func_table_indices = (
                 np.arange(np.prod(profile_params_dimensions)).reshape(profile_params_dimensions)
                 )
 
+    def _tabulate_profiles(self, profile_params_list, radius_array, num_threads):
+        r""" Stacked spline tables of the cumulative PDF and of the radial velocity dispersion
+        for every combination of the profile parameter bins, computed in chunks
+        on a pool of ``num_threads`` processes.
+        """
+        if num_threads == 'max':
+            num_threads = multiprocessing.cpu_count()
+
+        profile_params = list(product(*profile_params_list))
+        if num_threads == 1:
+            return _tabulate_profiles_chunk(profile_params, radius_array, model=self)
+
+        num_chunks = min(len(profile_params), 4*num_threads)
+        bounds = np.linspace(0, len(profile_params), num_chunks+1).astype(int)
+        chunks = [(profile_params[first:last], radius_array)
+            for first, last in zip(bounds[:-1], bounds[1:])]
+        pool = multiprocessing.Pool(num_threads,
+            initializer=_set_lookup_table_model, initargs=(self,))
+        result = pool.map(_tabulate_profiles_in_pool, chunks)
+        pool.close()
+
+        return tuple(np.concatenate(tables) for tables in zip(*result))
+
+    def _lookup_table_cache_fname(self, profile_params_list, radius_array):
+        r""" Path of the cached lookup tables, without the suffix of the four arrays.
+        """
+        hash_obj = hashlib.sha1()
+        hash_obj.update(_lookup_table_cache_version.encode('utf-8'))
+        hash_obj.update(type(self).__module__.encode('utf-8'))
+        hash_obj.update(type(self).__name__.encode('utf-8'))
+        for key, profile_params in zip(self.gal_prof_param_keys, profile_params_list):
+            hash_obj.update(key.encode('utf-8'))
+            hash_obj.update(np.ascontiguousarray(profile_params, dtype='f8').tobytes())
+        hash_obj.update(np.ascontiguousarray(radius_array, dtype='f8').tobytes())
+
+        basename = type(self).__name__ + '_' + hash_obj.hexdigest()
+        return os.path.join(_lookup_table_cache_dirname, basename)
+
     def _mc_dimensionless_radial_distance(self, *profile_params, **kwargs):
         r""" Method to generate Monte Carlo realizations of the profile model.
 
@@ -154,6 +233,11 @@ class MonteCarloGalProf(object):
         seed : int, optional
             Random number seed used in Monte Carlo realization. Default is None.
 
+        random_stream_index : array, optional
+            Integer array storing the index of each galaxy in the random streams,
+            so that the Monte Carlo realization of a galaxy does not depend on
+            which other galaxies are passed. Default is ``np.arange(Ngals)``.
+
         Returns
         -------
         scaled_radius : array_like
@@ -172,8 +256,10 @@ class MonteCarloGalProf(object):
         # These will be turned into random radial positions
         # by inverting the tabulated cumulative_gal_PDF
         seed = kwargs.get('seed', None)
-        with NumpyRNGContext(seed):
-            rho = np.random.random(len(profile_params[0]))
+        index = kwargs.get('random_stream_index', None)
+        if index is None:
+            index = len(profile_params[0])
+        rho = random_stream_uniform(index, seed=seed, stream=_radial_distance_stream)
 
         # Discretize each profile parameter for every galaxy
         # Store the collection of arrays in digitized_param_list
@@ -208,8 +294,8 @@ class MonteCarloGalProf(object):
         # the i^th function on the i^th element of rho.
         # Call the model_helpers module to access generic code for doing this.
         # (Remember that the interpolation is being done in log-space)
-        return 10.**call_func_table(
-            self.rad_prof_func_table.flatten(), np.log10(rho),
+        return 10.**call_spline_table(
+            self.rad_prof_spline_table, np.log10(rho),
             rad_prof_func_table_indices.flatten())
 
     def mc_unit_sphere(self, Npts, **kwargs):
@@ -224,16 +310,24 @@ class MonteCarloGalProf(object):
             Random number seed used in the Monte Carlo realization.
             Default is None, which will produce stochastic results.
 
+        random_stream_index : array, optional
+            Length-Npts integer array storing the index of each point in the random streams.
+            Default is ``np.arange(Npts)``.
+
         Returns
         -------
         x, y, z : array_like
             Length-Npts arrays of the coordinate positions.
         """
-        seed = kwargs.get('seed', None)
-
-        with NumpyRNGContext(seed):
-            cos_t = np.random.uniform(-1., 1., Npts)
-            phi = np.random.uniform(0, 2*np.pi, Npts)
+        seed = _random_stream_seed(kwargs.get('seed', None))
+        index = kwargs.get('random_stream_index', None)
+        if index is None:
+            index = Npts
+
+        cos_t = random_stream_uniform(index, seed=seed, stream=_unit_sphere_stream,
+            draw=0, low=-1., high=1.)
+        phi = random_stream_uniform(index, seed=seed, stream=_unit_sphere_stream,
+            draw=1, low=0, high=2*np.pi)
         sin_t = np.sqrt((1.-cos_t*cos_t))
 
         x = sin_t * np.cos(phi)
@@ -263,6 +357,11 @@ class MonteCarloGalProf(object):
             Random number seed used in the Monte Carlo realization.
             Default is None, which will produce stochastic results.
 
+        random_stream_index : array, optional
+            Integer array storing the index of each galaxy in the random streams,
+            so that the Monte Carlo realization of a galaxy does not depend on
+            which other galaxies are passed. Default is ``np.arange(Ngals)``.
+
         Returns
         -------
         x, y, z : arrays
@@ -289,14 +388,15 @@ class MonteCarloGalProf(object):
             return None, None, None
 
         seed = kwargs.get('seed', None)
-        x, y, z = self.mc_unit_sphere(Ngals, seed=seed)
+        index = kwargs.get('random_stream_index', None)
+        x, y, z = self.mc_unit_sphere(Ngals, seed=seed, random_stream_index=index)
 
         # Get the radial positions of the galaxies scaled by the halo radius
 
         if seed is not None:
             seed += 1
         dimensionless_radial_distance = self._mc_dimensionless_radial_distance(
-            *profile_params, seed=seed)
+            *profile_params, seed=seed, random_stream_index=index)
 
         # get random positions within the solid sphere
         x *= dimensionless_radial_distance
@@ -345,6 +445,11 @@ class MonteCarloGalProf(object):
             Random number seed used in the Monte Carlo realization.
             Default is None, which will produce stochastic results.
 
+        random_stream_index : array, optional
+            Integer array storing the index of each galaxy in the random streams,
+            so that the Monte Carlo realization of a galaxy does not depend on
+            which other galaxies are passed. Default is ``np.arange(Ngals)``.
+
         Returns
         -------
         x, y, z : arrays
@@ -409,6 +514,11 @@ class MonteCarloGalProf(object):
             Random number seed used in the Monte Carlo realization.
             Default is None, which will produce stochastic results.
 
+        random_stream_index : array, optional
+            Integer array storing the index of each galaxy in the random streams,
+            so that the Monte Carlo realization of a galaxy does not depend on
+            which other galaxies are passed. Default is ``np.arange(Ngals)``.
+
         Returns
         -------
         x, y, z : arrays, optional
@@ -524,8 +634,8 @@ class MonteCarloGalProf(object):
         # Now we have an array of indices for our functions, and we need to evaluate
         # the i^th function on the i^th element of rho.
         # Call the model_helpers module to access generic code for doing this.
-        dimensionless_radial_dispersions = call_func_table(
-            self.vel_prof_func_table.flatten(), np.log10(scaled_radius),
+        dimensionless_radial_dispersions = call_spline_table(
+            self.vel_prof_spline_table, np.log10(scaled_radius),
             vel_prof_func_table_indices.flatten())
 
         return dimensionless_radial_dispersions
@@ -556,6 +666,11 @@ class MonteCarloGalProf(object):
             Random number seed used in the Monte Carlo realization.
             Default is None, which will produce stochastic results.
 
+        random_stream_index : array, optional
+            Integer array storing the index of each galaxy in the random streams,
+            so that the Monte Carlo realization of a galaxy does not depend on
+            which other galaxies are passed. Default is ``np.arange(Ngals)``.
+
         Returns
         -------
         radial_velocities : array_like
@@ -571,13 +686,16 @@ class MonteCarloGalProf(object):
         radial_dispersions = np.where(radial_dispersions <= 0, _epsilon, radial_dispersions)
 
         seed = kwargs.get('seed', None)
-        with NumpyRNGContext(seed):
-            radial_velocities = np.random.normal(scale=radial_dispersions)
+        index = kwargs.get('random_stream_index', None)
+        if index is None:
+            index = len(radial_dispersions)
+        radial_velocities = random_stream_normal(index, seed=seed,
+            stream=_radial_velocity_stream, scale=radial_dispersions)
 
         return radial_velocities
 
     def mc_vel(self, table, overwrite_table_velocities=True,
-            return_velocities=False, seed=None):
+            return_velocities=False, seed=None, random_stream_index=None):
         r""" Method assigns a Monte Carlo realization of the Jeans velocity
         solution to the halos in the input ``table``.
 
@@ -598,6 +716,11 @@ class MonteCarloGalProf(object):
             Random number seed used in the Monte Carlo realization.
             Default is None, which will produce stochastic results.
 
+        random_stream_index : array, optional
+            Integer array storing the index of each galaxy in the random streams,
+            so that the Monte Carlo realization of a galaxy does not depend on
+            which other galaxies are passed. Default is ``np.arange(Ngals)``.
+
         Notes
         -------
         The method assumes that the ``vx``, ``vy``, and ``vz`` columns already store
@@ -624,13 +747,16 @@ class MonteCarloGalProf(object):
 
         total_mass = table[self.prim_haloprop_key]
 
-        vx = self.mc_radial_velocity(scaled_radius, total_mass, *profile_params, seed=seed)
+        vx = self.mc_radial_velocity(scaled_radius, total_mass, *profile_params,
+            seed=seed, random_stream_index=random_stream_index)
         if seed is not None:
             seed += 1
-        vy = self.mc_radial_velocity(scaled_radius, total_mass, *profile_params, seed=seed)
+        vy = self.mc_radial_velocity(scaled_radius, total_mass, *profile_params,
+            seed=seed, random_stream_index=random_stream_index)
         if seed is not None:
             seed += 1
-        vz = self.mc_radial_velocity(scaled_radius, total_mass, *profile_params, seed=seed)
+        vz = self.mc_radial_velocity(scaled_radius, total_mass, *profile_params,
+            seed=seed, random_stream_index=random_stream_index)
 
         if overwrite_table_velocities is True:
             table['vx'][:] += vx
@@ -639,3 +765,74 @@ class MonteCarloGalProf(object):
 
         if return_velocities is True:
             return vx, vy, vz
+
+
+def _tabulate_profiles_chunk(profile_params, radius_array, model):
+    r""" Stacked spline tables of ``model`` for the input sequence of profile parameters.
+    """
+    logradius_array = np.log10(radius_array)
+    func_table = []
+    velocity_func_table = []
+    for items in profile_params:
+        table_ordinates = model.cumulative_gal_PDF(radius_array, *items)
+        log_table_ordinates = np.log10(table_ordinates)
+        funcobj = custom_spline(log_table_ordinates, logradius_array, k=3)
+        func_table.append(funcobj)
+
+        velocity_table_ordinates = model.dimensionless_radial_velocity_dispersion(
+            radius_array, *items)
+        velocity_funcobj = custom_spline(logradius_array, velocity_table_ordinates, k=3)
+        velocity_func_table.append(velocity_funcobj)
+
+    return spline_table_coefficients(func_table) + spline_table_coefficients(velocity_func_table)
+
+
+#  Model tabulated by the processes of the pool, set once per process
+#  by the pool initializer rather than being pickled with every chunk
+_lookup_table_model = None
+
+
+def _set_lookup_table_model(model):
+    global _lookup_table_model
+    _lookup_table_model = model
+
+
+def _tabulate_profiles_in_pool(args):
+    profile_params, radius_array = args
+    return _tabulate_profiles_chunk(profile_params, radius_array, model=_lookup_table_model)
+
+
+def _load_lookup_tables(cache_fname):
+    r""" Memory-mapped lookup tables stored in the cache,
+    or None if they have not been stored yet.
+    """
+    try:
+        return tuple(np.load(cache_fname + '_' + name + '.npy', mmap_mode='r')
+            for name in _lookup_table_names)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def _save_lookup_tables(cache_fname, spline_tables):
+    r""" Store the lookup tables in the cache. Each file is written to a temporary
+    file that is then renamed, so that processes loading the tables concurrently
+    never read a partially written file.
+    """
+    dirname = os.path.dirname(cache_fname)
+    try:
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        for name, arr in zip(_lookup_table_names, spline_tables):
+            f = NamedTemporaryFile(dir=dirname, suffix='.npy', delete=False)
+            try:
+                with f:
+                    np.save(f, arr)
+                os.replace(f.name, cache_fname + '_' + name + '.npy')
+            finally:
+                #  Only left behind if the table could not be stored
+                if os.path.exists(f.name):
+                    os.remove(f.name)
+    except (IOError, OSError) as err:
+        msg = ("\nThe lookup tables could not be stored in the cache directory\n{0}\n"
+            "and will be rebuilt for every new model instance:\n{1}\n")
+        warn(msg.format(dirname, err))
@@ -5,6 +5,7 @@ from astropy.utils.data import get_pkg_data_filename
 
 from ..unbiased_isotropic_velocity import dimensionless_radial_velocity_dispersion as unbiased_dimless_vel_rad_disp
 from ..biased_isotropic_velocity import dimensionless_radial_velocity_dispersion as biased_dimless_vel_rad_disp
+from .test_unbiased_isotropic_velocity import _quad_dimless_vel_rad_disp
 
 
 __all__ = ('test_unbiased_vel_rad_disp1', )
@@ -48,3 +49,34 @@ def test_unbiased_vel_rad_disp_external_ch5_cg10():
     frank_dimless_sigma_rad = x[:, 2]
     aph_result = biased_dimless_vel_rad_disp(frank_r_by_Rvir, halo_conc, gal_conc)
     assert np.allclose(aph_result, frank_dimless_sigma_rad, rtol=1e-3)
+
+
+def test_biased_vel_rad_disp_quadrature():
+    r""" The vectorized quadrature agrees with adaptive integration.
+    """
+    scaled_radius = np.logspace(-3, 0, 30)
+    for halo_conc in (2, 20):
+        for gal_conc in (0.2, 2, 10, 200):
+            result = biased_dimless_vel_rad_disp(scaled_radius, halo_conc, gal_conc)
+            correct_result = _quad_dimless_vel_rad_disp(scaled_radius, halo_conc, gal_conc)
+            assert np.allclose(result, correct_result, rtol=1e-8)
+
+
+def test_biased_vel_rad_disp_conc_array():
+    scaled_radius = np.logspace(-2, 0, 25)
+    halo_conc = np.linspace(2, 20, 25)
+    gal_conc = np.linspace(20, 2, 25)
+    result = biased_dimless_vel_rad_disp(scaled_radius, halo_conc, gal_conc)
+    correct_result = list(biased_dimless_vel_rad_disp(x, ch, cg)[0]
+        for x, ch, cg in zip(scaled_radius, halo_conc, gal_conc))
+    assert np.allclose(result, correct_result)
+
+
+def test_biased_vel_rad_disp_zero_radius():
+    r""" The dispersion vanishes at the halo center.
+    """
+    result = biased_dimless_vel_rad_disp(np.array((0., 1e-12, 0.5)), 5., 10.)
+    assert result[0] == 0.
+    assert np.all(np.isfinite(result))
+    assert result[1] < 0.01
+    assert np.allclose(result[2], biased_dimless_vel_rad_disp(0.5, 5., 10.))
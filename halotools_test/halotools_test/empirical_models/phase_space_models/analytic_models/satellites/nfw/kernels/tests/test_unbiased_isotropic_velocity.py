@@ -1,9 +1,11 @@
 """
 """
 import numpy as np
+from scipy.integrate import quad as quad_integration
 from astropy.utils.data import get_pkg_data_filename
 
 from ..unbiased_isotropic_velocity import dimensionless_radial_velocity_dispersion as unbiased_dimless_vel_rad_disp
+from ..mass_profile import _g_integral
 
 
 __all__ = ('test_unbiased_vel_rad_disp1', )
@@ -31,3 +33,47 @@ def test_unbiased_vel_rad_disp_external_c10():
     frank_dimless_sigma_rad = x[:, 2]
     aph_dimless_sigma_rad = unbiased_dimless_vel_rad_disp(frank_r_by_Rvir, 10)
     assert np.allclose(frank_dimless_sigma_rad, aph_dimless_sigma_rad, rtol=1e-3)
+
+
+def _quad_dimless_vel_rad_disp(scaled_radius, halo_conc, gal_conc):
+    r""" Reference dispersion computed by adaptive quadrature of the Jeans integrand.
+    """
+    bias_ratio = halo_conc/float(gal_conc)
+
+    def integrand(y):
+        return (np.log(1+bias_ratio*y)/(y**3*(1+y)**2) -
+            bias_ratio/(y**2*(1+y)**2*(1+bias_ratio*y)))
+
+    integral = np.array(list(quad_integration(integrand, gal_conc*x, float("inf"),
+        epsabs=0, epsrel=1e-12, limit=500)[0] for x in scaled_radius))
+    prefactor = gal_conc*gal_conc*scaled_radius*(1. + gal_conc*scaled_radius)**2/_g_integral(halo_conc)
+    return np.sqrt(integral*prefactor)
+
+
+def test_unbiased_vel_rad_disp_quadrature():
+    r""" The closed-form solution agrees with numerical integration,
+    including the large radii where the integral is computed by quadrature.
+    """
+    scaled_radius = np.logspace(-3, 0, 50)
+    for conc in (0.5, 5, 20, 100):
+        result = unbiased_dimless_vel_rad_disp(scaled_radius, conc)
+        correct_result = _quad_dimless_vel_rad_disp(scaled_radius, conc, conc)
+        assert np.allclose(result, correct_result, rtol=1e-8)
+
+
+def test_unbiased_vel_rad_disp_conc_array():
+    scaled_radius = np.logspace(-2, 0, 25)
+    conc = np.linspace(2, 20, 25)
+    result = unbiased_dimless_vel_rad_disp(scaled_radius, conc)
+    correct_result = list(unbiased_dimless_vel_rad_disp(x, c)[0] for x, c in zip(scaled_radius, conc))
+    assert np.allclose(result, correct_result)
+
+
+def test_unbiased_vel_rad_disp_zero_radius():
+    r""" The dispersion vanishes at the halo center.
+    """
+    result = unbiased_dimless_vel_rad_disp(np.array((0., 1e-12, 0.5)), 5.)
+    assert result[0] == 0.
+    assert np.all(np.isfinite(result))
+    assert result[1] < 0.01
+    assert np.allclose(result[2], unbiased_dimless_vel_rad_disp(0.5, 5.))
@@ -1,24 +1,34 @@
 """
 """
 import numpy as np
-from scipy.integrate import quad as quad_integration
+from scipy.special import spence
 
 from .mass_profile import _g_integral
+from .biased_isotropic_velocity import _jeans_integral as _jeans_integral_quadrature
 
 
 __all__ = ('dimensionless_radial_velocity_dispersion', )
 
+#  Above this lower limit, the terms of the closed-form integral cancel
+#  catastrophically, and the integral is computed by quadrature instead
+_max_closed_form_lower_limit = 10.
 
-def _jeans_integrand_term1(y):
-    r"""
+
+def _jeans_integral(y):
+    r""" Closed-form integral of the Jeans integrand from ``y`` to infinity,
+    see Lokas & Mamon (2001), where :math:`{\rm Li}_{2}(-y)` = ``spence(1+y)``.
     """
-    return np.log(1+y)/(y**3*(1+y)**2)
+    y = np.atleast_1d(y).astype(np.float64)
+    result = np.zeros_like(y)
 
+    closed_form = y <= _max_closed_form_lower_limit
+    yc = y[closed_form]
+    log1py = np.log1p(yc)
+    result[closed_form] = 0.5*(np.pi**2 - np.log(yc) - 1./yc - 1./(1. + yc)**2 - 6./(1. + yc) +
+        (1. + 1./yc**2 - 4./yc - 2./(1. + yc))*log1py + 3.*log1py**2 + 6.*spence(1. + yc))
 
-def _jeans_integrand_term2(y):
-    r"""
-    """
-    return 1/(y**2*(1+y)**3)
+    result[~closed_form] = _jeans_integral_quadrature(y[~closed_form], 1.)
+    return result
 
 
 def dimensionless_radial_velocity_dispersion(scaled_radius, *conc):
@@ -37,7 +47,7 @@ def dimensionless_radial_velocity_dispersion(scaled_radius, *conc):
         *r* scaled by the halo boundary :math:`R_{\Delta}`, so that
         :math:`0 <= \tilde{r} \equiv r/R_{\Delta} <= 1`.
 
-    conc : float
+    conc : float or array_like
         Concentration of the halo.
 
     Returns
@@ -46,18 +56,16 @@ def dimensionless_radial_velocity_dispersion(scaled_radius, *conc):
         Radial velocity dispersion profile scaled by the virial velocity.
         The returned result has the same dimension as the input ``scaled_radius``.
     """
-    x = np.atleast_1d(scaled_radius).astype(np.float64)
+    x, conc = np.broadcast_arrays(np.atleast_1d(scaled_radius).astype(np.float64),
+        np.asarray(conc[0], dtype='f8'))
     result = np.zeros_like(x)
 
-    prefactor = conc*(conc*x)*(1. + conc*x)**2/_g_integral(conc)
+    #  The dispersion vanishes at the halo center, where the integral diverges
+    nonzero = x > 0
+    x, conc = x[nonzero], conc[nonzero]
 
-    lower_limit = conc*x
-    upper_limit = float("inf")
-    for i in range(len(x)):
-        term1, _ = quad_integration(_jeans_integrand_term1,
-            lower_limit[i], upper_limit, epsrel=1e-5)
-        term2, _ = quad_integration(_jeans_integrand_term2,
-            lower_limit[i], upper_limit, epsrel=1e-5)
-        result[i] = term1 - term2
+    prefactor = conc*(conc*x)*(1. + conc*x)**2/_g_integral(conc)
+    integral = _jeans_integral(conc*x)
 
-    return np.sqrt(result*prefactor)
+    result[nonzero] = np.sqrt(integral*prefactor)
+    return result
@@ -77,6 +77,7 @@ class NFWPhaseSpace(NFWProfile, MonteCarloGalProf):
         self.setup_prof_lookup_tables(*prof_lookup_args)
 
         self._mock_generation_calling_sequence = ['assign_phase_space']
+        self._methods_using_random_streams = ['assign_phase_space']
 
     def _retrieve_prof_lookup_info(self, **kwargs):
         r""" Retrieve the arrays defining the lookup table control points
@@ -88,7 +89,7 @@ class NFWPhaseSpace(NFWProfile, MonteCarloGalProf):
         conc_arr = kwargs.get('concentration_bins', default_conc_arr)
         return [conc_arr]
 
-    def assign_phase_space(self, table, seed=None):
+    def assign_phase_space(self, table, seed=None, random_stream_index=None):
         r""" Primary method of the `NFWPhaseSpace` class
         called during the mock-population sequence.
 
@@ -106,11 +107,17 @@ class NFWPhaseSpace(NFWProfile, MonteCarloGalProf):
             Random number seed used in the Monte Carlo realization.
             Default is None, which will produce stochastic results.
 
+        random_stream_index : array, optional
+            Integer array storing the index of each galaxy in the random streams.
+            Default is ``np.arange(len(table))``.
+
         """
-        MonteCarloGalProf.mc_pos(self, table=table, seed=seed)
+        MonteCarloGalProf.mc_pos(self, table=table, seed=seed,
+            random_stream_index=random_stream_index)
         if seed is not None:
             seed += 1
-        MonteCarloGalProf.mc_vel(self, table=table, seed=seed)
+        MonteCarloGalProf.mc_vel(self, table=table, seed=seed,
+            random_stream_index=random_stream_index)
 
     def conc_NFWmodel(self, *args, **kwargs):
         r""" NFW concentration as a function of halo mass.
@@ -619,7 +626,8 @@ class NFWPhaseSpace(NFWProfile, MonteCarloGalProf):
     def build_lookup_tables(self,
             logrmin=model_defaults.default_lograd_min,
             logrmax=model_defaults.default_lograd_max,
-            Npts_radius_table=model_defaults.Npts_radius_table):
+            Npts_radius_table=model_defaults.Npts_radius_table,
+            num_threads=1, use_cache=True):
         r""" Method used to create a lookup table of the spatial and velocity radial profiles.
 
         Parameters
@@ -636,8 +644,19 @@ class NFWPhaseSpace(NFWProfile, MonteCarloGalProf):
             Number of control points used in the spline.
             Default is set in `~halotools.empirical_models.model_defaults`.
 
+        num_threads : int, optional
+            Number of processes used to tabulate the profiles
+            of the different concentration bins.
+            If set to the string ``max``, all available cores are used. Default is 1.
+
+        use_cache : bool, optional
+            If True, the tables are stored in the Halotools cache directory
+            the first time they are built, and are memory-mapped from disk for any later
+            instance of the same class with the same binning. Default is True.
+
         """
-        MonteCarloGalProf.build_lookup_tables(self, logrmin, logrmax, Npts_radius_table)
+        MonteCarloGalProf.build_lookup_tables(self, logrmin, logrmax, Npts_radius_table,
+            num_threads=num_threads, use_cache=use_cache)
 
     def mc_unit_sphere(self, Npts, **kwargs):
         r""" Returns Npts random points on the unit sphere.
@@ -816,7 +835,7 @@ class NFWPhaseSpace(NFWProfile, MonteCarloGalProf):
         return MonteCarloGalProf.mc_radial_velocity(self,
             scaled_radius, total_mass, *concentration_array, **kwargs)
 
-    def mc_vel(self, table, seed=None):
+    def mc_vel(self, table, seed=None, random_stream_index=None):
         r""" Method assigns a Monte Carlo realization of the Jeans velocity
         solution to the halos in the input ``table``.
 
@@ -831,8 +850,12 @@ class NFWPhaseSpace(NFWProfile, MonteCarloGalProf):
             Random number seed used in the Monte Carlo realization.
             Default is None, which will produce stochastic results.
 
+        random_stream_index : array, optional
+            Integer array storing the index of each galaxy in the random streams.
+            Default is ``np.arange(len(table))``.
+
         """
-        MonteCarloGalProf.mc_vel(self, table, seed=seed)
+        MonteCarloGalProf.mc_vel(self, table, seed=seed, random_stream_index=random_stream_index)
 
     def mc_generate_nfw_phase_space_points(self, Ngals=int(1e4), conc=5, mass=1e12,
             verbose=True, seed=None):
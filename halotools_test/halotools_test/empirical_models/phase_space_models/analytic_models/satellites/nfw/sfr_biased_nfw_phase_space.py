@@ -92,6 +92,8 @@ class SFRBiasedNFWPhaseSpace(BiasedNFWPhaseSpace):
             galaxy bias parameter can be recovered in a likelihood analysis.
 
         profile_integration_tol : float, optional
+            Retained for backwards compatibility. The Jeans integral is evaluated
+            with a fixed-order quadrature whose accuracy does not depend on this argument.
             Default is 1e-5
 
         Examples
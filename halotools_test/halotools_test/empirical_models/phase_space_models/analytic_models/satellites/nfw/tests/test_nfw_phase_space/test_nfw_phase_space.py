@@ -4,9 +4,6 @@ do indeed trace an NFW profile.
 import numpy as np
 import pytest
 
-from ..test_nfw_profile import analytic_nfw_density_outer_shell_normalization
-from ..test_nfw_profile import monte_carlo_density_outer_shell_normalization
-
 from ...nfw_phase_space import NFWPhaseSpace
 
 __all__ = ['test_mc_dimensionless_radial_distance']
@@ -18,10 +15,10 @@ fixed_seed = 43
 def test_mc_dimensionless_radial_distance():
     r""" Method used to test `~halotools.empirical_models.NFWPhaseSpace._mc_dimensionless_radial_distance`.
 
-    Method uses the `~halotools.empirical_models.analytic_nfw_density_outer_shell_normalization` function
-    and the `~halotools.empirical_models.monte_carlo_density_outer_shell_normalization` function
-    to verify that the points returned by `~halotools.empirical_models.NFWPhaseSpace._mc_dimensionless_radial_distance`
-    do indeed trace an NFW profile.
+    Method compares the number of points returned by
+    `~halotools.empirical_models.NFWPhaseSpace._mc_dimensionless_radial_distance` in radial shells
+    to the expectation from `~halotools.empirical_models.NFWPhaseSpace.cumulative_gal_PDF`,
+    within the Poisson noise of the counts, to verify that the points do indeed trace an NFW profile.
 
     """
     nfw = NFWPhaseSpace()
@@ -31,9 +28,9 @@ def test_mc_dimensionless_radial_distance():
     c10 = np.zeros(Npts) + 10
     c15 = np.zeros(Npts) + 15
 
-    r5 = nfw._mc_dimensionless_radial_distance(c5, seed=43)
-    r10 = nfw._mc_dimensionless_radial_distance(c10, seed=43)
-    r15 = nfw._mc_dimensionless_radial_distance(c15, seed=43)
+    r5 = nfw._mc_dimensionless_radial_distance(c5, seed=fixed_seed)
+    r10 = nfw._mc_dimensionless_radial_distance(c10, seed=fixed_seed)
+    r15 = nfw._mc_dimensionless_radial_distance(c15, seed=fixed_seed)
 
     assert np.all(r15 <= 1)
     assert np.all(r15 >= 0)
@@ -49,10 +46,11 @@ def test_mc_dimensionless_radial_distance():
 
     num_rbins = 15
     rbins = np.linspace(0.05, 1, num_rbins)
+    conc_bins = nfw._conc_NFWmodel_lookup_table_bins
     for r, c in zip([r5, r10, r15], [5, 10, 15]):
-        rbin_midpoints, monte_carlo_ratio = (
-            monte_carlo_density_outer_shell_normalization(rbins, r))
-        analytical_ratio = (
-            analytic_nfw_density_outer_shell_normalization(rbin_midpoints, c))
-        assert np.allclose(monte_carlo_ratio, analytical_ratio, 0.05)
+        #  The radii are drawn from the profile tabulated at the next concentration of the lookup table
+        c_table = conc_bins[np.digitize(c, conc_bins, right=True)]
+        counts = np.histogram(r, bins=rbins)[0]
+        expected_counts = Npts*np.diff(nfw.cumulative_gal_PDF(rbins, c_table))
+        assert np.all(np.abs(counts - expected_counts) < 4*np.sqrt(expected_counts))
 
@@ -1,8 +1,12 @@
 """
 """
+import os
+import warnings
 import numpy as np
+from astropy.utils.misc import NumpyRNGContext
 
 from ...nfw_phase_space import NFWPhaseSpace
+from ..... import monte_carlo_helpers
 
 
 __all__ = ('test_constructor1', )
@@ -47,3 +51,92 @@ def test_constructor2():
     assert hasattr(nfw, 'logradius_array')
     assert hasattr(nfw, 'rad_prof_func_table')
     assert hasattr(nfw, 'vel_prof_func_table')
+
+
+def test_constructor3(monkeypatch, tmp_path):
+    r""" Test that lookup tables loaded from the cache agree with freshly built tables.
+    """
+    monkeypatch.setattr(monte_carlo_helpers, '_lookup_table_cache_dirname', str(tmp_path))
+    concentration_bins = np.linspace(5, 10, 4)
+    nfw = NFWPhaseSpace(concentration_bins=concentration_bins)
+    nfw.build_lookup_tables(use_cache=False)
+
+    nfw2 = NFWPhaseSpace(concentration_bins=concentration_bins)
+    nfw2.build_lookup_tables()
+    nfw3 = NFWPhaseSpace(concentration_bins=concentration_bins)
+    nfw3.build_lookup_tables()
+    assert isinstance(nfw3.rad_prof_spline_table[0], np.memmap)
+
+    for model in (nfw2, nfw3):
+        assert model.rad_prof_func_table.shape == (4, )
+        for table, table2 in zip(nfw.rad_prof_spline_table + nfw.vel_prof_spline_table,
+                model.rad_prof_spline_table + model.vel_prof_spline_table):
+            assert np.all(table == table2)
+
+    with NumpyRNGContext(fixed_seed):
+        scaled_radius = np.random.uniform(0, 1, 100)
+    conc = np.zeros(100) + 7.5
+    assert np.allclose(nfw._vrad_disp_from_lookup(scaled_radius, conc),
+        nfw3._vrad_disp_from_lookup(scaled_radius, conc))
+
+
+def test_constructor4():
+    r""" Test that lookup tables built on a pool of processes agree with the serial build.
+    """
+    nfw = NFWPhaseSpace(concentration_bins=np.linspace(5, 10, 5))
+    nfw.build_lookup_tables(use_cache=False)
+    nfw2 = NFWPhaseSpace(concentration_bins=np.linspace(5, 10, 5))
+    nfw2.build_lookup_tables(num_threads=2, use_cache=False)
+
+    for table, table2 in zip(nfw.rad_prof_spline_table + nfw.vel_prof_spline_table,
+            nfw2.rad_prof_spline_table + nfw2.vel_prof_spline_table):
+        assert np.all(table == table2)
+
+
+def test_constructor5(monkeypatch, tmp_path):
+    r""" Test that the lookup tables are rebuilt, with a warning, when the cache is not writable.
+    """
+    not_a_directory = tmp_path / 'not_a_directory'
+    not_a_directory.write_text(u'')
+    monkeypatch.setattr(monte_carlo_helpers, '_lookup_table_cache_dirname',
+        str(not_a_directory / 'lookup_tables'))
+
+    concentration_bins = np.linspace(5, 10, 3)
+    nfw = NFWPhaseSpace(concentration_bins=concentration_bins)
+    nfw.build_lookup_tables(use_cache=False)
+
+    nfw2 = NFWPhaseSpace(concentration_bins=concentration_bins)
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter("always")
+        nfw2.build_lookup_tables()
+        assert "could not be stored in the cache directory" in str(w[-1].message)
+
+    for table, table2 in zip(nfw.rad_prof_spline_table + nfw.vel_prof_spline_table,
+            nfw2.rad_prof_spline_table + nfw2.vel_prof_spline_table):
+        assert np.all(table == table2)
+
+
+def test_constructor6(monkeypatch, tmp_path):
+    r""" Test that corrupt or truncated lookup tables in the cache are rebuilt and replaced.
+    """
+    monkeypatch.setattr(monte_carlo_helpers, '_lookup_table_cache_dirname', str(tmp_path))
+    concentration_bins = np.linspace(5, 10, 3)
+    nfw = NFWPhaseSpace(concentration_bins=concentration_bins)
+    nfw.build_lookup_tables()
+
+    fnames = sorted(os.listdir(str(tmp_path)))
+    assert len(fnames) == 4
+    corrupt_fname, truncated_fname = (os.path.join(str(tmp_path), fname) for fname in fnames[:2])
+    with open(corrupt_fname, 'wb') as f:
+        f.write(b'not a numpy file')
+    with open(truncated_fname, 'r+b') as f:
+        f.truncate(os.path.getsize(truncated_fname) // 2)
+
+    for __ in range(2):
+        nfw2 = NFWPhaseSpace(concentration_bins=concentration_bins)
+        nfw2.build_lookup_tables()
+        for table, table2 in zip(nfw.rad_prof_spline_table + nfw.vel_prof_spline_table,
+                nfw2.rad_prof_spline_table + nfw2.vel_prof_spline_table):
+            assert np.all(table == table2)
+    assert isinstance(nfw2.rad_prof_spline_table[0], np.memmap)
+    assert sorted(os.listdir(str(tmp_path))) == fnames
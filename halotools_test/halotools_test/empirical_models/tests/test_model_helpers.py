@@ -7,6 +7,7 @@ from astropy.utils.misc import NumpyRNGContext
 from ..model_helpers import custom_spline, create_composite_dtype
 from ..model_helpers import enforce_periodicity_of_box
 from ..model_helpers import call_func_table, bind_default_kwarg_mixin_safe
+from ..model_helpers import spline_table_coefficients, call_spline_table
 
 from ...custom_exceptions import HalotoolsError
 
@@ -176,3 +177,42 @@ def test_call_func_table2():
 
 def test_call_func_table3():
     pass
+
+
+def test_call_spline_table1():
+    """ Compare the stacked spline table to calling each spline in a loop,
+    including points extrapolated beyond the knots.
+    """
+    x = np.linspace(-4, 0, 101)
+    f_table = list(custom_spline(x, np.sin(a*x) + x**2, k=3) for a in np.linspace(1, 3, 20))
+    spline_table = spline_table_coefficients(f_table)
+    assert spline_table[0].shape == (20, 99)
+    assert spline_table[1].shape == (20, 98, 4)
+
+    npts = int(1e4)
+    with NumpyRNGContext(fixed_seed):
+        abscissa = np.random.uniform(-4.5, 0.5, npts)
+        func_idx = np.random.randint(0, 20, npts)
+    correct_result = call_func_table(f_table, abscissa, func_idx)
+    result = call_spline_table(spline_table, abscissa, func_idx)
+    assert np.allclose(result, correct_result, rtol=1e-10, atol=1e-10)
+
+
+def test_call_spline_table2():
+    """ Splines with a degree lower than 3 are padded with zero coefficients.
+    """
+    x = np.linspace(0, 1, 3)
+    f_table = [custom_spline(x, x**2 + i, k=3) for i in range(2)]
+    spline_table = spline_table_coefficients(f_table)
+    abscissa = np.array((-0.5, 0.25, 0.75, 1.5))
+    result = call_spline_table(spline_table, abscissa, np.array((0, 1, 0, 1)))
+    assert np.allclose(result, abscissa**2 + np.array((0, 1, 0, 1)))
+
+
+def test_call_spline_table3():
+    """ Only spline objects can be stacked.
+    """
+    with pytest.raises(HalotoolsError) as err:
+        spline_table_coefficients([_func_maker(0)])
+    substr = "must be a spline object"
+    assert substr in err.value.args[0]
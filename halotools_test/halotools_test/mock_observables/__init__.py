@@ -11,7 +11,7 @@ from .pairwise_velocities import *
 from .isolation_functions import *
 from .void_statistics import *
 from .catalog_analysis_helpers import *
-from .pair_counters import (npairs_3d, npairs_projected, npairs_xy_z,
+from .pair_counters import (npairs_3d, npairs_projected, npairs_xy_z, PreparedSample,
     marked_npairs_3d, marked_npairs_xy_z)
 from .radial_profiles import *
 from .two_point_clustering import *
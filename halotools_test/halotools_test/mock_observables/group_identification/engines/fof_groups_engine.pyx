@@ -0,0 +1,214 @@
+# cython: language_level=2
+""" Module containing the Cython engine used by `~halotools.mock_observables.FoFGroups`
+to link points into friends-of-friends groups.
+"""
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+
+import numpy as np
+cimport numpy as cnp
+cimport cython
+from cython.parallel cimport prange, threadid
+
+__author__ = ('Andrew Hearin', 'Duncan Campbell')
+__all__ = ('fof_groups_engine', )
+
+
+cdef inline cnp.int64_t find_root(cnp.int64_t* parent, cnp.int64_t i) noexcept nogil:
+    """ Root of the tree containing ``i``, halving the path to the root along the way.
+    """
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+cdef inline void link(cnp.int64_t* parent, cnp.int64_t i, cnp.int64_t j) noexcept nogil:
+    """ Merge the trees containing ``i`` and ``j``. The larger root is attached to
+    the smaller one, so that the root of every tree is its smallest index.
+    """
+    i = find_root(parent, i)
+    j = find_root(parent, j)
+    if i < j:
+        parent[j] = i
+    elif j < i:
+        parent[i] = j
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+@cython.cdivision(True)
+def fof_groups_engine(double_mesh, x1in, y1in, z1in, d_perp, d_para, cell1_tuple, int num_threads):
+    r""" Cython engine linking points separated by less than ``d_perp`` in the xy-plane
+    and by less than ``d_para`` along z into friends-of-friends groups.
+
+    Linked pairs are merged into a union-find forest as they are found,
+    so the memory used is linear in the number of points rather than
+    in the number of linked pairs.
+
+    Parameters
+    ------------
+    double_mesh : object
+        Instance of `~halotools.mock_observables.RectangularDoubleMesh`
+        built on two copies of the same points, with search lengths
+        (d_perp, d_perp, d_para).
+
+    x1in, y1in, z1in : arrays
+        Numpy arrays storing Cartesian coordinates of the points.
+
+    d_perp, d_para : float
+        Linking lengths in the xy-plane and along z.
+
+    cell1_tuple : tuple
+        Two-element tuple defining the first and last cells in
+        double_mesh.mesh1 that will be looped over.
+
+    num_threads : int
+        Number of OpenMP threads. Each thread links pairs in its own forest,
+        and the forests are merged at the end. The loop runs serially if the
+        extension was compiled without OpenMP support.
+
+    Returns
+    --------
+    roots : array
+        Integer array of length len(x1in) storing, for each point,
+        the smallest index of the points in its group.
+
+    """
+    cdef cnp.float64_t d_perp_squared = d_perp*d_perp
+    cdef cnp.float64_t d_para_squared = d_para*d_para
+    cdef cnp.float64_t xperiod = double_mesh.xperiod
+    cdef cnp.float64_t yperiod = double_mesh.yperiod
+    cdef cnp.float64_t zperiod = double_mesh.zperiod
+    cdef cnp.int64_t first_cell1_element = cell1_tuple[0]
+    cdef cnp.int64_t last_cell1_element = cell1_tuple[1]
+    cdef int PBCs = double_mesh._PBCs
+
+    cdef cnp.int64_t npts = len(x1in)
+    cdef cnp.int64_t[:, :] forests = np.tile(np.arange(npts, dtype=np.int64), (num_threads, 1))
+    cdef cnp.int64_t* parent
+
+    cdef cnp.int64_t[:] idx1 = np.ascontiguousarray(double_mesh.mesh1.idx_sorted, dtype=np.int64)
+    cdef cnp.int64_t[:] idx2 = np.ascontiguousarray(double_mesh.mesh2.idx_sorted, dtype=np.int64)
+    cdef cnp.float64_t[:] x1 = np.ascontiguousarray(x1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] y1 = np.ascontiguousarray(y1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] z1 = np.ascontiguousarray(z1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] x2 = np.ascontiguousarray(x1in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] y2 = np.ascontiguousarray(y1in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] z2 = np.ascontiguousarray(z1in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+
+    cdef cnp.int64_t icell1, icell2
+    cdef cnp.int64_t[:] cell1_indices = np.ascontiguousarray(double_mesh.mesh1.cell_id_indices, dtype=np.int64)
+    cdef cnp.int64_t[:] cell2_indices = np.ascontiguousarray(double_mesh.mesh2.cell_id_indices, dtype=np.int64)
+
+    cdef cnp.int64_t ifirst1, ilast1, ifirst2, ilast2, i, j, i_orig
+
+    cdef int ix2, iy2, iz2, ix1, iy1, iz1
+    cdef int nonPBC_ix2, nonPBC_iy2, nonPBC_iz2
+
+    cdef int num_x2_covering_steps = int(np.ceil(
+        double_mesh.search_xlength / double_mesh.mesh2.xcell_size))
+    cdef int num_y2_covering_steps = int(np.ceil(
+        double_mesh.search_ylength / double_mesh.mesh2.ycell_size))
+    cdef int num_z2_covering_steps = int(np.ceil(
+        double_mesh.search_zlength / double_mesh.mesh2.zcell_size))
+
+    cdef int num_x1divs = double_mesh.mesh1.num_xdivs
+    cdef int num_y1divs = double_mesh.mesh1.num_ydivs
+    cdef int num_z1divs = double_mesh.mesh1.num_zdivs
+    cdef int num_x2divs = double_mesh.mesh2.num_xdivs
+    cdef int num_y2divs = double_mesh.mesh2.num_ydivs
+    cdef int num_z2divs = double_mesh.mesh2.num_zdivs
+    cdef int num_x2_per_x1 = num_x2divs // num_x1divs
+    cdef int num_y2_per_y1 = num_y2divs // num_y1divs
+    cdef int num_z2_per_z1 = num_z2divs // num_z1divs
+
+    cdef cnp.float64_t x2shift, y2shift, z2shift, dx, dy, dz
+    cdef cnp.float64_t x1tmp, y1tmp, z1tmp
+    cdef int tid
+
+    cdef cnp.int64_t[:] roots = np.empty(npts, dtype=np.int64)
+
+    with nogil:
+        for icell1 in prange(first_cell1_element, last_cell1_element,
+                schedule='dynamic', num_threads=num_threads):
+            parent = &forests[threadid(), 0]
+            ifirst1 = cell1_indices[icell1]
+            ilast1 = cell1_indices[icell1+1]
+
+            if ilast1 > ifirst1:
+
+                ix1 = icell1 // (num_y1divs*num_z1divs)
+                iy1 = (icell1 - ix1*num_y1divs*num_z1divs) // num_z1divs
+                iz1 = icell1 - (ix1*num_y1divs*num_z1divs) - (iy1*num_z1divs)
+
+                for nonPBC_ix2 in range(ix1*num_x2_per_x1 - num_x2_covering_steps,
+                        (ix1+1)*num_x2_per_x1 + num_x2_covering_steps):
+                    if nonPBC_ix2 < 0:
+                        x2shift = -xperiod*PBCs
+                        ix2 = nonPBC_ix2 + num_x2divs
+                    elif nonPBC_ix2 >= num_x2divs:
+                        x2shift = +xperiod*PBCs
+                        ix2 = nonPBC_ix2 - num_x2divs
+                    else:
+                        x2shift = 0.
+                        ix2 = nonPBC_ix2
+
+                    for nonPBC_iy2 in range(iy1*num_y2_per_y1 - num_y2_covering_steps,
+                            (iy1+1)*num_y2_per_y1 + num_y2_covering_steps):
+                        if nonPBC_iy2 < 0:
+                            y2shift = -yperiod*PBCs
+                            iy2 = nonPBC_iy2 + num_y2divs
+                        elif nonPBC_iy2 >= num_y2divs:
+                            y2shift = +yperiod*PBCs
+                            iy2 = nonPBC_iy2 - num_y2divs
+                        else:
+                            y2shift = 0.
+                            iy2 = nonPBC_iy2
+
+                        for nonPBC_iz2 in range(iz1*num_z2_per_z1 - num_z2_covering_steps,
+                                (iz1+1)*num_z2_per_z1 + num_z2_covering_steps):
+                            if nonPBC_iz2 < 0:
+                                z2shift = -zperiod*PBCs
+                                iz2 = nonPBC_iz2 + num_z2divs
+                            elif nonPBC_iz2 >= num_z2divs:
+                                z2shift = +zperiod*PBCs
+                                iz2 = nonPBC_iz2 - num_z2divs
+                            else:
+                                z2shift = 0.
+                                iz2 = nonPBC_iz2
+
+                            icell2 = ix2*(num_y2divs*num_z2divs) + iy2*num_z2divs + iz2
+                            ifirst2 = cell2_indices[icell2]
+                            ilast2 = cell2_indices[icell2+1]
+
+                            if ilast2 > ifirst2:
+                                for i in range(ifirst1, ilast1):
+                                    i_orig = idx1[i]
+                                    x1tmp = x1[i] - x2shift
+                                    y1tmp = y1[i] - y2shift
+                                    z1tmp = z1[i] - z2shift
+                                    for j in range(ifirst2, ilast2):
+                                        # each pair is found twice, so only link it
+                                        # when seen from the point with the smaller index
+                                        if idx2[j] <= i_orig:
+                                            continue
+                                        dz = z1tmp - z2[j]
+                                        if dz*dz > d_para_squared:
+                                            continue
+                                        dx = x1tmp - x2[j]
+                                        dy = y1tmp - y2[j]
+                                        if dx*dx + dy*dy <= d_perp_squared:
+                                            link(parent, i_orig, idx2[j])
+
+        # merge the forests of the other threads into the first one
+        parent = &forests[0, 0]
+        for tid in range(1, num_threads):
+            for i in range(npts):
+                if forests[tid, i] != i:
+                    link(parent, i, find_root(&forests[tid, 0], i))
+
+        for i in range(npts):
+            roots[i] = find_root(parent, i)
+
+    return np.asarray(roots)
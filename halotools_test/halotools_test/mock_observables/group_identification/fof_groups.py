@@ -5,9 +5,14 @@ identify friends-of-friends groups of points.
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 import numpy as np
-from scipy.sparse import csgraph, csr_matrix
+from scipy.sparse import csr_matrix
 
-from ..pair_counters.pairwise_distance_xy_z import pairwise_distance_xy_z
+from .engines import fof_groups_engine
+from ..pair_counters.pairwise_distance_xy_z import (pairwise_distance_xy_z,
+    _pairwise_distance_xy_z_process_args)
+from ..pair_counters.rectangular_mesh import RectangularDoubleMesh
+from ..pair_counters.mesh_helpers import _set_approximate_cell_sizes
+from ..pair_counters.cpairs import openmp_num_threads
 
 from ...custom_exceptions import HalotoolsError
 
@@ -68,11 +73,11 @@ class FoFGroups(object):
             length 3 array defining boundaries of the simulation box.
 
         num_threads : int, optional
-            Number of threads to use in calculation, where parallelization is performed
-            using the python ``multiprocessing`` module. Default is 1 for a purely serial
-            calculation, in which case a multiprocessing Pool object will
-            never be instantiated. A string 'max' may be used to indicate that
-            the pair counters should use all available cores on the machine.
+            Number of OpenMP threads used to link the points into groups.
+            Default is 1 for a purely serial calculation. A string 'max' may be
+            used to indicate that all available cores on the machine should be used.
+            The pairwise distance matrices used by the igraph methods are computed
+            with the python ``multiprocessing`` module using the same number of processes.
 
         Examples
         --------
@@ -162,12 +167,61 @@ class FoFGroups(object):
         self.n_gal = len(positions)/self.volume
         self.d_perp = self.b_perp/(self.n_gal**(1.0/3.0))
         self.d_para = self.b_para/(self.n_gal**(1.0/3.0))
-        self.m_perp, self.m_para = pairwise_distance_xy_z(
+        self.num_threads = num_threads
+
+        # link the points directly into groups, without storing the matrix of linked pairs
+        x1, y1, z1, __, __, __, __, d_perp, __, d_para, period, num_threads, PBCs, \
+            approx_cell_size, __ = _pairwise_distance_xy_z_process_args(
+                self.positions, self.positions, self.d_perp, self.d_para, self.period,
+                False, num_threads, None, None)
+        approx_x1cell_size, approx_y1cell_size, approx_z1cell_size = approx_cell_size
+        search_xlength, search_ylength, search_zlength = d_perp, d_perp, d_para
+        xperiod, yperiod, zperiod = period
+        double_mesh = RectangularDoubleMesh(x1, y1, z1, x1, y1, z1,
+            approx_x1cell_size, approx_y1cell_size, approx_z1cell_size,
+            approx_x1cell_size, approx_y1cell_size, approx_z1cell_size,
+            search_xlength, search_ylength, search_zlength, xperiod, yperiod, zperiod, PBCs)
+        cell1_tuple = (0, double_mesh.mesh1.ncells)
+        roots = fof_groups_engine(double_mesh, x1, y1, z1, d_perp, d_para,
+            cell1_tuple, openmp_num_threads(num_threads))
+        __, self._group_ids = np.unique(roots, return_inverse=True)
+        self._n_groups = int(self._group_ids.max()) + 1 if len(roots) > 0 else 0
+
+    def _pairwise_distances(self):
+        self._m_perp, self._m_para = pairwise_distance_xy_z(
             self.positions, self.positions, self.d_perp, self.d_para,
-            period=self.period, num_threads=num_threads)
+            period=self.period, num_threads=self.num_threads)
 
-        self.m = self.m_perp.multiply(self.m_perp)+self.m_para.multiply(self.m_para)
-        self.m = self.m.sqrt()
+    @property
+    def m_perp(self):
+        r"""
+        Sparse matrix of perpendicular distances between linked points,
+        computed the first time it is accessed.
+        """
+        if getattr(self, '_m_perp', None) is None:
+            self._pairwise_distances()
+        return self._m_perp
+
+    @property
+    def m_para(self):
+        r"""
+        Sparse matrix of parallel distances between linked points,
+        computed the first time it is accessed.
+        """
+        if getattr(self, '_m_para', None) is None:
+            self._pairwise_distances()
+        return self._m_para
+
+    @property
+    def m(self):
+        r"""
+        Sparse matrix of distances between linked points,
+        computed the first time it is accessed.
+        """
+        if getattr(self, '_m', None) is None:
+            m = self.m_perp.multiply(self.m_perp)+self.m_para.multiply(self.m_para)
+            self._m = m.sqrt()
+        return self._m
 
     @property
     def group_ids(self):
@@ -175,7 +229,7 @@ class FoFGroups(object):
         Determine integer IDs for groups.
 
         Each member of a group is assigned a unique integer ID that it shares with all
-        connected group members.
+        connected group members. Groups are numbered in order of their first member.
 
         Returns
         -------
@@ -183,9 +237,6 @@ class FoFGroups(object):
             array of group IDs for each galaxy
 
         """
-        if getattr(self, '_group_ids', None) is None:
-            self._n_groups, self._group_ids = csgraph.connected_components(
-                self.m_perp, directed=False, return_labels=True)
         return self._group_ids
 
     @property
@@ -199,9 +250,6 @@ class FoFGroups(object):
             number of distinct groups
 
         """
-        if getattr(self, '_n_groups', None) is None:
-            self._n_groups = csgraph.connected_components(self.m_perp,
-                directed=False, return_labels=False)
         return self._n_groups
 
     def create_graph(self):
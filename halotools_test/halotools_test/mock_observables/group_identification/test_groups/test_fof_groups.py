@@ -3,7 +3,7 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 import numpy as np
-from scipy.sparse import coo_matrix
+from scipy.sparse import coo_matrix, csgraph
 import pytest
 from astropy.utils.misc import NumpyRNGContext
 
@@ -17,7 +17,7 @@ except ImportError:
     print("igraph package not installed.  Some functions will not be available.")
 
 __all__ = ['test_fof_groups_init', 'test_fof_group_IDs',
-           'test_igraph_functionality']
+           'test_igraph_functionality', 'test_fof_group_IDs_agree_with_connected_components']
 
 # set random seed to get consistent behavior
 N = 1000
@@ -61,6 +61,25 @@ def test_fof_group_IDs():
     assert N_groups == fof_group.n_groups, "number of groups is incorrect"
 
 
+@pytest.mark.parametrize('num_threads', [1, 3])
+def test_fof_group_IDs_agree_with_connected_components(num_threads):
+    """ The union-find engine should give the same groups, in the same order,
+    as the connected components of the matrix of linked pairs.
+    """
+    with NumpyRNGContext(fixed_seed):
+        centers = np.random.random((50, 3))
+        members = centers[np.random.randint(0, 50, 2000)] + np.random.normal(0, 0.01, (2000, 3))
+        positions = np.mod(np.concatenate((members, np.random.random((500, 3)))), 1.)
+
+    fof_group = FoFGroups(positions, 0.2, 0.4, period=period, num_threads=num_threads)
+
+    n_groups, group_IDs = csgraph.connected_components(fof_group.m_perp,
+        directed=False, return_labels=True)
+    assert fof_group.n_groups == n_groups
+    assert np.all(fof_group.group_ids == group_IDs)
+    assert 1 < n_groups < len(positions)
+
+
 @pytest.mark.slow
 def test_igraph_functionality():
     """
@@ -89,7 +89,8 @@ def cylindrical_isolation(sample1, sample2, rp_max, pi_max, period=None,
         which will return reasonable result performance for most use-cases.
         Performance can vary sensitively with this parameter, so it is highly
         recommended that you experiment with this parameter when carrying out
-        performance-critical calculations.
+        performance-critical calculations. Set to 'auto' or 'auto_probe' to choose
+        the cell sizes as in `~halotools.mock_observables.pair_counters.npairs_3d`.
 
     approx_cell2_size : array_like, optional
         Analogous to ``approx_cell1_size``, but for ``sample2``.  See comments for
@@ -8,6 +8,8 @@ import numpy as np
 cimport numpy as cnp
 cimport cython
 from libc.math cimport ceil
+
+from ...pair_counters.mesh_helpers import _cell2_covering_offsets_by_distance
 from .isolation_criteria_marking_functions cimport (trivial, gt_cond, lt_cond,
     eq_cond, neq_cond, lg_cond, tg_cond)
 
@@ -117,9 +119,17 @@ def marked_spherical_isolation_engine(double_mesh, x1in, y1in, z1in, x2in, y2in,
     cdef int num_z2_covering_steps = int(np.ceil(
         double_mesh.search_zlength / double_mesh.mesh2.zcell_size))
 
-    cdef int leftmost_ix2, rightmost_ix2
-    cdef int leftmost_iy2, rightmost_iy2
-    cdef int leftmost_iz2, rightmost_iz2
+    cdef int leftmost_ix2, leftmost_iy2, leftmost_iz2
+
+    x2_offsets_tmp, y2_offsets_tmp, z2_offsets_tmp, gap_xy_sq_tmp, gap_z_sq_tmp = (
+        _cell2_covering_offsets_by_distance(double_mesh))
+    cdef cnp.int64_t[:] x2_offsets = x2_offsets_tmp
+    cdef cnp.int64_t[:] y2_offsets = y2_offsets_tmp
+    cdef cnp.int64_t[:] z2_offsets = z2_offsets_tmp
+    cdef cnp.float64_t[:] gap_xy_sq = gap_xy_sq_tmp
+    cdef cnp.float64_t[:] gap_z_sq = gap_z_sq_tmp
+    cdef int num_covering_cells = len(x2_offsets_tmp)
+    cdef int num_undecided
 
     cdef int num_x1divs = double_mesh.mesh1.num_xdivs
     cdef int num_y1divs = double_mesh.mesh1.num_ydivs
@@ -131,8 +141,9 @@ def marked_spherical_isolation_engine(double_mesh, x1in, y1in, z1in, x2in, y2in,
     cdef int num_y2_per_y1 = num_y2divs // num_y1divs
     cdef int num_z2_per_z1 = num_z2divs // num_z1divs
 
-    cdef cnp.float64_t x2shift, y2shift, z2shift, dx, dy, dz, dsq, weight
+    cdef cnp.float64_t x2shift, y2shift, z2shift, dx, dy, dz, dsq
     cdef cnp.float64_t x1tmp, y1tmp, z1tmp, r_max_squaredtmp
+    cdef cnp.float64_t gap_sq, max_r_max_squared
     cdef int Ni, Nj, i, j, k, l, current_data1_index
 
     cdef cnp.float64_t[:] x_icell1, x_icell2
@@ -164,11 +175,24 @@ def marked_spherical_isolation_engine(double_mesh, x1in, y1in, z1in, x2in, y2in,
             leftmost_iy2 = iy1*num_y2_per_y1 - num_y2_covering_steps
             leftmost_iz2 = iz1*num_z2_per_z1 - num_z2_covering_steps
 
-            rightmost_ix2 = (ix1+1)*num_x2_per_x1 + num_x2_covering_steps
-            rightmost_iy2 = (iy1+1)*num_y2_per_y1 + num_y2_covering_steps
-            rightmost_iz2 = (iz1+1)*num_z2_per_z1 + num_z2_covering_steps
-
-            for nonPBC_ix2 in range(leftmost_ix2, rightmost_ix2):
+            #points of cell1 are skipped once a neighbor has been found,
+            #and cell1 is done as soon as all of its points have one
+            num_undecided = Ni
+            max_r_max_squared = 0.
+            for i in range(0,Ni):
+                if r_max_squared[ifirst1+i] > max_r_max_squared:
+                    max_r_max_squared = r_max_squared[ifirst1+i]
+
+            #visit the covering cells of mesh2 in order of increasing distance from cell1
+            for k in range(num_covering_cells):
+                if num_undecided == 0:
+                    break
+                #no point of cell1 can have a neighbor in this or any later cell
+                gap_sq = gap_xy_sq[k] + gap_z_sq[k]
+                if gap_sq >= max_r_max_squared:
+                    break
+
+                nonPBC_ix2 = leftmost_ix2 + x2_offsets[k]
                 if nonPBC_ix2 < 0:
                     x2shift = -xperiod*PBCs
                 elif nonPBC_ix2 >= num_x2divs:
@@ -178,61 +202,63 @@ def marked_spherical_isolation_engine(double_mesh, x1in, y1in, z1in, x2in, y2in,
                 # Now apply the PBCs
                 ix2 = nonPBC_ix2 % num_x2divs
 
-                for nonPBC_iy2 in range(leftmost_iy2, rightmost_iy2):
-                    if nonPBC_iy2 < 0:
-                        y2shift = -yperiod*PBCs
-                    elif nonPBC_iy2 >= num_y2divs:
-                        y2shift = +yperiod*PBCs
-                    else:
-                        y2shift = 0.
-                    # Now apply the PBCs
-                    iy2 = nonPBC_iy2 % num_y2divs
-
-                    for nonPBC_iz2 in range(leftmost_iz2, rightmost_iz2):
-                        if nonPBC_iz2 < 0:
-                            z2shift = -zperiod*PBCs
-                        elif nonPBC_iz2 >= num_z2divs:
-                            z2shift = +zperiod*PBCs
-                        else:
-                            z2shift = 0.
-                        # Now apply the PBCs
-                        iz2 = nonPBC_iz2 % num_z2divs
-
-                        icell2 = ix2*(num_y2divs*num_z2divs) + iy2*num_z2divs + iz2
-                        ifirst2 = cell2_indices[icell2]
-                        ilast2 = cell2_indices[icell2+1]
-
-                        #extract the points in cell2
-                        x_icell2 = x2[ifirst2:ilast2]
-                        y_icell2 = y2[ifirst2:ilast2]
-                        z_icell2 = z2[ifirst2:ilast2]
-
-                        #extract the weights in cell2
-                        w_icell2 = weights2[ifirst2:ilast2,:]
-
-                        Nj = ilast2 - ifirst2
-                        #loop over points in cell1 points
-                        if Nj > 0:
-                            for i in range(0,Ni):
-                                current_data1_index = ifirst1 + i
-                                x1tmp = x_icell1[i] - x2shift
-                                y1tmp = y_icell1[i] - y2shift
-                                z1tmp = z_icell1[i] - z2shift
-                                r_max_squaredtmp = r_max_squared[ifirst1+i]
-
-                                #loop over points in cell2 points
-                                for j in range(0,Nj):
-                                    #calculate the square distance
-                                    dx = x1tmp - x_icell2[j]
-                                    dy = y1tmp - y_icell2[j]
-                                    dz = z1tmp - z_icell2[j]
-                                    dsq = dx*dx + dy*dy + dz*dz
-
-                                    weight = wfunc(&w_icell1[i,0], &w_icell2[j,0])
-
-                                    if (dsq < r_max_squaredtmp) & (weight == 1) & (dsq > 0.0):
-                                        has_neighbor[ifirst1+i] = 1
-                                        break
+                nonPBC_iy2 = leftmost_iy2 + y2_offsets[k]
+                if nonPBC_iy2 < 0:
+                    y2shift = -yperiod*PBCs
+                elif nonPBC_iy2 >= num_y2divs:
+                    y2shift = +yperiod*PBCs
+                else:
+                    y2shift = 0.
+                # Now apply the PBCs
+                iy2 = nonPBC_iy2 % num_y2divs
+
+                nonPBC_iz2 = leftmost_iz2 + z2_offsets[k]
+                if nonPBC_iz2 < 0:
+                    z2shift = -zperiod*PBCs
+                elif nonPBC_iz2 >= num_z2divs:
+                    z2shift = +zperiod*PBCs
+                else:
+                    z2shift = 0.
+                # Now apply the PBCs
+                iz2 = nonPBC_iz2 % num_z2divs
+
+                icell2 = ix2*(num_y2divs*num_z2divs) + iy2*num_z2divs + iz2
+                ifirst2 = cell2_indices[icell2]
+                ilast2 = cell2_indices[icell2+1]
+
+                #extract the points in cell2
+                x_icell2 = x2[ifirst2:ilast2]
+                y_icell2 = y2[ifirst2:ilast2]
+                z_icell2 = z2[ifirst2:ilast2]
+
+                #extract the weights in cell2
+                w_icell2 = weights2[ifirst2:ilast2,:]
+
+                Nj = ilast2 - ifirst2
+                #loop over points in cell1 points
+                if Nj > 0:
+                    for i in range(0,Ni):
+                        if has_neighbor[ifirst1+i] == 1:
+                            continue
+                        r_max_squaredtmp = r_max_squared[ifirst1+i]
+                        if gap_sq >= r_max_squaredtmp:
+                            continue
+                        x1tmp = x_icell1[i] - x2shift
+                        y1tmp = y_icell1[i] - y2shift
+                        z1tmp = z_icell1[i] - z2shift
+
+                        #loop over points in cell2 points
+                        for j in range(0,Nj):
+                            #calculate the square distance
+                            dx = x1tmp - x_icell2[j]
+                            dy = y1tmp - y_icell2[j]
+                            dz = z1tmp - z_icell2[j]
+                            dsq = dx*dx + dy*dy + dz*dz
+
+                            if (dsq < r_max_squaredtmp) & (dsq > 0.0) and wfunc(&w_icell1[i,0], &w_icell2[j,0]):
+                                has_neighbor[ifirst1+i] = 1
+                                num_undecided -= 1
+                                break
 
     #turn result into numpy array
     new_has_neighbor = np.array(has_neighbor)
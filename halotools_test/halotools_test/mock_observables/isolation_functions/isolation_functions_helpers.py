@@ -3,6 +3,7 @@ the isolation_functions sub-package.
 """
 import numpy as np
 
+from ..pair_counters.mesh_helpers import _expand_auto_cell_size, _is_auto_cell_size
 from ...custom_exceptions import HalotoolsError
 
 __all__ = ('_get_r_max', '_set_isolation_approx_cell_sizes')
@@ -37,10 +38,18 @@ def _get_r_max(sample1, r_max):
 
 def _set_isolation_approx_cell_sizes(approx_cell1_size, approx_cell2_size,
         xsearch_length, ysearch_length, zsearch_length):
+    """ Process the approximate cell sizes passed to the isolation functions.
+    Entries set to 'auto' or 'auto_probe' are kept as strings in a length-3 list,
+    and are resolved by `~halotools.mock_observables.pair_counters.RectangularDoubleMesh`
+    as in the pair counters.
     """
-    """
+    approx_cell1_size = _expand_auto_cell_size(approx_cell1_size, 3)
+    approx_cell2_size = _expand_auto_cell_size(approx_cell2_size, 3)
+
     if approx_cell1_size is None:
         approx_cell1_size = np.array([xsearch_length, ysearch_length, zsearch_length]).astype(float)
+    elif _is_auto_cell_size(approx_cell1_size):
+        approx_cell1_size = list(approx_cell1_size)
     else:
         approx_cell1_size = np.atleast_1d(approx_cell1_size)
         if len(approx_cell1_size) == 1:
@@ -48,13 +57,15 @@ def _set_isolation_approx_cell_sizes(approx_cell1_size, approx_cell2_size,
                 [approx_cell1_size[0], approx_cell1_size[0], approx_cell1_size[0]]).astype(float)
 
     try:
-        assert approx_cell1_size.shape == (3, )
+        assert np.shape(approx_cell1_size) == (3, )
     except:
         msg = ("Input ``approx_cell1_size`` must be a scalar or length-3 sequence.\n")
         raise ValueError(msg)
 
     if approx_cell2_size is None:
         approx_cell2_size = np.array([xsearch_length, ysearch_length, zsearch_length]).astype(float)
+    elif _is_auto_cell_size(approx_cell2_size):
+        approx_cell2_size = list(approx_cell2_size)
     else:
         approx_cell2_size = np.atleast_1d(approx_cell2_size)
         if len(approx_cell2_size) == 1:
@@ -62,7 +73,7 @@ def _set_isolation_approx_cell_sizes(approx_cell1_size, approx_cell2_size,
                 [approx_cell2_size[0], approx_cell2_size[0], approx_cell2_size[0]]).astype(float)
 
     try:
-        assert approx_cell2_size.shape == (3, )
+        assert np.shape(approx_cell2_size) == (3, )
     except:
         msg = ("Input ``approx_cell2_size`` must be a scalar or length-3 sequence.\n")
         raise ValueError(msg)
@@ -17,7 +17,8 @@ __all__ = ('test_agreement_with_unconditioned_calculation',
     'test_conditional_cylindrical_isolation_cond_func2',
     'test_conditional_cylindrical_isolation_cond_func3',
     'test_conditional_cylindrical_isolation_cond_func4',
-    'test_conditional_cylindrical_isolation_cond_func5')
+    'test_conditional_cylindrical_isolation_cond_func5',
+    'test_conditional_cylindrical_isolation_auto_cell_sizes')
 
 fixed_seed = 43
 
@@ -204,3 +205,25 @@ def test_conditional_cylindrical_isolation_cond_func5():
     marked_iso5 = conditional_cylindrical_isolation(sample1, sample2,
         rp_max, pi_max, marks1, marks2, cond_func, period=1)
     assert np.all(marked_iso5 == False)
+
+
+def test_conditional_cylindrical_isolation_auto_cell_sizes():
+    """ Verify that the `~halotools.mock_observables.conditional_cylindrical_isolation` function
+    returns the same result when the cell sizes are chosen automatically.
+    """
+    npts = 2000
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts, 3))
+        sample2 = np.random.random((npts, 3))
+        marks1 = np.random.random(npts)
+        marks2 = np.random.random(npts)
+    rp_max, pi_max = 0.03, 0.1
+    cond_func = 2
+
+    iso = conditional_cylindrical_isolation(sample1, sample2, rp_max, pi_max,
+        marks1, marks2, cond_func, period=1)
+    iso_auto = conditional_cylindrical_isolation(sample1, sample2, rp_max, pi_max,
+        marks1, marks2, cond_func, period=1,
+        approx_cell1_size='auto', approx_cell2_size='auto')
+    assert np.all(iso == iso_auto)
+    assert np.any(iso) and not np.all(iso)
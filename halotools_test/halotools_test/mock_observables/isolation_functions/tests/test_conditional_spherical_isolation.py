@@ -22,7 +22,8 @@ __all__ = ('test_agreement_with_unconditioned_calculation',
     'test_stellar_mass_conditional_spherical_isolation_correctness_cond_func3',
     'test_stellar_mass_conditional_spherical_isolation_correctness_cond_func4',
     'test_stellar_mass_conditional_spherical_isolation_correctness_cond_func5',
-    'test_stellar_mass_conditional_spherical_isolation_correctness_cond_func6')
+    'test_stellar_mass_conditional_spherical_isolation_correctness_cond_func6',
+    'test_conditional_spherical_isolation_auto_cell_sizes')
 
 fixed_seed = 43
 
@@ -525,3 +526,25 @@ def test_stellar_mass_conditional_spherical_isolation_correctness_cond_func6():
     iso = conditional_spherical_isolation(sample1, sample2,
         r_max, stellar_mass1, stellar_mass2, cond_func, period=1)
     assert np.all(iso == False)
+
+
+def test_conditional_spherical_isolation_auto_cell_sizes():
+    """ Verify that the `~halotools.mock_observables.conditional_spherical_isolation` function
+    returns the same result when the cell sizes are chosen automatically.
+    """
+    npts = 2000
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts, 3))
+        sample2 = np.random.random((npts, 3))
+        marks1 = np.random.random(npts)
+        marks2 = np.random.random(npts)
+    r_max = 0.05
+    cond_func = 2
+
+    iso = conditional_spherical_isolation(sample1, sample2, r_max,
+        marks1, marks2, cond_func, period=1)
+    iso_auto = conditional_spherical_isolation(sample1, sample2, r_max,
+        marks1, marks2, cond_func, period=1,
+        approx_cell1_size='auto', approx_cell2_size='auto')
+    assert np.all(iso == iso_auto)
+    assert np.any(iso) and not np.all(iso)
@@ -3,13 +3,15 @@
 from __future__ import (absolute_import, division, print_function)
 
 import numpy as np
+from astropy.utils.misc import NumpyRNGContext
 
 from ..cylindrical_isolation import cylindrical_isolation
 from ...tests.cf_helpers import generate_locus_of_3d_points, generate_3d_regular_mesh
 
 __all__ = ('test_cylindrical_isolation1', 'test_cylindrical_isolation2',
     'test_cylindrical_isolation3', 'test_cylindrical_isolation4',
-    'test_cylindrical_isolation5', 'test_cylindrical_isolation_indices')
+    'test_cylindrical_isolation5', 'test_cylindrical_isolation_indices',
+    'test_cylindrical_isolation_auto_cell_sizes')
 
 fixed_seed = 43
 
@@ -127,3 +129,23 @@ def test_cylindrical_isolation_indices():
     correct_result = np.ones(len(iso))
     correct_result[insertion_idx] = 0
     assert np.all(iso == correct_result)
+
+
+def test_cylindrical_isolation_auto_cell_sizes():
+    """ Verify that the `~halotools.mock_observables.cylindrical_isolation` function
+    returns the same result when the cell sizes are chosen automatically.
+    """
+    npts = 2000
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts, 3))
+        sample2 = np.random.random((npts, 3))
+    rp_max, pi_max = 0.03, 0.1
+
+    iso = cylindrical_isolation(sample1, sample2, rp_max, pi_max, period=1)
+    iso_auto = cylindrical_isolation(sample1, sample2, rp_max, pi_max, period=1,
+        approx_cell1_size='auto', approx_cell2_size='auto')
+    assert np.all(iso == iso_auto)
+
+    iso_auto = cylindrical_isolation(sample1, sample2, rp_max, pi_max,
+        approx_cell1_size=['auto', 0.1, 'auto_probe'])
+    assert np.all(cylindrical_isolation(sample1, sample2, rp_max, pi_max) == iso_auto)
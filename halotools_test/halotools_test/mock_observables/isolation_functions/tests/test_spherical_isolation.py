@@ -12,7 +12,8 @@ from ...tests.cf_helpers import generate_locus_of_3d_points, generate_3d_regular
 __all__ = ('test_spherical_isolation1', 'test_spherical_isolation2',
     'test_spherical_isolation3', 'test_spherical_isolation4',
     'test_spherical_isolation_grid1', 'test_spherical_isolation_grid2',
-    'test_shifted_randoms')
+    'test_shifted_randoms',
+    'test_spherical_isolation_auto_cell_sizes')
 
 fixed_seed = 43
 
@@ -151,3 +152,23 @@ def test_shifted_randoms():
     r_max = 2*epsilon
     iso = spherical_isolation(sample1, sample2, r_max)
     assert np.all(iso == False)
+
+
+def test_spherical_isolation_auto_cell_sizes():
+    """ Verify that the `~halotools.mock_observables.spherical_isolation` function
+    returns the same result when the cell sizes are chosen automatically.
+    """
+    npts = 2000
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.random((npts, 3))
+        sample2 = np.random.random((npts, 3))
+    r_max = 0.05
+
+    iso = spherical_isolation(sample1, sample2, r_max, period=1)
+    iso_auto = spherical_isolation(sample1, sample2, r_max, period=1,
+        approx_cell1_size='auto', approx_cell2_size='auto')
+    assert np.all(iso == iso_auto)
+
+    iso_auto = spherical_isolation(sample1, sample2, r_max,
+        approx_cell1_size=['auto', 0.1, 'auto_probe'])
+    assert np.all(spherical_isolation(sample1, sample2, r_max) == iso_auto)
@@ -1,6 +1,6 @@
 from __future__ import (absolute_import, division, print_function, unicode_literals)
 
-from .rectangular_mesh import RectangularDoubleMesh
+from .rectangular_mesh import RectangularDoubleMesh, PreparedSample
 from .rectangular_mesh_2d import RectangularDoubleMesh2D
 from .npairs_3d import npairs_3d
 from .npairs_projected import npairs_projected
@@ -3,13 +3,14 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 from .pairwise_distances import *
-from .npairs_3d_engine import npairs_3d_engine
-from .npairs_projected_engine import npairs_projected_engine
-from .npairs_xy_z_engine import npairs_xy_z_engine
+from .npairs_3d_engine import npairs_3d_engine, npairs_3d_engine_parallel
+from .npairs_projected_engine import npairs_projected_engine, npairs_projected_engine_parallel
+from .npairs_xy_z_engine import npairs_xy_z_engine, npairs_xy_z_engine_parallel
 from .npairs_jackknife_3d_engine import npairs_jackknife_3d_engine
-from .npairs_s_mu_engine import npairs_s_mu_engine
+from .npairs_s_mu_engine import npairs_s_mu_engine, npairs_s_mu_engine_parallel
 from .weighted_npairs_s_mu_engine import weighted_npairs_s_mu_engine
 from .npairs_per_object_3d_engine import npairs_per_object_3d_engine
 from .pairwise_distance_3d_engine import pairwise_distance_3d_engine
 from .pairwise_distance_xy_z_engine import pairwise_distance_xy_z_engine
 from .npairs_jackknife_xy_z_engine import npairs_jackknife_xy_z_engine
+from .parallel_helpers import openmp_num_threads
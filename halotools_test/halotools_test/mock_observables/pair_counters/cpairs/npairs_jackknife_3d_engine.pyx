@@ -9,7 +9,7 @@ cimport cython
 from libc.math cimport ceil
 
 __author__ = ('Andrew Hearin', 'Duncan Campbell')
-__all__ = ('npairs_jackknife_3d_engine', )
+__all__ = ('npairs_jackknife_3d_engine', 'jackknife_counts')
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
@@ -69,7 +69,11 @@ def npairs_jackknife_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
 
     cdef int Ncell1 = double_mesh.mesh1.ncells
     cdef int num_rbins = len(rbins)
-    cdef cnp.float64_t[:,:] counts = np.zeros((N_samples+1, num_rbins), dtype=np.float64)
+    cdef cnp.float64_t[:] counts = np.zeros(num_rbins, dtype=np.float64)
+    # weighted counts of the pairs in which point 1 (point 2) lies in each subvolume,
+    # from which all the leave-one-out counts follow (see jackknife_counts)
+    cdef cnp.float64_t[:,:] counts_by_tag1 = np.zeros((N_samples+1, num_rbins), dtype=np.float64)
+    cdef cnp.float64_t[:,:] counts_by_tag2 = np.zeros((N_samples+1, num_rbins), dtype=np.float64)
 
     cdef cnp.float64_t[:] x1 = np.ascontiguousarray(x1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
     cdef cnp.float64_t[:] y1 = np.ascontiguousarray(y1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
@@ -117,10 +121,9 @@ def npairs_jackknife_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
     cdef cnp.float64_t x1tmp, y1tmp, z1tmp
 
     cdef cnp.int64_t j1, j2
-    cdef cnp.float64_t w1, w2
+    cdef cnp.float64_t w1, w2, w12
 
     cdef int Ni, Nj, i, j, k, l
-    cdef cnp.int64_t s
 
     cdef cnp.float64_t[:] x_icell1, x_icell2
     cdef cnp.float64_t[:] y_icell1, y_icell2
@@ -223,69 +226,43 @@ def npairs_jackknife_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
 
                                     w2 = w_icell2[j]
                                     j2 = j_icell2[j]
+                                    w12 = w1*w2
 
-                                    for s in range(N_samples+1):
-                                        k = num_rbins-1
-                                        while dsq<=rbins_squared[k]:
-                                            counts[s,k] += jweight(s, j1, j2, w1, w2)
-                                            k=k-1
-                                            if k<0: break
+                                    k = num_rbins-1
+                                    while dsq<=rbins_squared[k]:
+                                        counts[k] += w12
+                                        counts_by_tag1[j1,k] += w12
+                                        counts_by_tag2[j2,k] += w12
+                                        k=k-1
+                                        if k<0: break
 
 
-    return np.array(counts)
+    return jackknife_counts(np.array(counts), np.array(counts_by_tag1), np.array(counts_by_tag2))
 
 
-cdef inline cnp.float64_t jweight(cnp.int64_t j, cnp.int64_t j1, cnp.int64_t j2,
-    cnp.float64_t w1, cnp.float64_t w2):
+def jackknife_counts(counts, counts_by_tag1, counts_by_tag2):
     """
-    Return the jackknife weighted count.
+    Leave-one-out counts from the total counts and the counts by subvolume of each point.
 
-    parameters
-    ----------
-    j : int
-        subsample being removed
-
-    j1 : int
-        integer label indicating which subsample point 1 occupies
-
-    j2 : int
-        integer label indicating which subsample point 2 occupies
+    When subvolume s is removed, the pairs with both points in s have weight zero and
+    the pairs with exactly one point in s half weight, so that
+    counts[s] = total - 0.5*(counts_by_tag1[s] + counts_by_tag2[s]).
+    The result is linear in the inputs, so it can be summed over parallel chunks.
 
-    w1 : float
-        weight associated with point 1
+    Parameters
+    ----------
+    counts : array
+        Total weighted counts, shape (num_bins...)
 
-    w2 : float
-        weight associated with point 2
+    counts_by_tag1, counts_by_tag2 : arrays
+        Weighted counts of the pairs with point 1 (point 2) in each subvolume,
+        shape (N_samples+1, num_bins...)
 
     Returns
     -------
-    w : double
-        0.0, w1*w2*0.5, or w1*w2
-
-    Notes
-    -----
-    We use the tag '0' to indicated we want to use the entire sample, i.e. no subsample
-    should be labeled with a '0'.
-
-    jackknife wiehgt is caclulated as follows:
-    if both points are inside the sample, return w1*w2
-    if both points are outside the sample, return 0.0
-    if one point is within and one point is outside the sample, return 0.5*w1*w2
+    counts : array
+        Array of shape (N_samples+1, num_bins...), the first row being the total counts
     """
-    cdef cnp.float64_t result
-    if j==0:
-        result = w1 * w2
-    # both outside the sub-sample
-    elif (j1 == j2) & (j1 == j):
-        result = 0.0
-    # both inside the sub-sample
-    elif (j1 != j) & (j2 != j):
-        result = (w1 * w2)
-    # only one inside the sub-sample
-    elif (j1 != j2) & ((j1 == j) | (j2 == j)):
-        result = 0.5*(w1 * w2)
-
+    result = counts - 0.5*(counts_by_tag1 + counts_by_tag2)
+    result[0] = counts
     return result
-
-
-
@@ -8,6 +8,8 @@ cimport numpy as cnp
 cimport cython
 from libc.math cimport ceil
 
+from .npairs_jackknife_3d_engine import jackknife_counts
+
 __author__ = ('Duncan Campbell', )
 __all__ = ('npairs_jackknife_xy_z_engine', )
 
@@ -76,7 +78,11 @@ def npairs_jackknife_xy_z_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in
     cdef int Ncell1 = double_mesh.mesh1.ncells
     cdef int num_rp_bins = len(rp_bins)
     cdef int num_pi_bins = len(pi_bins)
-    cdef cnp.float64_t[:,:,:] counts = np.zeros((N_samples+1, num_rp_bins, num_pi_bins), dtype=np.float64)
+    cdef cnp.float64_t[:,:] counts = np.zeros((num_rp_bins, num_pi_bins), dtype=np.float64)
+    # weighted counts of the pairs in which point 1 (point 2) lies in each subvolume,
+    # from which all the leave-one-out counts follow (see jackknife_counts)
+    cdef cnp.float64_t[:,:,:] counts_by_tag1 = np.zeros((N_samples+1, num_rp_bins, num_pi_bins), dtype=np.float64)
+    cdef cnp.float64_t[:,:,:] counts_by_tag2 = np.zeros((N_samples+1, num_rp_bins, num_pi_bins), dtype=np.float64)
 
     cdef cnp.float64_t[:] x1 = np.ascontiguousarray(x1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
     cdef cnp.float64_t[:] y1 = np.ascontiguousarray(y1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
@@ -124,10 +130,9 @@ def npairs_jackknife_xy_z_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in
     cdef cnp.float64_t x1tmp, y1tmp, z1tmp
 
     cdef cnp.int64_t j1, j2
-    cdef cnp.float64_t w1, w2
+    cdef cnp.float64_t w1, w2, w12
 
     cdef int Ni, Nj, i, j, k, l, g
-    cdef cnp.int64_t s
 
     cdef cnp.float64_t[:] x_icell1, x_icell2
     cdef cnp.float64_t[:] y_icell1, y_icell2
@@ -231,73 +236,19 @@ def npairs_jackknife_xy_z_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in
 
                                     w2 = w_icell2[j]
                                     j2 = j_icell2[j]
-
-                                    for s in range(N_samples+1):
-                                        k = num_rp_bins-1
-                                        while dxy_sq<=rp_bins_squared[k]:
-                                            g = num_pi_bins-1
-                                            while dz_sq<=pi_bins_squared[g]:
-                                                counts[s,k,g] += jweight(s, j1, j2, w1, w2)
-                                                g=g-1
-                                                if g<0: break
-                                            k=k-1
-                                            if k<0: break
-
-
-    return np.array(counts)
-
-
-cdef inline cnp.float64_t jweight(cnp.int64_t j, cnp.int64_t j1, cnp.int64_t j2,
-    cnp.float64_t w1, cnp.float64_t w2):
-    """
-    Return the jackknife weighted count.
-
-    parameters
-    ----------
-    j : int
-        subsample being removed
-
-    j1 : int
-        integer label indicating which subsample point 1 occupies
-
-    j2 : int
-        integer label indicating which subsample point 2 occupies
-
-    w1 : float
-        weight associated with point 1
-
-    w2 : float
-        weight associated with point 2
-
-    Returns
-    -------
-    w : double
-        0.0, w1*w2*0.5, or w1*w2
-
-    Notes
-    -----
-    We use the tag '0' to indicated we want to use the entire sample, i.e. no subsample
-    should be labeled with a '0'.
-
-    jackknife wiehgt is caclulated as follows:
-    if both points are inside the sample, return w1*w2
-    if both points are outside the sample, return 0.0
-    if one point is within and one point is outside the sample, return 0.5*w1*w2
-    """
-    cdef cnp.float64_t result
-    if j==0:
-        result = w1 * w2
-    # both outside the sub-sample
-    elif (j1 == j2) & (j1 == j):
-        result = 0.0
-    # both inside the sub-sample
-    elif (j1 != j) & (j2 != j):
-        result = (w1 * w2)
-    # only one inside the sub-sample
-    elif (j1 != j2) & ((j1 == j) | (j2 == j)):
-        result = 0.5*(w1 * w2)
-
-    return result
-
-
-
+                                    w12 = w1*w2
+
+                                    k = num_rp_bins-1
+                                    while dxy_sq<=rp_bins_squared[k]:
+                                        g = num_pi_bins-1
+                                        while dz_sq<=pi_bins_squared[g]:
+                                            counts[k,g] += w12
+                                            counts_by_tag1[j1,k,g] += w12
+                                            counts_by_tag2[j2,k,g] += w12
+                                            g=g-1
+                                            if g<0: break
+                                        k=k-1
+                                        if k<0: break
+
+
+    return jackknife_counts(np.array(counts), np.array(counts_by_tag1), np.array(counts_by_tag2))
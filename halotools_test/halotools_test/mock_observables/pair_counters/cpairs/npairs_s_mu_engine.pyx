@@ -6,11 +6,12 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 import numpy as np
 cimport numpy as cnp
 cimport cython
+from cython.parallel cimport prange, threadid
 from libc.math cimport ceil
 from libc.math cimport sqrt
 
 __author__ = ('Andrew Hearin', 'Duncan Campbell', 'Manodeep Sinha')
-__all__ = ('npairs_s_mu_engine', )
+__all__ = ('npairs_s_mu_engine', 'npairs_s_mu_engine_parallel')
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
@@ -236,4 +237,179 @@ def npairs_s_mu_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
     return np.array(counts_sum)
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+@cython.cdivision(True)
+def npairs_s_mu_engine_parallel(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in, s_bins_in, mu_bins_in,
+        cell1_tuple, int num_threads):
+    """ Same as `npairs_s_mu_engine`, but looping over the cells of mesh1 without the GIL
+    in ``num_threads`` OpenMP threads. Each thread fills its own histogram,
+    and the histograms are summed at the end.
+
+    Parameters
+    ------------
+    double_mesh, x1in, y1in, z1in, x2in, y2in, z2in, s_bins_in, mu_bins_in, cell1_tuple :
+        See `npairs_s_mu_engine`.
+
+    num_threads : int
+        Number of OpenMP threads. The loop runs serially if the extension
+        was compiled without OpenMP support.
+
+    Returns
+    --------
+    counts : array
+        Integer array of shape (len(s_bins), len(mu_bins)) giving the number of pairs
+        separated by less than the corresponding entries of ``s_bins`` and ``mu_bins``.
 
+    """
+    cdef cnp.float64_t[:] sqr_s_bins = s_bins_in * s_bins_in
+    cdef cnp.float64_t[:] sqr_mu_bins = mu_bins_in * mu_bins_in
+    cdef cnp.float64_t sqr_s_max = np.max(sqr_s_bins)
+    cdef cnp.float64_t sqr_mu_max = np.max(sqr_mu_bins)
+    cdef cnp.float64_t xperiod = double_mesh.xperiod
+    cdef cnp.float64_t yperiod = double_mesh.yperiod
+    cdef cnp.float64_t zperiod = double_mesh.zperiod
+    cdef cnp.int64_t first_cell1_element = cell1_tuple[0]
+    cdef cnp.int64_t last_cell1_element = cell1_tuple[1]
+    cdef int PBCs = double_mesh._PBCs
+
+    cdef int num_s_bins = len(sqr_s_bins)
+    cdef int num_mu_bins = len(sqr_mu_bins)
+    # flattened (s, mu) histograms, with rows padded by a cache line
+    # so that threads do not write to the same line
+    cdef cnp.int64_t[:, :] thread_counts = np.zeros(
+        (num_threads, num_s_bins*num_mu_bins + 8), dtype=np.int64)
+
+    cdef cnp.float64_t[:] x1 = np.ascontiguousarray(x1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] y1 = np.ascontiguousarray(y1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] z1 = np.ascontiguousarray(z1in[double_mesh.mesh1.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] x2 = np.ascontiguousarray(x2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] y2 = np.ascontiguousarray(y2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+    cdef cnp.float64_t[:] z2 = np.ascontiguousarray(z2in[double_mesh.mesh2.idx_sorted], dtype=np.float64)
+
+    cdef cnp.int64_t icell1, icell2
+    cdef cnp.int64_t[:] cell1_indices = np.ascontiguousarray(double_mesh.mesh1.cell_id_indices, dtype=np.int64)
+    cdef cnp.int64_t[:] cell2_indices = np.ascontiguousarray(double_mesh.mesh2.cell_id_indices, dtype=np.int64)
+
+    cdef cnp.int64_t ifirst1, ilast1, ifirst2, ilast2, i, j
+
+    cdef int ix2, iy2, iz2, ix1, iy1, iz1
+    cdef int nonPBC_ix2, nonPBC_iy2, nonPBC_iz2
+
+    cdef int num_x2_covering_steps = int(np.ceil(
+        double_mesh.search_xlength / double_mesh.mesh2.xcell_size))
+    cdef int num_y2_covering_steps = int(np.ceil(
+        double_mesh.search_ylength / double_mesh.mesh2.ycell_size))
+    cdef int num_z2_covering_steps = int(np.ceil(
+        double_mesh.search_zlength / double_mesh.mesh2.zcell_size))
+
+    cdef int num_x1divs = double_mesh.mesh1.num_xdivs
+    cdef int num_y1divs = double_mesh.mesh1.num_ydivs
+    cdef int num_z1divs = double_mesh.mesh1.num_zdivs
+    cdef int num_x2divs = double_mesh.mesh2.num_xdivs
+    cdef int num_y2divs = double_mesh.mesh2.num_ydivs
+    cdef int num_z2divs = double_mesh.mesh2.num_zdivs
+    cdef int num_x2_per_x1 = num_x2divs // num_x1divs
+    cdef int num_y2_per_y1 = num_y2divs // num_y1divs
+    cdef int num_z2_per_z1 = num_z2divs // num_z1divs
+
+    cdef cnp.float64_t x2shift, y2shift, z2shift, dx, dy, dz, dxy_sq, dz_sq
+    cdef cnp.float64_t x1tmp, y1tmp, z1tmp, sqr_s, sqr_mu
+    cdef int k, g, tid
+
+    with nogil:
+        for icell1 in prange(first_cell1_element, last_cell1_element,
+                schedule='dynamic', num_threads=num_threads):
+            tid = threadid()
+            ifirst1 = cell1_indices[icell1]
+            ilast1 = cell1_indices[icell1+1]
+
+            if ilast1 > ifirst1:
+
+                ix1 = icell1 // (num_y1divs*num_z1divs)
+                iy1 = (icell1 - ix1*num_y1divs*num_z1divs) // num_z1divs
+                iz1 = icell1 - (ix1*num_y1divs*num_z1divs) - (iy1*num_z1divs)
+
+                for nonPBC_ix2 in range(ix1*num_x2_per_x1 - num_x2_covering_steps,
+                        (ix1+1)*num_x2_per_x1 + num_x2_covering_steps):
+                    # C modulo of negative numbers is negative, so the periodic
+                    # images are computed explicitly
+                    if nonPBC_ix2 < 0:
+                        x2shift = -xperiod*PBCs
+                        ix2 = nonPBC_ix2 + num_x2divs
+                    elif nonPBC_ix2 >= num_x2divs:
+                        x2shift = +xperiod*PBCs
+                        ix2 = nonPBC_ix2 - num_x2divs
+                    else:
+                        x2shift = 0.
+                        ix2 = nonPBC_ix2
+
+                    for nonPBC_iy2 in range(iy1*num_y2_per_y1 - num_y2_covering_steps,
+                            (iy1+1)*num_y2_per_y1 + num_y2_covering_steps):
+                        if nonPBC_iy2 < 0:
+                            y2shift = -yperiod*PBCs
+                            iy2 = nonPBC_iy2 + num_y2divs
+                        elif nonPBC_iy2 >= num_y2divs:
+                            y2shift = +yperiod*PBCs
+                            iy2 = nonPBC_iy2 - num_y2divs
+                        else:
+                            y2shift = 0.
+                            iy2 = nonPBC_iy2
+
+                        for nonPBC_iz2 in range(iz1*num_z2_per_z1 - num_z2_covering_steps,
+                                (iz1+1)*num_z2_per_z1 + num_z2_covering_steps):
+                            if nonPBC_iz2 < 0:
+                                z2shift = -zperiod*PBCs
+                                iz2 = nonPBC_iz2 + num_z2divs
+                            elif nonPBC_iz2 >= num_z2divs:
+                                z2shift = +zperiod*PBCs
+                                iz2 = nonPBC_iz2 - num_z2divs
+                            else:
+                                z2shift = 0.
+                                iz2 = nonPBC_iz2
+
+                            icell2 = ix2*(num_y2divs*num_z2divs) + iy2*num_z2divs + iz2
+                            ifirst2 = cell2_indices[icell2]
+                            ilast2 = cell2_indices[icell2+1]
+
+                            if ilast2 > ifirst2:
+                                for i in range(ifirst1, ilast1):
+                                    x1tmp = x1[i] - x2shift
+                                    y1tmp = y1[i] - y2shift
+                                    z1tmp = z1[i] - z2shift
+                                    for j in range(ifirst2, ilast2):
+                                        #calculate the square distance
+                                        dx = x1tmp - x2[j]
+                                        dy = y1tmp - y2[j]
+                                        dz = z1tmp - z2[j]
+                                        dxy_sq = dx*dx + dy*dy
+                                        dz_sq = dz*dz
+
+                                        # transform to s and mu
+                                        sqr_s = dz_sq + dxy_sq
+                                        if sqr_s > sqr_s_max:
+                                            continue
+                                        if sqr_s > 0.0:
+                                            sqr_mu = dxy_sq/sqr_s
+                                        else:
+                                            sqr_mu = 0.0
+                                        if sqr_mu > sqr_mu_max:
+                                            continue
+
+                                        k = num_s_bins-2
+                                        while k != -1:
+                                            if sqr_s > sqr_s_bins[k]: break
+                                            k = k-1
+                                        g = num_mu_bins-2
+                                        while g != -1:
+                                            if sqr_mu > sqr_mu_bins[g]: break
+                                            g = g-1
+
+                                        # only counts pairs in that bin
+                                        thread_counts[tid, (k+1)*num_mu_bins + g+1] += 1
+
+    # adds counts for all bins where s < s_bin and mu < mu_bin
+    counts = np.sum(np.asarray(thread_counts)[:, :num_s_bins*num_mu_bins],
+        axis=0).reshape((num_s_bins, num_mu_bins))
+    return np.cumsum(np.cumsum(counts, axis=0), axis=1)
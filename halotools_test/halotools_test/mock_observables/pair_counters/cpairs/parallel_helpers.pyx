@@ -0,0 +1,33 @@
+# cython: language_level=2
+""" Module containing helper functions for the OpenMP variants of the pair-counting engines.
+"""
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+
+import numpy as np
+cimport cython
+from cython.parallel cimport prange, threadid
+
+__author__ = ('Andrew Hearin', )
+__all__ = ('openmp_num_threads', )
+
+_openmp_num_threads = {}
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def openmp_num_threads(int num_threads):
+    """ Number of threads actually used by an OpenMP loop requesting ``num_threads`` threads.
+    This is 1 if the extensions were compiled without OpenMP support,
+    in which case the ``_parallel`` engines run serially.
+    """
+    if num_threads in _openmp_num_threads:
+        return _openmp_num_threads[num_threads]
+
+    cdef int i
+    cdef int[:] used = np.zeros(num_threads, dtype=np.intc)
+    with nogil:
+        for i in prange(num_threads, num_threads=num_threads, schedule='static', chunksize=1):
+            used[threadid()] = 1
+    result = max(int(np.sum(used)), 1)
+    _openmp_num_threads[num_threads] = result
+    return result
@@ -1,12 +1,15 @@
 from distutils.extension import Extension
 import os
 
+from astropy_helpers.openmp_helpers import add_openmp_flags_if_available
+
 PATH_TO_PKG = os.path.relpath(os.path.dirname(__file__))
 SOURCES = ("distances.pyx", "pairwise_distances.pyx",
     "npairs_3d_engine.pyx", "npairs_projected_engine.pyx",
     "npairs_xy_z_engine.pyx", "npairs_jackknife_3d_engine.pyx", "npairs_s_mu_engine.pyx",
     "pairwise_distance_3d_engine.pyx", "pairwise_distance_xy_z_engine.pyx",
-    "weighted_npairs_s_mu_engine.pyx", "npairs_jackknife_xy_z_engine.pyx")
+    "weighted_npairs_s_mu_engine.pyx", "npairs_jackknife_xy_z_engine.pyx",
+    "parallel_helpers.pyx")
 THIS_PKG_NAME = '.'.join(__name__.split('.')[:-1])
 
 
@@ -21,11 +24,14 @@ def get_extensions():
 
     extensions = []
     for name, source in zip(names, sources):
-        extensions.append(Extension(name=name,
+        extension = Extension(name=name,
             sources=[source],
             include_dirs=include_dirs,
             libraries=libraries,
             language=language,
-            extra_compile_args=extra_compile_args))
+            extra_compile_args=extra_compile_args)
+        # the _parallel engines run serially if OpenMP is not available
+        add_openmp_flags_if_available(extension)
+        extensions.append(extension)
 
     return extensions
@@ -3,5 +3,5 @@ cimport numpy as cnp
 
 ##### declaration of user-defined custom marking function ####
 
-cdef cnp.float64_t custom_func(cnp.float64_t* w1, cnp.float64_t* w2)
+cdef cnp.float64_t custom_func(cnp.float64_t* w1, cnp.float64_t* w2) noexcept
 
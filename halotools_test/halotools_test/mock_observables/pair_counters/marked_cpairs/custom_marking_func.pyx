@@ -9,7 +9,7 @@ cimport numpy as cnp
 
 __author__ = ["Duncan Campbell"]
 
-cdef cnp.float64_t custom_func(cnp.float64_t* w1, cnp.float64_t* w2):
+cdef cnp.float64_t custom_func(cnp.float64_t* w1, cnp.float64_t* w2) noexcept:
     """
     Modify and use this function with weight_func_id=0 to get a custom function.
     """
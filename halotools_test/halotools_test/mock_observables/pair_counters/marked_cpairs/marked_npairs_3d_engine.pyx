@@ -9,60 +9,16 @@ cimport cython
 from libc.math cimport ceil
 
 from .marking_functions cimport *
-from .custom_marking_func cimport custom_func
 
 __author__ = ('Andrew Hearin', 'Duncan Campbell')
 __all__ = ('marked_npairs_3d_engine', )
 
-ctypedef double (*f_type)(cnp.float64_t* w1, cnp.float64_t* w2)
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.nonecheck(False)
-def marked_npairs_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
-    weights1in, weights2in, weight_func_idin, rbins, cell1_tuple):
-    """ Cython engine for counting pairs of points as a function of three-dimensional separation.
-
-    Parameters
-    ------------
-    double_mesh : object
-        Instance of `~halotools.mock_observables.RectangularDoubleMesh`
-
-    x1in, y1in, z1in : arrays
-        Numpy arrays storing Cartesian coordinates of points in sample 1
-
-    x2in, y2in, z2in : arrays
-        Numpy arrays storing Cartesian coordinates of points in sample 2
-
-    weights1in : array
-        Numpy array storing the weights for points in sample 1
-
-    weights2in : array
-        Numpy array storing the weights for points in sample 2
-
-    weight_func_id : int, optional
-        weighting function integer ID.
-
-    rbins : array
-        Boundaries defining the bins in which pairs are counted.
-
-    cell1_tuple : tuple
-        Two-element tuple defining the first and last cells in
-        double_mesh.mesh1 that will be looped over. Intended for use with
-        python multiprocessing.
-
-    Returns
-    --------
-    counts : array
-        Integer array of length len(rbins) giving the number of pairs
-        separated by a distance less than the corresponding entry of ``rbins``.
-
-    """
-    cdef int weight_func_id = weight_func_idin
-
-    cdef f_type wfunc
-    wfunc = return_weighting_function(weight_func_id)
-
+cdef object _marked_npairs_3d(marking_function* func, double_mesh,
+        x1in, y1in, z1in, x2in, y2in, z2in, weights1in, weights2in, rbins, cell1_tuple):
     cdef cnp.float64_t[:] rbins_squared = rbins*rbins
     cdef cnp.float64_t xperiod = double_mesh.xperiod
     cdef cnp.float64_t yperiod = double_mesh.yperiod
@@ -208,7 +164,10 @@ def marked_npairs_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
                                     dz = z1tmp - z_icell2[j]
                                     dsq = dx*dx + dy*dy + dz*dz
 
-                                    weight = wfunc(&w_icell1[i,0], &w_icell2[j,0])
+                                    # the weights are only needed for pairs within the search length
+                                    if dsq > rbins_squared[num_rbins-1]:
+                                        continue
+                                    weight = marking_weight(func, &w_icell1[i,0], &w_icell2[j,0])
                                     k = num_rbins-1
                                     while dsq <= rbins_squared[k]:
                                         counts[k] += weight
@@ -218,34 +177,97 @@ def marked_npairs_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
     return np.array(counts)
 
 
-cdef f_type return_weighting_function(weight_func_id):
-    """
-    returns a pointer to the user-specified weighting function.
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+def marked_npairs_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+    weights1in, weights2in, weight_func_idin, rbins, cell1_tuple):
+    """ Cython engine for counting pairs of points as a function of three-dimensional separation.
+
+    Parameters
+    ------------
+    double_mesh : object
+        Instance of `~halotools.mock_observables.RectangularDoubleMesh`
+
+    x1in, y1in, z1in : arrays
+        Numpy arrays storing Cartesian coordinates of points in sample 1
+
+    x2in, y2in, z2in : arrays
+        Numpy arrays storing Cartesian coordinates of points in sample 2
+
+    weights1in : array
+        Numpy array storing the weights for points in sample 1
+
+    weights2in : array
+        Numpy array storing the weights for points in sample 2
+
+    weight_func_id : int, optional
+        weighting function integer ID.
+
+    rbins : array
+        Boundaries defining the bins in which pairs are counted.
+
+    cell1_tuple : tuple
+        Two-element tuple defining the first and last cells in
+        double_mesh.mesh1 that will be looped over. Intended for use with
+        python multiprocessing.
+
+    Returns
+    --------
+    counts : array
+        Integer array of length len(rbins) giving the number of pairs
+        separated by a distance less than the corresponding entry of ``rbins``.
+
     """
+    cdef int weight_func_id = weight_func_idin
 
-    if weight_func_id==0:
-        return custom_func
-    elif weight_func_id==1:
-        return mweights
-    elif weight_func_id==2:
-        return sweights
-    elif weight_func_id==3:
-        return eqweights
-    elif weight_func_id==4:
-        return ineqweights
-    elif weight_func_id==5:
-        return gweights
-    elif weight_func_id==6:
-        return lweights
-    elif weight_func_id==7:
-        return tgweights
-    elif weight_func_id==8:
-        return tlweights
-    elif weight_func_id==9:
-        return tweights
-    elif weight_func_id==10:
-        return exweights
-    elif weight_func_id==11:
-        return ratio_weights
+    if weight_func_id == 0:
+        return _marked_npairs_3d(<CustomWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rbins, cell1_tuple)
+    elif weight_func_id == 1:
+        return _marked_npairs_3d(<MultiplicativeWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rbins, cell1_tuple)
+    elif weight_func_id == 2:
+        return _marked_npairs_3d(<SummedWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rbins, cell1_tuple)
+    elif weight_func_id == 3:
+        return _marked_npairs_3d(<EqualityWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rbins, cell1_tuple)
+    elif weight_func_id == 4:
+        return _marked_npairs_3d(<InequalityWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rbins, cell1_tuple)
+    elif weight_func_id == 5:
+        return _marked_npairs_3d(<GreaterThanWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rbins, cell1_tuple)
+    elif weight_func_id == 6:
+        return _marked_npairs_3d(<LessThanWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rbins, cell1_tuple)
+    elif weight_func_id == 7:
+        return _marked_npairs_3d(<GreaterThanToleranceWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rbins, cell1_tuple)
+    elif weight_func_id == 8:
+        return _marked_npairs_3d(<LessThanToleranceWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rbins, cell1_tuple)
+    elif weight_func_id == 9:
+        return _marked_npairs_3d(<ToleranceWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rbins, cell1_tuple)
+    elif weight_func_id == 10:
+        return _marked_npairs_3d(<ExclusionWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rbins, cell1_tuple)
+    elif weight_func_id == 11:
+        return _marked_npairs_3d(<RatioWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rbins, cell1_tuple)
     else:
         raise ValueError('marking function does not exist')
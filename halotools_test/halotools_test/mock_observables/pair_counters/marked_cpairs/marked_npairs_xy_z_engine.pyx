@@ -9,63 +9,16 @@ cimport cython
 from libc.math cimport ceil
 
 from .marking_functions cimport *
-from .custom_marking_func cimport custom_func
 
 __author__ = ('Andrew Hearin', 'Duncan Campbell')
 __all__ = ('marked_npairs_xy_z_engine', )
 
-ctypedef double (*f_type)(cnp.float64_t* w1, cnp.float64_t* w2)
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.nonecheck(False)
-def marked_npairs_xy_z_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
-    weights1in, weights2in, weight_func_idin, rp_bins, pi_bins, cell1_tuple):
-    r""" Cython engine for counting pairs of points
-    as a function of three-dimensional separation.
-
-    Parameters
-    ------------
-    double_mesh : object
-        Instance of `~halotools.mock_observables.RectangularDoubleMesh`
-
-    x1in, y1in, z1in : arrays
-        Numpy arrays storing Cartesian coordinates of points in sample 1
-
-    x2in, y2in, z2in : arrays
-        Numpy arrays storing Cartesian coordinates of points in sample 2
-
-    weight_func_id : int, optional
-        weighting function integer ID.
-
-    weights1in : array
-
-    weights2in : array
-
-    rp_bins : array_like
-        numpy array of boundaries defining the bins of separation in the xy-plane
-        :math:`r_{\rm p}` in which pairs are counted.
-
-    pi_bins : numpy.array
-        array defining parallel separation in which to sum the pair counts
-
-    cell1_tuple : tuple
-        Two-element tuple defining the first and last cells in
-        double_mesh.mesh1 that will be looped over. Intended for use with
-        python multiprocessing.
-
-    Returns
-    --------
-    counts : array
-        Integer array of length len(rp_bins) giving the number of pairs
-        separated by a distance less than the corresponding entry of ``rp_bins``.
-
-    """
-    cdef int weight_func_id = weight_func_idin
-
-    cdef f_type wfunc
-    wfunc = return_weighting_function(weight_func_id)
-
+cdef object _marked_npairs_xy_z(marking_function* func, double_mesh,
+        x1in, y1in, z1in, x2in, y2in, z2in, weights1in, weights2in, rp_bins, pi_bins, cell1_tuple):
     cdef cnp.float64_t[:] rp_bins_squared = rp_bins*rp_bins
     cdef cnp.float64_t[:] pi_bins_squared = pi_bins*pi_bins
     cdef cnp.float64_t xperiod = double_mesh.xperiod
@@ -214,7 +167,11 @@ def marked_npairs_xy_z_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
                                     dxy_sq = dx*dx + dy*dy
                                     dz_sq = dz*dz
 
-                                    weight = wfunc(&w_icell1[i,0], &w_icell2[j,0])
+                                    # the weights are only needed for pairs within the search lengths
+                                    if (dxy_sq > rp_bins_squared[num_rp_bins-1] or
+                                            dz_sq > pi_bins_squared[num_pi_bins-1]):
+                                        continue
+                                    weight = marking_weight(func, &w_icell1[i,0], &w_icell2[j,0])
                                     k = num_rp_bins-1
                                     while dxy_sq<=rp_bins_squared[k]:
                                         g = num_pi_bins-1
@@ -228,34 +185,100 @@ def marked_npairs_xy_z_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
     return np.array(counts)
 
 
-cdef f_type return_weighting_function(weight_func_id):
-    """
-    returns a pointer to the user-specified weighting function.
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+def marked_npairs_xy_z_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+    weights1in, weights2in, weight_func_idin, rp_bins, pi_bins, cell1_tuple):
+    r""" Cython engine for counting pairs of points
+    as a function of three-dimensional separation.
+
+    Parameters
+    ------------
+    double_mesh : object
+        Instance of `~halotools.mock_observables.RectangularDoubleMesh`
+
+    x1in, y1in, z1in : arrays
+        Numpy arrays storing Cartesian coordinates of points in sample 1
+
+    x2in, y2in, z2in : arrays
+        Numpy arrays storing Cartesian coordinates of points in sample 2
+
+    weight_func_id : int, optional
+        weighting function integer ID.
+
+    weights1in : array
+
+    weights2in : array
+
+    rp_bins : array_like
+        numpy array of boundaries defining the bins of separation in the xy-plane
+        :math:`r_{\rm p}` in which pairs are counted.
+
+    pi_bins : numpy.array
+        array defining parallel separation in which to sum the pair counts
+
+    cell1_tuple : tuple
+        Two-element tuple defining the first and last cells in
+        double_mesh.mesh1 that will be looped over. Intended for use with
+        python multiprocessing.
+
+    Returns
+    --------
+    counts : array
+        Integer array of length len(rp_bins) giving the number of pairs
+        separated by a distance less than the corresponding entry of ``rp_bins``.
+
     """
+    cdef int weight_func_id = weight_func_idin
 
-    if weight_func_id==0:
-        return custom_func
-    elif weight_func_id==1:
-        return mweights
-    elif weight_func_id==2:
-        return sweights
-    elif weight_func_id==3:
-        return eqweights
-    elif weight_func_id==4:
-        return ineqweights
-    elif weight_func_id==5:
-        return gweights
-    elif weight_func_id==6:
-        return lweights
-    elif weight_func_id==7:
-        return tgweights
-    elif weight_func_id==8:
-        return tlweights
-    elif weight_func_id==9:
-        return tweights
-    elif weight_func_id==10:
-        return exweights
-    elif weight_func_id==11:
-        return ratio_weights
+    if weight_func_id == 0:
+        return _marked_npairs_xy_z(<CustomWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rp_bins, pi_bins, cell1_tuple)
+    elif weight_func_id == 1:
+        return _marked_npairs_xy_z(<MultiplicativeWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rp_bins, pi_bins, cell1_tuple)
+    elif weight_func_id == 2:
+        return _marked_npairs_xy_z(<SummedWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rp_bins, pi_bins, cell1_tuple)
+    elif weight_func_id == 3:
+        return _marked_npairs_xy_z(<EqualityWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rp_bins, pi_bins, cell1_tuple)
+    elif weight_func_id == 4:
+        return _marked_npairs_xy_z(<InequalityWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rp_bins, pi_bins, cell1_tuple)
+    elif weight_func_id == 5:
+        return _marked_npairs_xy_z(<GreaterThanWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rp_bins, pi_bins, cell1_tuple)
+    elif weight_func_id == 6:
+        return _marked_npairs_xy_z(<LessThanWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rp_bins, pi_bins, cell1_tuple)
+    elif weight_func_id == 7:
+        return _marked_npairs_xy_z(<GreaterThanToleranceWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rp_bins, pi_bins, cell1_tuple)
+    elif weight_func_id == 8:
+        return _marked_npairs_xy_z(<LessThanToleranceWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rp_bins, pi_bins, cell1_tuple)
+    elif weight_func_id == 9:
+        return _marked_npairs_xy_z(<ToleranceWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rp_bins, pi_bins, cell1_tuple)
+    elif weight_func_id == 10:
+        return _marked_npairs_xy_z(<ExclusionWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rp_bins, pi_bins, cell1_tuple)
+    elif weight_func_id == 11:
+        return _marked_npairs_xy_z(<RatioWeights*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rp_bins, pi_bins, cell1_tuple)
     else:
         raise ValueError('marking function does not exist')
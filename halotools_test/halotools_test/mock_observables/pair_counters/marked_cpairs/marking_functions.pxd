@@ -1,16 +1,223 @@
 # cython: language_level=2
+"""
+Marking functions, defined inline here (rather than in the .pyx)
+so that the C compiler can inline them into the pair-counting loops.
+"""
 cimport numpy as cnp
+from libc.math cimport fabs
+
+from .custom_marking_func cimport custom_func
 
 ##### built-in weighting functions####
 
-cdef cnp.float64_t mweights(cnp.float64_t* w1, cnp.float64_t* w2)
-cdef cnp.float64_t sweights(cnp.float64_t* w1, cnp.float64_t* w2)
-cdef cnp.float64_t eqweights(cnp.float64_t* w1, cnp.float64_t* w2)
-cdef cnp.float64_t ineqweights(cnp.float64_t* w1, cnp.float64_t* w2)
-cdef cnp.float64_t gweights(cnp.float64_t* w1, cnp.float64_t* w2)
-cdef cnp.float64_t lweights(cnp.float64_t* w1, cnp.float64_t* w2)
-cdef cnp.float64_t tgweights(cnp.float64_t* w1, cnp.float64_t* w2)
-cdef cnp.float64_t tlweights(cnp.float64_t* w1, cnp.float64_t* w2)
-cdef cnp.float64_t tweights(cnp.float64_t* w1, cnp.float64_t* w2)
-cdef cnp.float64_t exweights(cnp.float64_t* w1, cnp.float64_t* w2)
-cdef cnp.float64_t ratio_weights(cnp.float64_t* w1, cnp.float64_t* w2)
+cdef inline cnp.float64_t mweights(cnp.float64_t* w1, cnp.float64_t* w2) noexcept nogil:
+    """
+    multiplicative weights
+    return w1[0]*w2[0]
+    id: 1
+    expects length 1 arrays
+    """
+    return w1[0]*w2[0]
+
+
+cdef inline cnp.float64_t sweights(cnp.float64_t* w1, cnp.float64_t* w2) noexcept nogil:
+    """
+    summed weights
+    return w1[0]+w2[0]
+    id: 2
+    expects length 1 arrays
+    """
+    return w1[0]+w2[0]
+
+
+cdef inline cnp.float64_t eqweights(cnp.float64_t* w1, cnp.float64_t* w2) noexcept nogil:
+    """
+    equality weights
+    return w1[1]*w2[1] if w1[0]==w2[0]
+    id: 3
+    expects length 2 arrays
+    """
+    if w1[0]==w2[0]:
+        return w1[1]*w2[1]
+    else:
+        return 0.0
+
+
+cdef inline cnp.float64_t ineqweights(cnp.float64_t* w1, cnp.float64_t* w2) noexcept nogil:
+    """
+    equality weights
+    return w1[1]*w2[1] if w1[0]!=w2[0]
+    id: 4
+    expects length 2 arrays
+    """
+    if w1[0]!=w2[0]:
+        return w1[1]*w2[1]
+    else:
+        return 0.0
+
+
+cdef inline cnp.float64_t gweights(cnp.float64_t* w1, cnp.float64_t* w2) noexcept nogil:
+    """
+    greater than weights
+    return w1[1]*w2[1] if w2[0]>w1[0]
+    id: 5
+    expects length 2 arrays
+    """
+    if w2[0]>w1[0]:
+        return w1[1]*w2[1]
+    else:
+        return 0.0
+
+
+cdef inline cnp.float64_t lweights(cnp.float64_t* w1, cnp.float64_t* w2) noexcept nogil:
+    """
+    less than weights
+    return w1[1]*w2[1] if w2[0]<w1[0]
+    id: 6
+    expects length 2 arrays
+    """
+    if w2[0]<w1[0]:
+        return w1[1]*w2[1]
+    else:
+        return 0.0
+
+
+cdef inline cnp.float64_t tgweights(cnp.float64_t* w1, cnp.float64_t* w2) noexcept nogil:
+    """
+    greater than tolerance weights
+    return w2[1] if w2[0]>(w1[0]+w1[1])
+    id: 7
+    expects length 2 arrays
+    """
+    if w2[0]>(w1[0]+w1[1]):
+        return w2[1]
+    else:
+        return 0.0
+
+
+cdef inline cnp.float64_t tlweights(cnp.float64_t* w1, cnp.float64_t* w2) noexcept nogil:
+    """
+    less than tolerance weights
+    return w2[1] if w2[0]<(w1[0]-w1[1])
+    id: 8
+    expects length 2 arrays
+    """
+    if w2[0]<(w1[0]+w1[1]):
+        return w2[1]
+    else:
+        return 0.0
+
+
+cdef inline cnp.float64_t tweights(cnp.float64_t* w1, cnp.float64_t* w2) noexcept nogil:
+    """
+    tolerance weights
+    return w2[1] if |w1[0]-w2[0]|<w1[1]
+    id: 9
+    expects length 2 arrays
+    """
+    if fabs(w1[0]-w2[0])<w1[1]:
+        return w2[1]
+    else:
+        return 0.0
+
+
+cdef inline cnp.float64_t exweights(cnp.float64_t* w1, cnp.float64_t* w2) noexcept nogil:
+    """
+    exclusion weights
+    return w2[1] if |w1[0]-w2[0]|>w1[1]
+    id: 10
+    expects length 2 arrays
+    """
+    if fabs(w1[0]-w2[0])>w1[1]:
+        return w2[1]
+    else:
+        return 0.0
+
+
+cdef inline cnp.float64_t ratio_weights(cnp.float64_t* w1, cnp.float64_t* w2) noexcept nogil:
+    """
+    ratio weights
+    return w2[1] if w2[0]>w1[1]*w1[0], 0 otherwise
+    id: 11
+    expects length 2 arrays
+    """
+    if w2[0] > w1[0]*w1[1]:
+        return w2[1]
+    else:
+        return 0.0
+
+
+# Types identifying the marking functions. The engines are fused over them, so that one
+# version of the pair-counting loop is compiled per function and the function ID is
+# resolved once per call instead of through a function pointer for every pair.
+cdef struct CustomWeights:
+    char unused
+cdef struct MultiplicativeWeights:
+    char unused
+cdef struct SummedWeights:
+    char unused
+cdef struct EqualityWeights:
+    char unused
+cdef struct InequalityWeights:
+    char unused
+cdef struct GreaterThanWeights:
+    char unused
+cdef struct LessThanWeights:
+    char unused
+cdef struct GreaterThanToleranceWeights:
+    char unused
+cdef struct LessThanToleranceWeights:
+    char unused
+cdef struct ToleranceWeights:
+    char unused
+cdef struct ExclusionWeights:
+    char unused
+cdef struct RatioWeights:
+    char unused
+
+ctypedef fused marking_function:
+    CustomWeights
+    MultiplicativeWeights
+    SummedWeights
+    EqualityWeights
+    InequalityWeights
+    GreaterThanWeights
+    LessThanWeights
+    GreaterThanToleranceWeights
+    LessThanToleranceWeights
+    ToleranceWeights
+    ExclusionWeights
+    RatioWeights
+
+
+cdef inline cnp.float64_t marking_weight(marking_function* func,
+                                         cnp.float64_t* w1,
+                                         cnp.float64_t* w2) noexcept:
+    """
+    Calls the marking function identified by the type of ``func``
+    (the pointer itself is not used).
+    """
+    if marking_function is CustomWeights:
+        return custom_func(w1, w2)
+    elif marking_function is MultiplicativeWeights:
+        return mweights(w1, w2)
+    elif marking_function is SummedWeights:
+        return sweights(w1, w2)
+    elif marking_function is EqualityWeights:
+        return eqweights(w1, w2)
+    elif marking_function is InequalityWeights:
+        return ineqweights(w1, w2)
+    elif marking_function is GreaterThanWeights:
+        return gweights(w1, w2)
+    elif marking_function is LessThanWeights:
+        return lweights(w1, w2)
+    elif marking_function is GreaterThanToleranceWeights:
+        return tgweights(w1, w2)
+    elif marking_function is LessThanToleranceWeights:
+        return tlweights(w1, w2)
+    elif marking_function is ToleranceWeights:
+        return tweights(w1, w2)
+    elif marking_function is ExclusionWeights:
+        return exweights(w1, w2)
+    else:
+        return ratio_weights(w1, w2)
@@ -9,9 +9,12 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 import numpy as np
 from copy import copy
 
+from .rectangular_mesh import _shift_coordinates
+
 __author__ = ['Duncan Campbell', 'Andrew Hearin']
 
-__all__ = ('_set_approximate_cell_sizes', '_cell1_parallelization_indices')
+__all__ = ('_set_approximate_cell_sizes', '_cell1_parallelization_indices',
+    '_cell2_covering_offsets_by_distance')
 
 
 def _enclose_in_box(x1, y1, z1, x2, y2, z2, min_size=None):
@@ -47,12 +50,8 @@ def _enclose_in_box(x1, y1, z1, x2, y2, z2, min_size=None):
     xyzmin = np.min([xmin, ymin, zmin])
     xyzmax = np.max([xmax, ymax, zmax])-xyzmin
 
-    x1 = x1 - xyzmin
-    y1 = y1 - xyzmin
-    z1 = z1 - xyzmin
-    x2 = x2 - xyzmin
-    y2 = y2 - xyzmin
-    z2 = z2 - xyzmin
+    x1, y1, z1 = _shift_coordinates(x1, y1, z1, xyzmin)
+    x2, y2, z2 = _shift_coordinates(x2, y2, z2, xyzmin)
 
     Lbox = np.array([xyzmax, xyzmax, xyzmax])
 
@@ -110,16 +109,42 @@ def _enclose_in_square(x1, y1, x2, y2, min_size=None):
     return x1, y1, x2, y2, Lbox
 
 
+def _expand_auto_cell_size(approx_cell_size, ndim):
+    """ Turns the string 'auto' (or 'auto_probe') into a list with one entry per dimension,
+    and checks that no other string is used.
+    """
+    if isinstance(approx_cell_size, str):
+        if approx_cell_size not in ('auto', 'auto_probe'):
+            msg = ("Input approximate cell sizes must be numbers, 'auto' or 'auto_probe'")
+            raise ValueError(msg)
+        return [approx_cell_size]*ndim
+    return approx_cell_size
+
+
+def _is_auto_cell_size(approx_cell_size):
+    """ Returns True if the input is a sequence containing 'auto' or 'auto_probe'.
+    """
+    return (isinstance(approx_cell_size, (list, tuple)) and
+        any(isinstance(size, str) for size in approx_cell_size))
+
+
 def _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period):
     """
     process the approximate cell size parameters.
     If either is set to None, apply default settings.
+    Either can also be 'auto' or 'auto_probe', in which case the cell sizes are chosen
+    by `~halotools.mock_observables.pair_counters.RectangularDoubleMesh`
+    (see `~halotools.mock_observables.pair_counters.mesh_tuning`).
     """
+    approx_cell1_size = _expand_auto_cell_size(approx_cell1_size, 3)
+    approx_cell2_size = _expand_auto_cell_size(approx_cell2_size, 3)
 
     #################################################
     # Set the approximate cell sizes of the trees
     if approx_cell1_size is None:
         approx_cell1_size = period/10.0
+    elif _is_auto_cell_size(approx_cell1_size):
+        pass
     else:
         approx_cell1_size = np.atleast_1d(approx_cell1_size)
         try:
@@ -132,6 +157,8 @@ def _set_approximate_cell_sizes(approx_cell1_size, approx_cell2_size, period):
 
     if approx_cell2_size is None:
         approx_cell2_size = copy(approx_cell1_size)
+    elif _is_auto_cell_size(approx_cell2_size):
+        pass
     else:
         approx_cell2_size = np.atleast_1d(approx_cell2_size)
         try:
@@ -221,6 +248,51 @@ def _cell1_parallelization_indices(ncells, num_threads):
         return num_threads, list_of_tuples
 
 
+
+def _cell2_covering_offsets_by_distance(double_mesh):
+    """ Return the cells of mesh2 covering any cell of mesh1, sorted by their distance
+    from the cell of mesh1. Engines that only need to find one neighbor per point,
+    such as the isolation engines, visit the cells of mesh2 in this order so that
+    neighbors are found as early as possible.
+
+    Parameters
+    -----------
+    double_mesh : object
+        Instance of `~halotools.mock_observables.RectangularDoubleMesh`
+
+    Returns
+    -------
+    x2_offsets, y2_offsets, z2_offsets : arrays
+        Integer arrays storing the index of each cell of mesh2 relative to the leftmost
+        covering cell, e.g., ``ix2 = ix1*num_x2_per_x1 - num_x2_covering_steps + x2_offsets``.
+
+    gap_xy_sq, gap_z_sq : arrays
+        Lower bounds on the squared xy-projected and z-separations between any point
+        in the cell of mesh1 and any point in the corresponding cell of mesh2.
+        Cells are sorted by ``gap_xy_sq + gap_z_sq``.
+    """
+    offsets, gaps = [], []
+    for dim in ('x', 'y', 'z'):
+        cell_size = getattr(double_mesh.mesh2, dim + 'cell_size')
+        num_covering_steps = int(np.ceil(getattr(double_mesh, 'search_' + dim + 'length')/cell_size))
+        num_2_per_1 = (getattr(double_mesh.mesh2, 'num_' + dim + 'divs') //
+            getattr(double_mesh.mesh1, 'num_' + dim + 'divs'))
+        dim_offsets = np.arange(num_2_per_1 + 2*num_covering_steps)
+        num_cells_between = np.maximum(0, np.maximum(num_covering_steps - dim_offsets - 1,
+            dim_offsets - num_covering_steps - num_2_per_1))
+        offsets.append(dim_offsets)
+        # shrink the gaps slightly so that roundoff never rejects a neighbor
+        gaps.append(num_cells_between*cell_size*(1. - 1e-10))
+
+    x2_offsets, y2_offsets, z2_offsets = (a.flatten() for a in np.meshgrid(*offsets, indexing='ij'))
+    xgaps, ygaps, zgaps = (a.flatten() for a in np.meshgrid(*gaps, indexing='ij'))
+    gap_xy_sq = xgaps*xgaps + ygaps*ygaps
+    gap_z_sq = zgaps*zgaps
+
+    idx_sorted = np.argsort(gap_xy_sq + gap_z_sq, kind='mergesort')
+    return (x2_offsets[idx_sorted].astype(np.int64), y2_offsets[idx_sorted].astype(np.int64),
+        z2_offsets[idx_sorted].astype(np.int64), gap_xy_sq[idx_sorted], gap_z_sq[idx_sorted])
+
 def _enforce_maximum_search_length(search_length, period=None):
     """ The `~halotools.mock_observables.pair_counters.RectangularDoubleMesh`
     algorithm requires that the search length cannot exceed period/3 in any dimension.
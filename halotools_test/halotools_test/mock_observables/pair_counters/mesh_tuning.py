@@ -0,0 +1,216 @@
+""" Module containing the automatic choice of the cell sizes of
+`~halotools.mock_observables.pair_counters.RectangularDoubleMesh`,
+used when the pair counters are called with ``approx_cell1_size='auto'``.
+
+The cell sizes are chosen by minimizing a cost model of the pair counting engines
+over the mesh geometries allowed by `RectangularDoubleMesh`. With ``'auto_probe'``,
+the best few geometries of the cost model are then timed on a slab of the data.
+The choice is cached per (Npts1, Npts2, period, search length) signature.
+"""
+import numpy as np
+from time import time
+
+from .rectangular_mesh import (RectangularDoubleMesh, sample1_cell_size, sample2_cell_sizes,
+    default_max_cells_per_dimension_cell1, default_max_cells_per_dimension_cell2)
+
+__all__ = ('pair_counting_cost', 'auto_cell_sizes')
+__author__ = ('Andrew Hearin', )
+
+auto_cell_size_options = ('auto', 'auto_probe')
+
+# Costs of the engine overheads in units of the cost of one distance evaluation,
+# fitted to timings of npairs_3d_engine on uniform samples.
+cost_per_cell2_visit = 27.
+cost_per_point_per_cell2 = 1.4
+
+num_probed_geometries = 3
+num_probe_points = 2000
+max_cached_signatures = 128
+_auto_cell_size_cache = {}
+
+
+def is_auto_cell_size(approx_cell_size):
+    """ Returns True if the input requests the automatic choice of cell sizes.
+    """
+    return isinstance(approx_cell_size, str) and approx_cell_size in auto_cell_size_options
+
+
+def mesh_cell_sizes(period, search_length, approx_cell1_size, approx_cell2_size,
+        max_cells_per_dimension_cell1=default_max_cells_per_dimension_cell1,
+        max_cells_per_dimension_cell2=default_max_cells_per_dimension_cell2):
+    """ Actual sizes of the cells of mesh1 and mesh2 in one dimension,
+    as chosen by `RectangularDoubleMesh` for the input approximate sizes.
+    """
+    cell1_size = sample1_cell_size(period, search_length, approx_cell1_size,
+        max_cells_per_dimension=max_cells_per_dimension_cell1)
+    cell2_size = sample2_cell_sizes(period, cell1_size, approx_cell2_size,
+        max_cells_per_dimension=max_cells_per_dimension_cell2)
+    return cell1_size, cell2_size
+
+
+def pair_counting_cost(npts1, npts2, periods, search_lengths, cell1_sizes, cell2_sizes):
+    """ Cost of a pair count with the input mesh geometry, in units of distance evaluations,
+    assuming the points are uniformly distributed.
+
+    For each non-empty cell of mesh1, the engines visit the block of cells of mesh2
+    covering the cell plus the search length on each side, and compute the distance
+    of every pair of points in the two cells. The cost is the number of distance evaluations
+    plus the overheads of visiting a cell of mesh2 and of looping over the points of
+    mesh1 for each non-empty cell of mesh2.
+
+    Parameters
+    ----------
+    npts1, npts2 : int
+        Number of points in the two samples.
+
+    periods, search_lengths, cell1_sizes, cell2_sizes : length-3 sequences
+        Box size, search length and (actual) cell sizes of the two meshes in each dimension.
+
+    Returns
+    -------
+    cost : float
+    """
+    periods, search_lengths, cell1_sizes, cell2_sizes = (np.asarray(x, dtype=float)
+        for x in (periods, search_lengths, cell1_sizes, cell2_sizes))
+    num_cell2_per_cell1 = np.round(cell1_sizes / cell2_sizes)
+    covering_steps = np.ceil(search_lengths / cell2_sizes)
+    visited_cells_per_dimension = num_cell2_per_cell1 + 2*covering_steps
+    num_visited_cells = np.prod(visited_cells_per_dimension)
+    visited_volume = np.prod(visited_cells_per_dimension*cell2_sizes)
+
+    num_cells1 = np.prod(np.round(periods / cell1_sizes))
+    num_cells2 = np.prod(np.round(periods / cell2_sizes))
+    num_nonempty_cells1 = num_cells1*(1. - np.exp(-npts1/num_cells1))
+    fraction_nonempty_cells2 = 1. - np.exp(-npts2/num_cells2)
+
+    num_distances = npts1*npts2*visited_volume/np.prod(periods)
+    return (num_distances +
+        cost_per_cell2_visit*num_nonempty_cells1*num_visited_cells +
+        cost_per_point_per_cell2*npts1*num_visited_cells*fraction_nonempty_cells2)
+
+
+def candidate_cell_sizes(periods, search_lengths, approx_cell1_sizes, approx_cell2_sizes,
+        max_cells_per_dimension_cell1=default_max_cells_per_dimension_cell1,
+        max_cells_per_dimension_cell2=default_max_cells_per_dimension_cell2):
+    """ Distinct mesh geometries allowed by `RectangularDoubleMesh`, as a list of
+    (approx_cell1_sizes, approx_cell2_sizes, cell1_sizes, cell2_sizes) tuples.
+    Cells of mesh1 are at least as large as the search length, so the candidates range
+    from there to a third of the box, each divided into 1 or more cells of mesh2.
+    Cell sizes that are not 'auto' are kept fixed.
+    """
+    max_ratio = max(p/(3.*s) for p, s in zip(periods, search_lengths))
+    ratios = np.unique(np.append(np.geomspace(1., max(max_ratio, 1.), 20), max_ratio))
+    ratios = ratios[ratios >= 1.]
+    num_divs = np.arange(1, max_cells_per_dimension_cell2 // 3 + 1)
+
+    candidates = {}
+    for ratio in ratios:
+        for ndivs in num_divs:
+            approx1, approx2, cell1_sizes, cell2_sizes = [], [], [], []
+            for d, (period, search_length) in enumerate(zip(periods, search_lengths)):
+                a1 = approx_cell1_sizes[d]
+                if is_auto_cell_size(a1):
+                    a1 = min(ratio*search_length, period/3.)
+                c1 = sample1_cell_size(period, search_length, a1,
+                    max_cells_per_dimension=max_cells_per_dimension_cell1)
+                a2 = approx_cell2_sizes[d]
+                if is_auto_cell_size(a2):
+                    a2 = c1/ndivs
+                c1, c2 = mesh_cell_sizes(period, search_length, a1, a2,
+                    max_cells_per_dimension_cell1, max_cells_per_dimension_cell2)
+                approx1.append(a1)
+                approx2.append(a2)
+                cell1_sizes.append(c1)
+                cell2_sizes.append(c2)
+            key = tuple(cell1_sizes) + tuple(cell2_sizes)
+            candidates.setdefault(key, (approx1, approx2, cell1_sizes, cell2_sizes))
+    return list(candidates.values())
+
+
+def probe_time_per_point(x1, y1, z1, x2, y2, z2, approx_cell1_sizes, approx_cell2_sizes,
+        search_lengths, periods, PBCs):
+    """ Time per point of sample1 of counting pairs with the input cell sizes,
+    measured by running `npairs_3d_engine` over a slab of cells of mesh1 holding
+    about ``num_probe_points`` points.
+    """
+    from .cpairs import npairs_3d_engine
+
+    double_mesh = RectangularDoubleMesh(x1, y1, z1, x2, y2, z2,
+        approx_cell1_sizes[0], approx_cell1_sizes[1], approx_cell1_sizes[2],
+        approx_cell2_sizes[0], approx_cell2_sizes[1], approx_cell2_sizes[2],
+        search_lengths[0], search_lengths[1], search_lengths[2],
+        periods[0], periods[1], periods[2], PBCs)
+    cell_id_indices = double_mesh.mesh1.cell_id_indices
+    npts1 = cell_id_indices[-1]
+    first_point = max(npts1//2 - num_probe_points//2, 0)
+    first_cell = np.searchsorted(cell_id_indices, first_point, side='right') - 1
+    last_cell = np.searchsorted(cell_id_indices, first_point + num_probe_points, side='left')
+    last_cell = min(max(last_cell, first_cell + 1), double_mesh.mesh1.ncells)
+    num_points = cell_id_indices[last_cell] - cell_id_indices[first_cell]
+
+    rbins = np.array([0., np.max(search_lengths)])
+    start = time()
+    npairs_3d_engine(double_mesh, x1, y1, z1, x2, y2, z2, rbins, (first_cell, last_cell))
+    return (time() - start)/max(num_points, 1)
+
+
+def auto_cell_sizes(x1, y1, z1, x2, y2, z2, approx_cell1_sizes, approx_cell2_sizes,
+        search_lengths, periods, PBCs=True,
+        max_cells_per_dimension_cell1=default_max_cells_per_dimension_cell1,
+        max_cells_per_dimension_cell2=default_max_cells_per_dimension_cell2):
+    """ Chooses the approximate cell sizes of `RectangularDoubleMesh`
+    that minimize the cost of counting pairs between the two samples.
+
+    Parameters
+    ----------
+    x1, y1, z1, x2, y2, z2 : arrays
+        Positions of the points of the two samples.
+
+    approx_cell1_sizes, approx_cell2_sizes : length-3 sequences
+        Approximate cell sizes in each dimension, either floats, which are kept fixed,
+        or 'auto' (choose from the cost model) or 'auto_probe' (choose between the best
+        ``num_probed_geometries`` of the cost model by timing them).
+
+    search_lengths, periods : length-3 sequences
+
+    PBCs : bool, optional
+
+    Returns
+    -------
+    approx_cell1_sizes, approx_cell2_sizes : lists
+        Length-3 lists of floats.
+    """
+    approx_cell_sizes = list(approx_cell1_sizes) + list(approx_cell2_sizes)
+    if any(isinstance(size, str) and not is_auto_cell_size(size) for size in approx_cell_sizes):
+        msg = ("Input approximate cell sizes must be numbers, 'auto' or 'auto_probe'")
+        raise ValueError(msg)
+    probe = 'auto_probe' in approx_cell_sizes
+    npts1, npts2 = len(x1), len(x2)
+    signature = (npts1, npts2, tuple(map(float, periods)), tuple(map(float, search_lengths)),
+        bool(PBCs),
+        tuple(map(str, approx_cell1_sizes)), tuple(map(str, approx_cell2_sizes)),
+        max_cells_per_dimension_cell1, max_cells_per_dimension_cell2)
+    try:
+        approx1, approx2 = _auto_cell_size_cache[signature]
+        return list(approx1), list(approx2)
+    except KeyError:
+        pass
+
+    candidates = candidate_cell_sizes(periods, search_lengths,
+        approx_cell1_sizes, approx_cell2_sizes,
+        max_cells_per_dimension_cell1, max_cells_per_dimension_cell2)
+    costs = [pair_counting_cost(npts1, npts2, periods, search_lengths, c1, c2)
+        for _, _, c1, c2 in candidates]
+    order = np.argsort(costs, kind='stable')
+    best = candidates[order[0]]
+
+    if probe and len(candidates) > 1 and npts1 > 0 and npts2 > 0:
+        probed = [candidates[i] for i in order[:num_probed_geometries]]
+        times = [probe_time_per_point(x1, y1, z1, x2, y2, z2, approx1, approx2,
+            search_lengths, periods, PBCs) for approx1, approx2, _, _ in probed]
+        best = probed[int(np.argmin(times))]
+
+    if len(_auto_cell_size_cache) >= max_cached_signatures:
+        _auto_cell_size_cache.pop(next(iter(_auto_cell_size_cache)))
+    _auto_cell_size_cache[signature] = (best[0], best[1])
+    return list(best[0]), list(best[1])
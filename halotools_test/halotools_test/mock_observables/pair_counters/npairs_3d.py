@@ -8,7 +8,7 @@ from functools import partial
 
 from .rectangular_mesh import RectangularDoubleMesh
 from .mesh_helpers import _set_approximate_cell_sizes, _enclose_in_box, _cell1_parallelization_indices
-from .cpairs import npairs_3d_engine
+from .cpairs import npairs_3d_engine, npairs_3d_engine_parallel, openmp_num_threads
 from ...utils.array_utils import array_is_monotonic, custom_len
 
 
@@ -56,10 +56,10 @@ def npairs_3d(sample1, sample2, rbins, period=None,
         period is assumed to be the same in all Cartesian directions.
 
     num_threads : int, optional
-        Number of threads to use in calculation, where parallelization is performed
-        using the python ``multiprocessing`` module. Default is 1 for a purely serial
-        calculation, in which case a multiprocessing Pool object will
-        never be instantiated. A string 'max' may be used to indicate that
+        Number of threads to use in calculation. If the pair-counting extensions were
+        compiled with OpenMP, the threads share the mesh in memory; otherwise parallelization
+        is performed using the python ``multiprocessing`` module. Default is 1 for a purely
+        serial calculation. A string 'max' may be used to indicate that
         the pair counters should use all available cores on the machine.
 
     approx_cell1_size : array_like, optional
@@ -70,7 +70,10 @@ def npairs_3d(sample1, sample2, rbins, period=None,
         which will return reasonable result performance for most use-cases.
         Performance can vary sensitively with this parameter, so it is highly
         recommended that you experiment with this parameter when carrying out
-        performance-critical calculations.
+        performance-critical calculations. Set to 'auto' to choose the cell sizes
+        from a cost model of the pair counter, given the number of points, box size and
+        search length, or to 'auto_probe' to also time the best few choices on a subset
+        of the points. The choice is cached for later calls with the same signature.
 
     approx_cell2_size : array_like, optional
         Analogous to ``approx_cell1_size``, but for sample2.  See comments for
@@ -139,7 +142,10 @@ def npairs_3d(sample1, sample2, rbins, period=None,
     num_threads, cell1_tuples = _cell1_parallelization_indices(
         double_mesh.mesh1.ncells, num_threads)
 
-    if num_threads > 1:
+    if num_threads > 1 and openmp_num_threads(num_threads) > 1:
+        counts = npairs_3d_engine_parallel(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            rbins, (0, double_mesh.mesh1.ncells), num_threads)
+    elif num_threads > 1:
         pool = multiprocessing.Pool(num_threads)
         result = pool.map(engine, cell1_tuples)
         counts = np.sum(np.array(result), axis=0)
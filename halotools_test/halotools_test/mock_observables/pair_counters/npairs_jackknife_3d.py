@@ -92,7 +92,10 @@ def npairs_jackknife_3d(sample1, sample2, rbins, jtags1, jtags2, N_samples,
         which will return reasonable result performance for most use-cases.
         Performance can vary sensitively with this parameter, so it is highly
         recommended that you experiment with this parameter when carrying out
-        performance-critical calculations.
+        performance-critical calculations. Set to 'auto' to choose the cell sizes
+        from a cost model of the pair counter, given the number of points, box size and
+        search length, or to 'auto_probe' to also time the best few choices on a subset
+        of the points. The choice is cached for later calls with the same signature.
 
     approx_cell2_size : array_like, optional
         Analogous to ``approx_cell1_size``, but for sample2.  See comments for
@@ -9,7 +9,7 @@ from functools import partial
 from .rectangular_mesh import RectangularDoubleMesh
 from .mesh_helpers import (_set_approximate_cell_sizes, _enclose_in_box,
     _cell1_parallelization_indices)
-from .cpairs import npairs_projected_engine
+from .cpairs import npairs_projected_engine, npairs_projected_engine_parallel, openmp_num_threads
 from ...utils.array_utils import array_is_monotonic, custom_len
 
 __author__ = ('Andrew Hearin', 'Duncan Campbell')
@@ -62,10 +62,10 @@ def npairs_projected(sample1, sample2, rp_bins, pi_max, period=None,
         period is assumed to be the same in all Cartesian directions.
 
     num_threads : int, optional
-        Number of threads to use in calculation, where parallelization is performed
-        using the python ``multiprocessing`` module. Default is 1 for a purely serial
-        calculation, in which case a multiprocessing Pool object will
-        never be instantiated. A string 'max' may be used to indicate that
+        Number of threads to use in calculation. If the pair-counting extensions were
+        compiled with OpenMP, the threads share the mesh in memory; otherwise parallelization
+        is performed using the python ``multiprocessing`` module. Default is 1 for a purely
+        serial calculation. A string 'max' may be used to indicate that
         the pair counters should use all available cores on the machine.
 
     approx_cell1_size : array_like, optional
@@ -146,7 +146,10 @@ def npairs_projected(sample1, sample2, rp_bins, pi_max, period=None,
     num_threads, cell1_tuples = _cell1_parallelization_indices(
         double_mesh.mesh1.ncells, num_threads)
 
-    if num_threads > 1:
+    if num_threads > 1 and openmp_num_threads(num_threads) > 1:
+        counts = npairs_projected_engine_parallel(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            rp_bins, pi_max, (0, double_mesh.mesh1.ncells), num_threads)
+    elif num_threads > 1:
         pool = multiprocessing.Pool(num_threads)
         result = pool.map(engine, cell1_tuples)
         counts = np.sum(np.array(result), axis=0)
@@ -8,7 +8,7 @@ from functools import partial
 
 from .rectangular_mesh import RectangularDoubleMesh
 from .mesh_helpers import _set_approximate_cell_sizes, _cell1_parallelization_indices
-from .cpairs import npairs_s_mu_engine
+from .cpairs import npairs_s_mu_engine, npairs_s_mu_engine_parallel, openmp_num_threads
 from .npairs_3d import _npairs_3d_process_args
 from ...utils.array_utils import array_is_monotonic
 
@@ -69,10 +69,10 @@ def npairs_s_mu(sample1, sample2, s_bins, mu_bins, period=None,
         Length units are comoving and assumed to be in Mpc/h, here and throughout Halotools.
 
     num_threads : int, optional
-        Number of threads to use in calculation, where parallelization is performed
-        using the python ``multiprocessing`` module. Default is 1 for a purely serial
-        calculation, in which case a multiprocessing Pool object will
-        never be instantiated. A string 'max' may be used to indicate that
+        Number of threads to use in calculation. If the pair-counting extensions were
+        compiled with OpenMP, the threads share the mesh in memory; otherwise parallelization
+        is performed using the python ``multiprocessing`` module. Default is 1 for a purely
+        serial calculation. A string 'max' may be used to indicate that
         the pair counters should use all available cores on the machine.
 
     approx_cell1_size : array_like, optional
@@ -83,7 +83,10 @@ def npairs_s_mu(sample1, sample2, s_bins, mu_bins, period=None,
         which will return reasonable result performance for most use-cases.
         Performance can vary sensitively with this parameter, so it is highly
         recommended that you experiment with this parameter when carrying out
-        performance-critical calculations.
+        performance-critical calculations. Set to 'auto' to choose the cell sizes
+        from a cost model of the pair counter, given the number of points, box size and
+        search length, or to 'auto_probe' to also time the best few choices on a subset
+        of the points. The choice is cached for later calls with the same signature.
 
     approx_cell2_size : array_like, optional
         Analogous to ``approx_cell1_size``, but for sample2.  See comments for
@@ -198,7 +201,10 @@ def npairs_s_mu(sample1, sample2, s_bins, mu_bins, period=None,
     num_threads, cell1_tuples = _cell1_parallelization_indices(
         double_mesh.mesh1.ncells, num_threads)
 
-    if num_threads > 1:
+    if num_threads > 1 and openmp_num_threads(num_threads) > 1:
+        counts = npairs_s_mu_engine_parallel(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            s_bins, mu_bins_prime, (0, double_mesh.mesh1.ncells), num_threads)
+    elif num_threads > 1:
         pool = multiprocessing.Pool(num_threads)
         result = pool.map(engine, cell1_tuples)
         counts = np.sum(np.array(result), axis=0)
@@ -2,10 +2,11 @@
 the primary data structure used to optimize pairwise
 calculations throughout the `~halotools.mock_observables` sub-package.
 """
+import weakref
 import numpy as np
 from math import floor
 
-__all__ = ('RectangularDoubleMesh', )
+__all__ = ('RectangularDoubleMesh', 'PreparedSample')
 __author__ = ('Andrew Hearin', )
 
 default_max_cells_per_dimension_cell1 = 50
@@ -180,6 +181,110 @@ class RectangularMesh(object):
         return ix*(self.num_ydivs*self.num_zdivs) + iy*self.num_zdivs + iz
 
 
+class PreparedSample(np.ndarray):
+    """ Array of points of shape (Npts, 3) that remembers the meshes built on it.
+
+    Building a `RectangularMesh` requires digitizing and sorting all the points, which for
+    large samples (e.g. randoms) can dominate the cost of a pair count. Passing the same
+    `PreparedSample` to several pair counters (or several times to the same one, e.g. for
+    the DD, DR and RR counts of a correlation function) builds each mesh only once.
+    A `PreparedSample` can be used wherever a sample of points is expected.
+
+    The cache is tied to the memory of the sample: meshes are only reused for coordinates
+    that are views of it, so the points must not be modified in place after preparing them.
+    Without periodic boundary conditions, the pair counters shift the points so that
+    they are enclosed in a box starting at the origin. The shifted copy of a `PreparedSample`
+    for the most recent position of the box is cached, and its meshes are reused in the same way
+    as long as the box does not move.
+
+    Examples
+    ---------
+    >>> Npts, Lbox = 1000, 250.
+    >>> randoms = PreparedSample(np.random.uniform(0, Lbox, Npts*3).reshape(Npts, 3))
+    >>> from halotools_test.mock_observables import npairs_3d
+    >>> rr = npairs_3d(randoms, randoms, np.logspace(-1, 1, 10), period=Lbox)
+    >>> rr_again = npairs_3d(randoms, randoms, np.logspace(-1, 1, 10), period=Lbox)
+    """
+
+    def __new__(cls, sample):
+        if isinstance(sample, PreparedSample):
+            return sample
+        obj = np.ascontiguousarray(sample, dtype=np.float64).view(cls)
+        start = obj.__array_interface__['data'][0]
+        # the cache is only reachable from views of the sample, which keep its memory alive,
+        # and only refers back to the sample weakly, so that it does not form a reference cycle
+        obj.mesh_cache = {'buffer': (start, start + obj.nbytes), 'meshes': {},
+            'owner': weakref.ref(obj), 'shifted': {}}
+        return obj
+
+    def __array_finalize__(self, obj):
+        self.mesh_cache = getattr(obj, 'mesh_cache', None)
+
+
+def _mesh_cache_key(x1in, y1in, z1in, *mesh_parameters):
+    """ Returns the cache shared by the input coordinates and the key of their mesh,
+    or (None, None) if the coordinates are not views of the same `PreparedSample`.
+    """
+    mesh_cache = getattr(x1in, 'mesh_cache', None)
+    if mesh_cache is None:
+        return None, None
+    start, end = mesh_cache['buffer']
+    key = []
+    for coordinate in (x1in, y1in, z1in):
+        if getattr(coordinate, 'mesh_cache', None) is not mesh_cache:
+            return None, None
+        pointer = coordinate.__array_interface__['data'][0]
+        if not start <= pointer < end:
+            return None, None
+        key.append((pointer, coordinate.dtype.str, coordinate.shape, coordinate.strides))
+    return mesh_cache, tuple(key) + tuple(mesh_parameters)
+
+
+def _shift_coordinates(x, y, z, origin):
+    """ Returns the coordinates shifted by ``-origin``. If the coordinates are the three
+    columns of a `PreparedSample`, they are taken from a shifted copy of the sample,
+    so that the meshes built on the shifted points are reused. Only the copy for the
+    last origin is kept, so that the cache does not grow with the number of calls.
+    """
+    mesh_cache = getattr(x, 'mesh_cache', None)
+    owner = None if mesh_cache is None else mesh_cache['owner']()
+    if owner is None:
+        return x - origin, y - origin, z - origin
+
+    start = mesh_cache['buffer'][0]
+    for icolumn, coordinate in enumerate((x, y, z)):
+        is_column = ((getattr(coordinate, 'mesh_cache', None) is mesh_cache) and
+            (owner.ndim == 2) and (owner.shape[1] == 3) and
+            (coordinate.__array_interface__['data'][0] == start + icolumn*owner.itemsize) and
+            (coordinate.shape == owner.shape[:1]) and (coordinate.strides == owner.strides[:1]))
+        if not is_column:
+            return x - origin, y - origin, z - origin
+
+    key = float(origin)
+    if key not in mesh_cache['shifted']:
+        mesh_cache['shifted'].clear()
+        mesh_cache['shifted'][key] = PreparedSample(owner.view(np.ndarray) - origin)
+    shifted = mesh_cache['shifted'][key]
+    return shifted[:, 0], shifted[:, 1], shifted[:, 2]
+
+
+def get_rectangular_mesh(x1in, y1in, z1in, xperiod, yperiod, zperiod,
+        approx_xcell_size, approx_ycell_size, approx_zcell_size):
+    """ Same as `RectangularMesh`, but reusing the mesh if the points belong to a `PreparedSample`
+    on which the same mesh was already built.
+    """
+    num_divs = tuple(max(int(np.round(period / cell_size)), 1) for period, cell_size in
+        ((xperiod, approx_xcell_size), (yperiod, approx_ycell_size), (zperiod, approx_zcell_size)))
+    mesh_cache, key = _mesh_cache_key(x1in, y1in, z1in, xperiod, yperiod, zperiod, num_divs)
+    if mesh_cache is not None and key in mesh_cache['meshes']:
+        return mesh_cache['meshes'][key]
+    mesh = RectangularMesh(x1in, y1in, z1in, xperiod, yperiod, zperiod,
+        approx_xcell_size, approx_ycell_size, approx_zcell_size)
+    if mesh_cache is not None:
+        mesh_cache['meshes'][key] = mesh
+    return mesh
+
+
 class RectangularDoubleMesh(object):
     """ Fundamental data structure of the `~halotools.mock_observables` sub-package.
     `~halotools.mock_observables.RectangularDoubleMesh` is built up from two instances
@@ -211,6 +316,12 @@ class RectangularDoubleMesh(object):
             An entirely separate tree is built for the *Npts2* points, the structure of
             which is dependent on the struture of the *Npts1* tree as described below.
 
+            Any of the approximate cell sizes can also be the string 'auto', in which case
+            the sizes are chosen by minimizing a cost model of the pair counting engines
+            given the number of points, box size and search lengths, or 'auto_probe',
+            in which case the best few choices of the cost model are timed on a subset
+            of the cells. See `~halotools.mock_observables.pair_counters.mesh_tuning`.
+
         search_xlength, search_ylength, search_zlength, floats, optional
             Maximum length over which a pair of points will searched for.
             For example, if using `~halotools.mock_observables.pair_counters.RectangularDoubleMesh`
@@ -247,13 +358,25 @@ class RectangularDoubleMesh(object):
 
         self._check_sensible_constructor_inputs()
 
+        approx_cell1_sizes = [approx_x1cell_size, approx_y1cell_size, approx_z1cell_size]
+        approx_cell2_sizes = [approx_x2cell_size, approx_y2cell_size, approx_z2cell_size]
+        if any(isinstance(size, str) for size in approx_cell1_sizes + approx_cell2_sizes):
+            from .mesh_tuning import auto_cell_sizes
+            approx_cell1_sizes, approx_cell2_sizes = auto_cell_sizes(x1, y1, z1, x2, y2, z2,
+                approx_cell1_sizes, approx_cell2_sizes,
+                [search_xlength, search_ylength, search_zlength],
+                [xperiod, yperiod, zperiod], PBCs,
+                max_cells_per_dimension_cell1, max_cells_per_dimension_cell2)
+            approx_x1cell_size, approx_y1cell_size, approx_z1cell_size = approx_cell1_sizes
+            approx_x2cell_size, approx_y2cell_size, approx_z2cell_size = approx_cell2_sizes
+
         approx_x1cell_size = sample1_cell_size(xperiod, search_xlength, approx_x1cell_size,
             max_cells_per_dimension=max_cells_per_dimension_cell1)
         approx_y1cell_size = sample1_cell_size(yperiod, search_ylength, approx_y1cell_size,
             max_cells_per_dimension=max_cells_per_dimension_cell1)
         approx_z1cell_size = sample1_cell_size(zperiod, search_zlength, approx_z1cell_size,
                 max_cells_per_dimension=max_cells_per_dimension_cell1)
-        self.mesh1 = RectangularMesh(x1, y1, z1, xperiod, yperiod, zperiod,
+        self.mesh1 = get_rectangular_mesh(x1, y1, z1, xperiod, yperiod, zperiod,
             approx_x1cell_size, approx_y1cell_size, approx_z1cell_size)
 
         approx_x2cell_size = sample2_cell_sizes(xperiod, self.mesh1.xcell_size, approx_x2cell_size,
@@ -262,7 +385,7 @@ class RectangularDoubleMesh(object):
             max_cells_per_dimension=max_cells_per_dimension_cell2)
         approx_z2cell_size = sample2_cell_sizes(zperiod, self.mesh1.zcell_size, approx_z2cell_size,
             max_cells_per_dimension=max_cells_per_dimension_cell2)
-        self.mesh2 = RectangularMesh(x2, y2, z2, xperiod, yperiod, zperiod,
+        self.mesh2 = get_rectangular_mesh(x2, y2, z2, xperiod, yperiod, zperiod,
             approx_x2cell_size, approx_y2cell_size, approx_z2cell_size)
 
         self.num_xcell2_per_xcell1 = self.mesh2.num_xdivs // self.mesh1.num_xdivs
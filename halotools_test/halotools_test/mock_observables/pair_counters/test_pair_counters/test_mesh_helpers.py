@@ -2,9 +2,12 @@
 """
 from __future__ import absolute_import, division, print_function
 
+import numpy as np
 import pytest
 
-from ..mesh_helpers import _set_approximate_cell_sizes, _enforce_maximum_search_length
+from ..mesh_helpers import (_set_approximate_cell_sizes, _enforce_maximum_search_length,
+    _cell2_covering_offsets_by_distance)
+from ..rectangular_mesh import RectangularDoubleMesh
 
 __all__ = ('test_set_approximate_cell_sizes', )
 
@@ -77,3 +80,38 @@ def test_enforce_maximum_search_length_case7():
 
     search_length, period = (1, 4, 2), (4, 100, 7)
     _enforce_maximum_search_length(search_length, period)
+
+
+def test_cell2_covering_offsets_by_distance():
+    Lbox, search_length = 100., 10.
+    x = np.linspace(0.5, 99.5, 100)
+    double_mesh = RectangularDoubleMesh(x, x, x, x, x, x,
+        20, 20, 25, 10, 10, 10, search_length, search_length, search_length,
+        Lbox, Lbox, Lbox, True)
+    x2_offsets, y2_offsets, z2_offsets, gap_xy_sq, gap_z_sq = (
+        _cell2_covering_offsets_by_distance(double_mesh))
+
+    # every covering cell is visited exactly once
+    shape = (x2_offsets.max()+1, y2_offsets.max()+1, z2_offsets.max()+1)
+    assert len(x2_offsets) == np.prod(shape)
+    assert len(set(zip(x2_offsets, y2_offsets, z2_offsets))) == len(x2_offsets)
+    assert np.all(np.diff(gap_xy_sq + gap_z_sq) >= 0)
+
+    # the gaps are lower bounds on the separations between the cells
+    num_x2_covering_steps = int(np.ceil(search_length/double_mesh.mesh2.xcell_size))
+    num_z2_covering_steps = int(np.ceil(search_length/double_mesh.mesh2.zcell_size))
+    num_x2_per_x1 = double_mesh.mesh2.num_xdivs // double_mesh.mesh1.num_xdivs
+    num_z2_per_z1 = double_mesh.mesh2.num_zdivs // double_mesh.mesh1.num_zdivs
+    ix1_lo = num_x2_covering_steps*double_mesh.mesh2.xcell_size
+    ix1_hi = ix1_lo + num_x2_per_x1*double_mesh.mesh2.xcell_size
+    iz1_lo = num_z2_covering_steps*double_mesh.mesh2.zcell_size
+    iz1_hi = iz1_lo + num_z2_per_z1*double_mesh.mesh2.zcell_size
+    # the x- and y-dimensions of the mesh are identical
+    xgap, ygap = (np.maximum(0, np.maximum(ix1_lo - (offsets+1)*double_mesh.mesh2.xcell_size,
+        offsets*double_mesh.mesh2.xcell_size - ix1_hi)) for offsets in (x2_offsets, y2_offsets))
+    zgap = np.maximum(0, np.maximum(iz1_lo - (z2_offsets+1)*double_mesh.mesh2.zcell_size,
+        z2_offsets*double_mesh.mesh2.zcell_size - iz1_hi))
+    assert np.allclose(gap_xy_sq, xgap**2 + ygap**2)
+    assert np.all(gap_xy_sq <= xgap**2 + ygap**2)
+    assert np.allclose(gap_z_sq, zgap**2)
+    assert np.all(gap_z_sq <= zgap**2)
@@ -0,0 +1,82 @@
+"""
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import numpy as np
+import pytest
+from astropy.utils.misc import NumpyRNGContext
+
+from ..mesh_tuning import (auto_cell_sizes, candidate_cell_sizes, pair_counting_cost,
+    mesh_cell_sizes, _auto_cell_size_cache)
+from ..npairs_3d import npairs_3d
+from ..npairs_xy_z import npairs_xy_z
+from ..npairs_jackknife_3d import npairs_jackknife_3d
+
+__all__ = ('test_auto_cell_sizes_counts', )
+
+fixed_seed = 43
+
+
+def test_auto_cell_sizes_counts():
+    Lbox = 250.
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.uniform(0, Lbox, 3000).reshape(1000, 3)
+        sample2 = np.random.uniform(0, Lbox, 9000).reshape(3000, 3)
+    rbins = np.logspace(0, 1.3, 10)
+    pi_bins = np.linspace(0, 30, 5)
+
+    for approx_cell_size in ('auto', 'auto_probe'):
+        assert np.all(npairs_3d(sample1, sample2, rbins, period=Lbox,
+                approx_cell1_size=approx_cell_size) ==
+            npairs_3d(sample1, sample2, rbins, period=Lbox))
+        assert np.all(npairs_3d(sample1, sample2, rbins,
+                approx_cell1_size=approx_cell_size, approx_cell2_size=approx_cell_size) ==
+            npairs_3d(sample1, sample2, rbins))
+        assert np.all(npairs_xy_z(sample1, sample2, rbins, pi_bins, period=Lbox,
+                approx_cell1_size=approx_cell_size) ==
+            npairs_xy_z(sample1, sample2, rbins, pi_bins, period=Lbox))
+
+    jackknife_args = (sample1, sample2, rbins)
+    jackknife_kwargs = dict(period=Lbox, jtags1=np.ones(1000, dtype=int),
+        jtags2=np.ones(3000, dtype=int), N_samples=2)
+    assert np.all(npairs_jackknife_3d(*jackknife_args, approx_cell1_size='auto',
+            **jackknife_kwargs) == npairs_jackknife_3d(*jackknife_args, **jackknife_kwargs))
+
+
+def test_auto_cell_sizes_mixed_and_cached():
+    Lbox = 100.
+    with NumpyRNGContext(fixed_seed):
+        x, y, z = np.random.uniform(0, Lbox, 1500).reshape(3, 500)
+    args = ([5., 5., 5.], [Lbox, Lbox, Lbox])
+
+    approx1, approx2 = auto_cell_sizes(x, y, z, x, y, z, ['auto', 20., 'auto'], ['auto']*3, *args)
+    assert approx1[1] == 20.
+    assert ('auto' not in approx1) and ('auto' not in approx2)
+
+    num_cached = len(_auto_cell_size_cache)
+    assert auto_cell_sizes(x, y, z, x, y, z, ['auto', 20., 'auto'], ['auto']*3, *args) == (
+        (approx1, approx2))
+    assert len(_auto_cell_size_cache) == num_cached
+
+
+def test_auto_cell_sizes_minimize_cost():
+    periods, search_lengths = [250.]*3, [5.]*3
+    candidates = candidate_cell_sizes(periods, search_lengths, ['auto']*3, ['auto']*3)
+    costs = [pair_counting_cost(10**5, 10**6, periods, search_lengths, c1, c2)
+        for _, _, c1, c2 in candidates]
+
+    default_geometry = mesh_cell_sizes(250., 5., 5., 5.)
+    default_cost = pair_counting_cost(10**5, 10**6, periods, search_lengths,
+        [default_geometry[0]]*3, [default_geometry[1]]*3)
+    assert min(costs) <= default_cost
+    assert len(candidates) > 1
+
+
+def test_bad_auto_cell_size():
+    Lbox = 100.
+    with NumpyRNGContext(fixed_seed):
+        sample = np.random.uniform(0, Lbox, 300).reshape(100, 3)
+    with pytest.raises(ValueError) as err:
+        npairs_3d(sample, sample, [1., 5.], period=Lbox, approx_cell1_size='fastest')
+    substr = "'auto' or 'auto_probe'"
+    assert substr in err.value.args[0]
@@ -0,0 +1,64 @@
+"""
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import numpy as np
+import pytest
+from astropy.utils.misc import NumpyRNGContext
+
+from ..rectangular_mesh import RectangularDoubleMesh
+from ..cpairs import (npairs_3d_engine, npairs_3d_engine_parallel,
+    npairs_xy_z_engine, npairs_xy_z_engine_parallel,
+    npairs_projected_engine, npairs_projected_engine_parallel,
+    npairs_s_mu_engine, npairs_s_mu_engine_parallel, openmp_num_threads)
+from ..npairs_3d import npairs_3d
+from ..npairs_s_mu import npairs_s_mu
+
+__all__ = ('test_parallel_engines_agree_with_serial', )
+
+fixed_seed = 43
+
+
+@pytest.mark.parametrize('PBCs', [True, False])
+def test_parallel_engines_agree_with_serial(PBCs):
+    Lbox = 100.
+    with NumpyRNGContext(fixed_seed):
+        x1, y1, z1 = np.random.uniform(0, Lbox, 3000).reshape(3, 1000)
+        x2, y2, z2 = np.random.uniform(0, Lbox, 6000).reshape(3, 2000)
+    rbins = np.logspace(-1, 1.2, 8)
+    pi_bins = np.linspace(0, 15, 4)
+    mu_bins = np.linspace(0, 1, 6)
+    search_length = rbins[-1]
+    double_mesh = RectangularDoubleMesh(x1, y1, z1, x2, y2, z2,
+        10, 10, 10, 5, 5, 5, search_length, search_length, search_length,
+        Lbox, Lbox, Lbox, PBCs)
+    points = (double_mesh, x1, y1, z1, x2, y2, z2)
+    cells = (0, double_mesh.mesh1.ncells)
+
+    for num_threads in (1, 3):
+        assert np.all(npairs_3d_engine(*points + (rbins, cells)) ==
+            npairs_3d_engine_parallel(*points + (rbins, cells, num_threads)))
+        assert np.all(npairs_xy_z_engine(*points + (rbins, pi_bins, cells)) ==
+            npairs_xy_z_engine_parallel(*points + (rbins, pi_bins, cells, num_threads)))
+        assert np.all(npairs_projected_engine(*points + (rbins, 10., cells)) ==
+            npairs_projected_engine_parallel(*points + (rbins, 10., cells, num_threads)))
+        assert np.all(npairs_s_mu_engine(*points + (rbins, mu_bins, cells)) ==
+            npairs_s_mu_engine_parallel(*points + (rbins, mu_bins, cells, num_threads)))
+
+    # a subset of the cells of mesh1, as used by multiprocessing
+    partial_cells = (5, double_mesh.mesh1.ncells // 2)
+    assert np.all(npairs_3d_engine(*points + (rbins, partial_cells)) ==
+        npairs_3d_engine_parallel(*points + (rbins, partial_cells, 2)))
+
+
+def test_threaded_pair_counters():
+    Lbox = 100.
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.uniform(0, Lbox, 3000).reshape(1000, 3)
+    rbins = np.logspace(-1, 1.2, 8)
+    mu_bins = np.linspace(0, 1, 6)
+    assert np.all(npairs_3d(sample1, sample1, rbins, period=Lbox, num_threads=2) ==
+        npairs_3d(sample1, sample1, rbins, period=Lbox))
+    assert np.all(npairs_s_mu(sample1, sample1, rbins, mu_bins, period=Lbox, num_threads=2) ==
+        npairs_s_mu(sample1, sample1, rbins, mu_bins, period=Lbox))
+    assert 1 <= openmp_num_threads(2) <= 2
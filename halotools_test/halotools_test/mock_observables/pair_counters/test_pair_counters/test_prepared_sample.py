@@ -0,0 +1,102 @@
+"""
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import numpy as np
+from astropy.utils.misc import NumpyRNGContext
+
+from ..rectangular_mesh import PreparedSample, RectangularDoubleMesh
+from ..npairs_3d import npairs_3d
+from ..npairs_xy_z import npairs_xy_z
+from ...two_point_clustering import tpcf
+
+__all__ = ('test_prepared_sample_counts', )
+
+fixed_seed = 43
+
+
+def test_prepared_sample_counts():
+    Lbox = 250.
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.uniform(0, Lbox, 3000).reshape(1000, 3)
+        randoms = np.random.uniform(0, Lbox, 9000).reshape(3000, 3)
+    rbins = np.logspace(0.5, 1.3, 10)
+    prepared1, prepared_randoms = PreparedSample(sample1), PreparedSample(randoms)
+
+    for _ in range(2):
+        assert np.all(npairs_3d(prepared1, prepared_randoms, rbins, period=Lbox) ==
+            npairs_3d(sample1, randoms, rbins, period=Lbox))
+        assert np.all(npairs_xy_z(prepared1, prepared1, rbins, rbins, period=Lbox) ==
+            npairs_xy_z(sample1, sample1, rbins, rbins, period=Lbox))
+    assert len(prepared1.mesh_cache['meshes']) > 0
+    assert len(prepared_randoms.mesh_cache['meshes']) == 1
+
+    xi = tpcf(sample1, rbins, randoms=randoms, period=Lbox)
+    assert np.allclose(xi, tpcf(prepared1, rbins, randoms=prepared_randoms, period=Lbox))
+
+
+def test_prepared_sample_mesh_reuse():
+    Lbox = 100.
+    with NumpyRNGContext(fixed_seed):
+        prepared = PreparedSample(np.random.uniform(0, Lbox, 300).reshape(100, 3))
+    x, y, z = prepared[:, 0], prepared[:, 1], prepared[:, 2]
+    args = (10, 10, 10, 10, 10, 10, 20, 20, 20, Lbox, Lbox, Lbox)
+    mesh = RectangularDoubleMesh(x, y, z, x, y, z, *args)
+    assert RectangularDoubleMesh(x, y, z, x, y, z, *args).mesh1 is mesh.mesh1
+
+    # arrays derived from the sample do not share its meshes
+    shifted = np.mod(prepared + 50., Lbox)
+    x2, y2, z2 = shifted[:, 0], shifted[:, 1], shifted[:, 2]
+    other_mesh = RectangularDoubleMesh(x2, y2, z2, x2, y2, z2, *args)
+    assert other_mesh.mesh1 is not mesh.mesh1
+    assert not np.all(other_mesh.mesh1.idx_sorted == mesh.mesh1.idx_sorted)
+
+
+def test_prepared_sample_no_pbc():
+    """ Without periodic boundary conditions, the points are shifted into a box,
+    and the meshes of the shifted copies of prepared samples are reused across calls.
+    The randoms enclose the data, so that the box is the same for all the counts.
+    """
+    Lbox = 100.
+    with NumpyRNGContext(fixed_seed):
+        sample1 = np.random.uniform(10, Lbox - 10, 3000).reshape(1000, 3)
+        randoms = np.random.uniform(0, Lbox, 9000).reshape(3000, 3)
+    rbins = np.logspace(0, 1, 5)
+    prepared_randoms = PreparedSample(randoms)
+
+    xi = tpcf(sample1, rbins, randoms=prepared_randoms)
+    shifted_samples = prepared_randoms.mesh_cache['shifted']
+    assert len(shifted_samples) == 1
+    meshes = {origin: dict(shifted.mesh_cache['meshes'])
+        for origin, shifted in shifted_samples.items()}
+    assert sum(len(m) for m in meshes.values()) > 0
+
+    xi2 = tpcf(sample1, rbins, randoms=prepared_randoms)
+    assert set(shifted_samples) == set(meshes)
+    for origin, shifted in shifted_samples.items():
+        assert shifted.mesh_cache['meshes'] == meshes[origin]
+
+    assert np.all(xi == xi2)
+    assert np.allclose(xi, tpcf(sample1, rbins, randoms=randoms))
+
+    prepared1 = PreparedSample(sample1)
+    assert np.all(npairs_3d(prepared1, prepared_randoms, rbins) ==
+        npairs_3d(sample1, randoms, rbins))
+
+
+def test_prepared_sample_no_pbc_bounded_cache():
+    """ Counting many data samples against the same prepared randoms without periodic
+    boundary conditions moves the box at each call, but only one shifted copy is kept.
+    """
+    Lbox = 100.
+    with NumpyRNGContext(fixed_seed):
+        randoms = np.random.uniform(0, Lbox, 3000).reshape(1000, 3)
+        data_samples = [np.random.uniform(-offset, Lbox, 300).reshape(100, 3)
+            for offset in np.linspace(1, 10, 10)]
+    rbins = np.logspace(0, 1, 5)
+    prepared_randoms = PreparedSample(randoms)
+
+    for sample in data_samples:
+        assert np.all(npairs_3d(sample, prepared_randoms, rbins) ==
+            npairs_3d(sample, randoms, rbins))
+        assert len(prepared_randoms.mesh_cache['shifted']) <= 1
@@ -13,51 +13,12 @@ from .velocity_marking_functions cimport *
 __author__ = ('Andrew Hearin', 'Duncan Campbell')
 __all__ = ('velocity_marked_npairs_3d_engine', )
 
-ctypedef void (*f_type)(cnp.float64_t* w1, cnp.float64_t* w2, cnp.float64_t* shift, cnp.float64_t* result1, cnp.float64_t* result2, cnp.float64_t* result3)
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.nonecheck(False)
-def velocity_marked_npairs_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
-    weights1in, weights2in, int weight_func_id, rbins, cell1_tuple):
-    """ Cython engine for counting pairs of points as a function of three-dimensional separation.
-
-    Parameters
-    ------------
-    double_mesh : object
-        Instance of `~halotools.mock_observables.RectangularDoubleMesh`
-
-    x1in, y1in, z1in : arrays
-        Numpy arrays storing Cartesian coordinates of points in sample 1
-
-    x2in, y2in, z2in : arrays
-        Numpy arrays storing Cartesian coordinates of points in sample 2
-
-    weight_func_id : int
-        weighting function integer ID.
-
-    weights1in : array
-
-    weights2in : array
-
-    rbins : array
-        Boundaries defining the bins in which pairs are counted.
-
-    cell1_tuple : tuple
-        Two-element tuple defining the first and last cells in
-        double_mesh.mesh1 that will be looped over. Intended for use with
-        python multiprocessing.
-
-    Returns
-    --------
-    counts : array
-        Integer array of length len(rbins) giving the number of pairs
-        separated by a distance less than the corresponding entry of ``rbins``.
-
-    """
-    cdef f_type wfunc
-    wfunc = return_velocity_weighting_function(weight_func_id)
-
+cdef object _velocity_marked_npairs_3d(velocity_weighting_function* func, double_mesh,
+        x1in, y1in, z1in, x2in, y2in, z2in, weights1in, weights2in, rbins, cell1_tuple):
     cdef cnp.float64_t[:] rbins_squared = rbins*rbins
     cdef cnp.float64_t xperiod = double_mesh.xperiod
     cdef cnp.float64_t yperiod = double_mesh.yperiod
@@ -213,7 +174,10 @@ def velocity_marked_npairs_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in,
                                     dz = z1tmp - z_icell2[j]
                                     dsq = dx*dx + dy*dy + dz*dz
 
-                                    wfunc(&w_icell1[i,0], &w_icell2[j,0], &shift[0], &holder1, &holder2, &holder3)
+                                    # the weights are only needed for pairs within the search length
+                                    if dsq > rbins_squared[num_rbins-1]:
+                                        continue
+                                    velocity_weights(func, &w_icell1[i,0], &w_icell2[j,0], &shift[0], &holder1, &holder2, &holder3)
                                     k = num_rbins-1
                                     while dsq <= rbins_squared[k]:
                                         counts1[k] += holder1
@@ -225,18 +189,61 @@ def velocity_marked_npairs_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in,
     return np.array(counts1), np.array(counts2), np.array(counts3)
 
 
-cdef f_type return_velocity_weighting_function(weight_func_id):
-    """
-    returns a pointer to the user-specified pairwise velocity weighting function.
-    """
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+def velocity_marked_npairs_3d_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+    weights1in, weights2in, int weight_func_id, rbins, cell1_tuple):
+    """ Cython engine for counting pairs of points as a function of three-dimensional separation.
+
+    Parameters
+    ------------
+    double_mesh : object
+        Instance of `~halotools.mock_observables.RectangularDoubleMesh`
+
+    x1in, y1in, z1in : arrays
+        Numpy arrays storing Cartesian coordinates of points in sample 1
+
+    x2in, y2in, z2in : arrays
+        Numpy arrays storing Cartesian coordinates of points in sample 2
+
+    weight_func_id : int
+        weighting function integer ID.
 
-    if weight_func_id==1:
-        return relative_radial_velocity_weights
-    if weight_func_id==2:
-        return radial_velocity_variance_counter_weights
-    if weight_func_id==3:
-        return relative_los_velocity_weights
-    if weight_func_id==4:
-        return los_velocity_variance_counter_weights
+    weights1in : array
+
+    weights2in : array
+
+    rbins : array
+        Boundaries defining the bins in which pairs are counted.
+
+    cell1_tuple : tuple
+        Two-element tuple defining the first and last cells in
+        double_mesh.mesh1 that will be looped over. Intended for use with
+        python multiprocessing.
+
+    Returns
+    --------
+    counts : array
+        Integer array of length len(rbins) giving the number of pairs
+        separated by a distance less than the corresponding entry of ``rbins``.
+
+    """
+    if weight_func_id == 1:
+        return _velocity_marked_npairs_3d(<RelativeRadialVelocity*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rbins, cell1_tuple)
+    elif weight_func_id == 2:
+        return _velocity_marked_npairs_3d(<RadialVelocityVariance*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rbins, cell1_tuple)
+    elif weight_func_id == 3:
+        return _velocity_marked_npairs_3d(<RelativeLOSVelocity*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rbins, cell1_tuple)
+    elif weight_func_id == 4:
+        return _velocity_marked_npairs_3d(<LOSVelocityVariance*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rbins, cell1_tuple)
     else:
         raise ValueError('weighting function does not exist')
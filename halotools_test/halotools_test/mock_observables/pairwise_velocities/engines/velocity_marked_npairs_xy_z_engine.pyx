@@ -13,54 +13,12 @@ from .velocity_marking_functions cimport *
 __author__ = ('Andrew Hearin', 'Duncan Campbell')
 __all__ = ('velocity_marked_npairs_xy_z_engine', )
 
-ctypedef void (*f_type)(cnp.float64_t* w1, cnp.float64_t* w2, cnp.float64_t* shift, cnp.float64_t* result1, cnp.float64_t* result2, cnp.float64_t* result3)
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.nonecheck(False)
-def velocity_marked_npairs_xy_z_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
-    weights1in, weights2in, int weight_func_id, rp_bins, pi_bins, cell1_tuple):
-    """ Cython engine for counting pairs of points as a function of three-dimensional separation.
-
-    Parameters
-    ------------
-    double_mesh : object
-        Instance of `~halotools.mock_observables.RectangularDoubleMesh`
-
-    x1in, y1in, z1in : arrays
-        Numpy arrays storing Cartesian coordinates of points in sample 1
-
-    x2in, y2in, z2in : arrays
-        Numpy arrays storing Cartesian coordinates of points in sample 2
-
-    weight_func_id : int, optional
-        weighting function integer ID.
-
-    weights1in : array
-
-    weights2in : array
-
-    rp_bins : array
-        Boundaries defining the bins in which pairs are counted.
-
-    pi_bins : numpy.array
-        array defining parallel separation in which to sum the pair counts
-
-    cell1_tuple : tuple
-        Two-element tuple defining the first and last cells in
-        double_mesh.mesh1 that will be looped over. Intended for use with
-        python multiprocessing.
-
-    Returns
-    --------
-    counts : array
-        Integer array of length len(rp_bins) giving the number of pairs
-        separated by a distance less than the corresponding entry of ``rp_bins``.
-
-    """
-    cdef f_type wfunc
-    wfunc = return_velocity_weighting_function(weight_func_id)
-
+cdef object _velocity_marked_npairs_xy_z(velocity_weighting_function* func, double_mesh,
+        x1in, y1in, z1in, x2in, y2in, z2in, weights1in, weights2in, rp_bins, pi_bins, cell1_tuple):
     cdef cnp.float64_t[:] rp_bins_squared = rp_bins*rp_bins
     cdef cnp.float64_t[:] pi_bins_squared = pi_bins*pi_bins
     cdef cnp.float64_t xperiod = double_mesh.xperiod
@@ -219,7 +177,11 @@ def velocity_marked_npairs_xy_z_engine(double_mesh, x1in, y1in, z1in, x2in, y2in
                                     dxy_sq = dx*dx + dy*dy
                                     dz_sq = dz*dz
 
-                                    wfunc(&w_icell1[i,0], &w_icell2[j,0], &shift[0], &holder1, &holder2, &holder3)
+                                    # the weights are only needed for pairs within the search lengths
+                                    if (dxy_sq > rp_bins_squared[num_rp_bins-1] or
+                                            dz_sq > pi_bins_squared[num_pi_bins-1]):
+                                        continue
+                                    velocity_weights(func, &w_icell1[i,0], &w_icell2[j,0], &shift[0], &holder1, &holder2, &holder3)
 
                                     k = num_rp_bins-1
                                     while dxy_sq<=rp_bins_squared[k]:
@@ -236,18 +198,64 @@ def velocity_marked_npairs_xy_z_engine(double_mesh, x1in, y1in, z1in, x2in, y2in
     return np.array(counts1), np.array(counts2), np.array(counts3)
 
 
-cdef f_type return_velocity_weighting_function(weight_func_id):
-    """
-    returns a pointer to the user-specified pairwise velocity weighting function.
-    """
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.nonecheck(False)
+def velocity_marked_npairs_xy_z_engine(double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+    weights1in, weights2in, int weight_func_id, rp_bins, pi_bins, cell1_tuple):
+    """ Cython engine for counting pairs of points as a function of three-dimensional separation.
+
+    Parameters
+    ------------
+    double_mesh : object
+        Instance of `~halotools.mock_observables.RectangularDoubleMesh`
+
+    x1in, y1in, z1in : arrays
+        Numpy arrays storing Cartesian coordinates of points in sample 1
+
+    x2in, y2in, z2in : arrays
+        Numpy arrays storing Cartesian coordinates of points in sample 2
+
+    weight_func_id : int, optional
+        weighting function integer ID.
+
+    weights1in : array
+
+    weights2in : array
+
+    rp_bins : array
+        Boundaries defining the bins in which pairs are counted.
 
-    if weight_func_id==1:
-        return relative_radial_velocity_weights
-    if weight_func_id==2:
-        return radial_velocity_variance_counter_weights
-    if weight_func_id==3:
-        return relative_los_velocity_weights
-    if weight_func_id==4:
-        return los_velocity_variance_counter_weights
+    pi_bins : numpy.array
+        array defining parallel separation in which to sum the pair counts
+
+    cell1_tuple : tuple
+        Two-element tuple defining the first and last cells in
+        double_mesh.mesh1 that will be looped over. Intended for use with
+        python multiprocessing.
+
+    Returns
+    --------
+    counts : array
+        Integer array of length len(rp_bins) giving the number of pairs
+        separated by a distance less than the corresponding entry of ``rp_bins``.
+
+    """
+    if weight_func_id == 1:
+        return _velocity_marked_npairs_xy_z(<RelativeRadialVelocity*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rp_bins, pi_bins, cell1_tuple)
+    elif weight_func_id == 2:
+        return _velocity_marked_npairs_xy_z(<RadialVelocityVariance*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rp_bins, pi_bins, cell1_tuple)
+    elif weight_func_id == 3:
+        return _velocity_marked_npairs_xy_z(<RelativeLOSVelocity*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rp_bins, pi_bins, cell1_tuple)
+    elif weight_func_id == 4:
+        return _velocity_marked_npairs_xy_z(<LOSVelocityVariance*> NULL,
+            double_mesh, x1in, y1in, z1in, x2in, y2in, z2in,
+            weights1in, weights2in, rp_bins, pi_bins, cell1_tuple)
     else:
         raise ValueError('weighting function does not exist')
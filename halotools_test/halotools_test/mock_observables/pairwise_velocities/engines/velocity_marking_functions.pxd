@@ -1,12 +1,296 @@
 # cython: language_level=2
+"""
+Pairwise velocity weighting functions, defined inline here (rather than in the .pyx)
+so that the C compiler can inline them into the pair-counting loops.
+"""
 cimport numpy as cnp
+from libc.math cimport sqrt, fabs
 
 #####built in weighting functions####
 
-#radial functions
-cdef void relative_radial_velocity_weights(cnp.float64_t* w1, cnp.float64_t* w2, cnp.float64_t* shift, cnp.float64_t* result1, cnp.float64_t* result2, cnp.float64_t* result3)
-cdef void radial_velocity_variance_counter_weights(cnp.float64_t* w1, cnp.float64_t* w2, cnp.float64_t* shift, cnp.float64_t* result1, cnp.float64_t* result2, cnp.float64_t* result3)
+cdef inline void relative_radial_velocity_weights(cnp.float64_t* w1,
+                                           cnp.float64_t* w2,
+                                           cnp.float64_t* shift,
+                                           cnp.float64_t* result1,
+                                           cnp.float64_t* result2,
+                                           cnp.float64_t* result3) noexcept nogil:
+    """
+    Calculate the relative radial velocity between two points.
 
-#line-of-sight functions
-cdef void relative_los_velocity_weights(cnp.float64_t* w1, cnp.float64_t* w2, cnp.float64_t* shift, cnp.float64_t* result1, cnp.float64_t* result2, cnp.float64_t* result3)
-cdef void los_velocity_variance_counter_weights(cnp.float64_t* w1, cnp.float64_t* w2, cnp.float64_t* shift, cnp.float64_t* result1, cnp.float64_t* result2, cnp.float64_t* result3)
+    func ID=1
+
+    Parameters
+    ----------
+    w1 : pointer to an array
+        weights array associated with data1.
+        w1[0:3] x,y,z positions
+        w1[3:6] vx, vy, vz velocities
+
+    w2 : pointer to an array
+        weights array associated with data2
+        w2[0:3] x,y,z positions
+        w2[3:6] vx, vy, vz velocities
+
+    shift : pointer to an array
+        Length-3 array storing the amount the points were shifted in each spatial
+        dimension.  This is used when doing pair counts on periodic boxes and the
+        points have been preshifted.
+
+    result1 : pointer to a double
+        relative radial velocity
+
+    result2 : pointer to a double
+        0.0 (dummy)
+
+    result3 : pointer to a double
+        1.0 (pairs involved, but also kind-of a dummy)
+
+    """
+    #calculate radial vector between points
+    # Note that due to the application of the shift,
+    #   when PBCs are applied, rx, ry, rz has its normal sign flipped
+    cdef cnp.float64_t rx = w1[0] - (w2[0] + shift[0])
+    cdef cnp.float64_t ry = w1[1] - (w2[1] + shift[1])
+    cdef cnp.float64_t rz = w1[2] - (w2[2] + shift[2])
+    cdef cnp.float64_t norm = sqrt(rx*rx + ry*ry + rz*rz)
+
+    cdef cnp.float64_t dvx, dvy, dvz, result
+
+    if norm==0.0:
+        result1[0] = 0.0 #radial velocity
+        result2[0] = 0.0 #unused value
+        result3[0] = 1.0 #number of pairs
+    else:
+       #calculate the difference velocity.
+       dvx = (w1[3] - w2[3])
+       dvy = (w1[4] - w2[4])
+       dvz = (w1[5] - w2[5])
+
+       #the radial component of the velocity difference
+       # Since rx, ry, rz have a flipped sign for PBC case,
+       #    the following definition requires no further modification
+       result = (dvx*rx + dvy*ry + dvz*rz)/norm
+
+       result1[0] = result #radial velocity
+       result2[0] = 0.0 #unused value
+       result3[0] = 1.0 #number of pairs
+
+
+
+cdef inline void radial_velocity_variance_counter_weights(cnp.float64_t* w1,
+                                                   cnp.float64_t* w2,
+                                                   cnp.float64_t* shift,
+                                                   cnp.float64_t* result1,
+                                                   cnp.float64_t* result2,
+                                                   cnp.float64_t* result3) noexcept nogil:
+    """
+    Calculate the relative radial velocity between two points minus an offset, and the
+    squared quantity.  This function is used to calculate the variance using the
+    "shifted data" technique where a constant value is subtracted from the value.
+
+    func ID=2
+
+    Parameters
+    ----------
+    w1 : pointer to an array
+        weights array associated with data1.
+        w1[0:3] x,y,z positions
+        w1[3:6] vx, vy, vz velocities
+        w1[6] offset
+
+    w2 : pointer to an array
+        weights array associated with data2
+        w2[0:3] x,y,z positions
+        w2[3:6] vx, vy, vz velocities
+        w2[6] offset
+
+    shift : pointer to an array
+        Length-3 array storing the amount the points were shifted in each spatial
+        dimension.  This is used when doing pair counts on periodic boxes and the
+        points have been preshifted.
+
+    result1 : pointer to a double
+        relative radial velocity minus an offset
+
+    result2 : pointer to a double
+        relative radial velocity minus an offset squared
+
+    result3 : pointer to a double
+        1.0 (pairs involved, but also kind-of a dummy)
+
+    """
+
+    #calculate radial vector between points
+    cdef cnp.float64_t rx = w1[0] - (w2[0] + shift[0])
+    cdef cnp.float64_t ry = w1[1] - (w2[1] + shift[1])
+    cdef cnp.float64_t rz = w1[2] - (w2[2] + shift[2])
+    cdef cnp.float64_t norm = sqrt(rx*rx + ry*ry + rz*rz)
+
+    cdef cnp.float64_t dvx, dvy, dvz, result
+
+    if norm==0:
+        result1[0] = 0.0
+        result2[0] = 0.0
+        result3[0] = 0.0
+    else:
+        #calculate the difference velocity.
+        dvx = (w1[3] - w2[3])
+        dvy = (w1[4] - w2[4])
+        dvz = (w1[5] - w2[5])
+
+        #the radial component of the velocity difference
+        result = (dvx*rx + dvy*ry + dvz*rz)/norm - w1[6]*w2[6]
+
+        result1[0] = result #radial velocity
+        result2[0] = result*result #radial velocity squared
+        result3[0] = 1.0 #number of pairs
+
+
+cdef inline void relative_los_velocity_weights(cnp.float64_t* w1,
+                                        cnp.float64_t* w2,
+                                        cnp.float64_t* shift,
+                                        cnp.float64_t* result1,
+                                        cnp.float64_t* result2,
+                                        cnp.float64_t* result3) noexcept nogil:
+    """
+    Calculate the relative line-of-sight (LOS) velocity between two points.
+
+    func ID=3
+
+    Parameters
+    ----------
+    w1 : pointer to an array
+        weights array associated with data1.
+        w1[0] vz velocities
+
+    w2 : pointer to an array
+        weights array associated with data2
+        w2[0] vz velocities
+
+    shift : pointer to an array
+        Length-3 array storing the amount the points were shifted in each spatial
+        dimension.  This is used when doing pair counts on periodic boxes and the
+        points have been preshifted.
+
+    result1 : pointer to a double
+        relative LOS velocity
+
+    result2 : pointer to a double
+        0.0 (dummy)
+
+    result3 : pointer to a double
+        1.0 (pairs involved, but also kind-of a dummy)
+
+    """
+    #calculate radial vector between points
+    # Note that due to the application of the shift,
+    #   when PBCs are applied, rx, ry, rz has its normal sign flipped
+    cdef cnp.float64_t rz = w1[2] - (w2[2] + shift[2])
+    cdef cnp.float64_t norm = fabs(rz)
+
+    cdef cnp.float64_t dvz
+
+    if rz == 0:
+        dvz = -fabs(w1[5] - w2[5])
+    else:
+        dvz = (w1[5] - w2[5])*rz/norm
+
+    result1[0] = dvz #LOS velocity
+    result2[0] = 0.0 #unused value
+    result3[0] = 1.0 #number of pairs
+
+
+cdef inline void los_velocity_variance_counter_weights(cnp.float64_t* w1,
+                                                cnp.float64_t* w2,
+                                                cnp.float64_t* shift,
+                                                cnp.float64_t* result1,
+                                                cnp.float64_t* result2,
+                                                cnp.float64_t* result3) noexcept nogil:
+    """
+    Calculate the relative LOS velocity between two points minus an offset, and the
+    squared quantity.  This function is used to calculate the variance using the
+    "shifted data" technique where a constant value is subtracted from the value.
+
+    func ID=4
+
+    Parameters
+    ----------
+    w1 : pointer to an array
+        weights array associated with data1.
+        w1[0] vz velocities
+
+    w2 : pointer to an array
+        weights array associated with data2
+        w2[0] vz velocities
+
+    shift : pointer to an array
+        Length-3 array storing the amount the points were shifted in each spatial
+        dimension.  This is used when doing pair counts on periodic boxes and the
+        points have been preshifted.
+
+    result1 : pointer to a double
+        relative LOS velocity minus an offset
+
+    result2 : pointer to a double
+        relative LOS velocity minus an offset squared
+
+    result3 : pointer to a double
+        1.0 (pairs involved, but also kind-of a dummy)
+
+    """
+    #calculate radial vector between points
+    # Note that due to the application of the shift,
+    #   when PBCs are applied, rx, ry, rz has its normal sign flipped
+    cdef cnp.float64_t rz = w1[2] - (w2[2] + shift[2])
+    cdef cnp.float64_t norm = fabs(rz)
+
+    cdef cnp.float64_t dvz
+
+    if rz == 0:
+        dvz = -fabs(w1[5] - w2[5]) - w1[6]*w2[6]
+    else:
+        dvz = (w1[5] - w2[5])*rz/norm - w1[6]*w2[6]
+
+    result1[0] = dvz #radial velocity
+    result2[0] = dvz*dvz #radial velocity squared
+    result3[0] = 1.0 #number of pairs
+
+
+# Types identifying the weighting functions. The engines are fused over them, so that one
+# version of the pair-counting loop is compiled per function and the function ID is
+# resolved once per call instead of through a function pointer for every pair.
+cdef struct RelativeRadialVelocity:
+    char unused
+cdef struct RadialVelocityVariance:
+    char unused
+cdef struct RelativeLOSVelocity:
+    char unused
+cdef struct LOSVelocityVariance:
+    char unused
+
+ctypedef fused velocity_weighting_function:
+    RelativeRadialVelocity
+    RadialVelocityVariance
+    RelativeLOSVelocity
+    LOSVelocityVariance
+
+
+cdef inline void velocity_weights(velocity_weighting_function* func,
+                                  cnp.float64_t* w1,
+                                  cnp.float64_t* w2,
+                                  cnp.float64_t* shift,
+                                  cnp.float64_t* result1,
+                                  cnp.float64_t* result2,
+                                  cnp.float64_t* result3) noexcept nogil:
+    """
+    Calls the weighting function identified by the type of ``func``
+    (the pointer itself is not used).
+    """
+    if velocity_weighting_function is RelativeRadialVelocity:
+        relative_radial_velocity_weights(w1, w2, shift, result1, result2, result3)
+    elif velocity_weighting_function is RadialVelocityVariance:
+        radial_velocity_variance_counter_weights(w1, w2, shift, result1, result2, result3)
+    elif velocity_weighting_function is RelativeLOSVelocity:
+        relative_los_velocity_weights(w1, w2, shift, result1, result2, result3)
+    else:
+        los_velocity_variance_counter_weights(w1, w2, shift, result1, result2, result3)
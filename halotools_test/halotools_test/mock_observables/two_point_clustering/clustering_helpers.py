@@ -8,8 +8,9 @@ import numpy as np
 from warnings import warn
 
 from ..mock_observables_helpers import enforce_sample_has_correct_shape
+from ..pair_counters.rectangular_mesh import PreparedSample
 
-__all__ = ('verify_tpcf_estimator', 'process_optional_input_sample2')
+__all__ = ('verify_tpcf_estimator', 'process_optional_input_sample2', 'prepare_samples')
 
 __author__ = ['Duncan Campbell', 'Andrew Hearin']
 
@@ -93,3 +94,29 @@ def process_optional_input_sample2(sample1, sample2, do_cross, ndim=3):
                 _sample1_is_sample2 = False
 
     return sample2, _sample1_is_sample2, do_cross
+
+
+def prepare_samples(sample1, sample2, randoms):
+    """ Function wraps the samples in `~halotools.mock_observables.pair_counters.rectangular_mesh.PreparedSample`
+    so that, within one call to a two-point function, the mesh of each sample is built once and
+    shared by the DD, DR and RR pair counts. Samples that are already prepared (and their meshes)
+    are used as they are.
+
+    Parameters
+    ----------
+    sample1 : array_like
+
+    sample2 : array_like
+
+    randoms : array_like or None
+
+    Returns
+    -------
+    sample1, sample2, randoms : PreparedSample
+        randoms stays None if it was None.
+    """
+    prepared1 = PreparedSample(sample1)
+    prepared2 = prepared1 if sample2 is sample1 else PreparedSample(sample2)
+    if randoms is not None:
+        randoms = PreparedSample(randoms)
+    return prepared1, prepared2, randoms
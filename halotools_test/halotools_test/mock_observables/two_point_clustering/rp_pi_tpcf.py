@@ -8,7 +8,7 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 import numpy as np
 from math import pi
 
-from .clustering_helpers import (process_optional_input_sample2, verify_tpcf_estimator)
+from .clustering_helpers import (process_optional_input_sample2, prepare_samples, verify_tpcf_estimator)
 from .tpcf_estimators import _TP_estimator, _TP_estimator_requirements
 
 from ..mock_observables_helpers import (enforce_sample_has_correct_shape,
@@ -188,6 +188,7 @@ def rp_pi_tpcf(sample1, rp_bins, pi_bins, sample2=None, randoms=None,
 
     sample1, rp_bins, pi_bins, sample2, randoms, period, do_auto, do_cross, num_threads,\
         _sample1_is_sample2, PBCs = _rp_pi_tpcf_process_args(*function_args)
+    sample1, sample2, randoms = prepare_samples(sample1, sample2, randoms)
 
     do_DD, do_DR, do_RR = _TP_estimator_requirements(estimator)
 
@@ -6,7 +6,7 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 import numpy as np
 
-from .clustering_helpers import (process_optional_input_sample2,
+from .clustering_helpers import (process_optional_input_sample2, prepare_samples,
     verify_tpcf_estimator, tpcf_estimator_dd_dr_rr_requirements)
 from ..mock_observables_helpers import (enforce_sample_has_correct_shape,
     get_separation_bins_array, get_line_of_sight_bins_array, get_period, get_num_threads)
@@ -206,6 +206,7 @@ def s_mu_tpcf(sample1, s_bins, mu_bins, sample2=None, randoms=None,
 
     sample1, s_bins, mu_bins, sample2, randoms, period, do_auto, do_cross, num_threads,\
         _sample1_is_sample2, PBCs = _s_mu_tpcf_process_args(*function_args)
+    sample1, sample2, randoms = prepare_samples(sample1, sample2, randoms)
 
     # what needs to be done?
     do_DD, do_DR, do_RR = _TP_estimator_requirements(estimator)
@@ -8,7 +8,7 @@ import numpy as np
 from math import gamma
 from warnings import warn
 
-from .clustering_helpers import (process_optional_input_sample2,
+from .clustering_helpers import (process_optional_input_sample2, prepare_samples,
     verify_tpcf_estimator, tpcf_estimator_dd_dr_rr_requirements)
 from .tpcf_estimators import _TP_estimator
 
@@ -330,6 +330,7 @@ def tpcf(sample1, rbins, sample2=None, randoms=None, period=None,
         do_auto, do_cross, num_threads,
         _sample1_is_sample2, PBCs,
         RR_precomputed, NR_precomputed) = _tpcf_process_args(*function_args)
+    sample1, sample2, randoms = prepare_samples(sample1, sample2, randoms)
 
     # What needs to be done?
     do_DD, do_DR, do_RR = tpcf_estimator_dd_dr_rr_requirements[estimator]
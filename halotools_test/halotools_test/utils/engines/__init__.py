@@ -1 +1,3 @@
 from .conditional_rank_kernel import cython_conditional_rank_kernel
+from .random_streams import cython_random_stream_uniform, cython_random_stream_normal
+from .spline_table_kernel import cython_spline_table_kernel
@@ -2,6 +2,7 @@
 """
 """
 import numpy as np
+cimport numpy as cnp
 cimport cython
 
 from ..array_utils import unsorting_indices
@@ -12,116 +13,66 @@ __all__ = ('cython_conditional_rank_kernel', )
 @cython.boundscheck(False)
 @cython.nonecheck(False)
 @cython.wraparound(False)
-cdef int _bisect_left_kernel(double[:] arr, double value):
-    """ Return the index where to insert ``value`` in list ``arr`` of length ``n``,
-    assuming ``arr`` is sorted.
-
-    This function is equivalent to the bisect_left function implemented in the
-    python standard libary bisect.
-    """
-    cdef int n = arr.shape[0]
-    cdef int ifirst_subarr = 0
-    cdef int ilast_subarr = n
-    cdef int imid_subarr
-
-    while ilast_subarr-ifirst_subarr >= 2:
-        imid_subarr = (ifirst_subarr + ilast_subarr)/2
-        if value > arr[imid_subarr]:
-            ifirst_subarr = imid_subarr
-        else:
-            ilast_subarr = imid_subarr
-    if value > arr[ifirst_subarr]:
-        return ilast_subarr
-    else:
-        return ifirst_subarr
-
-
-@cython.boundscheck(False)
-@cython.nonecheck(False)
-@cython.wraparound(False)
-cdef void _insert_first_pop_last_kernel(int* arr, int value_in, int n):
-    """ Insert the element ``value_in`` into the input array and pop out the last element
-    """
-    cdef int i
-    for i in range(n-2, -1, -1):
-        arr[i+1] = arr[i]
-    arr[0] = value_in
-
-
-@cython.boundscheck(False)
-@cython.nonecheck(False)
-@cython.wraparound(False)
-cdef int _correspondence_indices_shift(int idx_in, int idx_out, int idx):
-    """ Update the correspondence indices array
+cdef inline void _fenwick_add(cnp.int64_t* tree, cnp.int64_t n, cnp.int64_t i, cnp.int64_t value) noexcept nogil:
+    """ Add ``value`` to the count stored at index ``i`` of the Fenwick tree ``tree`` of length ``n``.
     """
-    cdef int shift = 0
-    if idx_in < idx_out:
-        if idx_in <= idx < idx_out:
-            shift = 1
-    elif idx_in > idx_out:
-        if idx_out < idx <= idx_in:
-            shift = -1
-    return shift
+    i += 1
+    while i <= n:
+        tree[i-1] += value
+        i += i & (-i)
 
 
 @cython.boundscheck(False)
 @cython.nonecheck(False)
 @cython.wraparound(False)
-cdef void _insert_pop_kernel(double* arr, int idx_in, int idx_out, double value_in):
-    """ Pop out the value stored in index ``idx_out`` of array ``arr``,
-    and insert ``value_in`` at index ``idx_in`` of the final array.
+cdef inline cnp.int64_t _fenwick_prefix_sum(cnp.int64_t* tree, cnp.int64_t i) noexcept nogil:
+    """ Return the sum of the counts stored at indices strictly smaller than ``i``
+    of the Fenwick tree ``tree``.
     """
-    cdef int i
-
-    if idx_in <= idx_out:
-        for i in range(idx_out-1, idx_in-1, -1):
-            arr[i+1] = arr[i]
-    else:
-        for i in range(idx_out, idx_in):
-            arr[i] = arr[i+1]
-    arr[idx_in] = value_in
+    cdef cnp.int64_t result = 0
+    while i > 0:
+        result += tree[i-1]
+        i -= i & (-i)
+    return result
 
 
 @cython.boundscheck(False)
 @cython.nonecheck(False)
 @cython.wraparound(False)
 def cython_conditional_rank_kernel(double[:] y_sorted, int nwin):
-    """
+    """ Rank-order of each element of ``y_sorted`` within the window of length ``nwin``
+    centered on it. Only the elements whose window fits inside the array are computed,
+    except for the last of these; the remaining elements of the returned array are zero.
+
+    Each element is assigned a global rank over the whole array, and the window is stored
+    as a Fenwick tree of counts indexed by global rank, so that sliding the window and
+    ranking an element each take O(log npts) operations.
+    Ties are broken as if the window were maintained as a sorted array with the values
+    entering the window inserted to the left of equal values:
+    the elements of the first window are ordered as by `numpy.argsort`,
+    and elements entering the window later rank below the equal values already in it.
     """
     cdef int nhalfwin = int(nwin/2)
-    cdef int iy, idx_in, idx_out, idx_temp, i, idx
-    cdef double value_in, value_out
-    cdef int npts = y_sorted.shape[0]
+    cdef cnp.int64_t npts = y_sorted.shape[0]
+    cdef cnp.int64_t iy
     cdef double[:] result = np.zeros(npts, dtype='f8')
 
-    cdef int ifirst_subarr, ilast_subarr, imid_subarr, shift
-
-    cdf_value_table = np.copy(y_sorted[:nwin])
-    idx_sorted_cdf_values = np.argsort(cdf_value_table)
-    _sorted_cdf_value_table = np.copy(cdf_value_table[idx_sorted_cdf_values])
-    _correspondence_indices = np.copy(unsorting_indices(idx_sorted_cdf_values)[::-1])
-
-    cdef double[:] sorted_cdf_value_table = np.array(_sorted_cdf_value_table, dtype='f8')
-    cdef int[:] correspondence_indices = np.array(_correspondence_indices, dtype='i4')
-
-    for iy in range(nhalfwin, npts-nhalfwin-1):
-        result[iy] = correspondence_indices[nhalfwin]
-        value_in = y_sorted[iy + nhalfwin + 1]
-
-        idx_out = correspondence_indices[nwin-1]
-        value_out = sorted_cdf_value_table[idx_out]
-
-        if value_in <= value_out:
-            idx_in = _bisect_left_kernel(sorted_cdf_value_table, value_in)
-        else:
-            idx_in = _bisect_left_kernel(sorted_cdf_value_table, value_in) - 1
+    y = np.asarray(y_sorted)
+    tiebreaker = -np.arange(npts)
+    tiebreaker[np.argsort(y[:nwin])] = np.arange(nwin)
+    cdef cnp.int64_t[:] global_ranks = np.ascontiguousarray(
+        unsorting_indices(np.lexsort((tiebreaker, y))), dtype=np.int64)
 
-        _insert_first_pop_last_kernel(&correspondence_indices[0], idx_in, nwin)
+    cdef cnp.int64_t[:] tree = np.zeros(npts, dtype=np.int64)
+    cdef cnp.int64_t* tree_ptr = &tree[0]
 
-        for i in range(1, nwin):
-            idx = correspondence_indices[i]
-            correspondence_indices[i] += _correspondence_indices_shift(idx_in, idx_out, idx)
+    with nogil:
+        for iy in range(nwin):
+            _fenwick_add(tree_ptr, npts, global_ranks[iy], 1)
 
-        _insert_pop_kernel(&sorted_cdf_value_table[0], idx_in, idx_out, value_in)
+        for iy in range(nhalfwin, npts-nhalfwin-1):
+            result[iy] = _fenwick_prefix_sum(tree_ptr, global_ranks[iy])
+            _fenwick_add(tree_ptr, npts, global_ranks[iy-nhalfwin], -1)
+            _fenwick_add(tree_ptr, npts, global_ranks[iy+nhalfwin+1], 1)
 
     return result
@@ -0,0 +1,93 @@
+# cython: language_level=2
+"""
+Counter-based random numbers, defined inline here so that Cython kernels can
+draw them without the GIL. The Philox4x32-10 generator of Salmon et al. (2011)
+maps a 128-bit counter and a 64-bit key to four 32-bit random integers. The key
+is the random number seed, and the counter stores the stream, the index of the object
+(e.g., of the galaxy) and the number of the draw for that object, so that the random
+numbers assigned to an object do not depend on the order in which objects are processed.
+"""
+from libc.stdint cimport uint32_t, uint64_t
+from libc.math cimport sqrt, log, cos, M_PI
+
+cdef enum:
+    PHILOX_M0 = 0xD2511F53
+    PHILOX_M1 = 0xCD9E8D57
+    PHILOX_W0 = 0x9E3779B9
+    PHILOX_W1 = 0xBB67AE85
+
+
+cdef inline void philox4x32_10(uint32_t* ctr, uint32_t* key, uint32_t* out) noexcept nogil:
+    """
+    Ten rounds of the Philox4x32 bijection of the counter ``ctr``
+    with key ``key``, stored in ``out``.
+    """
+    cdef uint32_t c0 = ctr[0], c1 = ctr[1], c2 = ctr[2], c3 = ctr[3]
+    cdef uint32_t k0 = key[0], k1 = key[1]
+    cdef uint64_t p0, p1
+    cdef int r
+    for r in range(10):
+        if r > 0:
+            k0 = k0 + <uint32_t>PHILOX_W0
+            k1 = k1 + <uint32_t>PHILOX_W1
+        p0 = (<uint64_t>PHILOX_M0) * c0
+        p1 = (<uint64_t>PHILOX_M1) * c2
+        c0 = (<uint32_t>(p1 >> 32)) ^ c1 ^ k0
+        c1 = <uint32_t>p1
+        c2 = (<uint32_t>(p0 >> 32)) ^ c3 ^ k1
+        c3 = <uint32_t>p0
+    out[0] = c0
+    out[1] = c1
+    out[2] = c2
+    out[3] = c3
+
+
+cdef inline void random_stream_block(uint64_t seed, uint32_t stream,
+        uint64_t index, uint32_t block, uint32_t* out) noexcept nogil:
+    """
+    Four random 32-bit integers for block ``block`` of object ``index`` in stream ``stream``.
+    """
+    cdef uint32_t ctr[4]
+    cdef uint32_t key[2]
+    ctr[0] = <uint32_t>index
+    ctr[1] = <uint32_t>(index >> 32)
+    ctr[2] = block
+    ctr[3] = stream
+    key[0] = <uint32_t>seed
+    key[1] = <uint32_t>(seed >> 32)
+    philox4x32_10(ctr, key, out)
+
+
+cdef inline double _uint32_pair_to_double(uint32_t a, uint32_t b) noexcept nogil:
+    """
+    Random double in [0, 1) with 53 random bits.
+    """
+    return ((a >> 5)*67108864.0 + (b >> 6))/9007199254740992.0
+
+
+cdef inline double random_stream_uniform_value(uint64_t seed, uint32_t stream,
+        uint64_t index, uint32_t draw) noexcept nogil:
+    """
+    Uniform random number in [0, 1) for draw ``draw`` of object ``index``
+    in stream ``stream``. Each block of the generator provides two draws.
+    """
+    cdef uint32_t out[4]
+    random_stream_block(seed, stream, index, draw >> 1, out)
+    if draw & 1:
+        return _uint32_pair_to_double(out[2], out[3])
+    else:
+        return _uint32_pair_to_double(out[0], out[1])
+
+
+cdef inline double random_stream_normal_value(uint64_t seed, uint32_t stream,
+        uint64_t index, uint32_t draw) noexcept nogil:
+    """
+    Standard normal random number for draw ``draw`` of object ``index``
+    in stream ``stream``, computed from uniform draws 2*draw and 2*draw+1
+    with the Box-Muller transform.
+    """
+    cdef uint32_t out[4]
+    random_stream_block(seed, stream, index, draw, out)
+    cdef double u1 = _uint32_pair_to_double(out[0], out[1])
+    cdef double u2 = _uint32_pair_to_double(out[2], out[3])
+    return sqrt(-2.*log(1. - u1))*cos(2.*M_PI*u2)
@@ -0,0 +1,56 @@
+# cython: language_level=2
+""" Module containing the vectorized versions of the counter-based random numbers
+declared in random_streams.pxd, used by `~halotools.utils.random_stream_uniform`
+and `~halotools.utils.random_stream_normal`.
+"""
+import numpy as np
+cimport cython
+from libc.stdint cimport uint32_t, uint64_t
+
+__all__ = ('cython_random_stream_uniform', 'cython_random_stream_normal', 'philox4x32_10_block')
+
+
+@cython.boundscheck(False)
+@cython.nonecheck(False)
+@cython.wraparound(False)
+def cython_random_stream_uniform(uint64_t seed, uint32_t stream, uint64_t[:] index, uint32_t draw):
+    """ Uniform random numbers in [0, 1) for draw ``draw`` of objects ``index``
+    in stream ``stream``.
+    """
+    cdef Py_ssize_t i, n = index.shape[0]
+    cdef double[:] result = np.empty(n, dtype='f8')
+    with nogil:
+        for i in range(n):
+            result[i] = random_stream_uniform_value(seed, stream, index[i], draw)
+    return np.asarray(result)
+
+
+@cython.boundscheck(False)
+@cython.nonecheck(False)
+@cython.wraparound(False)
+def cython_random_stream_normal(uint64_t seed, uint32_t stream, uint64_t[:] index, uint32_t draw):
+    """ Standard normal random numbers for draw ``draw`` of objects ``index``
+    in stream ``stream``.
+    """
+    cdef Py_ssize_t i, n = index.shape[0]
+    cdef double[:] result = np.empty(n, dtype='f8')
+    with nogil:
+        for i in range(n):
+            result[i] = random_stream_normal_value(seed, stream, index[i], draw)
+    return np.asarray(result)
+
+
+def philox4x32_10_block(counter, key):
+    """ Output of the Philox4x32-10 generator for a length-4 ``counter``
+    and a length-2 ``key``, used to check the generator against its known-answer tests.
+    """
+    cdef uint32_t ctr[4]
+    cdef uint32_t k[2]
+    cdef uint32_t out[4]
+    cdef int i
+    for i in range(4):
+        ctr[i] = counter[i]
+    for i in range(2):
+        k[i] = key[i]
+    philox4x32_10(ctr, k, out)
+    return tuple(out[i] for i in range(4))
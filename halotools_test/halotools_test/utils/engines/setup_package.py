@@ -2,7 +2,7 @@ from distutils.extension import Extension
 import os
 
 PATH_TO_PKG = os.path.relpath(os.path.dirname(__file__))
-SOURCES = ("conditional_rank_kernel.pyx", )
+SOURCES = ("conditional_rank_kernel.pyx", "random_streams.pyx", "spline_table_kernel.pyx")
 THIS_PKG_NAME = '.'.join(__name__.split('.')[:-1])
 
 
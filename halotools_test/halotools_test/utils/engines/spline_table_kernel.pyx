@@ -0,0 +1,54 @@
+# cython: language_level=2
+""" Module containing the kernel used by `~halotools.empirical_models.call_spline_table`
+to evaluate a stacked table of piecewise polynomials.
+"""
+import numpy as np
+cimport cython
+
+__all__ = ('cython_spline_table_kernel', )
+
+
+@cython.boundscheck(False)
+@cython.nonecheck(False)
+@cython.wraparound(False)
+def cython_spline_table_kernel(const double[:, :] breakpoints,
+        const double[:, :, :] coefficients, const double[:] abscissa,
+        const Py_ssize_t[:] func_indices):
+    """ Evaluate function ``func_indices[i]`` of the table at ``abscissa[i]``.
+
+    Function ``f`` is the polynomial
+    ``sum_m coefficients[f, j, m] * (x - breakpoints[f, j])**(degree - m)``
+    on the interval ``breakpoints[f, j] <= x < breakpoints[f, j+1]``.
+    Points outside the breakpoints are extrapolated with the first or last polynomial.
+    """
+    cdef Py_ssize_t npts = abscissa.shape[0]
+    cdef Py_ssize_t nintervals = coefficients.shape[1]
+    cdef Py_ssize_t ncoeffs = coefficients.shape[2]
+    cdef double[:] result = np.empty(npts, dtype='f8')
+
+    cdef Py_ssize_t i, f, m, low, high, mid
+    cdef double x, dx, y
+
+    with nogil:
+        for i in range(npts):
+            f = func_indices[i]
+            x = abscissa[i]
+
+            #  Bisect for the last interval whose left breakpoint is <= x,
+            #  clipped to the first and last intervals
+            low = 0
+            high = nintervals - 1
+            while low < high:
+                mid = (low + high + 1) >> 1
+                if breakpoints[f, mid] <= x:
+                    low = mid
+                else:
+                    high = mid - 1
+
+            dx = x - breakpoints[f, low]
+            y = coefficients[f, low, 0]
+            for m in range(1, ncoeffs):
+                y = y*dx + coefficients[f, low, m]
+            result[i] = y
+
+    return np.asarray(result)
@@ -0,0 +1,131 @@
+r""" Module providing counter-based random numbers. Each random number is a function
+of the seed, of a stream identifying the quantity being drawn, and of the index
+of the object it is drawn for, so that Monte Carlo realizations can be computed
+for any subset of the objects, in any order or in parallel, with identical results.
+"""
+from __future__ import division, print_function, absolute_import, unicode_literals
+
+import numpy as np
+from zlib import crc32
+
+from .engines import cython_random_stream_uniform, cython_random_stream_normal
+
+__all__ = ('random_stream_id', 'random_stream_uniform', 'random_stream_normal')
+
+_max_seed = 2**64
+
+
+def random_stream_id(name):
+    r""" Integer identifying the random stream with the input name.
+
+    Parameters
+    ----------
+    name : string
+        Name of the stream, e.g., the name of the method drawing the random numbers.
+
+    Returns
+    -------
+    stream : int
+        Unsigned 32-bit integer that only depends on ``name``.
+
+    Examples
+    --------
+    >>> stream = random_stream_id('mc_unit_sphere')
+    """
+    return crc32(name.encode('utf-8')) & 0xffffffff
+
+
+def random_stream_uniform(index, seed=None, stream=0, draw=0, low=0., high=1.):
+    r""" Uniform random numbers computed from the Philox4x32-10 counter-based generator.
+
+    Parameters
+    ----------
+    index : int or array_like
+        Non-negative integer(s) storing the index of each object in the stream.
+        If an integer is passed, the indices of the objects are ``np.arange(index)``.
+
+    seed : int, optional
+        Random number seed. Default is None, in which case a seed is drawn
+        from the global Numpy random state, producing stochastic results.
+
+    stream : int, optional
+        Unsigned 32-bit integer identifying the stream, see `random_stream_id`.
+        Default is 0.
+
+    draw : int, optional
+        Number of the draw for each object. Different draws
+        for the same objects are statistically independent. Default is 0.
+
+    low, high : float, optional
+        Bounds of the interval [low, high) of the random numbers. Default is [0, 1).
+
+    Returns
+    -------
+    randoms : ndarray
+        Array with the same length as ``index``.
+
+    Examples
+    --------
+    >>> randoms = random_stream_uniform(100, seed=43)
+    >>> subset = random_stream_uniform(np.arange(50, 100), seed=43)
+    >>> assert np.all(randoms[50:] == subset)
+    """
+    seed, index = _process_args(index, seed)
+    randoms = cython_random_stream_uniform(seed, stream, index, draw)
+    return low + (high-low)*randoms
+
+
+def random_stream_normal(index, seed=None, stream=0, draw=0, loc=0., scale=1.):
+    r""" Gaussian random numbers computed from the Philox4x32-10 counter-based generator.
+
+    Parameters
+    ----------
+    index : int or array_like
+        Non-negative integer(s) storing the index of each object in the stream.
+        If an integer is passed, the indices of the objects are ``np.arange(index)``.
+
+    seed : int, optional
+        Random number seed. Default is None, in which case a seed is drawn
+        from the global Numpy random state, producing stochastic results.
+
+    stream : int, optional
+        Unsigned 32-bit integer identifying the stream, see `random_stream_id`.
+        Default is 0.
+
+    draw : int, optional
+        Number of the draw for each object. Draw ``draw`` of Gaussian random numbers
+        is computed from draws ``2*draw`` and ``2*draw+1`` of uniform random numbers
+        in the same stream with the Box-Muller transform. Default is 0.
+
+    loc, scale : float or array_like, optional
+        Mean and standard deviation of the Gaussian. Default is 0 and 1.
+
+    Returns
+    -------
+    randoms : ndarray
+        Array with the same length as ``index``.
+
+    Examples
+    --------
+    >>> randoms = random_stream_normal(100, seed=43, scale=np.linspace(1, 2, 100))
+    """
+    seed, index = _process_args(index, seed)
+    randoms = cython_random_stream_normal(seed, stream, index, draw)
+    return loc + scale*randoms
+
+
+def _random_stream_seed(seed):
+    r""" Seed of the random streams, drawn from the global Numpy random state
+    if the input ``seed`` is None.
+    """
+    if seed is None:
+        high, low = np.random.randint(0, 2**32, size=2, dtype=np.int64)
+        seed = int(high)*2**32 + int(low)
+    return int(seed) % _max_seed
+
+
+def _process_args(index, seed):
+    if np.ndim(index) == 0:
+        index = np.arange(index)
+    index = np.ascontiguousarray(np.atleast_1d(index), dtype=np.uint64)
+    return _random_stream_seed(seed), index
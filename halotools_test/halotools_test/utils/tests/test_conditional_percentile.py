@@ -1,5 +1,6 @@
 """
 """
+from bisect import bisect_left
 import numpy as np
 from astropy.utils.misc import NumpyRNGContext
 from copy import deepcopy
@@ -7,6 +8,7 @@ from copy import deepcopy
 from ..conditional_percentile import cython_sliding_rank, sliding_conditional_percentile
 from ..conditional_percentile import rank_order_function, _check_xyn_bounds
 from ..array_utils import unsorting_indices
+from ..engines import cython_conditional_rank_kernel
 
 
 __all__ = ('test_brute_force_python_rank_comparison', )
@@ -93,6 +95,35 @@ def test_brute_force_python_rank_comparison():
     assert num_failures == 0, msg.format(num_failures, num_tests)
 
 
+def python_sorted_window_rank(y_sorted, nwin):
+    r""" Sliding rank computed by maintaining the window as a sorted list,
+    inserting each value entering the window to the left of equal values.
+    """
+    npts = len(y_sorted)
+    nhalfwin = int(nwin/2)
+    result = np.zeros(npts)
+    window = [(y_sorted[i], i) for i in np.argsort(y_sorted[:nwin])]
+    for iy in range(nhalfwin, npts-nhalfwin-1):
+        indices = [i for __, i in window]
+        result[iy] = indices.index(iy)
+        window.pop(indices.index(iy-nhalfwin))
+        value_in = y_sorted[iy+nhalfwin+1]
+        window.insert(bisect_left([value for value, __ in window], value_in),
+            (value_in, iy+nhalfwin+1))
+    return result
+
+
+def test_conditional_rank_kernel_ties():
+    r""" The ranks of tied values should agree with the sorted-window ordering.
+    """
+    with NumpyRNGContext(fixed_seed):
+        y_sorted = np.random.randint(0, 10, 500).astype('f8')
+    for window_length in (5, 35, 101):
+        result = np.asarray(cython_conditional_rank_kernel(y_sorted, window_length))
+        correct_result = python_sorted_window_rank(y_sorted, window_length)
+        assert np.all(result == correct_result)
+
+
 def test1_assume_x_is_sorted():
     npts = 1000
     with NumpyRNGContext(fixed_seed):
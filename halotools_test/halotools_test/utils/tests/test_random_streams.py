@@ -0,0 +1,74 @@
+"""
+"""
+import numpy as np
+from astropy.utils.misc import NumpyRNGContext
+
+from ..random_streams import random_stream_id, random_stream_uniform, random_stream_normal
+from ..engines.random_streams import philox4x32_10_block
+
+
+__all__ = ('test_philox4x32_10_known_answers', )
+
+fixed_seed = 43
+
+
+def test_philox4x32_10_known_answers():
+    """ Compare the generator to the known-answer tests of the Random123 library.
+    """
+    assert philox4x32_10_block((0, 0, 0, 0), (0, 0)) == (
+        0x6627e8d5, 0xe169c58d, 0xbc57ac4c, 0x9b00dbd8)
+    assert philox4x32_10_block((0xffffffff,)*4, (0xffffffff,)*2) == (
+        0x408f276d, 0x41c83b0e, 0xa20bc7c6, 0x6d5451fd)
+    counter = (0x243f6a88, 0x85a308d3, 0x13198a2e, 0x03707344)
+    key = (0xa4093822, 0x299f31d0)
+    assert philox4x32_10_block(counter, key) == (
+        0xd16cfe09, 0x94fdcceb, 0x5001e420, 0x24126ea1)
+
+
+def test_random_stream_uniform_subsets():
+    """ The random number of each object only depends on its index,
+    so that chunks of objects can be processed in any order.
+    """
+    npts = 1000
+    randoms = random_stream_uniform(npts, seed=fixed_seed)
+
+    with NumpyRNGContext(fixed_seed):
+        index = np.random.permutation(npts)
+    assert np.all(random_stream_uniform(index, seed=fixed_seed) == randoms[index])
+
+    chunks = [random_stream_uniform(np.arange(i, min(i+300, npts)), seed=fixed_seed)
+        for i in range(0, npts, 300)]
+    assert np.all(np.concatenate(chunks) == randoms)
+
+
+def test_random_stream_uniform_independence():
+    npts = 1000
+    randoms = random_stream_uniform(npts, seed=fixed_seed)
+    assert not np.any(random_stream_uniform(npts, seed=fixed_seed+1) == randoms)
+    assert not np.any(random_stream_uniform(npts, seed=fixed_seed, draw=1) == randoms)
+    stream = random_stream_id('some_method')
+    assert not np.any(random_stream_uniform(npts, seed=fixed_seed, stream=stream) == randoms)
+
+    randoms2 = random_stream_uniform(npts)
+    randoms3 = random_stream_uniform(npts)
+    assert not np.any(randoms2 == randoms3)
+
+
+def test_random_stream_uniform_distribution():
+    npts = int(1e5)
+    randoms = random_stream_uniform(npts, seed=fixed_seed, low=-1, high=3)
+    assert np.all(randoms >= -1)
+    assert np.all(randoms < 3)
+    counts = np.histogram(randoms, bins=np.linspace(-1, 3, 11))[0]
+    assert np.allclose(counts, npts/10., rtol=0.05)
+
+
+def test_random_stream_normal_distribution():
+    npts = int(1e5)
+    randoms = random_stream_normal(npts, seed=fixed_seed, loc=1, scale=2)
+    assert np.allclose(np.mean(randoms), 1, atol=0.03)
+    assert np.allclose(np.std(randoms), 2, rtol=0.02)
+
+    scale = np.linspace(1, 2, npts)
+    randoms2 = random_stream_normal(npts, seed=fixed_seed, scale=scale)
+    assert np.allclose(randoms2, (randoms - 1)/2.*scale)